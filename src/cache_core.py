@@ -1,9 +1,11 @@
 """
 cache_core.py - LUGS-Integrated Cache System
-Version: 2025.10.21.01
+Version: 2026.10.18.01
 Description: In-memory cache with LUGS tracking, metrics, TTL, rate limiting
 
 CHANGELOG:
+- 2026.10.18.01: Rate limiting via shared GCRA limiter (rate_limiter.py) replaces deque window
+
 - 2025.10.21.01: PHASE 1 OPTIMIZATION
   - Added rate limiting (1000 ops/sec, similar to METRICS)
   - Added reset method for testing
@@ -25,7 +27,7 @@ Licensed under the Apache License, Version 2.0
 
 import time
 import sys
-from collections import deque
+from rate_limiter import get_rate_limiter
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, Optional, Set
@@ -89,34 +91,20 @@ class LUGSIntegratedCache:
         self.current_bytes = 0
         
         # Rate limiting (Phase 1 addition)
-        self._rate_limiter = deque(maxlen=RATE_LIMIT_MAX_OPS)
-        self._rate_limit_window_ms = RATE_LIMIT_WINDOW_MS
-        self._rate_limited_count = 0
+        self._rate_limiter = get_rate_limiter('cache', RATE_LIMIT_MAX_OPS)
     
     def _check_rate_limit(self) -> bool:
         """
-        Check if rate limit exceeded.
+        Check if operation is within rate limit.
         
-        Uses sliding window rate limiter (1000 ops/sec default).
-        Same pattern as METRICS interface (LESS-21).
+        Shared GCRA limiter 'cache' (rate_limiter.py): O(1), monotonic clock.
+        No threading locks needed (AP-08, DEC-04).
         
         Returns:
-            True if operation allowed, False if rate limited
+            bool: True if operation allowed, False if rate limited
         """
-        now = time.time() * 1000  # Convert to milliseconds
-        
-        # Clean old timestamps outside window
-        while self._rate_limiter and (now - self._rate_limiter[0]) > self._rate_limit_window_ms:
-            self._rate_limiter.popleft()
-        
-        # Check limit
-        if len(self._rate_limiter) >= RATE_LIMIT_MAX_OPS:
-            self._rate_limited_count += 1
-            return False  # Rate limited
-        
-        self._rate_limiter.append(now)
-        return True
-    
+        return self._rate_limiter.allow()
+
     def _calculate_entry_size(self, key: str, value: Any) -> int:
         """Estimate memory size of cache entry."""
         try:
@@ -375,8 +363,7 @@ class LUGSIntegratedCache:
         """
         self._cache.clear()
         self.current_bytes = 0
-        self._rate_limiter.clear()
-        self._rate_limited_count = 0
+        self._rate_limiter.reset()
         return True
     
     def cleanup_expired(self) -> int:
@@ -472,7 +459,7 @@ class LUGSIntegratedCache:
             'max_mb': round(self.max_bytes / (1024 * 1024), 2),
             'memory_utilization_percent': round((self.current_bytes / self.max_bytes) * 100, 2),
             'default_ttl_seconds': DEFAULT_CACHE_TTL,
-            'rate_limited_count': self._rate_limited_count  # Phase 1 addition
+            'rate_limited_count': self._rate_limiter.rejected  # Phase 1 addition
         }
     
     def get_module_dependencies(self) -> Set[str]:
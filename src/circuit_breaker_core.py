@@ -1,8 +1,36 @@
 """
 circuit_breaker_core.py - Circuit Breaker Pattern Implementation
-Version: 2025.10.22.01 (OPTIMIZED - Phase 1 + SINGLETON + Rate Limiting)
+Version: 2026.10.18.04 (OPTIMIZED - Phase 1 + SINGLETON + Rate Limiting)
 Description: Circuit breaker with SIMA compliance and Phase 1 optimizations
 
+CHANGES (2026.10.18.04):
+- Split call protection for callers that can't pass a function (asyncio
+  requests): manager.allow(name) before the call, manager.record(name,
+  success, duration_ms) after it
+- CircuitBreaker gets allow_request() / record() like the sliding window
+  breaker; call() is unchanged
+
+CHANGES (2026.10.18.03):
+- SlidingWindowCircuitBreaker: failure-rate and slow-call-rate over a ring
+  buffer of the last N calls, limited HALF_OPEN probes, exponentially
+  increasing open durations (fixes flapping under partial degradation)
+- Policy selectable per name: manager.get(name, policy='sliding_window', ...)
+  or CIRCUIT_BREAKER_SLIDING_WINDOW=<names> for implicitly created breakers
+
+CHANGES (2026.10.18.02):
+- Lean call() hot path: no uuid4, no gateway import, no per-call metric
+  or log. State check + outcome are attribute updates on __slots__ state
+- Call durations go to a per-breaker CallHistogram, flushed to METRICS
+  once per invocation (invocation end hook) via flush_metrics()
+- Only the transition to OPEN is logged, with the invocation
+  correlation ID (invocation_context.get_correlation_id)
+- Manager call() checks the rate limit once (was three times per call)
+- get_circuit_breaker_manager() returns the module instance directly once
+  it is registered (no gateway singleton lookup per call)
+
+CHANGES (2026.10.18.01):
+- Rate limiting via shared GCRA limiter (rate_limiter.py) replaces deque window
+
 PHASE 1 OPTIMIZATIONS APPLIED:
 ==============================
 ✅ REMOVED THREADING LOCKS (AP-08, DEC-04) - CRITICAL FIX
@@ -49,10 +77,12 @@ Copyright 2025 Joseph Hersey
 Licensed under Apache 2.0 (see LICENSE).
 """
 
+import os
 import time
-import uuid
-from typing import Callable, Dict, Any, Optional
-from collections import deque
+from bisect import bisect_left
+from typing import Callable, Dict, Any, List, Optional
+from rate_limiter import get_rate_limiter
+from invocation_context import get_correlation_id, register_invocation_end_hook
 from enum import Enum
 
 
@@ -65,18 +95,92 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"  # Testing recovery
 
 
+# Call duration bucket upper bounds (ms) - last bucket is everything above
+DURATION_BUCKETS_MS = (5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0)
+
+
+class CallHistogram:
+    """
+    Fixed-bucket call duration histogram (local, flushed once per invocation).
+    
+    observe() is a bisect plus a few integer adds - no allocation, no gateway.
+    """
+    
+    __slots__ = ('counts', 'count', 'failures', 'total_ms', 'max_ms')
+    
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(DURATION_BUCKETS_MS) + 1)
+        self.count = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, duration_ms: float, success: bool) -> None:
+        self.counts[bisect_left(DURATION_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+        if not success:
+            self.failures += 1
+    
+    def quantile(self, q: float) -> float:
+        """Bucket upper bound containing quantile q (max_ms for the last bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(DURATION_BUCKETS_MS):
+                    return min(DURATION_BUCKETS_MS[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'failures': self.failures,
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.5), 3),
+            'p99_ms': round(self.quantile(0.99), 3),
+            'max_ms': round(self.max_ms, 3)
+        }
+    
+    def clear(self) -> None:
+        counts = self.counts
+        for index in range(len(counts)):
+            counts[index] = 0
+        self.count = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+
 # ===== CIRCUIT BREAKER =====
 
 class CircuitBreaker:
     """
     Single circuit breaker instance.
     
+    Hot path (call) is the state check, the function call and a few
+    attribute updates. Durations go to a local CallHistogram that the
+    manager flushes to METRICS once per invocation.
+    
     COMPLIANCE:
     - AP-08: No threading locks (Lambda single-threaded)
     - DEC-04: Lambda single-threaded model
     - LESS-21: Rate limiting for DoS protection
     """
     
+    __slots__ = ('name', 'failure_threshold', 'timeout', 'state', 'failures',
+                 'last_failure_time', 'histogram', '_total_calls',
+                 '_successful_calls', '_failed_calls', '_rejected_calls',
+                 '_times_opened', '_last_error')
+    
+    policy = 'consecutive'
+    
     def __init__(self, name: str, failure_threshold: int = 5, timeout: int = 60):
         self.name = name
         self.failure_threshold = failure_threshold
@@ -84,20 +188,25 @@ class CircuitBreaker:
         self.state = CircuitState.CLOSED
         self.failures = 0
         self.last_failure_time = None
+        self.histogram = CallHistogram()
         
         # Statistics
         self._total_calls = 0
         self._successful_calls = 0
         self._failed_calls = 0
         self._rejected_calls = 0
+        self._times_opened = 0
+        self._last_error: Optional[str] = None
     
-    def call(self, func: Callable, rate_limit_check: Callable, *args, **kwargs) -> Any:
+    def call(self, func: Callable, rate_limit_check: Optional[Callable] = None,
+             *args, **kwargs) -> Any:
         """
         Execute function with circuit breaker protection.
         
         Args:
             func: Function to execute
-            rate_limit_check: Callable that returns True if within rate limit
+            rate_limit_check: Optional callable that returns True if within
+                rate limit (None when the caller already checked)
             *args, **kwargs: Arguments for func
         
         Returns:
@@ -106,95 +215,53 @@ class CircuitBreaker:
         Raises:
             Exception: If circuit is open or function fails
         """
-        # Check rate limit first
-        if not rate_limit_check():
+        if rate_limit_check is not None and not rate_limit_check():
             raise Exception(f"Circuit breaker '{self.name}': Rate limit exceeded")
         
         self._total_calls += 1
         
         # Check if circuit is open
-        if self.state == CircuitState.OPEN:
+        if self.state is CircuitState.OPEN:
             if time.time() - self.last_failure_time > self.timeout:
                 self.state = CircuitState.HALF_OPEN
             else:
                 self._rejected_calls += 1
                 raise Exception(f"Circuit breaker '{self.name}' is OPEN")
         
-        # Create operation context
-        correlation_id = str(uuid.uuid4())
-        start_time = time.time()
-        
+        start_time = time.perf_counter()
         try:
-            # Import from gateway for cross-interface utilities
-            from gateway import execute_operation, GatewayInterface
-            
-            # Execute the function
             result = func(*args, **kwargs)
-            
-            # Record success metrics via gateway
-            duration_ms = (time.time() - start_time) * 1000
-            try:
-                execute_operation(
-                    GatewayInterface.METRICS,
-                    'record_metric',
-                    name='circuit_breaker_call_duration',
-                    value=duration_ms,
-                    tags={
-                        'operation': 'call',
-                        'success': 'true',
-                        'correlation_id': correlation_id
-                    }
-                )
-            except Exception:
-                pass  # Metrics failure should not crash circuit breaker
-            
-            self._on_success()
-            return result
-            
-        except ImportError:
-            # Fallback: execute without gateway
-            try:
-                result = func(*args, **kwargs)
-                self._on_success()
-                return result
-            except Exception as e:
-                self._on_failure()
-                raise
-        
         except Exception as e:
-            # Record failure metrics via gateway
-            duration_ms = (time.time() - start_time) * 1000
-            try:
-                from gateway import execute_operation, GatewayInterface
-                execute_operation(
-                    GatewayInterface.METRICS,
-                    'record_metric',
-                    name='circuit_breaker_call_duration',
-                    value=duration_ms,
-                    tags={
-                        'operation': 'call',
-                        'success': 'false',
-                        'correlation_id': correlation_id
-                    }
-                )
-                
-                execute_operation(
-                    GatewayInterface.LOGGING,
-                    'log_error',
-                    message=f"Circuit breaker call failed: {str(e)}",
-                    extra={'correlation_id': correlation_id}
-                )
-            except Exception:
-                pass  # Metrics/logging failure should not crash circuit breaker
-            
+            self.histogram.observe((time.perf_counter() - start_time) * 1000, False)
+            self._last_error = f"{type(e).__name__}: {e}"
             self._on_failure()
             raise
+        
+        self.histogram.observe((time.perf_counter() - start_time) * 1000, True)
+        self._on_success()
+        return result
+    
+    def allow_request(self) -> bool:
+        """Check (and take) permission for one call made outside call()."""
+        if self.state is CircuitState.OPEN:
+            if time.time() - self.last_failure_time <= self.timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+        return True
+    
+    def record(self, success: bool, duration_ms: float) -> None:
+        """Record the outcome of a call permitted by allow_request()."""
+        self.histogram.observe(duration_ms, success)
+        if success:
+            self._on_success()
+        else:
+            self._on_failure()
     
     def _on_success(self):
         """Handle successful call (no locks needed in single-threaded Lambda)."""
         self._successful_calls += 1
         self.failures = 0
-        if self.state == CircuitState.HALF_OPEN:
+        if self.state is CircuitState.HALF_OPEN:
             self.state = CircuitState.CLOSED
     
     def _on_failure(self):
@@ -202,8 +269,21 @@ class CircuitBreaker:
         self._failed_calls += 1
         self.failures += 1
         self.last_failure_time = time.time()
-        if self.failures >= self.failure_threshold:
+        if self.failures >= self.failure_threshold and self.state is not CircuitState.OPEN:
             self.state = CircuitState.OPEN
+            self._times_opened += 1
+            self._log_opened()
+    
+    def _log_opened(self):
+        """Log the CLOSED/HALF_OPEN -> OPEN transition (rare, so via gateway)."""
+        try:
+            from gateway import log_warning
+            log_warning(
+                f"Circuit breaker '{self.name}' OPEN after {self.failures} failures: {self._last_error}",
+                correlation_id=get_correlation_id()
+            )
+        except Exception:
+            pass  # Logging failure should not crash circuit breaker
     
     def reset(self):
         """Reset circuit breaker state."""
@@ -216,20 +296,317 @@ class CircuitBreaker:
         """Get current circuit breaker state."""
         return {
             'name': self.name,
+            'policy': self.policy,
             'state': self.state.value,
             'failures': self.failures,
             'threshold': self.failure_threshold,
             'timeout': self.timeout,
             'last_failure': self.last_failure_time,
+            'last_error': self._last_error,
             'statistics': {
                 'total_calls': self._total_calls,
                 'successful_calls': self._successful_calls,
                 'failed_calls': self._failed_calls,
-                'rejected_calls': self._rejected_calls
+                'rejected_calls': self._rejected_calls,
+                'times_opened': self._times_opened,
+                'pending_durations': self.histogram.summary()
             }
         }
 
 
+# ===== SLIDING WINDOW CIRCUIT BREAKER =====
+
+# Breaker policies selectable per name (manager.get(..., policy=...))
+POLICY_CONSECUTIVE = 'consecutive'
+POLICY_SLIDING_WINDOW = 'sliding_window'
+
+# Breaker names that default to the sliding window policy when created
+# implicitly (e.g. by execute_with_circuit_breaker)
+CIRCUIT_BREAKER_SLIDING_WINDOW = frozenset(
+    name.strip() for name in os.getenv('CIRCUIT_BREAKER_SLIDING_WINDOW', '').split(',') if name.strip()
+)
+
+# Ring buffer outcome flags
+_OUTCOME_FAILURE = 1
+_OUTCOME_SLOW = 2
+
+
+class SlidingWindowCircuitBreaker:
+    """
+    Failure-rate / slow-call-rate circuit breaker over the last N calls.
+    
+    CLOSED: every call outcome goes into a ring buffer of window_size
+    entries. Once minimum_calls are recorded, the breaker opens when the
+    failure rate or the slow-call rate reaches its threshold.
+    
+    OPEN: calls are rejected for the open duration. Each consecutive open
+    (without a successful close in between) multiplies the duration by
+    open_backoff, up to max_open_duration.
+    
+    HALF_OPEN: at most half_open_max_probes calls are let through (others
+    are rejected). The breaker opens again as soon as the probe failures
+    or slow probes alone reach the threshold, and closes (window cleared,
+    open duration back to base) once all probes completed below it. A
+    single lucky probe can no longer close it.
+    
+    Same interface as CircuitBreaker (call, reset, get_state).
+    
+    Args:
+        name: Breaker name
+        window_size: Calls kept in the ring buffer
+        minimum_calls: Calls needed before rates are evaluated
+        failure_rate_threshold: Failure rate (0-1) that opens the breaker
+        slow_call_duration_ms: Calls at least this long count as slow
+        slow_call_rate_threshold: Slow-call rate (0-1) that opens the breaker
+        half_open_max_probes: Calls allowed through in HALF_OPEN
+        timeout: Base open duration in seconds
+        open_backoff: Open duration multiplier per consecutive open
+        max_open_duration: Open duration cap in seconds
+        clock: Monotonic time source in seconds (injectable for simulation)
+    """
+    
+    __slots__ = ('name', 'window_size', 'minimum_calls', 'failure_rate_threshold',
+                 'slow_call_duration_ms', 'slow_call_rate_threshold',
+                 'half_open_max_probes', 'timeout', 'open_backoff',
+                 'max_open_duration', 'state', 'histogram', '_clock',
+                 '_window', '_index', '_recorded', '_window_failures', '_window_slow',
+                 '_open_until', '_consecutive_opens', '_probes_started',
+                 '_probes_done', '_probe_failures', '_probe_slow',
+                 '_total_calls', '_successful_calls', '_failed_calls',
+                 '_slow_calls', '_rejected_calls', '_times_opened', '_last_error',
+                 'last_failure_time')
+    
+    policy = POLICY_SLIDING_WINDOW
+    
+    def __init__(self, name: str, window_size: int = 20, minimum_calls: int = 10,
+                 failure_rate_threshold: float = 0.5, slow_call_duration_ms: float = 2000.0,
+                 slow_call_rate_threshold: float = 0.8, half_open_max_probes: int = 3,
+                 timeout: float = 30, open_backoff: float = 2.0, max_open_duration: float = 300,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.window_size = max(1, int(window_size))
+        self.minimum_calls = max(1, min(int(minimum_calls), self.window_size))
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration_ms = slow_call_duration_ms
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.half_open_max_probes = max(1, int(half_open_max_probes))
+        self.timeout = timeout
+        self.open_backoff = max(1.0, open_backoff)
+        self.max_open_duration = max(timeout, max_open_duration)
+        self.histogram = CallHistogram()
+        self._clock = clock
+        
+        self._window = bytearray(self.window_size)
+        self._total_calls = 0
+        self._successful_calls = 0
+        self._failed_calls = 0
+        self._slow_calls = 0
+        self._rejected_calls = 0
+        self._times_opened = 0
+        self._last_error: Optional[str] = None
+        self.last_failure_time = None
+        self.reset()
+    
+    # --- state machine ---
+    
+    def allow_request(self) -> bool:
+        """Check (and take) permission for one call."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.OPEN:
+            if self._clock() < self._open_until:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probes_started = 0
+            self._probes_done = 0
+            self._probe_failures = 0
+            self._probe_slow = 0
+        if self._probes_started >= self.half_open_max_probes:
+            return False
+        self._probes_started += 1
+        return True
+    
+    def record(self, success: bool, duration_ms: float) -> None:
+        """Record the outcome of a permitted call."""
+        slow = duration_ms >= self.slow_call_duration_ms
+        self.histogram.observe(duration_ms, success)
+        if success:
+            self._successful_calls += 1
+        else:
+            self._failed_calls += 1
+            self.last_failure_time = time.time()
+        if slow:
+            self._slow_calls += 1
+        
+        if self.state is CircuitState.HALF_OPEN:
+            self._record_probe(success, slow)
+            return
+        if self.state is CircuitState.OPEN:
+            return  # Call started before the breaker opened
+        
+        # Ring buffer: replace the oldest outcome, keep running counts
+        outcome = (0 if success else _OUTCOME_FAILURE) | (_OUTCOME_SLOW if slow else 0)
+        index = self._index
+        evicted = self._window[index]
+        if self._recorded == self.window_size:
+            self._window_failures -= evicted & _OUTCOME_FAILURE
+            self._window_slow -= (evicted & _OUTCOME_SLOW) >> 1
+        else:
+            self._recorded += 1
+        self._window[index] = outcome
+        self._window_failures += outcome & _OUTCOME_FAILURE
+        self._window_slow += (outcome & _OUTCOME_SLOW) >> 1
+        self._index = (index + 1) % self.window_size
+        
+        if self._recorded >= self.minimum_calls and (
+                self._window_failures >= self.failure_rate_threshold * self._recorded or
+                self._window_slow >= self.slow_call_rate_threshold * self._recorded):
+            self._trip()
+    
+    def _record_probe(self, success: bool, slow: bool) -> None:
+        self._probes_done += 1
+        if not success:
+            self._probe_failures += 1
+        if slow:
+            self._probe_slow += 1
+        
+        probes = self.half_open_max_probes
+        if (self._probe_failures >= self.failure_rate_threshold * probes or
+                self._probe_slow >= self.slow_call_rate_threshold * probes):
+            self._trip()
+        elif self._probes_done >= probes:
+            self._close()
+    
+    def _trip(self) -> None:
+        self._consecutive_opens += 1
+        duration = min(self.max_open_duration,
+                       self.timeout * self.open_backoff ** (self._consecutive_opens - 1))
+        self.state = CircuitState.OPEN
+        self._open_until = self._clock() + duration
+        self._times_opened += 1
+        self._log_opened(duration)
+    
+    def _close(self) -> None:
+        self.state = CircuitState.CLOSED
+        self._consecutive_opens = 0
+        self._clear_window()
+    
+    def _clear_window(self) -> None:
+        self._index = 0
+        self._recorded = 0
+        self._window_failures = 0
+        self._window_slow = 0
+    
+    def _log_opened(self, duration: float) -> None:
+        """Log the transition to OPEN (rare, so via gateway)."""
+        try:
+            from gateway import log_warning
+            log_warning(
+                f"Circuit breaker '{self.name}' OPEN for {duration:.0f}s "
+                f"(open #{self._consecutive_opens}): {self._last_error}",
+                correlation_id=get_correlation_id()
+            )
+        except Exception:
+            pass  # Logging failure should not crash circuit breaker
+    
+    # --- CircuitBreaker interface ---
+    
+    def call(self, func: Callable, rate_limit_check: Optional[Callable] = None,
+             *args, **kwargs) -> Any:
+        """
+        Execute function with circuit breaker protection.
+        
+        Args:
+            func: Function to execute
+            rate_limit_check: Optional callable that returns True if within
+                rate limit (None when the caller already checked)
+            *args, **kwargs: Arguments for func
+        
+        Returns:
+            Function result
+            
+        Raises:
+            Exception: If circuit is open (or out of probes) or function fails
+        """
+        if rate_limit_check is not None and not rate_limit_check():
+            raise Exception(f"Circuit breaker '{self.name}': Rate limit exceeded")
+        
+        self._total_calls += 1
+        if not self.allow_request():
+            self._rejected_calls += 1
+            raise Exception(f"Circuit breaker '{self.name}' is {self.state.name}")
+        
+        clock = self._clock
+        start_time = clock()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._last_error = f"{type(e).__name__}: {e}"
+            self.record(False, (clock() - start_time) * 1000)
+            raise
+        
+        self.record(True, (clock() - start_time) * 1000)
+        return result
+    
+    def reset(self):
+        """Reset circuit breaker state (statistics kept)."""
+        self.state = CircuitState.CLOSED
+        self._clear_window()
+        self._open_until = 0.0
+        self._consecutive_opens = 0
+        self._probes_started = 0
+        self._probes_done = 0
+        self._probe_failures = 0
+        self._probe_slow = 0
+        self.last_failure_time = None
+    
+    def get_state(self) -> Dict[str, Any]:
+        """Get current circuit breaker state."""
+        recorded = self._recorded
+        return {
+            'name': self.name,
+            'policy': self.policy,
+            'state': self.state.value,
+            'window': {
+                'size': self.window_size,
+                'recorded': recorded,
+                'failure_rate': round(self._window_failures / recorded, 4) if recorded else 0.0,
+                'slow_call_rate': round(self._window_slow / recorded, 4) if recorded else 0.0
+            },
+            'thresholds': {
+                'minimum_calls': self.minimum_calls,
+                'failure_rate': self.failure_rate_threshold,
+                'slow_call_rate': self.slow_call_rate_threshold,
+                'slow_call_duration_ms': self.slow_call_duration_ms
+            },
+            'open': {
+                'consecutive_opens': self._consecutive_opens,
+                'remaining_seconds': round(max(0.0, self._open_until - self._clock()), 3)
+                    if self.state is CircuitState.OPEN else 0.0,
+                'half_open_probes': self._probes_started
+            },
+            'timeout': self.timeout,
+            'last_failure': self.last_failure_time,
+            'last_error': self._last_error,
+            'statistics': {
+                'total_calls': self._total_calls,
+                'successful_calls': self._successful_calls,
+                'failed_calls': self._failed_calls,
+                'slow_calls': self._slow_calls,
+                'rejected_calls': self._rejected_calls,
+                'times_opened': self._times_opened,
+                'pending_durations': self.histogram.summary()
+            }
+        }
+
+
+_BREAKER_POLICIES = {
+    POLICY_CONSECUTIVE: CircuitBreaker,
+    POLICY_SLIDING_WINDOW: SlidingWindowCircuitBreaker,
+}
+
+
 class CircuitBreakerCore:
     """
     Manages circuit breakers with SINGLETON pattern and rate limiting.
@@ -246,57 +623,145 @@ class CircuitBreakerCore:
         
         # Rate limiting (1000 ops/sec - higher for infrastructure)
         # LESS-21: Rate limiting essential for DoS protection
-        self._rate_limiter = deque(maxlen=1000)  # 1000 ops/sec window
-        self._rate_limit_window_ms = 1000  # 1 second window
-        self._rate_limited_count = 0
+        self._rate_limiter = get_rate_limiter('circuit_breaker', 1000)
         
         # Statistics
         self._total_operations = 0
+        self._metric_flushes = 0
+        
+        # Durations are flushed once per invocation, not per call
+        register_invocation_end_hook(self.flush_metrics)
     
     def _check_rate_limit(self) -> bool:
         """
         Check if operation is within rate limit.
         
-        LESS-21: Uses deque for efficient rate limiting.
+        Shared GCRA limiter 'circuit_breaker' (rate_limiter.py): O(1), monotonic clock.
         No threading locks needed (AP-08, DEC-04).
         
         Returns:
             bool: True if operation allowed, False if rate limited
         """
-        now = time.time() * 1000  # milliseconds
-        
-        # Remove expired timestamps
-        while self._rate_limiter and (now - self._rate_limiter[0]) > self._rate_limit_window_ms:
-            self._rate_limiter.popleft()
+        return self._rate_limiter.allow()
+
+    def get(self, name: str, failure_threshold: int = 5, timeout: int = 60,
+            policy: Optional[str] = None, **options) -> CircuitBreaker:
+        """
+        Get or create circuit breaker (no locks needed in single-threaded Lambda).
         
-        # Check if over limit
-        if len(self._rate_limiter) >= 1000:  # 1000 ops/sec
-            self._rate_limited_count += 1
-            return False
+        Args:
+            name: Breaker name
+            failure_threshold: Consecutive failures that open a 'consecutive' breaker
+            timeout: Open duration in seconds (base duration for 'sliding_window')
+            policy: 'consecutive' or 'sliding_window' (default: 'sliding_window'
+                if name is listed in CIRCUIT_BREAKER_SLIDING_WINDOW, else
+                'consecutive')
+            **options: SlidingWindowCircuitBreaker options (window_size,
+                failure_rate_threshold, ...)
         
-        # Add current timestamp
-        self._rate_limiter.append(now)
-        return True
-    
-    def get(self, name: str, failure_threshold: int = 5, timeout: int = 60) -> CircuitBreaker:
-        """Get or create circuit breaker (no locks needed in single-threaded Lambda)."""
+        Returns:
+            The breaker. An existing breaker is replaced only when a
+            different policy is requested explicitly.
+        """
         if not self._check_rate_limit():
             raise Exception("Rate limit exceeded")
         
         self._total_operations += 1
         
-        if name not in self._breakers:
-            self._breakers[name] = CircuitBreaker(name, failure_threshold, timeout)
-        return self._breakers[name]
+        breaker = self._breakers.get(name)
+        if breaker is not None and (policy is None or breaker.policy == policy):
+            return breaker
+        
+        breaker = self._create(name, policy, failure_threshold=failure_threshold,
+                               timeout=timeout, **options)
+        self._breakers[name] = breaker
+        return breaker
+    
+    def _create(self, name: str, policy: Optional[str] = None, failure_threshold: int = 5,
+                timeout: int = 60, **options) -> CircuitBreaker:
+        """Build a breaker for the given (or configured default) policy."""
+        if policy is None:
+            policy = POLICY_SLIDING_WINDOW if name in CIRCUIT_BREAKER_SLIDING_WINDOW else POLICY_CONSECUTIVE
+        if policy not in _BREAKER_POLICIES:
+            raise ValueError(f"Unknown circuit breaker policy: '{policy}'. "
+                             f"Valid policies: {', '.join(_BREAKER_POLICIES)}")
+        if policy == POLICY_SLIDING_WINDOW:
+            return SlidingWindowCircuitBreaker(name, timeout=timeout, **options)
+        return CircuitBreaker(name, failure_threshold, timeout)
     
     def call(self, name: str, func: Callable, *args, **kwargs) -> Any:
-        """Call function with circuit breaker protection."""
-        if not self._check_rate_limit():
+        """Call function with circuit breaker protection (one rate limit check)."""
+        if not self._rate_limiter.allow():
             raise Exception("Rate limit exceeded")
         
         self._total_operations += 1
-        breaker = self.get(name)
-        return breaker.call(func, self._check_rate_limit, *args, **kwargs)
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = self._create(name)
+        return breaker.call(func, None, *args, **kwargs)
+    
+    def allow(self, name: str) -> bool:
+        """
+        Permission for one call that runs outside call() (e.g. an awaited
+        request). Every permitted call must be followed by record().
+        
+        Returns:
+            bool: False if the breaker rejects the call (counted as rejected)
+        """
+        if not self._rate_limiter.allow():
+            raise Exception("Rate limit exceeded")
+        
+        self._total_operations += 1
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = self._create(name)
+        breaker._total_calls += 1
+        if breaker.allow_request():
+            return True
+        breaker._rejected_calls += 1
+        return False
+    
+    def record(self, name: str, success: bool, duration_ms: float,
+               error: Optional[str] = None) -> None:
+        """Record the outcome of a call permitted by allow()."""
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            return  # Manager reset while the call was running
+        if not success and error:
+            breaker._last_error = error
+        breaker.record(success, duration_ms)
+    
+    def flush_metrics(self) -> int:
+        """
+        Send pending call histograms to METRICS and clear them.
+        
+        Runs at the end of every invocation. One set of metrics per breaker
+        that was called, dimensioned by breaker name only.
+        
+        Returns:
+            int: Number of breakers flushed
+        """
+        pending = [breaker for breaker in self._breakers.values() if breaker.histogram.count]
+        if not pending:
+            return 0
+        
+        try:
+            from gateway import record_metric, increment_counter
+            for breaker in pending:
+                summary = breaker.histogram.summary()
+                dimensions = {'circuit': breaker.name}
+                increment_counter('circuit_breaker_calls', summary['count'])
+                if summary['failures']:
+                    increment_counter('circuit_breaker_failures', summary['failures'])
+                for key in ('avg_ms', 'p50_ms', 'p99_ms', 'max_ms'):
+                    record_metric(f'circuit_breaker_call_duration_{key}', summary[key], dimensions=dimensions)
+        except Exception:
+            pass  # Metrics failure should not crash circuit breaker
+        
+        for breaker in pending:
+            breaker.histogram.clear()
+        self._metric_flushes += 1
+        return len(pending)
     
     def get_all_states(self) -> Dict[str, Dict[str, Any]]:
         """Get states of all circuit breakers."""
@@ -329,10 +794,11 @@ class CircuitBreakerCore:
         return create_success_response("Circuit breaker statistics", {
             'total_operations': self._total_operations,
             'breakers_count': len(self._breakers),
-            'rate_limited_count': self._rate_limited_count,
-            'rate_limit_window_ms': self._rate_limit_window_ms,
-            'current_rate_limit_size': len(self._rate_limiter),
-            'max_rate_limit': self._rate_limiter.maxlen,
+            'metric_flushes': self._metric_flushes,
+            'rate_limited_count': self._rate_limiter.rejected,
+            'rate_limit': self._rate_limiter.get_stats(),
+            'current_rate_limit_size': self._rate_limiter.in_use(),
+            'max_rate_limit': self._rate_limiter.burst,
             'breakers': {
                 name: breaker.get_state()
                 for name, breaker in self._breakers.items()
@@ -358,10 +824,10 @@ class CircuitBreakerCore:
             
             # Reset statistics
             self._total_operations = 0
+            self._metric_flushes = 0
             
             # Reset rate limiting
-            self._rate_limiter.clear()
-            self._rate_limited_count = 0
+            self._rate_limiter.reset()
             
             return True
         except Exception:
@@ -388,6 +854,10 @@ def get_circuit_breaker_manager() -> CircuitBreakerCore:
     """
     global _circuit_breaker_core
     
+    # Fast path: registered on first use, same instance afterwards
+    if _circuit_breaker_core is not None:
+        return _circuit_breaker_core
+    
     try:
         # Try to use gateway SINGLETON registry
         from gateway import singleton_get, singleton_register
@@ -400,6 +870,7 @@ def get_circuit_breaker_manager() -> CircuitBreakerCore:
             singleton_register('circuit_breaker_manager', _circuit_breaker_core)
             manager = _circuit_breaker_core
         
+        _circuit_breaker_core = manager
         return manager
         
     except (ImportError, Exception):
@@ -414,9 +885,9 @@ def get_circuit_breaker_manager() -> CircuitBreakerCore:
 
 def get_breaker_implementation(name: str, failure_threshold: int = 5, 
                                timeout: int = 60, **kwargs) -> Dict[str, Any]:
-    """Get circuit breaker state using SINGLETON manager."""
+    """Get circuit breaker state using SINGLETON manager (kwargs: policy, window options)."""
     manager = get_circuit_breaker_manager()
-    breaker = manager.get(name, failure_threshold, timeout)
+    breaker = manager.get(name, failure_threshold, timeout, **kwargs)
     return breaker.get_state()
 
 
@@ -427,6 +898,19 @@ def execute_with_breaker_implementation(name: str, func: Callable,
     return manager.call(name, func, *args, **kwargs)
 
 
+def allow_implementation(name: str, **kwargs) -> bool:
+    """Take permission for one call outside call() using SINGLETON manager."""
+    manager = get_circuit_breaker_manager()
+    return manager.allow(name)
+
+
+def record_implementation(name: str, success: bool, duration_ms: float,
+                          error: Optional[str] = None, **kwargs) -> None:
+    """Record the outcome of a call permitted by allow using SINGLETON manager."""
+    manager = get_circuit_breaker_manager()
+    manager.record(name, success, duration_ms, error)
+
+
 def get_all_states_implementation(**kwargs) -> Dict[str, Dict[str, Any]]:
     """Get all circuit breaker states using SINGLETON manager."""
     manager = get_circuit_breaker_manager()
@@ -464,11 +948,17 @@ def reset_implementation(**kwargs) -> Dict[str, Any]:
 
 __all__ = [
     'CircuitState',
+    'CallHistogram',
     'CircuitBreaker',
+    'SlidingWindowCircuitBreaker',
     'CircuitBreakerCore',
+    'POLICY_CONSECUTIVE',
+    'POLICY_SLIDING_WINDOW',
     'get_circuit_breaker_manager',
     'get_breaker_implementation',
     'execute_with_breaker_implementation',
+    'allow_implementation',
+    'record_implementation',
     'get_all_states_implementation',
     'reset_all_implementation',
     'get_stats_implementation',
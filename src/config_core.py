@@ -1,9 +1,11 @@
 """
 config_core.py - Core Configuration Management
-Version: 2025.10.22.01
+Version: 2026.10.18.01
 Description: Phase 1 Optimization - Remove threading lock, add SINGLETON + rate limiting
 
 CHANGELOG:
+- 2026.10.18.01: Rate limiting via shared GCRA limiter (rate_limiter.py) replaces deque window
+  
 - 2025.10.22.01: PHASE 1 OPTIMIZATION
   - REMOVED: threading.Lock (AP-08, DEC-04, LESS-17)
   - ADDED: SINGLETON pattern with get_config_manager()
@@ -40,7 +42,7 @@ Licensed under Apache 2.0 (see LICENSE).
 import os
 import time
 from typing import Dict, Any
-from collections import deque
+from rate_limiter import get_rate_limiter
 
 # Import helper modules from same directory
 from config_state import ConfigurationState, ConfigurationVersion
@@ -68,27 +70,20 @@ class ConfigurationCore:
         self._parameter_prefix = "/lambda-execution-engine"
         
         # Rate limiting (1000 ops/sec) - replaces threading lock
-        self._rate_limiter = deque(maxlen=1000)
-        self._rate_limit_window_ms = 1000
-        self._rate_limited_count = 0
+        self._rate_limiter = get_rate_limiter('config', 1000)
     
     def _check_rate_limit(self) -> bool:
-        """Check if operation should be rate limited."""
-        now = time.time() * 1000
-        
-        # Remove old timestamps outside window
-        while self._rate_limiter and (now - self._rate_limiter[0]) > self._rate_limit_window_ms:
-            self._rate_limiter.popleft()
+        """
+        Check if operation is within rate limit.
         
-        # Check if at limit
-        if len(self._rate_limiter) >= 1000:
-            self._rate_limited_count += 1
-            return False
+        Shared GCRA limiter 'config' (rate_limiter.py): O(1), monotonic clock.
+        No threading locks needed (AP-08, DEC-04).
         
-        # Add timestamp and allow
-        self._rate_limiter.append(now)
-        return True
-    
+        Returns:
+            bool: True if operation allowed, False if rate limited
+        """
+        return self._rate_limiter.allow()
+
     # ===== INITIALIZATION =====
     
     def initialize(self) -> Dict[str, Any]:
@@ -477,7 +472,7 @@ class ConfigurationCore:
             "pending_changes": len(self._state.pending_changes),
             "version_history_count": len(self._state.version_history),
             "use_parameter_store": self._use_parameter_store,
-            "rate_limited_count": self._rate_limited_count
+            "rate_limited_count": self._rate_limiter.rejected
         }
     
     # ===== VALIDATION =====
@@ -532,8 +527,7 @@ class ConfigurationCore:
             # No lock needed - Lambda is single-threaded (DEC-04)
             self._config = {}
             self._state = ConfigurationState()
-            self._rate_limiter.clear()
-            self._rate_limited_count = 0
+            self._rate_limiter.reset()
             self._initialized = False
             return True
         except Exception:
@@ -60,7 +60,8 @@ class ConfigurationValidator:
         core_categories = [
             'cache', 'logging', 'metrics', 'security', 
             'circuit_breaker', 'singleton', 'http_client',
-            'lambda_opt', 'cost_protection', 'utility', 'initialization'
+            'lambda_opt', 'cost_protection', 'utility', 'initialization',
+            'rate_limits'
         ]
         
         for category in core_categories:
@@ -0,0 +1,469 @@
+"""
+dns_cache.py - Shared In-Process DNS Cache
+Version: 2026.10.18.01
+Description: TTL-bounded getaddrinfo cache with negative caching,
+             stale-if-error and optional happy-eyeballs connects (IPv6/IPv4
+             racing). Used directly by the HTTP client (pool connections,
+             asyncio engine) and the WebSocket transports.
+
+CHANGELOG:
+- 2026.10.18.01: Initial version
+  - DNSCache.resolve(): one getaddrinfo per host per DNS_CACHE_TTL_SECONDS,
+    failures cached for DNS_CACHE_NEGATIVE_TTL_SECONDS
+  - Expired entries served for DNS_CACHE_STALE_SECONDS while the resolver
+    fails (stale-if-error)
+  - DNSCache.create_connection(): socket.create_connection replacement;
+    a connect failure on cached addresses refreshes the entry once and
+    retries if the addresses changed
+  - Happy eyeballs (DNS_HAPPY_EYEBALLS): address families interleaved, next
+    attempt started after DNS_HAPPY_EYEBALLS_DELAY_MS, first connect wins
+    (blocking connects: urllib3 pool and WebSocket; the asyncio engine
+    tries the addresses in order)
+  - Stats: lookups, hits, misses, negative_hits, stale_served,
+    error_refreshes, lookup time, happy-eyeballs races/fallbacks
+
+DESIGN DECISION: Cache addresses in the process, not per connection pool
+Reason: urllib3 calls getaddrinfo for every new pooled connection, the
+asyncio engine for every connection it opens and each WebSocket reconnect
+does the same. Lambda has no local resolver cache, so each lookup is a
+network round trip to the VPC resolver (and a gaierror whenever it
+hiccups). The answers for the HA host change rarely; one cache per
+container serves all clients.
+
+DESIGN DECISION: Refresh on connection errors instead of trusting the TTL
+Reason: A TTL can't know the HA host just moved (new DHCP lease, failover).
+A failed connect to cached addresses drops the entry and resolves again;
+the connect is retried only if the answer actually changed, so a down host
+still fails once, not twice.
+
+DESIGN DECISION: Resolver and clock injectable
+Reason: Tests run with a stub resolver (counts calls, returns local
+addresses or raises gaierror) and a fake clock, without network access.
+
+COMPLIANCE:
+- AP-08: No threading locks (Lambda single-threaded)
+- DEC-04: Lambda single-threaded model
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import errno
+import ipaddress
+import os
+import select
+import socket
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Global switch (read once per container)
+DNS_CACHE_ENABLED = os.getenv('DNS_CACHE_ENABLED', 'true').lower() == 'true'
+
+# Freshness of resolved addresses (seconds)
+DNS_CACHE_TTL_SECONDS = float(os.getenv('DNS_CACHE_TTL_SECONDS', '60'))
+
+# Freshness of failed lookups (seconds, 0 = don't cache failures)
+DNS_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv('DNS_CACHE_NEGATIVE_TTL_SECONDS', '5'))
+
+# Expired addresses still used while the resolver fails (seconds past TTL)
+DNS_CACHE_STALE_SECONDS = float(os.getenv('DNS_CACHE_STALE_SECONDS', '300'))
+
+# Race connects over the resolved addresses (RFC 8305 style)
+DNS_HAPPY_EYEBALLS = os.getenv('DNS_HAPPY_EYEBALLS', 'false').lower() == 'true'
+
+# Head start of each connect attempt before the next one begins
+DNS_HAPPY_EYEBALLS_DELAY_MS = float(os.getenv('DNS_HAPPY_EYEBALLS_DELAY_MS', '250'))
+
+# Hosts kept before the oldest entry is dropped
+DNS_CACHE_MAX_ENTRIES = 64
+
+# connect_ex() results of a non-blocking connect still in progress
+_CONNECT_PENDING = (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY)
+
+# getaddrinfo result: (family, type, proto, canonname, sockaddr)
+AddrInfo = Tuple[int, int, int, str, tuple]
+
+
+class _Entry:
+    __slots__ = ('addresses', 'error', 'expires', 'stale_until')
+
+    def __init__(self, addresses: Optional[List[AddrInfo]], error: Optional[socket.gaierror],
+                 expires: float, stale_until: float):
+        self.addresses = addresses
+        self.error = error
+        self.expires = expires
+        self.stale_until = stale_until
+
+
+def _literal_address(host: str) -> Optional[List[AddrInfo]]:
+    """addrinfo for an IP literal (never resolved or cached), None for names."""
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        return None
+    if ip.version == 6:
+        return [(socket.AF_INET6, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (host, 0, 0, 0))]
+    return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (host, 0))]
+
+
+def _with_port(sockaddr: tuple, port: int) -> tuple:
+    return (sockaddr[0], port) + tuple(sockaddr[2:])
+
+
+def _interleave(addresses: Sequence[AddrInfo]) -> List[AddrInfo]:
+    """Alternate address families, starting with the resolver's first choice."""
+    first_family = addresses[0][0]
+    preferred = [info for info in addresses if info[0] == first_family]
+    others = [info for info in addresses if info[0] != first_family]
+    ordered = []
+    for index in range(max(len(preferred), len(others))):
+        ordered.extend(group[index] for group in (preferred, others) if index < len(group))
+    return ordered
+
+
+def _new_socket(info: AddrInfo, source_address: Optional[tuple],
+                socket_options: Optional[Sequence[tuple]]) -> socket.socket:
+    sock = socket.socket(info[0], info[1], info[2])
+    try:
+        for option in socket_options or ():
+            sock.setsockopt(*option)
+        if source_address:
+            sock.bind(source_address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class DNSCache:
+    """
+    getaddrinfo cache with negative caching and connection helpers.
+
+    Args:
+        ttl: Seconds resolved addresses are used without asking again
+        negative_ttl: Seconds a failed lookup is answered from the cache
+        stale_seconds: Seconds past ttl an entry is used if the resolver fails
+        happy_eyeballs: Race connects over the addresses instead of one by one
+        happy_eyeballs_delay: Seconds before the next connect attempt starts
+        resolver: getaddrinfo compatible function (injectable for tests)
+        clock: Monotonic time source in seconds (injectable for tests)
+        enabled: False = every resolve() asks the resolver
+        max_entries: Hosts kept before the oldest entry is dropped
+    """
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL_SECONDS,
+                 negative_ttl: float = DNS_CACHE_NEGATIVE_TTL_SECONDS,
+                 stale_seconds: float = DNS_CACHE_STALE_SECONDS,
+                 happy_eyeballs: bool = DNS_HAPPY_EYEBALLS,
+                 happy_eyeballs_delay: float = DNS_HAPPY_EYEBALLS_DELAY_MS / 1000.0,
+                 resolver: Callable[..., List[AddrInfo]] = socket.getaddrinfo,
+                 clock: Callable[[], float] = time.monotonic,
+                 enabled: bool = DNS_CACHE_ENABLED,
+                 max_entries: int = DNS_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_seconds = stale_seconds
+        self.happy_eyeballs = happy_eyeballs
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self._resolver = resolver
+        self._clock = clock
+        self._entries: Dict[str, _Entry] = {}
+        self._stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, Any]:
+        return {
+            'lookups': 0,
+            'hits': 0,
+            'misses': 0,
+            'negative_hits': 0,
+            'failures': 0,
+            'stale_served': 0,
+            'forced_refreshes': 0,
+            'error_refreshes': 0,
+            'error_retries': 0,
+            'evictions': 0,
+            'lookup_ms_total': 0.0,
+            'lookup_ms_max': 0.0,
+            'happy_eyeballs_races': 0,
+            'happy_eyeballs_fallbacks': 0
+        }
+
+    # ===== RESOLUTION =====
+
+    def resolve(self, host: str, force: bool = False) -> Tuple[List[AddrInfo], bool]:
+        """
+        Addresses of host (ports are 0; _with_port() fills them in).
+
+        Args:
+            host: Host name or IP literal
+            force: Ask the resolver even if a fresh entry exists
+
+        Returns:
+            (addresses, from_cache)
+
+        Raises:
+            socket.gaierror: Lookup failed (possibly a cached failure)
+        """
+        literal = _literal_address(host)
+        if literal is not None:
+            return literal, False
+
+        self._stats['lookups'] += 1
+        now = self._clock()
+        entry = self._entries.get(host) if self.enabled else None
+        if force:
+            self._stats['forced_refreshes'] += 1
+        elif entry is not None and now < entry.expires:
+            if entry.error is not None:
+                self._stats['negative_hits'] += 1
+                raise socket.gaierror(*entry.error.args)
+            self._stats['hits'] += 1
+            return entry.addresses, True
+
+        self._stats['misses'] += 1
+        started = time.perf_counter()
+        try:
+            addresses = self._resolver(host, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+            if not addresses:
+                raise socket.gaierror(socket.EAI_NONAME, f"No addresses for {host}")
+        except socket.gaierror as e:
+            self._record_lookup(started)
+            self._stats['failures'] += 1
+            if entry is not None and entry.addresses and now < entry.stale_until:
+                # stale-if-error: last known addresses beat no addresses
+                self._stats['stale_served'] += 1
+                return entry.addresses, True
+            if self.enabled and self.negative_ttl > 0:
+                self._store(host, _Entry(None, e, now + self.negative_ttl, now + self.negative_ttl))
+            raise
+        self._record_lookup(started)
+        addresses = list(addresses)
+        if self.enabled:
+            self._store(host, _Entry(addresses, None, now + self.ttl, now + self.ttl + self.stale_seconds))
+        return addresses, False
+
+    def _record_lookup(self, started: float) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._stats['lookup_ms_total'] += elapsed_ms
+        if elapsed_ms > self._stats['lookup_ms_max']:
+            self._stats['lookup_ms_max'] = elapsed_ms
+
+    def _store(self, host: str, entry: _Entry) -> None:
+        self._entries.pop(host, None)
+        self._entries[host] = entry
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+            self._stats['evictions'] += 1
+
+    def refresh(self, host: Optional[str] = None) -> int:
+        """
+        Drop the entry of host (all entries if None); the next resolve() asks
+        the resolver.
+
+        Returns:
+            Number of entries dropped
+        """
+        if host is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+        return 1 if self._entries.pop(host, None) is not None else 0
+
+    # ===== CONNECTIONS =====
+
+    def create_connection(self, address: Tuple[str, int], timeout: Optional[float] = None,
+                          source_address: Optional[tuple] = None,
+                          socket_options: Optional[Sequence[tuple]] = None) -> socket.socket:
+        """
+        Connected TCP socket to (host, port), like socket.create_connection.
+
+        A failed connect to cached addresses refreshes the entry and, if the
+        resolver now returns other addresses, tries those once.
+
+        Args:
+            address: (host, port)
+            timeout: Socket timeout in seconds (None = blocking)
+            source_address: Local (host, port) to bind to
+            socket_options: setsockopt() argument tuples applied before connect
+
+        Raises:
+            socket.gaierror: Host could not be resolved
+            OSError: No address accepted the connection (socket.timeout included)
+        """
+        host, port = address
+        host = host.strip('[]')
+        addresses, from_cache = self.resolve(host)
+        try:
+            return self.connect(addresses, port, timeout, source_address, socket_options)
+        except OSError:
+            fresh = self.refresh_after_error(host, addresses) if from_cache else None
+            if fresh is None:
+                raise
+        return self.connect(fresh, port, timeout, source_address, socket_options)
+
+    def refresh_after_error(self, host: str, failed: Sequence[AddrInfo]) -> Optional[List[AddrInfo]]:
+        """
+        Resolve host again after connecting to its cached addresses failed.
+
+        Returns:
+            New addresses worth one more attempt, None if the answer is unchanged
+        """
+        self._stats['error_refreshes'] += 1
+        try:
+            fresh, _ = self.resolve(host, force=True)
+        except socket.gaierror:
+            return None
+        if [info[4] for info in fresh] == [info[4] for info in failed]:
+            return None
+        self._stats['error_retries'] += 1
+        return fresh
+
+    def connect(self, addresses: Sequence[AddrInfo], port: int, timeout: Optional[float] = None,
+                source_address: Optional[tuple] = None,
+                socket_options: Optional[Sequence[tuple]] = None) -> socket.socket:
+        """Connect to the first address that accepts (raced if happy_eyeballs)."""
+        if self.happy_eyeballs and len(addresses) > 1:
+            return self._race(addresses, port, timeout, source_address, socket_options)
+
+        last_error: Optional[OSError] = None
+        for info in addresses:
+            sock = None
+            try:
+                sock = _new_socket(info, source_address, socket_options)
+                sock.settimeout(timeout)
+                sock.connect(_with_port(info[4], port))
+                return sock
+            except OSError as e:
+                last_error = e
+                if sock is not None:
+                    sock.close()
+        raise last_error or OSError(f"No addresses to connect to on port {port}")
+
+    def _race(self, addresses: Sequence[AddrInfo], port: int, timeout: Optional[float],
+              source_address: Optional[tuple],
+              socket_options: Optional[Sequence[tuple]]) -> socket.socket:
+        """
+        Happy eyeballs: start the next attempt every happy_eyeballs_delay (or
+        as soon as one fails), keep the first socket that connects.
+        """
+        self._stats['happy_eyeballs_races'] += 1
+        queue = _interleave(addresses)
+        first = queue[0]
+        pending: Dict[socket.socket, AddrInfo] = {}
+        deadline = None if timeout is None else time.monotonic() + timeout
+        next_start = 0.0
+        last_error: Optional[OSError] = None
+        try:
+            while queue or pending:
+                now = time.monotonic()
+                if queue and now >= next_start:
+                    info = queue.pop(0)
+                    try:
+                        sock = _new_socket(info, source_address, socket_options)
+                    except OSError as e:
+                        last_error = e
+                        next_start = 0.0
+                        continue
+                    sock.setblocking(False)
+                    code = sock.connect_ex(_with_port(info[4], port))
+                    if code not in _CONNECT_PENDING:
+                        sock.close()
+                        last_error = OSError(code, os.strerror(code))
+                        next_start = 0.0
+                        continue
+                    pending[sock] = info
+                    next_start = now + self.happy_eyeballs_delay
+
+                if not pending:
+                    continue
+                wait = max(0.0, next_start - now) if queue else None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise socket.timeout(f"Connect to port {port} timed out")
+                    wait = remaining if wait is None else min(wait, remaining)
+                _, writable, _ = select.select([], list(pending), [], wait)
+                for sock in writable:
+                    info = pending.pop(sock)
+                    code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if code == 0:
+                        if info is not first:
+                            self._stats['happy_eyeballs_fallbacks'] += 1
+                        sock.settimeout(timeout)
+                        return sock
+                    sock.close()
+                    last_error = OSError(code, os.strerror(code))
+                    next_start = 0.0
+        finally:
+            for sock in pending:
+                sock.close()
+        raise last_error or OSError(f"No addresses to connect to on port {port}")
+
+    # ===== STATS =====
+
+    def clear(self) -> None:
+        """Drop all entries and zero the counters."""
+        self._entries.clear()
+        self._stats = self._new_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        misses = stats['misses']
+        stats['lookup_ms_avg'] = round(stats['lookup_ms_total'] / misses, 3) if misses else 0.0
+        stats['lookup_ms_total'] = round(stats['lookup_ms_total'], 3)
+        stats['lookup_ms_max'] = round(stats['lookup_ms_max'], 3)
+        answered = stats['hits'] + stats['negative_hits']
+        stats['hit_rate'] = round(answered / stats['lookups'], 4) if stats['lookups'] else 0.0
+        stats['entries'] = len(self._entries)
+        stats['enabled'] = self.enabled
+        stats['happy_eyeballs'] = self.happy_eyeballs
+        return stats
+
+
+# ===== SHARED INSTANCE =====
+
+_DNS_CACHE: Optional[DNSCache] = None
+
+
+def get_dns_cache() -> DNSCache:
+    """The container's shared DNSCache (created on first use)."""
+    global _DNS_CACHE
+    if _DNS_CACHE is None:
+        _DNS_CACHE = DNSCache()
+    return _DNS_CACHE
+
+
+def get_dns_cache_stats() -> Dict[str, Any]:
+    """Stats of the shared DNS cache."""
+    return get_dns_cache().get_stats()
+
+
+def refresh_dns_cache(host: Optional[str] = None) -> int:
+    """Drop cached addresses of host (all hosts if None). Returns entries dropped."""
+    return get_dns_cache().refresh(host)
+
+
+def reset_dns_cache() -> None:
+    """Drop all entries and zero the counters of the shared DNS cache."""
+    get_dns_cache().clear()
+
+
+__all__ = [
+    'DNSCache',
+    'AddrInfo',
+    'get_dns_cache',
+    'get_dns_cache_stats',
+    'refresh_dns_cache',
+    'reset_dns_cache',
+    'DNS_CACHE_ENABLED',
+    'DNS_CACHE_TTL_SECONDS',
+    'DNS_CACHE_NEGATIVE_TTL_SECONDS',
+    'DNS_CACHE_STALE_SECONDS',
+    'DNS_HAPPY_EYEBALLS',
+    'DNS_HAPPY_EYEBALLS_DELAY_MS',
+]
+
+# EOF
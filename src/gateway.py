@@ -8,6 +8,15 @@ FIXED: Import GatewayInterface from gateway_enums to prevent circular import
 FIXED: Added create_error_response and create_success_response exports
 ADDED: render_template export
 ADDED: config_get export
+ADDED: Invocation deadline exports (begin_invocation, get_invocation_deadline)
+ADDED: register_invocation_end_hook export
+ADDED: Rate limiter exports (get_rate_limiter_stats, configure_rate_limiter)
+ADDED: get_correlation_id export (invocation correlation ID)
+ADDED: make_requests_concurrently, circuit_breaker_allow, circuit_breaker_record exports
+ADDED: DNS cache exports (get_dns_cache_stats, refresh_dns_cache)
+ADDED: flush_emf_metrics export (CloudWatch EMF, end of invocation)
+ADDED: metrics_counter, metrics_distribution exports (interned metric handles)
+ADDED: get_logger export (structured, level-gated logging)
 
 Copyright 2025 Joseph Hersey
 Licensed under Apache 2.0 (see LICENSE).
@@ -24,6 +33,25 @@ from gateway_core import (
     create_success_response,
 )
 
+from invocation_context import (
+    begin_invocation,
+    end_invocation,
+    get_invocation_deadline,
+    get_invocation_stats,
+    register_invocation_end_hook,
+    get_correlation_id,
+)
+
+from rate_limiter import (
+    get_rate_limiter_stats,
+    configure_rate_limiter,
+)
+
+from dns_cache import (
+    get_dns_cache_stats,
+    refresh_dns_cache,
+)
+
 from gateway_wrappers_cache import *
 from gateway_wrappers_logging import *
 from gateway_wrappers_security import *
@@ -44,6 +72,16 @@ __all__ = [
     'reset_gateway_state',
     'create_error_response',
     'create_success_response',
+    'begin_invocation',
+    'end_invocation',
+    'get_invocation_deadline',
+    'get_invocation_stats',
+    'register_invocation_end_hook',
+    'get_correlation_id',
+    'get_rate_limiter_stats',
+    'configure_rate_limiter',
+    'get_dns_cache_stats',
+    'refresh_dns_cache',
     'cache_get',
     'cache_set',
     'cache_exists',
@@ -54,6 +92,7 @@ __all__ = [
     'log_error',
     'log_warning',
     'log_debug',
+    'get_logger',
     'log_operation_start',
     'log_operation_success',
     'log_operation_failure',
@@ -77,6 +116,9 @@ __all__ = [
     'record_metric',
     'get_metrics_stats',
     'reset_metrics',
+    'flush_emf_metrics',
+    'metrics_counter',
+    'metrics_distribution',
     'get_config_value',
     'set_config_value',
     'config_exists',
@@ -95,6 +137,7 @@ __all__ = [
     'make_put_request',
     'make_delete_request',
     'make_patch_request',
+    'make_requests_concurrently',
     'http_retry_request',
     'http_get_stats',
     'ws_connect',
@@ -103,6 +146,8 @@ __all__ = [
     'ws_close',
     'ws_get_stats',
     'execute_with_circuit_breaker',
+    'circuit_breaker_allow',
+    'circuit_breaker_record',
     'get_circuit_breaker_state',
     'reset_circuit_breaker',
     'get_all_circuit_breaker_stats',
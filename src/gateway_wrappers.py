@@ -1,9 +1,19 @@
 """
 gateway_wrappers.py - Gateway Convenience Wrapper Functions (Main Module)
-Version: 2025.11.20.01
+Version: 2026.10.18.07
 Description: Main module that imports and re-exports all interface wrappers
 
 CHANGELOG:
+- 2026.10.18.07: Added get_logger export (structured logging)
+- 2026.10.18.06: Added metrics_counter and metrics_distribution exports
+- 2026.10.18.05: Added set_gauge and flush_emf_metrics exports
+- 2026.10.18.04: Added make_requests_concurrently, circuit_breaker_allow and
+                 circuit_breaker_record exports
+- 2026.10.18.03: Added make_request / make_get_request / make_post_request /
+                 make_put_request / make_delete_request / make_patch_request
+- 2026.10.18.02: Added http_prewarm export
+- 2026.10.18.01: Added http_configure_retry and http_get_statistics exports
+
 - 2025.11.20.01: CRITICAL FIX - Added singleton_register to exports
   - FIXED: Import error "cannot import name 'singleton_register' from 'gateway'"
   - ADDED: 'singleton_register' to SINGLETON wrappers section (13 functions now)
@@ -24,15 +34,15 @@ CHANGELOG:
 
 STRUCTURE:
 - gateway_wrappers_cache.py - CACHE interface (6 functions)
-- gateway_wrappers_logging.py - LOGGING interface (7 functions)
+- gateway_wrappers_logging.py - LOGGING interface (8 functions)
 - gateway_wrappers_security.py - SECURITY interface (16 functions)
-- gateway_wrappers_metrics.py - METRICS interface (8 functions)
+- gateway_wrappers_metrics.py - METRICS interface (12 functions)
 - gateway_wrappers_config.py - CONFIG interface (20 functions)
 - gateway_wrappers_singleton.py - SINGLETON interface (13 functions) ← UPDATED 2025.11.20.01
 - gateway_wrappers_initialization.py - INITIALIZATION interface (4 functions)
-- gateway_wrappers_http_client.py - HTTP_CLIENT interface (8 functions)
+- gateway_wrappers_http_client.py - HTTP_CLIENT interface (18 functions)
 - gateway_wrappers_websocket.py - WEBSOCKET interface (5 functions)
-- gateway_wrappers_circuit_breaker.py - CIRCUIT_BREAKER interface (6 functions)
+- gateway_wrappers_circuit_breaker.py - CIRCUIT_BREAKER interface (8 functions)
 - gateway_wrappers_utility.py - UTILITY interface (5 functions)
 - gateway_wrappers_debug.py - DEBUG interface (13 functions)
 
@@ -64,11 +74,12 @@ __all__ = [
     'cache_clear',
     'cache_stats',
     
-    # LOGGING wrappers (7)
+    # LOGGING wrappers (8)
     'log_info',
     'log_error',
     'log_warning',
     'log_debug',
+    'get_logger',
     'log_operation_start',
     'log_operation_success',
     'log_operation_failure',
@@ -91,7 +102,7 @@ __all__ = [
     'validate_module_name',
     'validate_number_range',
     
-    # METRICS wrappers (8)
+    # METRICS wrappers (12)
     'record_metric',
     'increment_counter',
     'get_metrics_stats',
@@ -100,6 +111,10 @@ __all__ = [
     'record_cache_metric',
     'record_api_metric',
     'get_performance_report',
+    'set_gauge',
+    'flush_emf_metrics',
+    'metrics_counter',
+    'metrics_distribution',
     
     # CONFIG wrappers (20)
     'initialize_config',
@@ -145,15 +160,25 @@ __all__ = [
     'set_initialization_flag',
     'get_initialization_flag',
     
-    # HTTP_CLIENT wrappers (8)
+    # HTTP_CLIENT wrappers (18)
     'http_request',
     'http_get',
     'http_post',
     'http_put',
     'http_delete',
     'http_reset',
+    'http_prewarm',
     'http_get_state',
     'http_reset_state',
+    'http_configure_retry',
+    'http_get_statistics',
+    'make_request',
+    'make_get_request',
+    'make_post_request',
+    'make_put_request',
+    'make_delete_request',
+    'make_patch_request',
+    'make_requests_concurrently',
     
     # WEBSOCKET wrappers (5)
     'websocket_connect',
@@ -162,11 +187,13 @@ __all__ = [
     'websocket_close',
     'websocket_request',
     
-    # CIRCUIT_BREAKER wrappers (6)
+    # CIRCUIT_BREAKER wrappers (8)
     'is_circuit_breaker_open',
     'get_circuit_breaker_state',
     'get_circuit_breaker',
     'execute_with_circuit_breaker',
+    'circuit_breaker_allow',
+    'circuit_breaker_record',
     'get_all_circuit_breaker_states',
     'reset_all_circuit_breakers',
     
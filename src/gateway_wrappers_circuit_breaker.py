@@ -1,16 +1,18 @@
 """
 gateway_wrappers_circuit_breaker.py - CIRCUIT_BREAKER Interface Wrappers
-Version: 2025.10.22.02
+Version: 2026.10.18.02
 Description: Convenience wrappers for CIRCUIT_BREAKER interface operations
 
 CHANGELOG:
+- 2026.10.18.02: Added circuit_breaker_allow and circuit_breaker_record
+- 2026.10.18.01: get_circuit_breaker passes policy / sliding window options
 - 2025.10.22.02: Added get_stats and reset wrapper functions
 
 Copyright 2025 Joseph Hersey
 Licensed under the Apache License, Version 2.0
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from gateway_core import GatewayInterface, execute_operation
 
 
@@ -25,9 +27,9 @@ def get_circuit_breaker_state(name: str) -> Dict[str, Any]:
     return execute_operation(GatewayInterface.CIRCUIT_BREAKER, 'get', name=name)
 
 
-def get_circuit_breaker(name: str, failure_threshold: int = 5, timeout: float = 60.0) -> Any:
-    """Get circuit breaker."""
-    return execute_operation(GatewayInterface.CIRCUIT_BREAKER, 'get', name=name, failure_threshold=failure_threshold, timeout=timeout)
+def get_circuit_breaker(name: str, failure_threshold: int = 5, timeout: float = 60.0, **kwargs) -> Any:
+    """Get circuit breaker (kwargs: policy='sliding_window', window options)."""
+    return execute_operation(GatewayInterface.CIRCUIT_BREAKER, 'get', name=name, failure_threshold=failure_threshold, timeout=timeout, **kwargs)
 
 
 def execute_with_circuit_breaker(name: str, func: Any, args: tuple = (), **kwargs) -> Any:
@@ -35,6 +37,17 @@ def execute_with_circuit_breaker(name: str, func: Any, args: tuple = (), **kwarg
     return execute_operation(GatewayInterface.CIRCUIT_BREAKER, 'call', name=name, func=func, args=args, **kwargs)
 
 
+def circuit_breaker_allow(name: str) -> bool:
+    """Take permission for one call made outside execute_with_circuit_breaker (pair with circuit_breaker_record)."""
+    return execute_operation(GatewayInterface.CIRCUIT_BREAKER, 'allow', name=name)
+
+
+def circuit_breaker_record(name: str, success: bool, duration_ms: float, error: Optional[str] = None) -> None:
+    """Record the outcome of a call permitted by circuit_breaker_allow."""
+    execute_operation(GatewayInterface.CIRCUIT_BREAKER, 'record', name=name, success=success,
+                      duration_ms=duration_ms, error=error)
+
+
 def get_all_circuit_breaker_states() -> Dict[str, Dict[str, Any]]:
     """Get all circuit breaker states."""
     return execute_operation(GatewayInterface.CIRCUIT_BREAKER, 'get_all_states')
@@ -60,6 +73,8 @@ __all__ = [
     'get_circuit_breaker_state',
     'get_circuit_breaker',
     'execute_with_circuit_breaker',
+    'circuit_breaker_allow',
+    'circuit_breaker_record',
     'get_all_circuit_breaker_states',
     'reset_all_circuit_breakers',
     'get_circuit_breaker_stats',
@@ -1,13 +1,21 @@
 """
 gateway_wrappers_http_client.py - HTTP_CLIENT Interface Wrappers
-Version: 2025.10.22.02
+Version: 2026.10.18.04
 Description: Convenience wrappers for HTTP_CLIENT interface operations
 
+CHANGELOG:
+- 2026.10.18.04: Added make_requests_concurrently (asyncio fan-out)
+- 2026.10.18.03: Added make_request / make_get_request (cache_policy) /
+                 make_post_request / make_put_request / make_delete_request /
+                 make_patch_request (names used by home_assistant/ha_common.py)
+- 2026.10.18.02: Added http_prewarm
+- 2026.10.18.01: Added http_configure_retry and http_get_statistics
+
 Copyright 2025 Joseph Hersey
 Licensed under the Apache License, Version 2.0
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 from gateway_core import GatewayInterface, execute_operation
 
 
@@ -99,6 +107,20 @@ def http_reset() -> Dict[str, Any]:
     return execute_operation(GatewayInterface.HTTP_CLIENT, 'reset')
 
 
+def http_prewarm(url: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Open a keep-alive connection to url's host (Lambda INIT pre-warming).
+    
+    Args:
+        url: Any URL on the target host
+        timeout: Connect timeout in seconds (default HTTP_PREWARM_TIMEOUT_MS)
+    
+    Returns:
+        Dict with success, host, connect_ms, tls_version (or error)
+    """
+    return execute_operation(GatewayInterface.HTTP_CLIENT, 'prewarm', url=url, timeout=timeout)
+
+
 def http_get_state(**kwargs) -> Dict[str, Any]:
     """
     Get HTTP client state.
@@ -119,6 +141,116 @@ def http_reset_state(**kwargs) -> Dict[str, Any]:
     return execute_operation(GatewayInterface.HTTP_CLIENT, 'reset_state', **kwargs)
 
 
+def http_configure_retry(**kwargs) -> Dict[str, Any]:
+    """
+    Configure HTTP retry and adaptive timeout behavior.
+    
+    Args:
+        **kwargs: See http_client_state.configure_http_retry
+    
+    Returns:
+        Dict with success status and configuration
+    """
+    return execute_operation(GatewayInterface.HTTP_CLIENT, 'configure_retry', **kwargs)
+
+
+def http_get_statistics() -> Dict[str, Any]:
+    """
+    Get HTTP client statistics (incl. latency per endpoint class).
+    
+    Returns:
+        Dict with statistics
+    """
+    return execute_operation(GatewayInterface.HTTP_CLIENT, 'get_statistics')
+
+
+# ===== REQUEST HELPERS (data= body, cache_policy) =====
+
+def _with_data(kwargs: Dict[str, Any], data: Any) -> Dict[str, Any]:
+    """Map data= to json= (dict/list) or body= (str/bytes)."""
+    if data is not None:
+        kwargs['json' if isinstance(data, (dict, list)) else 'body'] = data
+    return kwargs
+
+
+def make_request(method: str, url: str, data: Any = None, **kwargs) -> Dict[str, Any]:
+    """
+    Execute HTTP request; data is sent as JSON (dict/list) or raw body.
+    
+    Args:
+        method: HTTP method
+        url: Target URL
+        data: Request payload
+        **kwargs: See http_request
+    
+    Returns:
+        Dict with success status, data, and metadata
+    """
+    return http_request(method, url, **_with_data(kwargs, data))
+
+
+def make_get_request(url: str, cache_policy: Any = None, **kwargs) -> Dict[str, Any]:
+    """
+    Execute HTTP GET, optionally through the conditional response cache.
+    
+    Args:
+        url: Target URL
+        cache_policy: None (no caching), 'conditional' (revalidate with
+            ETag/Last-Modified every call; TTL + content fingerprint when the
+            server sends no validators) or {'ttl': s, 'max_age': s}
+        **kwargs: See http_get
+    
+    Returns:
+        Dict with success status, data, and metadata ('cache' state when
+        cached: miss, fresh, not_modified, fingerprint). Cached data is
+        shared - do not modify it.
+    """
+    if cache_policy is not None:
+        kwargs['cache_policy'] = cache_policy
+    return http_get(url, **kwargs)
+
+
+def make_post_request(url: str, data: Any = None, **kwargs) -> Dict[str, Any]:
+    """Execute HTTP POST; data is sent as JSON (dict/list) or raw body."""
+    return http_post(url, **_with_data(kwargs, data))
+
+
+def make_put_request(url: str, data: Any = None, **kwargs) -> Dict[str, Any]:
+    """Execute HTTP PUT; data is sent as JSON (dict/list) or raw body."""
+    return http_put(url, **_with_data(kwargs, data))
+
+
+def make_delete_request(url: str, **kwargs) -> Dict[str, Any]:
+    """Execute HTTP DELETE."""
+    return http_delete(url, **kwargs)
+
+
+def make_patch_request(url: str, data: Any = None, **kwargs) -> Dict[str, Any]:
+    """Execute HTTP PATCH; data is sent as JSON (dict/list) or raw body."""
+    return http_request('PATCH', url, **_with_data(kwargs, data))
+
+
+def make_requests_concurrently(requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Execute several HTTP requests concurrently (one event loop per invocation).
+    
+    Args:
+        requests: Dicts with url, method (default GET) and any of data
+            (JSON for dict/list, else raw body), json, body, headers,
+            timeout, deadline, compress, circuit_breaker (breaker name)
+    
+    Returns:
+        Results in request order, each like make_request's
+    """
+    prepared = []
+    for request in requests:
+        if isinstance(request, dict) and 'data' in request:
+            request = dict(request)
+            _with_data(request, request.pop('data'))
+        prepared.append(request)
+    return execute_operation(GatewayInterface.HTTP_CLIENT, 'request_concurrent', requests=prepared)
+
+
 __all__ = [
     'http_request',
     'http_get',
@@ -126,6 +258,16 @@ __all__ = [
     'http_put',
     'http_delete',
     'http_reset',
+    'http_prewarm',
     'http_get_state',
     'http_reset_state',
+    'http_configure_retry',
+    'http_get_statistics',
+    'make_request',
+    'make_get_request',
+    'make_post_request',
+    'make_put_request',
+    'make_delete_request',
+    'make_patch_request',
+    'make_requests_concurrently',
 ]
@@ -1,13 +1,17 @@
 """
 gateway_wrappers_logging.py - LOGGING Interface Wrappers
-Version: 2025.10.22.02
+Version: 2026.10.18.01
 Description: Convenience wrappers for LOGGING interface operations
 
+CHANGELOG:
+- 2026.10.18.01: Added get_logger() - structured, level-gated logger
+  handle; log_info / log_debug / ... remain as the compatibility layer
+
 Copyright 2025 Joseph Hersey
 Licensed under the Apache License, Version 2.0
 """
 
-from typing import Optional
+from typing import Any, Optional
 from gateway_core import GatewayInterface, execute_operation
 
 
@@ -31,6 +35,20 @@ def log_debug(message: str, **kwargs) -> None:
     execute_operation(GatewayInterface.LOGGING, 'log_debug', message=message, **kwargs)
 
 
+def get_logger(name: str = '') -> Any:
+    """
+    Structured logger handle (resolve once per module).
+    
+    log.info(template, *args, **fields) checks the level before formatting
+    anything and writes one JSON record per event.
+    
+    Example:
+        >>> log = get_logger('ha_alexa')
+        >>> log.debug("Directive %s.%s", namespace, name, endpoint=endpoint_id)
+    """
+    return execute_operation(GatewayInterface.LOGGING, 'get_logger', name=name)
+
+
 def log_operation_start(operation_name: str, **kwargs) -> None:
     """
     Log operation start.
@@ -80,6 +98,7 @@ __all__ = [
     'log_error',
     'log_warning',
     'log_debug',
+    'get_logger',
     'log_operation_start',
     'log_operation_success',
     'log_operation_failure',
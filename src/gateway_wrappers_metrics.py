@@ -1,9 +1,12 @@
 """
 gateway_wrappers_metrics.py - METRICS Interface Wrappers
-Version: 2025.10.26.01
+Version: 2026.10.18.02
 Description: Convenience wrappers for METRICS interface operations
 
 CHANGELOG:
+- 2026.10.18.02: Added metrics_counter() and metrics_distribution()
+  (interned metric handles; the name-based wrappers stay as they are)
+- 2026.10.18.01: Added set_gauge() and flush_emf_metrics() (CloudWatch EMF)
 - 2025.10.26.01: PHASE 5 EXTRACTION - Added performance reporting wrapper
   - ADDED: get_performance_report() - System-wide performance analysis
   - Makes performance reporting available across entire Lambda via INT-04
@@ -73,6 +76,43 @@ def record_api_metric(endpoint: str, method: str, status_code: int, duration_ms:
     execute_operation(GatewayInterface.METRICS, 'record_api', endpoint=endpoint, method=method, status_code=status_code, duration_ms=duration_ms, **kwargs)
 
 
+def set_gauge(name: str, value: float) -> None:
+    """Set gauge metric."""
+    execute_operation(GatewayInterface.METRICS, 'set_gauge', name=name, value=value)
+
+
+def flush_emf_metrics() -> int:
+    """
+    Write the invocation's metrics to stdout as CloudWatch EMF lines.
+    
+    Called once at the end of each invocation (lambda_function). No-op
+    unless EMF_ENABLED=true.
+    
+    Returns:
+        Number of EMF lines written
+    """
+    return execute_operation(GatewayInterface.METRICS, 'flush_emf')
+
+
+def metrics_counter(name: str, **dimensions) -> Any:
+    """
+    Interned counter handle.
+    
+    Resolves the series once; keep the handle and call handle.inc() - no
+    key building or gateway dispatch per increment.
+    
+    Example:
+        >>> directives = metrics_counter('alexa_directive', namespace='Alexa')
+        >>> directives.inc()
+    """
+    return execute_operation(GatewayInterface.METRICS, 'counter', name=name, dimensions=dimensions)
+
+
+def metrics_distribution(name: str, **dimensions) -> Any:
+    """Interned distribution handle (quantile sketch) - keep it and call handle.observe(value)."""
+    return execute_operation(GatewayInterface.METRICS, 'distribution', name=name, dimensions=dimensions)
+
+
 # ADDED Phase 5: Performance reporting wrapper
 def get_performance_report(slow_threshold_ms: float = 1000, **kwargs) -> Dict[str, Any]:
     """
@@ -122,4 +162,8 @@ __all__ = [
     'record_cache_metric',
     'record_api_metric',
     'get_performance_report',  # ADDED Phase 5
+    'set_gauge',
+    'flush_emf_metrics',
+    'metrics_counter',
+    'metrics_distribution',
 ]
@@ -1,16 +1,19 @@
 """
 gateway_wrappers_websocket.py - WEBSOCKET Interface Wrappers
-Version: 2025.10.22.02
+Version: 2026.10.18.03
 Description: Convenience wrappers for WEBSOCKET interface operations
 
 CHANGELOG:
+- 2026.10.18.03: Added websocket_session_subscribe, websocket_session_poll
+- 2026.10.18.02: Added websocket_session_pipeline
+- 2026.10.18.01: Added persistent session wrappers
 - 2025.10.22.02: Added get_stats and reset wrapper functions
 
 Copyright 2025 Joseph Hersey
 Licensed under the Apache License, Version 2.0
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from gateway_core import GatewayInterface, execute_operation
 
 
@@ -39,6 +42,47 @@ def websocket_request(url: str, message: Any, timeout: Optional[float] = None, *
     return execute_operation(GatewayInterface.WEBSOCKET, 'request', url=url, message=message, timeout=timeout, **kwargs)
 
 
+def websocket_session_request(url: str, message: Dict[str, Any],
+                              auth_message: Optional[Dict[str, Any]] = None,
+                              timeout: float = 10.0, **kwargs) -> Dict[str, Any]:
+    """Send request over persistent authenticated WebSocket session."""
+    return execute_operation(GatewayInterface.WEBSOCKET, 'session_request', url=url, message=message,
+                             auth_message=auth_message, timeout=timeout, **kwargs)
+
+
+def websocket_session_pipeline(url: str, messages: List[Dict[str, Any]],
+                               auth_message: Optional[Dict[str, Any]] = None,
+                               timeout: float = 10.0, **kwargs) -> Dict[str, Any]:
+    """Pipeline several requests over persistent WebSocket session (replies matched by ID)."""
+    return execute_operation(GatewayInterface.WEBSOCKET, 'session_pipeline', url=url, messages=messages,
+                             auth_message=auth_message, timeout=timeout, **kwargs)
+
+
+def websocket_session_subscribe(url: str, message: Dict[str, Any],
+                                auth_message: Optional[Dict[str, Any]] = None,
+                                timeout: float = 10.0, **kwargs) -> Dict[str, Any]:
+    """Subscribe to server-pushed events on persistent WebSocket session."""
+    return execute_operation(GatewayInterface.WEBSOCKET, 'session_subscribe', url=url, message=message,
+                             auth_message=auth_message, timeout=timeout, **kwargs)
+
+
+def websocket_session_poll(url: str, auth_message: Optional[Dict[str, Any]] = None,
+                           subscription_ids: Optional[List[int]] = None, wait: float = 0.0) -> Dict[str, Any]:
+    """Collect events pushed to persistent WebSocket session since last poll."""
+    return execute_operation(GatewayInterface.WEBSOCKET, 'session_poll', url=url, auth_message=auth_message,
+                             subscription_ids=subscription_ids, wait=wait)
+
+
+def websocket_session_close(url: Optional[str] = None, auth_message: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Close persistent WebSocket session(s) (url=None closes all)."""
+    return execute_operation(GatewayInterface.WEBSOCKET, 'session_close', url=url, auth_message=auth_message)
+
+
+def websocket_session_stats() -> Dict[str, Any]:
+    """Get persistent WebSocket session statistics (reuse rate, reconnect cost)."""
+    return execute_operation(GatewayInterface.WEBSOCKET, 'session_stats')
+
+
 def websocket_get_stats() -> Dict[str, Any]:
     """Get WebSocket manager statistics."""
     return execute_operation(GatewayInterface.WEBSOCKET, 'get_stats')
@@ -55,6 +99,12 @@ __all__ = [
     'websocket_receive',
     'websocket_close',
     'websocket_request',
+    'websocket_session_request',
+    'websocket_session_pipeline',
+    'websocket_session_subscribe',
+    'websocket_session_poll',
+    'websocket_session_close',
+    'websocket_session_stats',
     'websocket_get_stats',
     'websocket_reset',
 ]
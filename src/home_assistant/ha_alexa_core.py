@@ -1,9 +1,51 @@
 """
 ha_alexa_core.py - Alexa Core Implementation (INT-HA-01)
-Version: 4.3.0
-Date: 2025-12-06
+Version: 4.9.1
+Date: 2026-10-18
 Description: Core implementation for Alexa Smart Home integration
 
+CHANGES (4.9.1):
+- FIXED: Remaining f-string _debug calls (discovery, forwarding,
+  enrichment, endpoint filtering) use template + args, so nothing is
+  formatted when DEBUG_MODE is off
+
+CHANGES (4.9.0):
+- ADDED: Discovery records each endpoint's advertised properties
+  (ha_alexa_state_report) - ReportState is answered locally only for
+  fully covered endpoints, otherwise forwarded to HA
+
+CHANGES (4.8.1):
+- FIXED: "Directive received" debug event logs namespace, name and
+  endpointId only (the whole directive carried endpoint.scope.token)
+
+CHANGES (4.8.0 - STRUCTURED LOGGING):
+- MODIFIED: _debug / _timing and the directive hot path log through a
+  structured logger (get_logger) - templates with args and fields,
+  formatted only when the level is enabled, one JSON record per event
+- REMOVED: json.dumps(..., indent=2)[:N] dumps under DEBUG_MODE - the
+  structures are passed as fields and serialized only if DEBUG is on
+
+CHANGES (4.7.0 - INTERNED DIRECTIVE METRICS):
+- MODIFIED: Directive counts use interned metric handles
+  (alexa_directive{namespace=...}) instead of building
+  f'alexa_directive_{namespace}' and dispatching through the gateway
+  on every directive
+
+CHANGES (4.6.0 - STATE SNAPSHOT REPORTING):
+- ADDED: ReportState answered from container-local state snapshot
+  (ha_alexa_state_report) - misses refresh all states in one fetch
+- MODIFIED: Enrichment reads through the snapshot; controlled entity is
+  invalidated so it is re-read on its own
+
+CHANGES (4.5.0 - TABLE-DRIVEN PROPERTIES):
+- REPLACED: _build_context_properties if-chain with compiled mapping table
+  (ha_alexa_properties) - adds locks, covers, media players, sensors, color
+- Timestamp formatted once per response instead of per property
+
+CHANGES (4.4.0 - DEADLINE BUDGETING):
+- ADDED: Skip optional state enrichment when invocation budget is low
+- ADDED: alexa_enrichment_skipped_deadline metric
+
 CHANGES (4.3.0 - COMPREHENSIVE DEBUGGING):
 - ADDED: Full DEBUG_MODE support with detailed pipeline logging
 - ADDED: DEBUG_TIMINGS support with performance measurements
@@ -22,9 +64,7 @@ Licensed under Apache 2.0 (see LICENSE).
 
 import os
 import time
-import json
 from typing import Dict, Any
-from datetime import datetime, timezone
 
 # Debug configuration from environment
 DEBUG_MODE = os.environ.get('DEBUG_MODE', 'false').lower() == 'true'
@@ -32,9 +72,10 @@ DEBUG_TIMINGS = os.environ.get('DEBUG_TIMINGS', 'false').lower() == 'true'
 
 # Import LEE services via gateway (ONLY way to access LEE)
 from gateway import (
-    log_info, log_error, log_debug, log_warning,
+    log_info, log_error, log_warning,
     increment_counter, generate_correlation_id,
-    render_template
+    render_template, get_invocation_deadline,
+    metrics_counter, get_logger
 )
 
 # Import templates
@@ -43,21 +84,37 @@ from home_assistant.ha_alexa_templates import (
     ALEXA_ACCEPT_GRANT_RESPONSE
 )
 
+from home_assistant.ha_alexa_properties import build_context_properties
+from home_assistant import ha_alexa_state_report
+
+
+# Interned directive counters by namespace (resolved once per container)
+_directive_counters: Dict[str, Any] = {}
+
+
+def _count_directive(namespace: str) -> None:
+    """Count a directive in alexa_directive{namespace=...}."""
+    counter = _directive_counters.get(namespace)
+    if counter is None:
+        counter = _directive_counters[namespace] = metrics_counter('alexa_directive', namespace=namespace)
+    counter.inc()
 
-def _debug(correlation_id: str, message: str, **context):
-    """Log debug message if DEBUG_MODE enabled."""
+
+# Structured logger (level checked before any formatting)
+_log = get_logger('ha_alexa')
+
+
+def _debug(correlation_id: str, message: str, *args, **context):
+    """Log debug event (message template + args) if DEBUG_MODE enabled."""
     if DEBUG_MODE:
-        context_str = ', '.join(f"{k}={v}" for k, v in context.items()) if context else ''
-        full_msg = f"[{correlation_id}] [ALEXA-DEBUG] {message}"
-        if context_str:
-            full_msg += f" ({context_str})"
-        log_debug(full_msg)
+        _log.debug(message, *args, correlation_id=correlation_id, **context)
 
 
 def _timing(correlation_id: str, operation: str, duration_ms: float):
     """Log timing if DEBUG_TIMINGS enabled."""
     if DEBUG_TIMINGS:
-        log_info(f"[{correlation_id}] [ALEXA-TIMING] {operation}: {duration_ms:.2f}ms")
+        _log.info("Timing %s", operation, correlation_id=correlation_id,
+                  operation=operation, duration_ms=round(duration_ms, 2))
 
 
 def process_directive_impl(event: Dict[str, Any], oauth_token: str = None, **kwargs) -> Dict[str, Any]:
@@ -93,18 +150,14 @@ def process_directive_impl(event: Dict[str, Any], oauth_token: str = None, **kwa
         namespace = header.get('namespace', '')
         name = header.get('name', '')
         
-        _debug(correlation_id, f"Directive received: {namespace}.{name}")
+        _debug(correlation_id, "Directive received: %s.%s", namespace, name,
+               endpoint_id=directive.get('endpoint', {}).get('endpointId'))
         
-        if DEBUG_MODE:
-            # Log full directive structure (truncated)
-            directive_json = json.dumps(directive, indent=2)[:500]
-            _debug(correlation_id, f"Directive structure: {directive_json}...")
-        
-        log_info(f"[{correlation_id}] Alexa directive: {namespace}.{name}")
+        _log.info("Alexa directive: %s.%s", namespace, name, correlation_id=correlation_id)
         
         # Metric tracking for directive types
         increment_counter('alexa_directive_received')
-        increment_counter(f'alexa_directive_{namespace}')
+        _count_directive(namespace)
         
         # Route to appropriate handler (pass oauth_token)
         if namespace == 'Alexa.Discovery' and name == 'Discover':
@@ -113,20 +166,23 @@ def process_directive_impl(event: Dict[str, Any], oauth_token: str = None, **kwa
         elif namespace == 'Alexa.Authorization' and name == 'AcceptGrant':
             _debug(correlation_id, "Routing to accept grant handler")
             result = handle_accept_grant_impl(event, oauth_token=oauth_token, **kwargs)
+        elif namespace == 'Alexa' and name == 'ReportState':
+            _debug(correlation_id, "Routing to report state handler")
+            result = handle_report_state_impl(event, oauth_token=oauth_token, **kwargs)
         else:
             _debug(correlation_id, "Routing to control handler")
             result = _forward_to_ha_alexa(event, oauth_token, correlation_id)
         
         duration_ms = (time.perf_counter() - start_time) * 1000
         _timing(correlation_id, "process_directive_impl", duration_ms)
-        _debug(correlation_id, "=== DIRECTIVE PROCESSING COMPLETE ===", duration_ms=f"{duration_ms:.2f}")
+        _debug(correlation_id, "=== DIRECTIVE PROCESSING COMPLETE ===", duration_ms=round(duration_ms, 2))
         
         return result
         
     except Exception as e:
         duration_ms = (time.perf_counter() - start_time) * 1000
         log_error(f"[{correlation_id}] Directive processing failed: {str(e)}")
-        _debug(correlation_id, f"Exception: {type(e).__name__}: {str(e)}")
+        _debug(correlation_id, "Exception: %s", type(e).__name__, error=e)
         increment_counter('alexa_directive_error')
         return _create_error_response({}, 'INTERNAL_ERROR', str(e))
 
@@ -171,7 +227,7 @@ def handle_discovery_impl(event: Dict[str, Any], oauth_token: str = None, **kwar
         if not result.get('success'):
             error_msg = result.get('error', 'Unknown error')
             log_error(f"[{correlation_id}] Discovery failed: {error_msg}")
-            _debug(correlation_id, f"Discovery API failed: {error_msg}")
+            _debug(correlation_id, "Discovery API failed: %s", error_msg)
             increment_counter('alexa_discovery_failed')
             return _create_error_response({}, 'BRIDGE_UNREACHABLE', f'Discovery failed: {error_msg}')
         
@@ -185,7 +241,7 @@ def handle_discovery_impl(event: Dict[str, Any], oauth_token: str = None, **kwar
         
         # Count endpoints before filtering
         endpoints_before = len(response_data.get('event', {}).get('payload', {}).get('endpoints', []))
-        _debug(correlation_id, f"Endpoints before filtering: {endpoints_before}")
+        _debug(correlation_id, "Endpoints before filtering: %d", endpoints_before)
         
         # Filter invalid capability combinations
         filter_start = time.perf_counter()
@@ -193,21 +249,23 @@ def handle_discovery_impl(event: Dict[str, Any], oauth_token: str = None, **kwar
         filter_duration_ms = (time.perf_counter() - filter_start) * 1000
         _timing(correlation_id, "discovery_filtering", filter_duration_ms)
         
-        endpoints_after = len(filtered_response.get('event', {}).get('payload', {}).get('endpoints', []))
-        _debug(correlation_id, f"Endpoints after filtering: {endpoints_after}")
+        endpoints = filtered_response.get('event', {}).get('payload', {}).get('endpoints', [])
+        endpoints_after = len(endpoints)
+        ha_alexa_state_report.record_discovered_endpoints(endpoints)
+        _debug(correlation_id, "Endpoints after filtering: %d", endpoints_after)
         
         increment_counter('alexa_discovery_success')
         
         duration_ms = (time.perf_counter() - start_time) * 1000
         _timing(correlation_id, "handle_discovery_impl", duration_ms)
-        _debug(correlation_id, "=== DISCOVERY COMPLETE ===", endpoints=endpoints_after, duration_ms=f"{duration_ms:.2f}")
+        _debug(correlation_id, "=== DISCOVERY COMPLETE ===", endpoints=endpoints_after, duration_ms=round(duration_ms, 2))
         
         return filtered_response
         
     except Exception as e:
         duration_ms = (time.perf_counter() - start_time) * 1000
         log_error(f"[{correlation_id}] Discovery error: {str(e)}")
-        _debug(correlation_id, f"Discovery exception: {type(e).__name__}: {str(e)}")
+        _debug(correlation_id, "Discovery exception: %s: %s", type(e).__name__, e)
         increment_counter('alexa_discovery_error')
         return _create_error_response({}, 'BRIDGE_UNREACHABLE', f'Discovery error: {str(e)}')
 
@@ -252,6 +310,39 @@ def handle_thermostat_control_impl(event: Dict[str, Any], oauth_token: str = Non
     return handle_control_impl(event, oauth_token=oauth_token, **kwargs)
 
 
+def handle_report_state_impl(event: Dict[str, Any], oauth_token: str = None, **kwargs) -> Dict[str, Any]:
+    """
+    Handle Alexa ReportState directive implementation.
+    
+    Answers from the container-local state snapshot when enabled and the
+    endpoint's discovered properties are all mapped; otherwise forwards
+    to HA.
+    
+    Args:
+        event: Alexa ReportState event
+        oauth_token: OAuth token from directive (LWA)
+        **kwargs: Additional options
+        
+    Returns:
+        StateReport response
+    """
+    correlation_id = generate_correlation_id()
+    start_time = time.perf_counter()
+    
+    increment_counter('alexa_report_state')
+    
+    try:
+        result = ha_alexa_state_report.handle_report_state(event, oauth_token, correlation_id)
+        if result is not None:
+            _timing(correlation_id, "report_state_snapshot", (time.perf_counter() - start_time) * 1000)
+            return result
+    except Exception as e:
+        log_warning(f"[{correlation_id}] Snapshot ReportState failed, forwarding to HA: {e}")
+        increment_counter('alexa_report_state_snapshot_error')
+    
+    return _forward_to_ha_alexa(event, oauth_token, correlation_id)
+
+
 def handle_accept_grant_impl(event: Dict[str, Any], oauth_token: str = None, **kwargs) -> Dict[str, Any]:
     """
     Handle Alexa AcceptGrant directive implementation.
@@ -314,13 +405,13 @@ def _forward_to_ha_alexa(event: Dict[str, Any], oauth_token: str, correlation_id
         entity_id = entity_id_raw
         if entity_id and '#' in entity_id:
             entity_id = entity_id.replace('#', '.')
-            _debug(correlation_id, f"Normalized entity_id: {entity_id_raw} -> {entity_id}")
+            _debug(correlation_id, "Normalized entity_id: %s -> %s", entity_id_raw, entity_id)
         
         header = directive.get('header', {})
         namespace = header.get('namespace', '')
         name = header.get('name', '')
         
-        _debug(correlation_id, f"Control directive: {namespace}.{name} for {entity_id}")
+        _debug(correlation_id, "Control directive: %s.%s for %s", namespace, name, entity_id)
         
         # Forward to HA
         _debug(correlation_id, "Calling HA API")
@@ -340,7 +431,7 @@ def _forward_to_ha_alexa(event: Dict[str, Any], oauth_token: str, correlation_id
             error_msg = result.get('error', 'Unknown error')
             error_code = result.get('error_code', 'UNKNOWN')
             log_error(f"[{correlation_id}] HA API call failed: {error_code} - {error_msg}")
-            _debug(correlation_id, f"HA API failed: {error_code} - {error_msg}")
+            _debug(correlation_id, "HA API failed: %s - %s", error_code, error_msg)
             increment_counter('alexa_forward_ha_failed')
             return _create_error_response({}, 'BRIDGE_UNREACHABLE', f'HA error: {error_msg}')
         
@@ -352,25 +443,29 @@ def _forward_to_ha_alexa(event: Dict[str, Any], oauth_token: str, correlation_id
             increment_counter('alexa_forward_no_data')
             return _create_error_response({}, 'INTERNAL_ERROR', 'No response data from HA')
         
-        if DEBUG_MODE:
-            # Log original HA response structure (truncated)
-            response_json = json.dumps(response_data, indent=2)[:800]
-            _debug(correlation_id, f"HA response (original): {response_json}...")
+        _debug(correlation_id, "HA response (original)", response=response_data)
         
         # FIXED: Invalidate cache for controlled entity
         if entity_id:
             try:
                 cache_start = time.perf_counter()
                 ha_interconnect.devices_invalidate_entity_cache(entity_id)
+                ha_alexa_state_report.invalidate_entity(entity_id)
                 cache_duration_ms = (time.perf_counter() - cache_start) * 1000
                 _timing(correlation_id, "cache_invalidation", cache_duration_ms)
-                _debug(correlation_id, f"Cache invalidated for {entity_id}")
+                _debug(correlation_id, "Cache invalidated for %s", entity_id)
             except Exception as cache_error:
                 log_warning(f"[{correlation_id}] Cache invalidation failed: {cache_error}")
-                _debug(correlation_id, f"Cache invalidation error: {cache_error}")
-        
-        # ADDED: Enrich response with fresh state
-        if entity_id and namespace != 'Alexa.Discovery':
+                _debug(correlation_id, "Cache invalidation error: %s", cache_error)
+        
+        # Enrichment is optional - skip it rather than risk missing Alexa's deadline
+        deadline = get_invocation_deadline()
+        if entity_id and namespace != 'Alexa.Discovery' and deadline is not None and deadline.is_low():
+            _debug(correlation_id, "Skipping state enrichment (low budget)",
+                   remaining_ms=round(deadline.remaining_ms()))
+            increment_counter('alexa_enrichment_skipped_deadline')
+        elif entity_id and namespace != 'Alexa.Discovery':
+            # ADDED: Enrich response with fresh state
             try:
                 _debug(correlation_id, "Starting state enrichment")
                 enrich_start = time.perf_counter()
@@ -386,24 +481,20 @@ def _forward_to_ha_alexa(event: Dict[str, Any], oauth_token: str, correlation_id
                 enrich_duration_ms = (time.perf_counter() - enrich_start) * 1000
                 _timing(correlation_id, "state_enrichment", enrich_duration_ms)
                 
-                log_info(f"[{correlation_id}] Response enriched with fresh state for {entity_id}")
-                
-                if DEBUG_MODE:
-                    # Log enriched response structure (truncated)
-                    enriched_json = json.dumps(enriched_response, indent=2)[:1500]
-                    _debug(correlation_id, f"Response (enriched): {enriched_json}...")
+                _log.info("Response enriched with fresh state for %s", entity_id, correlation_id=correlation_id)
+                _debug(correlation_id, "Response (enriched)", response=enriched_response)
                 
                 increment_counter('alexa_response_enriched')
                 
                 duration_ms = (time.perf_counter() - start_time) * 1000
                 _timing(correlation_id, "_forward_to_ha_alexa", duration_ms)
-                _debug(correlation_id, "=== FORWARD TO HA COMPLETE ===", duration_ms=f"{duration_ms:.2f}")
+                _debug(correlation_id, "=== FORWARD TO HA COMPLETE ===", duration_ms=round(duration_ms, 2))
                 
                 return enriched_response
                 
             except Exception as enrich_error:
                 log_warning(f"[{correlation_id}] State enrichment failed: {enrich_error}")
-                _debug(correlation_id, f"Enrichment error: {type(enrich_error).__name__}: {str(enrich_error)}")
+                _debug(correlation_id, "Enrichment error: %s: %s", type(enrich_error).__name__, enrich_error)
                 increment_counter('alexa_enrichment_failed')
                 # Fall through to return original response
         
@@ -411,14 +502,14 @@ def _forward_to_ha_alexa(event: Dict[str, Any], oauth_token: str, correlation_id
         
         duration_ms = (time.perf_counter() - start_time) * 1000
         _timing(correlation_id, "_forward_to_ha_alexa", duration_ms)
-        _debug(correlation_id, "=== FORWARD TO HA COMPLETE (no enrichment) ===", duration_ms=f"{duration_ms:.2f}")
+        _debug(correlation_id, "=== FORWARD TO HA COMPLETE (no enrichment) ===", duration_ms=round(duration_ms, 2))
         
         return response_data
         
     except Exception as e:
         duration_ms = (time.perf_counter() - start_time) * 1000
         log_error(f"[{correlation_id}] Failed to forward to HA: {str(e)}")
-        _debug(correlation_id, f"Forward exception: {type(e).__name__}: {str(e)}")
+        _debug(correlation_id, "Forward exception: %s: %s", type(e).__name__, e)
         increment_counter('alexa_forward_error')
         return _create_error_response({}, 'BRIDGE_UNREACHABLE', f'Connection error: {str(e)}')
 
@@ -439,29 +530,26 @@ def _enrich_response_with_state(response: Dict[str, Any], entity_id: str,
     Returns:
         Response enriched with fresh state
     """
-    _debug(correlation_id, f"Enriching response for {entity_id}")
+    _debug(correlation_id, "Enriching response for %s", entity_id)
     
     try:
         # Fetch fresh state from HA
-        _debug(correlation_id, f"Fetching fresh state for {entity_id}")
+        _debug(correlation_id, "Fetching fresh state for %s", entity_id)
         state_start = time.perf_counter()
         
-        state_result = ha_interconnect.devices_get_by_id(entity_id, oauth_token=oauth_token)
+        entity_state, source = ha_alexa_state_report.get_entity_state(
+            entity_id, oauth_token, correlation_id, single_only=True
+        )
         
         state_duration_ms = (time.perf_counter() - state_start) * 1000
         _timing(correlation_id, "fetch_entity_state", state_duration_ms)
         
-        if not state_result.get('success'):
+        if entity_state is None:
             log_warning(f"[{correlation_id}] Could not fetch fresh state for {entity_id}")
-            _debug(correlation_id, f"State fetch failed: {state_result.get('error', 'unknown')}")
+            _debug(correlation_id, "State fetch failed", source=source)
             return response
         
-        entity_state = state_result.get('data', {})
-        _debug(correlation_id, f"Entity state fetched: state={entity_state.get('state')}")
-        
-        if DEBUG_MODE:
-            state_json = json.dumps(entity_state, indent=2)[:500]
-            _debug(correlation_id, f"Entity state details: {state_json}...")
+        _debug(correlation_id, "Entity state fetched", source=source, entity_state=entity_state)
         
         # Build context.properties from fresh state
         _debug(correlation_id, "Building context properties")
@@ -476,11 +564,7 @@ def _enrich_response_with_state(response: Dict[str, Any], entity_id: str,
             _debug(correlation_id, "No properties built (unsupported entity type?)")
             return response
         
-        _debug(correlation_id, f"Built {len(properties)} properties")
-        
-        if DEBUG_MODE:
-            props_json = json.dumps(properties, indent=2)[:500]
-            _debug(correlation_id, f"Properties: {props_json}...")
+        _debug(correlation_id, "Built %d properties", len(properties), properties=properties)
         
         # Ensure response has context structure
         if 'context' not in response:
@@ -489,13 +573,13 @@ def _enrich_response_with_state(response: Dict[str, Any], entity_id: str,
         
         # Replace/add properties with fresh state
         response['context']['properties'] = properties
-        _debug(correlation_id, f"Injected {len(properties)} properties into response context")
+        _debug(correlation_id, "Injected %d properties into response context", len(properties))
         
         return response
         
     except Exception as e:
         log_error(f"[{correlation_id}] State enrichment error: {str(e)}")
-        _debug(correlation_id, f"Enrichment exception: {type(e).__name__}: {str(e)}")
+        _debug(correlation_id, "Enrichment exception: %s: %s", type(e).__name__, e)
         return response
 
 
@@ -504,6 +588,8 @@ def _build_context_properties(entity_id: str, entity_state: Dict[str, Any],
     """
     Build Alexa context.properties from HA entity state.
     
+    Delegates to the compiled mapping table in ha_alexa_properties.
+    
     Args:
         entity_id: Entity ID
         entity_state: HA entity state
@@ -512,106 +598,14 @@ def _build_context_properties(entity_id: str, entity_state: Dict[str, Any],
     Returns:
         List of Alexa property objects
     """
-    _debug(correlation_id, f"Building properties for {entity_id}")
-    
-    properties = []
-    
     try:
-        state = entity_state.get('state', '').lower()
-        attributes = entity_state.get('attributes', {})
-        domain = entity_id.split('.')[0] if '.' in entity_id else 'unknown'
-        
-        _debug(correlation_id, f"Entity domain={domain}, state={state}")
-        
-        # Current timestamp
-        now = datetime.now(timezone.utc).isoformat()
-        
-        # Power state (for lights, switches, etc.)
-        if domain in ['light', 'switch', 'fan']:
-            power_value = 'ON' if state == 'on' else 'OFF'
-            properties.append({
-                'namespace': 'Alexa.PowerController',
-                'name': 'powerState',
-                'value': power_value,
-                'timeOfSample': now,
-                'uncertaintyInMilliseconds': 500
-            })
-            _debug(correlation_id, f"Added PowerController.powerState={power_value}")
-        
-        # Brightness (for dimmable lights)
-        if domain == 'light' and 'brightness' in attributes:
-            # HA brightness: 0-255, Alexa: 0-100
-            brightness_255 = attributes.get('brightness', 0)
-            brightness_100 = int((brightness_255 / 255) * 100)
-            
-            properties.append({
-                'namespace': 'Alexa.BrightnessController',
-                'name': 'brightness',
-                'value': brightness_100,
-                'timeOfSample': now,
-                'uncertaintyInMilliseconds': 500
-            })
-            _debug(correlation_id, f"Added BrightnessController.brightness={brightness_100}")
-        
-        # Color temperature (for lights)
-        if domain == 'light' and 'color_temp' in attributes:
-            color_temp = attributes.get('color_temp', 2700)
-            properties.append({
-                'namespace': 'Alexa.ColorTemperatureController',
-                'name': 'colorTemperatureInKelvin',
-                'value': color_temp,
-                'timeOfSample': now,
-                'uncertaintyInMilliseconds': 500
-            })
-            _debug(correlation_id, f"Added ColorTemperatureController={color_temp}K")
-        
-        # Contact sensor
-        if domain == 'binary_sensor' and attributes.get('device_class') == 'door':
-            contact_value = 'DETECTED' if state == 'on' else 'NOT_DETECTED'
-            properties.append({
-                'namespace': 'Alexa.ContactSensor',
-                'name': 'detectionState',
-                'value': contact_value,
-                'timeOfSample': now,
-                'uncertaintyInMilliseconds': 500
-            })
-            _debug(correlation_id, f"Added ContactSensor={contact_value}")
-        
-        # Temperature
-        if domain == 'climate':
-            if 'current_temperature' in attributes:
-                properties.append({
-                    'namespace': 'Alexa.TemperatureSensor',
-                    'name': 'temperature',
-                    'value': {
-                        'value': attributes.get('current_temperature'),
-                        'scale': 'FAHRENHEIT'  # or CELSIUS based on HA config
-                    },
-                    'timeOfSample': now,
-                    'uncertaintyInMilliseconds': 500
-                })
-                _debug(correlation_id, "Added TemperatureSensor")
-            
-            if 'temperature' in attributes:
-                properties.append({
-                    'namespace': 'Alexa.ThermostatController',
-                    'name': 'targetSetpoint',
-                    'value': {
-                        'value': attributes.get('temperature'),
-                        'scale': 'FAHRENHEIT'
-                    },
-                    'timeOfSample': now,
-                    'uncertaintyInMilliseconds': 500
-                })
-                _debug(correlation_id, "Added ThermostatController")
-        
-        _debug(correlation_id, f"Built {len(properties)} total properties")
-        
+        properties = build_context_properties(entity_id, entity_state)
+        _debug(correlation_id, "Built %d total properties for %s", len(properties), entity_id)
+        return properties
     except Exception as e:
         log_error(f"[{correlation_id}] Property building error: {str(e)}")
-        _debug(correlation_id, f"Property build exception: {type(e).__name__}: {str(e)}")
-    
-    return properties
+        _debug(correlation_id, "Property build exception: %s: %s", type(e).__name__, e)
+        return []
 
 
 def _create_error_response(header: Dict[str, Any], error_type: str,
@@ -633,7 +627,7 @@ def _filter_discovery_response(response: Dict[str, Any], correlation_id: str) ->
         if not endpoints:
             return response
         
-        _debug(correlation_id, f"Filtering {len(endpoints)} endpoints")
+        _debug(correlation_id, "Filtering %d endpoints", len(endpoints))
         
         filtered_endpoints = []
         filtered_count = 0
@@ -653,14 +647,14 @@ def _filter_discovery_response(response: Dict[str, Any], correlation_id: str) ->
         
         if filtered_count > 0:
             log_info(f"[{correlation_id}] Filtered capabilities on {filtered_count} devices")
-            _debug(correlation_id, f"Filtered {filtered_count} endpoints")
+            _debug(correlation_id, "Filtered %d endpoints", filtered_count)
             increment_counter('alexa_discovery_filtered', filtered_count)
         
         return response
         
     except Exception as e:
         log_error(f"[{correlation_id}] Filtering error: {e}")
-        _debug(correlation_id, f"Filtering exception: {type(e).__name__}: {str(e)}")
+        _debug(correlation_id, "Filtering exception: %s: %s", type(e).__name__, e)
         increment_counter('alexa_discovery_filter_error')
         return response
 
@@ -690,7 +684,7 @@ def _filter_endpoint_capabilities(endpoint: Dict[str, Any], correlation_id: str)
             log_warning(
                 f"[{correlation_id}] Removing ContactSensor from power device: {friendly_name}"
             )
-            _debug(correlation_id, f"Filtering ContactSensor from {friendly_name}")
+            _debug(correlation_id, "Filtering ContactSensor from %s", friendly_name)
             
             # Filter out ContactSensor
             filtered_capabilities = [
@@ -705,7 +699,7 @@ def _filter_endpoint_capabilities(endpoint: Dict[str, Any], correlation_id: str)
         
     except Exception as e:
         log_error(f"[{correlation_id}] Endpoint filtering error: {e}")
-        _debug(correlation_id, f"Endpoint filter exception: {type(e).__name__}: {str(e)}")
+        _debug(correlation_id, "Endpoint filter exception: %s: %s", type(e).__name__, e)
         return endpoint
 
 
@@ -0,0 +1,436 @@
+"""
+ha_alexa_properties.py - Alexa context.properties mapping (table-driven)
+Version: 1.0.2
+Date: 2026-10-18
+Description: Declarative HA state -> Alexa property table, compiled at import
+
+CHANGES (1.0.2):
+- ADDED: reportable_properties(domain) - property keys the table maps,
+  used to check a discovered endpoint is fully covered before answering
+  ReportState locally
+
+CHANGES (1.0.1):
+- FIXED: cover.position ModeController values use HA's mode names
+  (position.open / position.closed / position.opening / ...) instead of
+  Position.Up / Position.Down, which discovery never advertised
+
+The mapping table (PROPERTY_RULES) describes which Alexa properties are
+reported for an HA domain, optionally narrowed by device_class and a
+required attribute. At import the table is compiled into one builder per
+domain (and per device_class), so building properties for an entity only
+walks the rules that can apply to it.
+
+Timestamps are formatted once per response by the caller
+(format_time_of_sample) and shared by every property.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import os
+import time
+from typing import Dict, Any, List, Optional, Callable, Tuple, FrozenSet
+
+# Alexa property uncertainty (ms) - state read right after fetch
+ALEXA_PROPERTY_UNCERTAINTY_MS = 500
+
+# Fallback temperature scale when HA doesn't report a unit (climate entities)
+ALEXA_DEFAULT_TEMPERATURE_SCALE = os.getenv('ALEXA_TEMPERATURE_SCALE', 'FAHRENHEIT').upper()
+
+_UNIT_TO_SCALE = {
+    '°F': 'FAHRENHEIT',
+    'F': 'FAHRENHEIT',
+    '°C': 'CELSIUS',
+    'C': 'CELSIUS',
+    'K': 'KELVIN',
+}
+
+
+# ===== VALUE EXTRACTORS =====
+# Each extractor takes (state, attributes) and returns the Alexa value,
+# or None to omit the property.
+
+def _power_state(state: str, attributes: Dict[str, Any]) -> Optional[str]:
+    if state in ('unavailable', 'unknown'):
+        return None
+    return 'OFF' if state in ('off', 'standby') else 'ON'
+
+
+def _switch_power_state(state: str, attributes: Dict[str, Any]) -> Optional[str]:
+    if state in ('unavailable', 'unknown'):
+        return None
+    return 'ON' if state == 'on' else 'OFF'
+
+
+def _brightness(state: str, attributes: Dict[str, Any]) -> int:
+    # HA brightness: 0-255, Alexa: 0-100
+    return int((attributes['brightness'] / 255) * 100)
+
+
+def _color_temperature_kelvin(state: str, attributes: Dict[str, Any]) -> Optional[int]:
+    kelvin = attributes.get('color_temp_kelvin')
+    if kelvin:
+        return int(kelvin)
+    mireds = attributes.get('color_temp')
+    if mireds:
+        # Legacy attribute is in mireds
+        return int(round(1000000 / mireds))
+    return None
+
+
+def _color(state: str, attributes: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    hs_color = attributes['hs_color']
+    if not hs_color or len(hs_color) != 2:
+        return None
+    brightness = attributes.get('brightness')
+    return {
+        'hue': float(hs_color[0]),
+        'saturation': float(hs_color[1]) / 100.0,
+        'brightness': (brightness / 255.0) if brightness is not None else 1.0
+    }
+
+
+def _fan_percentage(state: str, attributes: Dict[str, Any]) -> int:
+    return int(attributes['percentage'])
+
+
+def _lock_state(state: str, attributes: Dict[str, Any]) -> Optional[str]:
+    return _LOCK_STATES.get(state)
+
+
+_LOCK_STATES = {
+    'locked': 'LOCKED',
+    'unlocked': 'UNLOCKED',
+    'open': 'UNLOCKED',
+    'jammed': 'JAMMED',
+}
+
+
+def _cover_range(state: str, attributes: Dict[str, Any]) -> int:
+    return int(attributes['current_position'])
+
+
+def _cover_mode(state: str, attributes: Dict[str, Any]) -> Optional[str]:
+    if 'current_position' in attributes:
+        return None
+    return _COVER_MODES.get(state)
+
+
+# HA's cover.position ModeController reports 'position.<state>' (as HA's
+# own Alexa integration does); discovery advertises position.open,
+# position.closed and position.custom
+_COVER_MODES = {
+    'open': 'position.open',
+    'opening': 'position.opening',
+    'closed': 'position.closed',
+    'closing': 'position.closing',
+    'unknown': 'position.unknown',
+}
+
+
+def _volume(state: str, attributes: Dict[str, Any]) -> int:
+    return int(round(float(attributes['volume_level']) * 100))
+
+
+def _muted(state: str, attributes: Dict[str, Any]) -> bool:
+    return bool(attributes['is_volume_muted'])
+
+
+def _playback_state(state: str, attributes: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    playback = _PLAYBACK_STATES.get(state)
+    return {'state': playback} if playback else None
+
+
+_PLAYBACK_STATES = {
+    'playing': 'PLAYING',
+    'paused': 'PAUSED',
+    'idle': 'STOPPED',
+    'off': 'STOPPED',
+    'standby': 'STOPPED',
+    'on': 'STOPPED',
+}
+
+
+def _detection_state(state: str, attributes: Dict[str, Any]) -> Optional[str]:
+    if state in ('unavailable', 'unknown'):
+        return None
+    return 'DETECTED' if state == 'on' else 'NOT_DETECTED'
+
+
+def _temperature_scale(attributes: Dict[str, Any]) -> str:
+    unit = attributes.get('unit_of_measurement') or attributes.get('temperature_unit')
+    return _UNIT_TO_SCALE.get(unit, ALEXA_DEFAULT_TEMPERATURE_SCALE)
+
+
+def _sensor_temperature(state: str, attributes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return None
+    return {'value': value, 'scale': _temperature_scale(attributes)}
+
+
+def _climate_current_temperature(state: str, attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {'value': attributes['current_temperature'], 'scale': _temperature_scale(attributes)}
+
+
+def _climate_target_setpoint(state: str, attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {'value': attributes['temperature'], 'scale': _temperature_scale(attributes)}
+
+
+def _thermostat_mode(state: str, attributes: Dict[str, Any]) -> Optional[str]:
+    return _THERMOSTAT_MODES.get(state)
+
+
+_THERMOSTAT_MODES = {
+    'heat': 'HEAT',
+    'cool': 'COOL',
+    'auto': 'AUTO',
+    'heat_cool': 'AUTO',
+    'off': 'OFF',
+    'dry': 'CUSTOM',
+    'fan_only': 'CUSTOM',
+}
+
+
+def _connectivity(state: str, attributes: Dict[str, Any]) -> Dict[str, str]:
+    return {'value': 'UNREACHABLE' if state == 'unavailable' else 'OK'}
+
+
+# ===== MAPPING TABLE =====
+# domains:        HA domains the rule applies to
+# device_classes: Optional device_class filter (None = any device_class)
+# attribute:      Optional attribute that must be present and not None
+# instance:       Optional Alexa capability instance (Range/Mode controllers)
+
+_CONTACT_CLASSES = ('door', 'window', 'garage_door', 'opening')
+_MOTION_CLASSES = ('motion', 'occupancy', 'presence')
+
+PROPERTY_RULES: Tuple[Dict[str, Any], ...] = (
+    # Power
+    {'domains': ('light', 'media_player'),
+     'namespace': 'Alexa.PowerController', 'name': 'powerState', 'value': _power_state},
+    {'domains': ('switch', 'fan', 'input_boolean'),
+     'namespace': 'Alexa.PowerController', 'name': 'powerState', 'value': _switch_power_state},
+
+    # Lights
+    {'domains': ('light',), 'attribute': 'brightness',
+     'namespace': 'Alexa.BrightnessController', 'name': 'brightness', 'value': _brightness},
+    {'domains': ('light',),
+     'namespace': 'Alexa.ColorTemperatureController', 'name': 'colorTemperatureInKelvin',
+     'value': _color_temperature_kelvin},
+    {'domains': ('light',), 'attribute': 'hs_color',
+     'namespace': 'Alexa.ColorController', 'name': 'color', 'value': _color},
+
+    # Fans
+    {'domains': ('fan',), 'attribute': 'percentage',
+     'namespace': 'Alexa.PercentageController', 'name': 'percentage', 'value': _fan_percentage},
+
+    # Locks
+    {'domains': ('lock',),
+     'namespace': 'Alexa.LockController', 'name': 'lockState', 'value': _lock_state},
+
+    # Covers
+    {'domains': ('cover',), 'attribute': 'current_position', 'instance': 'cover.position',
+     'namespace': 'Alexa.RangeController', 'name': 'rangeValue', 'value': _cover_range},
+    {'domains': ('cover',), 'instance': 'cover.position',
+     'namespace': 'Alexa.ModeController', 'name': 'mode', 'value': _cover_mode},
+
+    # Media players
+    {'domains': ('media_player',), 'attribute': 'volume_level',
+     'namespace': 'Alexa.Speaker', 'name': 'volume', 'value': _volume},
+    {'domains': ('media_player',), 'attribute': 'is_volume_muted',
+     'namespace': 'Alexa.Speaker', 'name': 'muted', 'value': _muted},
+    {'domains': ('media_player',),
+     'namespace': 'Alexa.PlaybackStateReporter', 'name': 'playbackState', 'value': _playback_state},
+
+    # Sensors
+    {'domains': ('sensor',), 'device_classes': ('temperature',),
+     'namespace': 'Alexa.TemperatureSensor', 'name': 'temperature', 'value': _sensor_temperature},
+    {'domains': ('binary_sensor',), 'device_classes': _CONTACT_CLASSES,
+     'namespace': 'Alexa.ContactSensor', 'name': 'detectionState', 'value': _detection_state},
+    {'domains': ('binary_sensor',), 'device_classes': _MOTION_CLASSES,
+     'namespace': 'Alexa.MotionSensor', 'name': 'detectionState', 'value': _detection_state},
+
+    # Climate
+    {'domains': ('climate',), 'attribute': 'current_temperature',
+     'namespace': 'Alexa.TemperatureSensor', 'name': 'temperature',
+     'value': _climate_current_temperature},
+    {'domains': ('climate',), 'attribute': 'temperature',
+     'namespace': 'Alexa.ThermostatController', 'name': 'targetSetpoint',
+     'value': _climate_target_setpoint},
+    {'domains': ('climate',),
+     'namespace': 'Alexa.ThermostatController', 'name': 'thermostatMode', 'value': _thermostat_mode},
+
+    # Every reportable endpoint
+    {'domains': ('light', 'switch', 'fan', 'input_boolean', 'lock', 'cover',
+                 'media_player', 'sensor', 'binary_sensor', 'climate'),
+     'namespace': 'Alexa.EndpointHealth', 'name': 'connectivity', 'value': _connectivity},
+)
+
+
+# ===== COMPILATION =====
+
+# Compiled rule: (namespace, name, instance, attribute, value_fn)
+_CompiledRule = Tuple[str, str, Optional[str], Optional[str], Callable]
+
+
+def _compile_domain(rules: List[Dict[str, Any]]) -> Callable:
+    """
+    Compile the rules of one domain into a builder function.
+
+    Rules are pre-split by device_class, so the builder does a single dict
+    lookup to find the rules for an entity and never tests a device_class
+    at call time.
+    """
+    generic: List[_CompiledRule] = []
+    by_class: Dict[str, List[_CompiledRule]] = {}
+
+    for rule in rules:
+        compiled = (rule['namespace'], rule['name'], rule.get('instance'),
+                    rule.get('attribute'), rule['value'])
+        classes = rule.get('device_classes')
+        if classes is None:
+            generic.append(compiled)
+            for class_rules in by_class.values():
+                class_rules.append(compiled)
+        else:
+            for device_class in classes:
+                by_class.setdefault(device_class, list(generic)).append(compiled)
+
+    generic_rules = tuple(generic)
+    class_rules = {device_class: tuple(r) for device_class, r in by_class.items()}
+
+    def build(state: str, attributes: Dict[str, Any], time_of_sample: str) -> List[Dict[str, Any]]:
+        rules_for_entity = class_rules.get(attributes.get('device_class'), generic_rules) if class_rules else generic_rules
+        properties = []
+        for namespace, name, instance, attribute, value_fn in rules_for_entity:
+            if attribute is not None and attributes.get(attribute) is None:
+                continue
+            value = value_fn(state, attributes)
+            if value is None:
+                continue
+            prop = {
+                'namespace': namespace,
+                'name': name,
+                'value': value,
+                'timeOfSample': time_of_sample,
+                'uncertaintyInMilliseconds': ALEXA_PROPERTY_UNCERTAINTY_MS
+            }
+            if instance is not None:
+                prop['instance'] = instance
+            properties.append(prop)
+        return properties
+
+    return build
+
+
+def _compile_rules(rules: Tuple[Dict[str, Any], ...]) -> Dict[str, Callable]:
+    """Group rules by domain (table order preserved) and compile each group."""
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for rule in rules:
+        for domain in rule['domains']:
+            grouped.setdefault(domain, []).append(rule)
+    return {domain: _compile_domain(domain_rules) for domain, domain_rules in grouped.items()}
+
+
+_DOMAIN_BUILDERS: Dict[str, Callable] = _compile_rules(PROPERTY_RULES)
+
+_PropertyKey = Tuple[str, Optional[str], str]
+
+
+def _collect_properties(rules: Tuple[Dict[str, Any], ...]) -> Dict[str, FrozenSet[_PropertyKey]]:
+    """(namespace, instance, name) of every property the table can report, per domain."""
+    collected: Dict[str, set] = {}
+    for rule in rules:
+        for domain in rule['domains']:
+            collected.setdefault(domain, set()).add((rule['namespace'], rule.get('instance'), rule['name']))
+    return {domain: frozenset(keys) for domain, keys in collected.items()}
+
+
+_DOMAIN_PROPERTIES: Dict[str, FrozenSet[_PropertyKey]] = _collect_properties(PROPERTY_RULES)
+
+
+# ===== PUBLIC API =====
+
+def format_time_of_sample(timestamp: Optional[float] = None) -> str:
+    """
+    Format an Alexa timeOfSample (ISO 8601, UTC, 'Z' suffix).
+
+    Call once per response and pass the result to every builder.
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    centiseconds = int((timestamp % 1) * 100)
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(timestamp)) + f'.{centiseconds:02d}Z'
+
+
+def is_reportable_domain(domain: str) -> bool:
+    """Check if a domain has any property mapping."""
+    return domain in _DOMAIN_BUILDERS
+
+
+def reportable_properties(domain: str) -> FrozenSet[_PropertyKey]:
+    """(namespace, instance, name) of every property the table maps for a domain."""
+    return _DOMAIN_PROPERTIES.get(domain, frozenset())
+
+
+def build_context_properties(entity_id: str, entity_state: Dict[str, Any],
+                             time_of_sample: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Build Alexa context.properties for one HA entity state.
+
+    Args:
+        entity_id: HA entity ID (domain.object_id)
+        entity_state: HA state object ({'state': ..., 'attributes': {...}})
+        time_of_sample: Pre-formatted timestamp (formatted here if omitted)
+
+    Returns:
+        List of Alexa property objects (empty for unmapped domains)
+    """
+    builder = _DOMAIN_BUILDERS.get(entity_id.partition('.')[0])
+    if builder is None or not isinstance(entity_state, dict):
+        return []
+
+    state = (entity_state.get('state') or '').lower()
+    attributes = entity_state.get('attributes') or {}
+    return builder(state, attributes, time_of_sample or format_time_of_sample())
+
+
+def build_properties_for_states(entity_states: List[Dict[str, Any]],
+                                time_of_sample: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Build properties for many entity states sharing one timestamp.
+
+    Args:
+        entity_states: HA state objects (must contain 'entity_id')
+        time_of_sample: Pre-formatted timestamp (formatted here if omitted)
+
+    Returns:
+        Dict mapping entity_id to its property list (unmapped entities omitted)
+    """
+    time_of_sample = time_of_sample or format_time_of_sample()
+    result = {}
+    for entity_state in entity_states:
+        if not isinstance(entity_state, dict):
+            continue
+        entity_id = entity_state.get('entity_id')
+        if not entity_id:
+            continue
+        properties = build_context_properties(entity_id, entity_state, time_of_sample)
+        if properties:
+            result[entity_id] = properties
+    return result
+
+
+__all__ = [
+    'PROPERTY_RULES',
+    'ALEXA_PROPERTY_UNCERTAINTY_MS',
+    'format_time_of_sample',
+    'is_reportable_domain',
+    'reportable_properties',
+    'build_context_properties',
+    'build_properties_for_states',
+]
+
+# EOF
@@ -0,0 +1,536 @@
+"""
+ha_alexa_state_report.py - Alexa ReportState / ChangeReport from state snapshot
+Version: 1.1.0
+Date: 2026-10-18
+Description: Answers ReportState from a container-local state snapshot
+
+CHANGES (1.1.0):
+- MODIFIED: HA_STATE_REPORT_ENABLED defaults to false (opt-in)
+- ADDED: Discovered capabilities per endpoint (record_discovered_endpoints,
+  fed by the Discovery handler). ReportState is answered locally only when
+  every property discovery advertised for the endpoint is in the mapping
+  table; the StateReport carries exactly those properties. Endpoints not
+  discovered in this container, or not fully covered (climate dual
+  setpoints, cover tilt, ...), are forwarded to HA.
+
+When the Alexa app opens a room view it fires many ReportState directives
+back to back. Warm invocations in the same container share one snapshot of
+HA states: a miss refreshes the whole snapshot with a single /api/states
+fetch, so the directives that follow are answered without calling HA.
+
+Freshness is configured per domain (HA_STATE_FRESHNESS_SECONDS). An entity
+that was just controlled is invalidated and re-read on its own while the
+rest of the snapshot is still fresh.
+
+DESIGN DECISION: Answer locally only for fully covered, discovered endpoints
+Reason: HA's StateReport is authoritative. The mapping table is partial,
+and which controllers an entity gets (RangeController vs ModeController,
+dual setpoints, PowerController) depends on HA's discovery. A local answer
+is only as good as HA's when it reports the same property set, so
+anything else goes to HA.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import os
+import time
+import uuid
+from typing import Dict, Any, Optional, List, Tuple, FrozenSet
+
+from gateway import (
+    log_debug, log_warning,
+    increment_counter, record_metric,
+    get_invocation_deadline
+)
+
+from home_assistant.ha_alexa_properties import (
+    build_context_properties,
+    format_time_of_sample,
+    reportable_properties
+)
+
+# Default freshness (seconds) per domain - fast-changing domains are kept short
+HA_STATE_FRESHNESS_DEFAULTS = {
+    'binary_sensor': 5.0,
+    'lock': 5.0,
+    'media_player': 5.0,
+    'light': 10.0,
+    'switch': 10.0,
+    'fan': 10.0,
+    'cover': 10.0,
+    'climate': 30.0,
+    'sensor': 30.0,
+    'default': 10.0,
+}
+
+
+def _parse_freshness(raw: str) -> Dict[str, float]:
+    """
+    Parse HA_STATE_FRESHNESS_SECONDS ("light=5,sensor=60,default=10").
+
+    Invalid entries are ignored; unspecified domains keep their defaults.
+    """
+    freshness = dict(HA_STATE_FRESHNESS_DEFAULTS)
+    for item in raw.split(','):
+        domain, sep, seconds = item.partition('=')
+        if not sep:
+            continue
+        try:
+            value = float(seconds)
+        except ValueError:
+            continue
+        if value >= 0:
+            freshness[domain.strip()] = value
+    return freshness
+
+
+HA_STATE_FRESHNESS = _parse_freshness(os.getenv('HA_STATE_FRESHNESS_SECONDS', ''))
+
+HA_STATE_REPORT_ENABLED = os.getenv('HA_STATE_REPORT_ENABLED', 'false').lower() == 'true'
+
+
+# (namespace, instance, name) of one Alexa property
+PropertyKey = Tuple[str, Optional[str], str]
+
+
+class StateReportStore:
+    """
+    Container-local snapshot of HA entity states.
+
+    COMPLIANCE:
+    - AP-08: No threading locks (Lambda single-threaded)
+    - DEC-04: One event per container at a time
+    """
+
+    def __init__(self, freshness: Optional[Dict[str, float]] = None):
+        self._freshness = freshness or HA_STATE_FRESHNESS
+        self._default_freshness = self._freshness.get('default', 10.0)
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._snapshot_at = 0.0
+        self._capabilities: Dict[str, FrozenSet[PropertyKey]] = {}
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'snapshot_fetches': 0,
+            'single_fetches': 0,
+            'stale_served': 0,
+            'fetch_errors': 0,
+            'invalidations': 0
+        }
+
+    def freshness_for(self, entity_id: str) -> float:
+        """Freshness window (seconds) for the entity's domain."""
+        return self._freshness.get(entity_id.partition('.')[0], self._default_freshness)
+
+    def _is_fresh(self, entity_id: str, now: float) -> bool:
+        fetched_at = self._fetched_at.get(entity_id)
+        return fetched_at is not None and (now - fetched_at) <= self.freshness_for(entity_id)
+
+    def update_states(self, entity_states: List[Dict[str, Any]], full_snapshot: bool = False) -> int:
+        """
+        Store entity states.
+
+        Args:
+            entity_states: HA state objects (must contain 'entity_id')
+            full_snapshot: True if this is the complete /api/states list
+
+        Returns:
+            Number of entities stored
+        """
+        now = time.monotonic()
+        stored = 0
+        for entity_state in entity_states:
+            if not isinstance(entity_state, dict):
+                continue
+            entity_id = entity_state.get('entity_id')
+            if not entity_id:
+                continue
+            self._states[entity_id] = entity_state
+            self._fetched_at[entity_id] = now
+            stored += 1
+        if full_snapshot:
+            self._snapshot_at = now
+        return stored
+
+    def record_capabilities(self, endpoint_id: str, properties: FrozenSet[PropertyKey]) -> None:
+        """Store the retrievable properties discovery advertised for an endpoint."""
+        self._capabilities[endpoint_id] = properties
+
+    def capabilities_for(self, endpoint_id: str) -> Optional[FrozenSet[PropertyKey]]:
+        """Discovered properties of an endpoint (None if not discovered here)."""
+        return self._capabilities.get(endpoint_id)
+
+    def invalidate(self, entity_id: str) -> None:
+        """Mark one entity as needing a re-read (e.g. after a control directive)."""
+        if self._fetched_at.pop(entity_id, None) is not None:
+            self._stats['invalidations'] += 1
+
+    def get_state(self, entity_id: str, fetch_snapshot, fetch_single,
+                  allow_stale: bool = False,
+                  single_only: bool = False) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Get entity state, refreshing from HA when it is not fresh enough.
+
+        Args:
+            entity_id: Entity ID
+            fetch_snapshot: Callable returning full states list (or None on error)
+            fetch_single: Callable(entity_id) returning one state (or None on error)
+            allow_stale: Serve last-known state instead of fetching
+            single_only: Never refresh the whole snapshot on a miss
+
+        Returns:
+            Tuple of (state or None, source) with source one of
+            'snapshot', 'snapshot_refresh', 'single', 'stale', 'missing'
+        """
+        now = time.monotonic()
+
+        if self._is_fresh(entity_id, now):
+            self._stats['hits'] += 1
+            return self._states[entity_id], 'snapshot'
+
+        self._stats['misses'] += 1
+
+        if allow_stale and entity_id in self._states:
+            self._stats['stale_served'] += 1
+            return self._states[entity_id], 'stale'
+
+        # Rest of the snapshot still fresh - only this entity needs a re-read
+        if single_only or (self._snapshot_at and (now - self._snapshot_at) <= self.freshness_for(entity_id)):
+            self._stats['single_fetches'] += 1
+            state = fetch_single(entity_id)
+            if state is not None:
+                self.update_states([state])
+                return state, 'single'
+        else:
+            # One /api/states call refreshes every entity for the directives that follow
+            self._stats['snapshot_fetches'] += 1
+            states = fetch_snapshot()
+            if states is not None:
+                self.update_states(states, full_snapshot=True)
+                if entity_id in self._states:
+                    return self._states[entity_id], 'snapshot_refresh'
+                return None, 'missing'
+
+        self._stats['fetch_errors'] += 1
+        if entity_id in self._states:
+            self._stats['stale_served'] += 1
+            return self._states[entity_id], 'stale'
+        return None, 'missing'
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot statistics."""
+        stats = self._stats.copy()
+        lookups = stats['hits'] + stats['misses']
+        stats['entities'] = len(self._states)
+        stats['discovered_endpoints'] = len(self._capabilities)
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['snapshot_age_seconds'] = (
+            round(time.monotonic() - self._snapshot_at, 2) if self._snapshot_at else None
+        )
+        return stats
+
+    def reset(self) -> None:
+        """Drop snapshot and statistics."""
+        self.__init__(self._freshness)
+
+
+_STORE = StateReportStore()
+
+
+# ===== FETCHERS =====
+
+def _make_fetchers(oauth_token: Optional[str], correlation_id: str):
+    """Build snapshot/single fetchers bound to the directive's token."""
+    import home_assistant.ha_interconnect as ha_interconnect
+
+    def fetch_snapshot() -> Optional[List[Dict[str, Any]]]:
+        start = time.perf_counter()
+        result = ha_interconnect.devices_get_states(use_cache=False, oauth_token=oauth_token)
+        record_metric('ha_state_report_snapshot_fetch_ms', (time.perf_counter() - start) * 1000)
+        if not result.get('success'):
+            log_warning(f"[{correlation_id}] State snapshot fetch failed: {result.get('error', 'unknown')}")
+            return None
+        data = result.get('data')
+        return data if isinstance(data, list) else None
+
+    def fetch_single(entity_id: str) -> Optional[Dict[str, Any]]:
+        result = ha_interconnect.devices_get_by_id(entity_id, oauth_token=oauth_token)
+        if not result.get('success'):
+            log_warning(f"[{correlation_id}] State fetch failed for {entity_id}: {result.get('error', 'unknown')}")
+            return None
+        data = result.get('data')
+        return data if isinstance(data, dict) else None
+
+    return fetch_snapshot, fetch_single
+
+
+def get_entity_state(entity_id: str, oauth_token: Optional[str] = None,
+                     correlation_id: str = '',
+                     single_only: bool = False) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Get entity state from the snapshot, refreshing as needed.
+
+    Serves last-known state when the invocation budget is low.
+
+    Args:
+        entity_id: Entity ID
+        oauth_token: OAuth token from directive (LWA)
+        correlation_id: Correlation ID for logging
+        single_only: Re-read only this entity on a miss (post-control enrichment)
+
+    Returns:
+        Tuple of (state or None, source)
+    """
+    deadline = get_invocation_deadline()
+    allow_stale = deadline is not None and deadline.is_low()
+    fetch_snapshot, fetch_single = _make_fetchers(oauth_token, correlation_id)
+    state, source = _STORE.get_state(entity_id, fetch_snapshot, fetch_single,
+                                     allow_stale=allow_stale, single_only=single_only)
+    increment_counter(f'ha_state_report_{source}')
+    return state, source
+
+
+def invalidate_entity(entity_id: str) -> None:
+    """Invalidate one entity (call after a control directive changed it)."""
+    _STORE.invalidate(entity_id)
+
+
+def discovered_properties(endpoint: Dict[str, Any]) -> FrozenSet[PropertyKey]:
+    """Retrievable (interface, instance, property) keys of a discovery endpoint."""
+    keys = set()
+    for capability in endpoint.get('capabilities') or []:
+        properties = capability.get('properties') or {}
+        if not properties.get('retrievable'):
+            continue
+        for prop in properties.get('supported') or []:
+            if prop.get('name'):
+                keys.add((capability.get('interface'), capability.get('instance'), prop['name']))
+    return frozenset(keys)
+
+
+def record_discovered_endpoints(endpoints: List[Dict[str, Any]]) -> int:
+    """
+    Record the capabilities of discovered endpoints (Discovery response).
+
+    Returns:
+        Number of endpoints recorded
+    """
+    recorded = 0
+    for endpoint in endpoints or []:
+        if isinstance(endpoint, dict) and endpoint.get('endpointId'):
+            _STORE.record_capabilities(endpoint['endpointId'], discovered_properties(endpoint))
+            recorded += 1
+    return recorded
+
+
+# ===== RESPONSE BUILDERS =====
+
+def _message_id() -> str:
+    return str(uuid.uuid4())
+
+
+def build_state_report(directive: Dict[str, Any], properties: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build Alexa StateReport response for a ReportState directive.
+
+    Args:
+        directive: The ReportState directive (event['directive'])
+        properties: Alexa properties for the endpoint
+
+    Returns:
+        StateReport response
+    """
+    header = directive.get('header', {})
+    endpoint = directive.get('endpoint', {})
+
+    response_endpoint = {'endpointId': endpoint.get('endpointId')}
+    if endpoint.get('scope'):
+        response_endpoint['scope'] = endpoint['scope']
+
+    return {
+        'event': {
+            'header': {
+                'namespace': 'Alexa',
+                'name': 'StateReport',
+                'messageId': _message_id(),
+                'correlationToken': header.get('correlationToken'),
+                'payloadVersion': '3'
+            },
+            'endpoint': response_endpoint,
+            'payload': {}
+        },
+        'context': {
+            'properties': properties
+        }
+    }
+
+
+def build_change_report(endpoint_id: str, previous_state: Optional[Dict[str, Any]],
+                        new_state: Dict[str, Any], scope: Optional[Dict[str, Any]] = None,
+                        cause: str = 'PHYSICAL_INTERACTION',
+                        time_of_sample: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Build Alexa ChangeReport event from two states of one entity.
+
+    Properties whose value changed go to payload.change.properties, the rest
+    to context.properties (as required by the Alexa event gateway).
+
+    Args:
+        endpoint_id: Alexa endpoint ID (HA entity ID)
+        previous_state: Previous HA state (None = everything changed)
+        new_state: Current HA state
+        scope: Optional Alexa BearerToken scope
+        cause: Alexa change cause type
+        time_of_sample: Pre-formatted timestamp shared with other reports
+
+    Returns:
+        ChangeReport event, or None if no reported property changed
+    """
+    entity_id = endpoint_id.replace('#', '.')
+    time_of_sample = time_of_sample or format_time_of_sample()
+
+    new_properties = build_context_properties(entity_id, new_state, time_of_sample)
+    if not new_properties:
+        return None
+
+    previous_values = {}
+    if previous_state:
+        for prop in build_context_properties(entity_id, previous_state, time_of_sample):
+            previous_values[(prop['namespace'], prop['name'], prop.get('instance'))] = prop['value']
+
+    changed = []
+    unchanged = []
+    for prop in new_properties:
+        key = (prop['namespace'], prop['name'], prop.get('instance'))
+        if key in previous_values and previous_values[key] == prop['value']:
+            unchanged.append(prop)
+        else:
+            changed.append(prop)
+
+    if not changed:
+        return None
+
+    endpoint = {'endpointId': endpoint_id}
+    if scope:
+        endpoint['scope'] = scope
+
+    return {
+        'event': {
+            'header': {
+                'namespace': 'Alexa',
+                'name': 'ChangeReport',
+                'messageId': _message_id(),
+                'payloadVersion': '3'
+            },
+            'endpoint': endpoint,
+            'payload': {
+                'change': {
+                    'cause': {'type': cause},
+                    'properties': changed
+                }
+            }
+        },
+        'context': {
+            'properties': unchanged
+        }
+    }
+
+
+def build_change_reports(changes: List[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]],
+                         scope: Optional[Dict[str, Any]] = None,
+                         cause: str = 'PHYSICAL_INTERACTION') -> List[Dict[str, Any]]:
+    """
+    Build ChangeReports for a batch of (previous_state, new_state) pairs.
+
+    All reports share one timestamp.
+    """
+    time_of_sample = format_time_of_sample()
+    reports = []
+    for previous_state, new_state in changes:
+        entity_id = new_state.get('entity_id') if isinstance(new_state, dict) else None
+        if not entity_id:
+            continue
+        report = build_change_report(entity_id, previous_state, new_state,
+                                     scope=scope, cause=cause, time_of_sample=time_of_sample)
+        if report:
+            reports.append(report)
+    return reports
+
+
+# ===== DIRECTIVE HANDLER =====
+
+def handle_report_state(event: Dict[str, Any], oauth_token: Optional[str] = None,
+                        correlation_id: str = '') -> Optional[Dict[str, Any]]:
+    """
+    Answer a ReportState directive from the state snapshot.
+
+    Args:
+        event: Alexa ReportState event
+        oauth_token: OAuth token from directive (LWA)
+        correlation_id: Correlation ID for logging
+
+    Returns:
+        StateReport response, or None if the caller should forward to HA
+        (feature disabled, endpoint not discovered in this container, a
+        discovered property the table doesn't map, or unknown entity)
+    """
+    if not HA_STATE_REPORT_ENABLED:
+        return None
+
+    directive = event.get('directive', {})
+    endpoint_id = directive.get('endpoint', {}).get('endpointId')
+    if not endpoint_id:
+        return None
+
+    entity_id = endpoint_id.replace('#', '.')
+    advertised = _STORE.capabilities_for(endpoint_id)
+    if not advertised:
+        increment_counter('ha_state_report_undiscovered')
+        return None
+    if not advertised <= reportable_properties(entity_id.partition('.')[0]):
+        increment_counter('ha_state_report_uncovered')
+        return None
+
+    state, source = get_entity_state(entity_id, oauth_token, correlation_id)
+    if state is None:
+        increment_counter('ha_state_report_fallback')
+        return None
+
+    properties = [prop for prop in build_context_properties(entity_id, state)
+                  if (prop['namespace'], prop.get('instance'), prop['name']) in advertised]
+    if not properties:
+        increment_counter('ha_state_report_fallback')
+        return None
+
+    log_debug(f"[{correlation_id}] ReportState {entity_id} answered from {source}")
+    return build_state_report(directive, properties)
+
+
+def get_state_report_stats() -> Dict[str, Any]:
+    """Get state report snapshot statistics."""
+    return _STORE.get_stats()
+
+
+def reset_state_report_store() -> None:
+    """Reset the state report snapshot."""
+    _STORE.reset()
+
+
+__all__ = [
+    'StateReportStore',
+    'HA_STATE_FRESHNESS',
+    'get_entity_state',
+    'invalidate_entity',
+    'discovered_properties',
+    'record_discovered_endpoints',
+    'build_state_report',
+    'build_change_report',
+    'build_change_reports',
+    'handle_report_state',
+    'get_state_report_stats',
+    'reset_state_report_store',
+]
+
+# EOF
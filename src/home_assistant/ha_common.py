@@ -1,9 +1,13 @@
 # ha_common.py
 """
 ha_common.py
-Version: 3.1.0
+Version: 3.2.0
 Description: Home Assistant common utilities with debug tracing
 
+MODIFIED (3.2.0 - DEADLINE BUDGETING):
+- ADDED: deadline parameter to call_ha_api (defaults to invocation deadline)
+- MODIFIED: Deadline passed through to HTTP client to cap timeout/retries
+
 MODIFIED (3.1.0 - LWA MIGRATION):
 - ADDED: oauth_token parameter to call_ha_api and all wrapper functions
 - MODIFIED: Prefer oauth_token over config['access_token']
@@ -124,7 +128,8 @@ def call_ha_api(
     ha_config: Optional[Dict[str, Any]] = None,
     method: str = 'GET',
     data: Optional[Dict] = None,
-    oauth_token: str = None  # ADDED: LWA OAuth token
+    oauth_token: str = None,  # ADDED: LWA OAuth token
+    deadline=None
 ) -> Dict[str, Any]:
     """
     Call Home Assistant API with circuit breaker protection.
@@ -137,6 +142,7 @@ def call_ha_api(
         method: HTTP method (GET, POST)
         data: Optional request data
         oauth_token: OAuth token from Alexa directive (LWA) - PREFERRED
+        deadline: Optional InvocationDeadline (defaults to current invocation)
         
     Returns:
         API response dictionary
@@ -144,7 +150,8 @@ def call_ha_api(
     from gateway import (
         make_request, make_get_request, make_post_request, 
         execute_with_circuit_breaker, generate_correlation_id,
-        record_metric, increment_counter, log_info, log_error
+        record_metric, increment_counter, log_info, log_error,
+        get_invocation_deadline
     )
     from shared_utilities import (
         create_operation_context, close_operation_context, 
@@ -184,13 +191,27 @@ def call_ha_api(
         _debug_trace(correlation_id, "Making HA API request", url=url[:50], 
                     token_source="oauth" if oauth_token else "config")
         
+        deadline = deadline or get_invocation_deadline()
+        if deadline is not None and deadline.expired():
+            deadline.record_miss()
+            increment_counter('ha_common_api_call_deadline_exceeded')
+            close_operation_context(context, success=False)
+            return {
+                'success': False,
+                'error': 'Invocation deadline exceeded',
+                'error_code': 'DEADLINE_EXCEEDED'
+            }
+        
         def _make_ha_request():
             if method.upper() == 'GET':
-                return make_get_request(url=url, headers=headers, timeout=config.get('timeout', 30))
+                return make_get_request(url=url, headers=headers, timeout=config.get('timeout', 30),
+                                        deadline=deadline)
             elif method.upper() == 'POST':
-                return make_post_request(url=url, data=data or {}, headers=headers, timeout=config.get('timeout', 30))
+                return make_post_request(url=url, data=data or {}, headers=headers, timeout=config.get('timeout', 30),
+                                         deadline=deadline)
             else:
-                return make_request(method, url, headers=headers, data=data, timeout=config.get('timeout', 30))
+                return make_request(method, url, headers=headers, data=data, timeout=config.get('timeout', 30),
+                                    deadline=deadline)
         
         result = execute_with_circuit_breaker(HA_CIRCUIT_BREAKER_NAME, _make_ha_request)
         
@@ -1,10 +1,23 @@
 # ha_devices_core.py
 """
 ha_devices_core.py - Core Device Operations (INT-HA-02)
-Version: 3.1.0
-Date: 2025-12-06
+Version: 3.4.0
+Date: 2026-10-18
 Purpose: Core implementation for Home Assistant device operations
 
+CHANGES (3.4.0 - STRUCTURED LOGGING):
+- MODIFIED: _trace_step calls pass template + args (formatted only when
+  debug tracing is on)
+
+CHANGES (3.3.0 - STATE MIRROR):
+- ADDED: get_states_impl/get_by_id_impl read from ha_state_mirror when
+  HA_STATE_MIRROR_ENABLED (event-fed, no HTTP call); REST is the fallback
+
+CHANGES (3.2.0 - DEADLINE BUDGETING):
+- ADDED: Stale states snapshot (ha_all_states_stale) kept next to fresh cache
+- ADDED: get_states_impl/get_by_id_impl serve stale state when invocation
+  budget is low or the API call ran out of time
+
 Architecture:
 ha_interconnect.py → ha_interface_devices.py → ha_devices_core.py (THIS FILE)
                                                   ├─ ha_devices_helpers.py (helpers)
@@ -44,9 +57,12 @@ from gateway import (
     cache_get, cache_set, cache_delete,
     increment_counter, record_metric,
     create_success_response, create_error_response,
-    generate_correlation_id
+    generate_correlation_id,
+    get_invocation_deadline
 )
 
+from home_assistant import ha_state_mirror
+
 # Import helpers from ha_devices_helpers
 from home_assistant.ha_devices_helpers import (
     call_ha_api_impl as _helper_call_ha_api_impl,
@@ -55,9 +71,68 @@ from home_assistant.ha_devices_helpers import (
     _trace_step,
     DebugContext,
     HA_CACHE_TTL_STATE,
+    HA_CACHE_TTL_STATE_STALE,
     HA_CACHE_TTL_FUZZY_MATCH
 )
 
+HA_STATES_CACHE_KEY = 'ha_all_states'
+HA_STATES_STALE_CACHE_KEY = 'ha_all_states_stale'
+
+
+# ===== STALE STATE FALLBACK =====
+
+def _is_budget_low() -> bool:
+    """Check if the running invocation is short on time."""
+    deadline = get_invocation_deadline()
+    return deadline is not None and deadline.is_low()
+
+
+def _is_deadline_error(result: Dict[str, Any]) -> bool:
+    """Check if an API result failed because the invocation ran out of time."""
+    return (result.get('error_code') == 'DEADLINE_EXCEEDED'
+            or bool(result.get('deadline_exceeded'))
+            or result.get('retry_skipped') == 'deadline')
+
+
+def _get_stale_states(correlation_id: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get last-known entity states regardless of freshness.
+    
+    Checks the fresh cache first, then the long-lived stale snapshot.
+    
+    Returns:
+        Entity list or None if nothing cached
+    """
+    for key in (HA_STATES_CACHE_KEY, HA_STATES_STALE_CACHE_KEY):
+        cached = cache_get(key)
+        if cached and isinstance(cached, dict) and cached.get('success'):
+            _trace_step(correlation_id, "Stale fallback from %s", key)
+            return _extract_entity_list(cached.get('data', []), 'stale_states')
+    return None
+
+
+def _states_response(entity_list: List[Dict[str, Any]], entity_ids: Optional[List[str]],
+                     message: str) -> Dict[str, Any]:
+    """Build stale states response, filtered to entity_ids if given."""
+    if entity_ids and isinstance(entity_ids, list):
+        entity_set = set(entity_ids)
+        entity_list = [e for e in entity_list
+                       if isinstance(e, dict) and e.get('entity_id') in entity_set]
+    response = create_success_response(message, entity_list)
+    response['stale'] = True
+    return response
+
+
+def _find_stale_entity(entity_id: str, correlation_id: str) -> Optional[Dict[str, Any]]:
+    """Find a single entity in the last-known states."""
+    stale = _get_stale_states(correlation_id)
+    if not stale:
+        return None
+    for entity in stale:
+        if isinstance(entity, dict) and entity.get('entity_id') == entity_id:
+            return entity
+    return None
+
 
 # ===== CORE DEVICE OPERATIONS (7 FUNCTIONS) =====
 
@@ -84,7 +159,13 @@ def get_states_impl(entity_ids: Optional[List[str]] = None, use_cache: bool = Tr
                          entity_count=len(entity_ids) if entity_ids else "all",
                          use_cache=use_cache):
             
-            cache_key = 'ha_all_states'
+            mirrored = ha_state_mirror.read_mirrored_states(entity_ids)
+            if mirrored is not None:
+                _trace_step(correlation_id, "Using state mirror")
+                increment_counter('ha_state_mirror_hit')
+                return create_success_response('States retrieved from state mirror', mirrored)
+            
+            cache_key = HA_STATES_CACHE_KEY
             
             if use_cache:
                 cached = cache_get(cache_key)
@@ -105,9 +186,21 @@ def get_states_impl(entity_ids: Optional[List[str]] = None, use_cache: bool = Tr
                     log_warning(f"[{correlation_id}] Cached data is {type(cached)}, not dict - invalidating")
                     cache_delete(cache_key)
             
+            if use_cache and _is_budget_low():
+                stale = _get_stale_states(correlation_id)
+                if stale is not None:
+                    increment_counter('ha_state_stale_served')
+                    return _states_response(stale, entity_ids, 'States retrieved from stale cache (low budget)')
+            
             _trace_step(correlation_id, "Fetching states from API")
             result = _helper_call_ha_api_impl('/api/states', oauth_token=oauth_token)
             
+            if isinstance(result, dict) and not result.get('success') and use_cache and _is_deadline_error(result):
+                stale = _get_stale_states(correlation_id)
+                if stale is not None:
+                    increment_counter('ha_state_stale_served')
+                    return _states_response(stale, entity_ids, 'States retrieved from stale cache (deadline)')
+            
             if not isinstance(result, dict):
                 log_error(f"[{correlation_id}] call_ha_api_impl returned {type(result)}, not dict")
                 return create_error_response(f'API returned invalid type: {type(result).__name__}', 'INVALID_API_RESPONSE')
@@ -122,7 +215,7 @@ def get_states_impl(entity_ids: Optional[List[str]] = None, use_cache: bool = Tr
                 
                 if use_cache:
                     cache_set(cache_key, normalized_result, ttl=HA_CACHE_TTL_STATE)
-                    _trace_step(correlation_id, "States cached")
+                    cache_set(HA_STATES_STALE_CACHE_KEY, normalized_result, ttl=HA_CACHE_TTL_STATE_STALE)
                     _trace_step(correlation_id, "States cached")
                 
                 if entity_ids and isinstance(entity_ids, list):
@@ -161,12 +254,33 @@ def get_by_id_impl(entity_id: str, oauth_token: str = None, **kwargs) -> Dict[st
     
     try:
         with DebugContext("get_by_id_impl", correlation_id, entity_id=entity_id):
+            mirrored = ha_state_mirror.read_mirrored_state(entity_id)
+            if mirrored is not None:
+                increment_counter('ha_state_mirror_hit')
+                return create_success_response(f'Entity {entity_id} retrieved from state mirror', mirrored)
+            
+            if _is_budget_low():
+                stale_entity = _find_stale_entity(entity_id, correlation_id)
+                if stale_entity is not None:
+                    increment_counter('ha_state_stale_served')
+                    response = create_success_response(f'Entity {entity_id} retrieved from stale cache', stale_entity)
+                    response['stale'] = True
+                    return response
+            
             result = _helper_call_ha_api_impl(f'/api/states/{entity_id}', oauth_token=oauth_token)
             
             if result.get('success'):
                 increment_counter('ha_devices_get_by_id_success')
                 return create_success_response(f'Entity {entity_id} retrieved', result.get('data'))
             
+            if _is_deadline_error(result):
+                stale_entity = _find_stale_entity(entity_id, correlation_id)
+                if stale_entity is not None:
+                    increment_counter('ha_state_stale_served')
+                    response = create_success_response(f'Entity {entity_id} retrieved from stale cache', stale_entity)
+                    response['stale'] = True
+                    return response
+            
             increment_counter('ha_devices_get_by_id_error')
             return result
             
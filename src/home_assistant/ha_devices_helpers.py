@@ -1,9 +1,18 @@
 """
 ha_devices_helpers.py - Device Helper Functions and Utilities
-Version: 4.1.0
-Date: 2025-12-06
+Version: 4.3.0
+Date: 2026-10-18
 Purpose: Helper functions and utilities for HA device operations
 
+CHANGES (4.3.0 - STRUCTURED LOGGING):
+- MODIFIED: _trace_step / DebugContext emit structured DEBUG events
+  (step and details as fields, no detail string join)
+
+CHANGES (4.2.0 - DEADLINE BUDGETING):
+- ADDED: call_ha_api_impl honors invocation deadline (deadline kwarg)
+- ADDED: ha_api_deadline_exceeded metric
+- ADDED: HA_CACHE_TTL_STATE_STALE for stale-state fallback
+
 Copyright 2025 Joseph Hersey
 Licensed under Apache 2.0 (see LICENSE).
 """
@@ -15,19 +24,22 @@ from collections import defaultdict, deque
 
 # Import LEE services via gateway (ONLY way to access LEE)
 from gateway import (
-    log_info, log_error, log_debug, log_warning,
+    log_error, log_debug, log_warning,
     execute_operation, GatewayInterface,
     cache_get, cache_set, cache_delete,
     increment_counter, record_metric,
     create_success_response, create_error_response,
     generate_correlation_id,
-    execute_with_circuit_breaker
+    execute_with_circuit_breaker,
+    get_invocation_deadline,
+    get_logger
 )
 
 # ===== MODULE CONSTANTS =====
 
 HA_CACHE_TTL_ENTITIES = 300
 HA_CACHE_TTL_STATE = 60
+HA_CACHE_TTL_STATE_STALE = 600  # Last-known states kept for low-budget fallback
 HA_CACHE_TTL_CONFIG = 600
 HA_CACHE_TTL_FUZZY_MATCH = 300
 HA_CIRCUIT_BREAKER_NAME = "home_assistant"
@@ -49,18 +61,20 @@ _DEBUG_MODE_ENABLED = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
 # ===== DEBUG TRACING =====
 # ADDED: Debug trace helper
 
-def _trace_step(correlation_id: str, step: str, **details):
+_trace_log = get_logger('ha_devices.trace')
+
+
+def _trace_step(correlation_id: str, step: str, *args, **details):
     """
     Debug trace helper for device operations.
     
     Args:
         correlation_id: Correlation ID for request tracing
-        step: Step description
-        **details: Additional details to log
+        step: Step description (template, formatted with args)
+        **details: Additional details to log (record fields)
     """
     if _DEBUG_MODE_ENABLED:
-        detail_str = ', '.join(f"{k}={v}" for k, v in details.items()) if details else ''
-        log_info(f"[{correlation_id}] [DEVICES-TRACE] {step}" + (f" ({detail_str})" if detail_str else ""))
+        _trace_log.info(step, *args, correlation_id=correlation_id, **details)
 
 
 # ADDED: Debug context manager
@@ -91,7 +105,7 @@ class DebugContext:
         """Enter context - trace start."""
         if _DEBUG_MODE_ENABLED:
             self.start_time = time.perf_counter()
-            _trace_step(self.correlation_id, f"{self.operation} START", **self.details)
+            _trace_step(self.correlation_id, "%s START", self.operation, **self.details)
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -100,9 +114,9 @@ class DebugContext:
             duration_ms = (time.perf_counter() - self.start_time) * 1000
             status = "FAILED" if exc_type else "SUCCESS"
             _trace_step(
-                self.correlation_id, 
-                f"{self.operation} {status}", 
-                duration_ms=f"{duration_ms:.2f}"
+                self.correlation_id,
+                "%s %s", self.operation, status,
+                duration_ms=round(duration_ms, 2)
             )
         return False  # Don't suppress exceptions
 
@@ -299,12 +313,14 @@ def call_ha_api_impl(endpoint: str, method: str = 'GET', data: Optional[Dict] =
         config: Optional HA configuration
         oauth_token: OAuth token from directive (LWA)
         **kwargs: Additional options
+            deadline: Optional InvocationDeadline (defaults to current invocation)
         
     Returns:
         API response dictionary
     """
     correlation_id = generate_correlation_id()
     start_time = time.perf_counter()
+    deadline = kwargs.get('deadline') or get_invocation_deadline()
     
     try:
         log_debug("Calling HA API", correlation_id=correlation_id, endpoint=endpoint, method=method)
@@ -318,6 +334,12 @@ def call_ha_api_impl(endpoint: str, method: str = 'GET', data: Optional[Dict] =
         if not isinstance(endpoint, str) or not endpoint:
             return create_error_response('Invalid endpoint', 'INVALID_ENDPOINT')
         
+        if deadline is not None and deadline.expired():
+            deadline.record_miss()
+            increment_counter('ha_api_deadline_exceeded')
+            log_warning(f"[{correlation_id}] Skipping {endpoint}: invocation deadline exceeded")
+            return create_error_response('Invocation deadline exceeded', 'DEADLINE_EXCEEDED')
+        
         if not isinstance(method, str):
             method = 'GET'
         
@@ -354,11 +376,15 @@ def call_ha_api_impl(endpoint: str, method: str = 'GET', data: Optional[Dict] =
             url=url,
             headers=headers,
             json=data,
-            timeout=config.get('timeout', 30)
+            timeout=config.get('timeout', 30),
+            deadline=deadline
         )
         
         duration_ms = (time.perf_counter() - start_time) * 1000
         
+        if http_result.get('deadline_exceeded') or http_result.get('retry_skipped') == 'deadline':
+            increment_counter('ha_api_deadline_exceeded')
+        
         if duration_ms > HA_SLOW_OPERATION_THRESHOLD_MS:
             _SLOW_OPERATIONS[f'call_ha_api_{endpoint}'] += 1
             log_warning(f"Slow API call: {endpoint} took {duration_ms:.2f}ms")
@@ -393,6 +419,7 @@ __all__ = [
     # Constants
     'HA_CACHE_TTL_ENTITIES',
     'HA_CACHE_TTL_STATE',
+    'HA_CACHE_TTL_STATE_STALE',
     'HA_CACHE_TTL_CONFIG',
     'HA_CACHE_TTL_FUZZY_MATCH',
     'HA_CIRCUIT_BREAKER_NAME',
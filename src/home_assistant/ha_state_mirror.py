@@ -0,0 +1,402 @@
+"""
+ha_state_mirror.py - Event-fed HA state mirror
+Version: 1.1.0
+Date: 2026-10-18
+Description: In-memory entity states kept current by HA's state_changed stream
+
+CHANGES (1.1.0):
+- CHANGED: entity_registry_updated updates the exposure index incrementally
+  (ha_websocket.apply_registry_event) instead of dropping the registry cache
+
+Optional (HA_STATE_MIRROR_ENABLED). Instead of polling /api/states on the
+HA_CACHE_TTL_STATE TTL, the mirror subscribes to state_changed and
+entity_registry_updated on the persistent WebSocket session and applies the
+deltas to its store. Reads in a warm container then need no HTTP call.
+
+Lambda has no background reader: events pushed while an invocation is
+running or while the container is frozen wait in the socket and are applied
+on the next read. The mirror resyncs (resubscribe + full get_states) when:
+- the session reconnected (subscriptions are lost)
+- the container was frozen longer than HA_STATE_MIRROR_MAX_FREEZE_SECONDS
+- an event's old_state does not match the mirrored state (missed event)
+- the session dropped buffered frames
+
+After HA_STATE_MIRROR_MAX_FAILURES consecutive failed resyncs the mirror
+disables itself for HA_STATE_MIRROR_RETRY_SECONDS; reads fall back to REST.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import os
+import time
+from typing import Dict, Any, Optional, List
+
+from gateway import (
+    log_info, log_warning, log_debug,
+    increment_counter, record_metric,
+    register_invocation_end_hook
+)
+
+from home_assistant import ha_websocket
+
+# Configuration
+HA_STATE_MIRROR_ENABLED = os.getenv('HA_STATE_MIRROR_ENABLED', 'false').lower() == 'true'
+HA_STATE_MIRROR_MAX_FREEZE_SECONDS = float(os.getenv('HA_STATE_MIRROR_MAX_FREEZE_SECONDS', '300'))
+HA_STATE_MIRROR_MAX_FAILURES = int(os.getenv('HA_STATE_MIRROR_MAX_FAILURES', '3'))
+HA_STATE_MIRROR_RETRY_SECONDS = float(os.getenv('HA_STATE_MIRROR_RETRY_SECONDS', '300'))
+
+MIRROR_EVENT_TYPES = ('state_changed', 'entity_registry_updated')
+
+
+class StateMirror:
+    """
+    Entity states mirrored from the HA event stream.
+
+    Transport is injected (subscribe/poll/fetch_states callables) so the
+    mirror can be replayed against a scripted stand-in server.
+
+    COMPLIANCE:
+    - AP-08: No threading locks (events applied on read, not by a thread)
+    - DEC-04: Lambda single-threaded model
+    """
+
+    def __init__(self, subscribe=None, poll=None, fetch_states=None,
+                 max_freeze_seconds: float = HA_STATE_MIRROR_MAX_FREEZE_SECONDS,
+                 max_failures: int = HA_STATE_MIRROR_MAX_FAILURES,
+                 retry_seconds: float = HA_STATE_MIRROR_RETRY_SECONDS):
+        self._subscribe = subscribe or ha_websocket.ha_websocket_subscribe
+        self._poll = poll or ha_websocket.ha_websocket_poll
+        self._fetch_states = fetch_states or (lambda: ha_websocket.ha_websocket_command('get_states'))
+        self._max_freeze = max_freeze_seconds
+        self._max_failures = max_failures
+        self._retry_seconds = retry_seconds
+
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._subscriptions: Dict[int, str] = {}
+        self._generation: Optional[int] = None
+        self._frames_dropped = 0
+        self._synced = False
+        self._suspended_at: Optional[float] = None
+        self._failures = 0
+        self._disabled_until = 0.0
+        self._disabled_reason: Optional[str] = None
+
+        self._stats = {
+            'resyncs': 0,
+            'resync_reasons': {},
+            'resync_failures': 0,
+            'last_resync_ms': 0.0,
+            'events_applied': 0,
+            'events_stale': 0,
+            'registry_events': 0,
+            'reads_served': 0,
+            'reads_fallback': 0,
+            'suspensions': 0,
+            'disabled_count': 0
+        }
+
+    # ===== LIFECYCLE =====
+
+    @property
+    def synced(self) -> bool:
+        return self._synced
+
+    def suspend(self) -> None:
+        """
+        Mark the end of an invocation (container may freeze now).
+
+        Registered as invocation end hook. Nothing is torn down: on the next
+        read the mirror catches up from the socket, or resyncs if the freeze
+        was too long to trust the buffered event stream.
+        """
+        if self._synced:
+            self._suspended_at = time.monotonic()
+            self._stats['suspensions'] += 1
+
+    def disable(self, reason: str) -> None:
+        """Drop mirrored state and stop serving reads until the retry time."""
+        self._synced = False
+        self._states = {}
+        self._subscriptions = {}
+        self._generation = None
+        self._disabled_reason = reason
+        self._disabled_until = time.monotonic() + self._retry_seconds
+        self._stats['disabled_count'] += 1
+        increment_counter('ha_state_mirror_disabled')
+        log_warning(f"State mirror disabled for {self._retry_seconds:.0f}s: {reason}")
+
+    def _invalidate(self, reason: str) -> None:
+        """Stop trusting mirrored state; next ensure_synced() resyncs."""
+        if self._synced:
+            log_debug(f"State mirror out of sync: {reason}")
+        self._synced = False
+        reasons = self._stats['resync_reasons']
+        reasons[reason] = reasons.get(reason, 0) + 1
+
+    # ===== SYNC =====
+
+    def _resync(self) -> bool:
+        """Resubscribe and load full state snapshot."""
+        start = time.perf_counter()
+        self._subscriptions = {}
+        self._generation = None
+
+        for event_type in MIRROR_EVENT_TYPES:
+            result = self._subscribe(event_type)
+            if not result.get('success'):
+                return self._resync_failed(f"subscribe {event_type}: {result.get('error')}")
+            data = result.get('data', {})
+            self._subscriptions[data['subscription_id']] = event_type
+            if self._generation is not None and data.get('generation') != self._generation:
+                # Session reconnected between subscriptions - start over next time
+                return self._resync_failed('session reconnected during subscribe')
+            self._generation = data.get('generation')
+
+        # Subscribed before fetching: events racing the snapshot are applied
+        # afterwards and dropped if older than the snapshot (last_updated).
+        result = self._fetch_states()
+        if not result.get('success'):
+            return self._resync_failed(f"get_states: {result.get('error')}")
+
+        self._states = {
+            state['entity_id']: state
+            for state in (result.get('data') or [])
+            if isinstance(state, dict) and 'entity_id' in state
+        }
+        self._synced = True
+        self._suspended_at = None
+        self._failures = 0
+        self._disabled_reason = None
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        self._stats['resyncs'] += 1
+        self._stats['last_resync_ms'] = round(duration_ms, 2)
+        record_metric('ha_state_mirror_resync_ms', duration_ms)
+        log_info(f"State mirror synced: {len(self._states)} entities in {duration_ms:.1f}ms")
+        return True
+
+    def _resync_failed(self, reason: str) -> bool:
+        self._synced = False
+        self._failures += 1
+        self._stats['resync_failures'] += 1
+        increment_counter('ha_state_mirror_resync_failure')
+        log_warning(f"State mirror resync failed ({self._failures}/{self._max_failures}): {reason}")
+        if self._failures >= self._max_failures:
+            self._failures = 0
+            self.disable(reason)
+        return False
+
+    def _catch_up(self, after_resync: bool = False) -> None:
+        """
+        Apply events buffered since the last read; invalidate on any gap.
+
+        Args:
+            after_resync: Only take the current frames_dropped as baseline
+        """
+        if self._suspended_at is not None:
+            frozen_for = time.monotonic() - self._suspended_at
+            self._suspended_at = None
+            if frozen_for > self._max_freeze:
+                self._invalidate('freeze')
+                return
+
+        result = self._poll(list(self._subscriptions.keys()))
+        if not result.get('success'):
+            self._invalidate('poll_failed')
+            return
+
+        data = result.get('data', {})
+        if not data.get('connected') or data.get('generation') != self._generation:
+            self._invalidate('reconnect')
+            return
+
+        frames_dropped = data.get('frames_dropped', 0)
+        if frames_dropped > self._frames_dropped:
+            self._frames_dropped = frames_dropped
+            if not after_resync:
+                self._invalidate('overflow')
+                return
+
+        for frame in data.get('events', []):
+            if not self._apply_event(frame):
+                self._invalidate('gap')
+                return
+
+    def ensure_synced(self) -> bool:
+        """
+        Bring the mirror up to date.
+
+        Returns:
+            True if reads can be served from the mirror
+        """
+        if self._disabled_reason is not None:
+            if time.monotonic() < self._disabled_until:
+                return False
+            self._disabled_reason = None
+
+        if self._synced:
+            self._catch_up()
+        if not self._synced and self._resync():
+            # Apply events that raced the snapshot
+            self._catch_up(after_resync=True)
+        return self._synced
+
+    # ===== EVENT APPLICATION =====
+
+    def _apply_event(self, frame: Dict[str, Any]) -> bool:
+        """
+        Apply one event frame.
+
+        Returns:
+            False if the event reveals a missed update (resync needed)
+        """
+        event = frame.get('event', {})
+        event_type = event.get('event_type') or self._subscriptions.get(frame.get('id'))
+        data = event.get('data', {})
+
+        if event_type == 'entity_registry_updated':
+            return self._apply_registry_event(data)
+        if event_type != 'state_changed':
+            return True
+
+        entity_id = data.get('entity_id')
+        if not entity_id:
+            return True
+
+        new_state = data.get('new_state')
+        old_state = data.get('old_state')
+        current = self._states.get(entity_id)
+
+        if current is not None:
+            current_updated = current.get('last_updated', '')
+            new_updated = (new_state or {}).get('last_updated', '')
+            if new_state is not None and new_updated and new_updated <= current_updated:
+                # Older than (or same as) what the snapshot already has
+                self._stats['events_stale'] += 1
+                return True
+            if old_state is not None and old_state.get('last_updated', '') > current_updated:
+                # HA changed the entity in between - we missed an event
+                return False
+
+        if new_state is None:
+            self._states.pop(entity_id, None)
+        else:
+            self._states[entity_id] = new_state
+        self._stats['events_applied'] += 1
+        return True
+
+    def _apply_registry_event(self, data: Dict[str, Any]) -> bool:
+        """Apply entity_registry_updated (remove / rename) and update exposure index."""
+        self._stats['registry_events'] += 1
+        action = data.get('action')
+        entity_id = data.get('entity_id')
+
+        if action == 'remove' and entity_id:
+            self._states.pop(entity_id, None)
+        elif action == 'update' and data.get('old_entity_id') and entity_id:
+            state = self._states.pop(data['old_entity_id'], None)
+            if state is not None:
+                state = dict(state)
+                state['entity_id'] = entity_id
+                self._states[entity_id] = state
+
+        ha_websocket.apply_registry_event(data)
+        return True
+
+    # ===== READS =====
+
+    def read_states(self, entity_ids: Optional[List[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read mirrored states.
+
+        Returns:
+            Entity state list, or None if the mirror cannot serve (use REST)
+        """
+        if not self.ensure_synced():
+            self._stats['reads_fallback'] += 1
+            return None
+        self._stats['reads_served'] += 1
+        if entity_ids:
+            return [self._states[e] for e in entity_ids if e in self._states]
+        return list(self._states.values())
+
+    def read_state(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read one mirrored state.
+
+        Returns:
+            Entity state, or None if not mirrored (use REST)
+        """
+        if not self.ensure_synced():
+            self._stats['reads_fallback'] += 1
+            return None
+        state = self._states.get(entity_id)
+        self._stats['reads_served' if state is not None else 'reads_fallback'] += 1
+        return state
+
+    # ===== STATS =====
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats['resync_reasons'] = dict(self._stats['resync_reasons'])
+        stats['synced'] = self._synced
+        stats['entities'] = len(self._states)
+        stats['subscriptions'] = len(self._subscriptions)
+        stats['disabled_reason'] = self._disabled_reason
+        return stats
+
+
+# ===== MODULE SINGLETON =====
+
+_MIRROR: Optional[StateMirror] = None
+
+
+def get_state_mirror() -> Optional[StateMirror]:
+    """
+    Get container-wide mirror (None when mirror mode is off).
+
+    Requires HA_STATE_MIRROR_ENABLED and HA_WEBSOCKET_ENABLED.
+    """
+    global _MIRROR
+    if not (HA_STATE_MIRROR_ENABLED and ha_websocket.is_websocket_enabled()):
+        return None
+    if _MIRROR is None:
+        _MIRROR = StateMirror()
+        register_invocation_end_hook(_MIRROR.suspend)
+    return _MIRROR
+
+
+def read_mirrored_states(entity_ids: Optional[List[str]] = None) -> Optional[List[Dict[str, Any]]]:
+    """Mirrored states, or None if mirror mode is off or cannot serve."""
+    mirror = get_state_mirror()
+    return mirror.read_states(entity_ids) if mirror is not None else None
+
+
+def read_mirrored_state(entity_id: str) -> Optional[Dict[str, Any]]:
+    """Mirrored state of one entity, or None if unavailable."""
+    mirror = get_state_mirror()
+    return mirror.read_state(entity_id) if mirror is not None else None
+
+
+def get_state_mirror_stats() -> Dict[str, Any]:
+    """Mirror statistics (enabled=False when mirror mode is off)."""
+    mirror = get_state_mirror()
+    if mirror is None:
+        return {'enabled': False}
+    stats = mirror.get_stats()
+    stats['enabled'] = True
+    return stats
+
+
+__all__ = [
+    'StateMirror',
+    'get_state_mirror',
+    'read_mirrored_states',
+    'read_mirrored_state',
+    'get_state_mirror_stats',
+    'HA_STATE_MIRROR_ENABLED',
+    'MIRROR_EVENT_TYPES',
+]
+
+# EOF
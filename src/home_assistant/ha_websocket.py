@@ -1,9 +1,48 @@
 # ha_websocket.py
 """
 ha_websocket.py - WebSocket Operations
-Version: 3.0.0
+Version: 3.4.2
+Date: 2026-10-18
 Description: WebSocket communication with debug tracing and timing metrics
 
+CHANGES (3.4.2):
+- FIXED: ExposureIndex docstring - cache_get returns the cached index
+  itself, not a copy; index and returned entries are read-only for callers
+- CHANGED: ExposureIndex.exposed_ids() returns a read-only keys view
+  instead of the internal dict
+
+CHANGES (3.4.1):
+- CHANGED: ExposureIndex keeps entries and exposed IDs in dicts keyed by
+  entity_id (insertion = registry order); filter() no longer sorts
+- CHANGED: filter_exposed_entities() with an explicit list scans it once
+  instead of building a throwaway ExposureIndex
+
+CHANGES (3.4.0):
+- ADDED: ExposureIndex - per-assistant exposed entity ID sets built once per
+  registry fetch and cached next to the registry
+- CHANGED: filter_exposed_entities(entities=None, assistant=None) is an
+  O(exposed) index lookup for the cached registry
+- ADDED: apply_registry_event() - incremental index update from
+  entity_registry_updated events (fed by ha_state_mirror)
+- FIXED: registry cache check treated the cache-miss sentinel as a hit
+
+CHANGES (3.3.0):
+- ADDED: ha_websocket_subscribe() / ha_websocket_poll() - HA event stream on
+  the persistent session (used by ha_state_mirror)
+- ADDED: HA_ENTITY_REGISTRY_CACHE_KEY constant
+
+CHANGES (3.2.0):
+- ADDED: ha_websocket_commands() - pipelined commands on the persistent session
+- ADDED: get_registries_via_websocket() - entity/device/area registry + states
+  in one round trip
+- FIXED: websocket_request() skips frames whose id does not match the request
+
+CHANGES (3.1.0):
+- ADDED: Persistent authenticated session (HA_WEBSOCKET_PERSISTENT)
+  - ha_websocket_command() sends over the warm-container session via gateway
+  - ensure_connected() opens/validates the session (HA ping/pong)
+  - get_entity_registry_via_websocket() no longer pays connect + auth per call
+
 Copyright 2025 Joseph Hersey
 Licensed under Apache 2.0 (see LICENSE).
 """
@@ -11,11 +50,11 @@ Licensed under Apache 2.0 (see LICENSE).
 import os
 import json
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, KeysView
 from gateway import (
     log_info, log_error, log_debug, log_warning,
     execute_operation, GatewayInterface,
-    cache_get, cache_set,
+    cache_get, cache_set, cache_delete,
     increment_counter, record_metric,
     create_success_response, create_error_response,
     generate_correlation_id
@@ -25,6 +64,19 @@ from gateway import (
 HA_WEBSOCKET_ENABLED = os.getenv('HA_WEBSOCKET_ENABLED', 'false').lower() == 'true'
 HA_WEBSOCKET_TIMEOUT = int(os.getenv('HA_WEBSOCKET_TIMEOUT', '10'))
 HA_WEBSOCKET_CACHE_TTL = 300
+HA_ENTITY_REGISTRY_CACHE_KEY = 'ha_entity_registry_ws'
+HA_EXPOSURE_INDEX_CACHE_KEY = 'ha_entity_exposure_index'
+
+# Assistants checked when filter_exposed_entities() gets no assistant
+HA_DEFAULT_EXPOSURE_ASSISTANTS = ('alexa', 'conversation')
+
+# Persistent session (reused across warm invocations)
+HA_WEBSOCKET_PERSISTENT = os.getenv('HA_WEBSOCKET_PERSISTENT', 'true').lower() == 'true'
+HA_WEBSOCKET_PING_AFTER_SECONDS = float(os.getenv('HA_WEBSOCKET_PING_AFTER_SECONDS', '30'))
+HA_WEBSOCKET_MAX_IDLE_SECONDS = float(os.getenv('HA_WEBSOCKET_MAX_IDLE_SECONDS', '240'))
+
+# Unrelated frames tolerated while waiting for a reply on a plain connection
+HA_WEBSOCKET_MAX_SKIPPED_FRAMES = 100
 
 # ===== MODULE-LEVEL DEBUG MODE =====
 _DEBUG_MODE_ENABLED = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
@@ -339,13 +391,20 @@ def websocket_request(connection: Any, message_type: str,
         if not send_result.get('success'):
             return send_result
         
-        # Receive response
+        # Receive response (skip events and replies to other ids)
         _debug_trace(correlation_id, "Receiving response")
-        response = receive_websocket_message(connection, timeout=HA_WEBSOCKET_TIMEOUT)
-        if not response.get('success'):
-            return response
-        
-        response_data = response.get('data', {}).get('message', {})
+        for _ in range(HA_WEBSOCKET_MAX_SKIPPED_FRAMES + 1):
+            response = receive_websocket_message(connection, timeout=HA_WEBSOCKET_TIMEOUT)
+            if not response.get('success'):
+                return response
+            
+            response_data = response.get('data', {}).get('message', {})
+            if response_data.get('id') == request_id and response_data.get('type') != 'event':
+                break
+            _debug_trace(correlation_id, "Skipping unrelated frame",
+                         frame_id=response_data.get('id'), frame_type=response_data.get('type'))
+        else:
+            return create_error_response(f'No reply for request id {request_id}', 'WEBSOCKET_NO_REPLY')
         
         duration_ms = (time.perf_counter() - start_time) * 1000
         
@@ -381,6 +440,221 @@ def websocket_request(connection: Any, message_type: str,
         return create_error_response(str(e), 'WEBSOCKET_REQUEST_FAILED')
 
 
+# ===== PERSISTENT SESSION =====
+
+def _get_session_endpoint() -> Dict[str, Any]:
+    """
+    Build WebSocket URL and auth message from HA config.
+    
+    Returns:
+        Success response with 'url' and 'auth_message', or error response
+    """
+    from home_assistant.ha_config import load_ha_config
+    config = load_ha_config()
+    
+    if not config.get('enabled'):
+        return create_error_response('HA not enabled', 'HA_DISABLED')
+    
+    base_url = config['base_url'].replace('http://', 'ws://').replace('https://', 'wss://')
+    return create_success_response('WebSocket endpoint', {
+        'url': f"{base_url}/api/websocket",
+        'auth_message': {'type': 'auth', 'access_token': config['access_token']}
+    })
+
+
+def _result_from_frame(response_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert HA reply frame to success/error response."""
+    if response_data.get('type') == 'result':
+        if response_data.get('success'):
+            return create_success_response('Request successful', response_data.get('result'))
+        return create_error_response(
+            response_data.get('error', {}).get('message', 'Unknown error'),
+            'WEBSOCKET_REQUEST_FAILED'
+        )
+    return create_success_response('Response received', response_data)
+
+
+def _session_call(operation: str, correlation_id: str, timeout: int, **params) -> Dict[str, Any]:
+    """Run session operation against HA endpoint and count reuse/connects."""
+    endpoint = _get_session_endpoint()
+    if not endpoint.get('success'):
+        return endpoint
+    
+    result = execute_operation(
+        GatewayInterface.WEBSOCKET,
+        operation,
+        url=endpoint['data']['url'],
+        auth_message=endpoint['data']['auth_message'],
+        timeout=timeout,
+        ping_after_seconds=HA_WEBSOCKET_PING_AFTER_SECONDS,
+        max_idle_seconds=HA_WEBSOCKET_MAX_IDLE_SECONDS,
+        correlation_id=correlation_id,
+        **params
+    )
+    
+    if not result.get('success'):
+        increment_counter('ha_websocket_session_failure')
+    elif result['data'].get('reconnected'):
+        increment_counter('ha_websocket_session_connect')
+    else:
+        increment_counter('ha_websocket_session_reuse')
+    return result
+
+
+def ha_websocket_command(message_type: str, params: Optional[Dict[str, Any]] = None,
+                         timeout: int = HA_WEBSOCKET_TIMEOUT) -> Dict[str, Any]:
+    """
+    Send command over persistent authenticated HA session.
+    
+    Message IDs are assigned by the session. The socket stays open for the
+    next invocation; liveness is checked and reconnects are transparent.
+    
+    Args:
+        message_type: HA WebSocket command type (e.g. 'config/entity_registry/list')
+        params: Additional command fields
+        timeout: Reply timeout in seconds
+        
+    Returns:
+        Success response with command result, or error response
+    """
+    correlation_id = generate_correlation_id()
+    start_time = time.perf_counter()
+    
+    _debug_trace(correlation_id, "ha_websocket_command START", message_type=message_type)
+    
+    try:
+        message = {'type': message_type}
+        if params:
+            message.update(params)
+        
+        result = _session_call('session_request', correlation_id, timeout, message=message)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        
+        if not result.get('success'):
+            _debug_trace(correlation_id, "ha_websocket_command FAILED", duration_ms=duration_ms)
+            return result
+        
+        record_metric(f'ha_websocket_request_{message_type}_duration_ms', duration_ms)
+        _debug_trace(correlation_id, "ha_websocket_command COMPLETE", duration_ms=duration_ms,
+                     reconnected=result['data'].get('reconnected'))
+        
+        return _result_from_frame(result['data'].get('response', {}))
+        
+    except Exception as e:
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        _debug_trace(correlation_id, "ha_websocket_command FAILED", error=str(e), duration_ms=duration_ms)
+        log_error(f"[{correlation_id}] WebSocket command failed: {str(e)}")
+        increment_counter('ha_websocket_request_error')
+        return create_error_response(str(e), 'WEBSOCKET_REQUEST_FAILED')
+
+
+def ha_websocket_commands(commands: List[Dict[str, Any]],
+                          timeout: int = HA_WEBSOCKET_TIMEOUT) -> Dict[str, Any]:
+    """
+    Pipeline several read-only commands on the persistent HA session.
+    
+    All commands are sent before any reply is read; HA processes them
+    concurrently, so the cost is about one round trip plus the slowest command.
+    
+    Args:
+        commands: Command messages without 'id', e.g. [{'type': 'get_states'}]
+        timeout: Total reply timeout in seconds
+        
+    Returns:
+        Success response with list of per-command responses (same order)
+    """
+    correlation_id = generate_correlation_id()
+    start_time = time.perf_counter()
+    
+    _debug_trace(correlation_id, "ha_websocket_commands START", count=len(commands))
+    
+    try:
+        result = _session_call('session_pipeline', correlation_id, timeout, messages=commands)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        
+        if not result.get('success'):
+            _debug_trace(correlation_id, "ha_websocket_commands FAILED", duration_ms=duration_ms)
+            return result
+        
+        record_metric('ha_websocket_pipeline_duration_ms', duration_ms)
+        record_metric('ha_websocket_pipeline_size', float(len(commands)))
+        _debug_trace(correlation_id, "ha_websocket_commands COMPLETE", duration_ms=duration_ms,
+                     reconnected=result['data'].get('reconnected'))
+        
+        return create_success_response('Pipeline completed', [
+            _result_from_frame(frame) for frame in result['data'].get('response', [])
+        ])
+        
+    except Exception as e:
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        _debug_trace(correlation_id, "ha_websocket_commands FAILED", error=str(e), duration_ms=duration_ms)
+        log_error(f"[{correlation_id}] WebSocket pipeline failed: {str(e)}")
+        increment_counter('ha_websocket_request_error')
+        return create_error_response(str(e), 'WEBSOCKET_REQUEST_FAILED')
+
+
+def ha_websocket_subscribe(event_type: str, timeout: int = HA_WEBSOCKET_TIMEOUT) -> Dict[str, Any]:
+    """
+    Subscribe to an HA event type on the persistent session.
+    
+    Returns:
+        Success response with 'subscription_id' and session 'generation'
+        (generation changes when the session reconnects and subscriptions are lost)
+    """
+    correlation_id = generate_correlation_id()
+    _debug_trace(correlation_id, "ha_websocket_subscribe", event_type=event_type)
+    try:
+        return _session_call('session_subscribe', correlation_id, timeout,
+                             message={'type': 'subscribe_events', 'event_type': event_type})
+    except Exception as e:
+        log_error(f"[{correlation_id}] WebSocket subscribe failed: {str(e)}")
+        increment_counter('ha_websocket_subscribe_error')
+        return create_error_response(str(e), 'WEBSOCKET_SUBSCRIBE_FAILED')
+
+
+def ha_websocket_poll(subscription_ids: Optional[List[int]] = None, wait: float = 0.0) -> Dict[str, Any]:
+    """
+    Collect HA events pushed to the persistent session since the last poll.
+    
+    Returns:
+        Success response with 'events', 'connected', 'generation', 'frames_dropped'
+    """
+    try:
+        endpoint = _get_session_endpoint()
+        if not endpoint.get('success'):
+            return endpoint
+        return execute_operation(
+            GatewayInterface.WEBSOCKET,
+            'session_poll',
+            url=endpoint['data']['url'],
+            auth_message=endpoint['data']['auth_message'],
+            subscription_ids=subscription_ids,
+            wait=wait
+        )
+    except Exception as e:
+        log_error(f"WebSocket poll failed: {str(e)}")
+        increment_counter('ha_websocket_poll_error')
+        return create_error_response(str(e), 'WEBSOCKET_POLL_FAILED')
+
+
+def ensure_connected() -> Dict[str, Any]:
+    """Open or validate the persistent HA session (HA ping/pong round trip)."""
+    return ha_websocket_command('ping', timeout=HA_WEBSOCKET_TIMEOUT)
+
+
+def close_persistent_session() -> Dict[str, Any]:
+    """Close the persistent HA session (next command reconnects)."""
+    endpoint = _get_session_endpoint()
+    if not endpoint.get('success'):
+        return endpoint
+    return execute_operation(
+        GatewayInterface.WEBSOCKET,
+        'session_close',
+        url=endpoint['data']['url'],
+        auth_message=endpoint['data']['auth_message']
+    )
+
+
 # ===== ENTITY REGISTRY =====
 
 def get_entity_registry_via_websocket(use_cache: bool = True) -> Dict[str, Any]:
@@ -394,13 +668,13 @@ def get_entity_registry_via_websocket(use_cache: bool = True) -> Dict[str, Any]:
         return create_error_response('WebSocket not enabled', 'WEBSOCKET_DISABLED')
     
     # Check cache
-    cache_key = 'ha_entity_registry_ws'
+    cache_key = HA_ENTITY_REGISTRY_CACHE_KEY
     if use_cache:
         cache_start = time.perf_counter()
         cached = cache_get(cache_key)
         cache_duration_ms = (time.perf_counter() - cache_start) * 1000
         
-        if cached:
+        if isinstance(cached, dict):
             duration_ms = (time.perf_counter() - start_time) * 1000
             _debug_trace(correlation_id, "get_entity_registry_via_websocket COMPLETE (CACHE)", 
                         duration_ms=duration_ms)
@@ -409,6 +683,11 @@ def get_entity_registry_via_websocket(use_cache: bool = True) -> Dict[str, Any]:
             record_metric('ha_entity_registry_duration_ms', duration_ms)
             return cached
     
+    if HA_WEBSOCKET_PERSISTENT:
+        log_info(f"[{correlation_id}] Fetching entity registry via persistent WebSocket session")
+        registry_result = ha_websocket_command('config/entity_registry/list')
+        return _registry_response(correlation_id, registry_result, cache_key, use_cache, start_time)
+    
     try:
         from home_assistant.ha_config import load_ha_config
         config = load_ha_config()
@@ -447,30 +726,7 @@ def get_entity_registry_via_websocket(use_cache: bool = True) -> Dict[str, Any]:
                 'config/entity_registry/list'
             )
             
-            if registry_result.get('success'):
-                entities = registry_result.get('data', [])
-                
-                response = create_success_response('Entity registry retrieved', {
-                    'entities': entities,
-                    'count': len(entities),
-                    'via': 'websocket'
-                })
-                
-                # Cache result
-                if use_cache:
-                    cache_set(cache_key, response, ttl=HA_WEBSOCKET_CACHE_TTL)
-                
-                duration_ms = (time.perf_counter() - start_time) * 1000
-                
-                _debug_trace(correlation_id, "get_entity_registry_via_websocket SUCCESS",
-                            entity_count=len(entities), duration_ms=duration_ms)
-                increment_counter('ha_entity_registry_ws_success')
-                record_metric('ha_entity_registry_duration_ms', duration_ms)
-                log_info(f"[{correlation_id}] Retrieved {len(entities)} entities via WebSocket")
-                
-                return response
-            
-            return registry_result
+            return _registry_response(correlation_id, registry_result, cache_key, use_cache, start_time)
             
         finally:
             # Always close connection
@@ -492,29 +748,286 @@ def get_entity_registry_via_websocket(use_cache: bool = True) -> Dict[str, Any]:
         return create_error_response(str(e), 'ENTITY_REGISTRY_FAILED')
 
 
-def filter_exposed_entities(entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Filter entities to only exposed ones."""
+def _registry_response(correlation_id: str, registry_result: Dict[str, Any], cache_key: str,
+                       use_cache: bool, start_time: float) -> Dict[str, Any]:
+    """Wrap entity registry command result, cache it and record metrics."""
+    if not registry_result.get('success'):
+        increment_counter('ha_entity_registry_ws_error')
+        return registry_result
+    
+    entities = registry_result.get('data', [])
+    
+    response = create_success_response('Entity registry retrieved', {
+        'entities': entities,
+        'count': len(entities),
+        'via': 'websocket'
+    })
+    
+    # Cache result (exposure index is built once here, not per filter call)
+    if use_cache:
+        cache_set(cache_key, response, ttl=HA_WEBSOCKET_CACHE_TTL)
+        cache_set(HA_EXPOSURE_INDEX_CACHE_KEY, ExposureIndex(entities), ttl=HA_WEBSOCKET_CACHE_TTL)
+    
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    
+    _debug_trace(correlation_id, "get_entity_registry_via_websocket SUCCESS",
+                entity_count=len(entities), duration_ms=duration_ms)
+    increment_counter('ha_entity_registry_ws_success')
+    record_metric('ha_entity_registry_duration_ms', duration_ms)
+    log_info(f"[{correlation_id}] Retrieved {len(entities)} entities via WebSocket")
+    
+    return response
+
+
+def get_registries_via_websocket() -> Dict[str, Any]:
+    """
+    Fetch entity, device and area registries plus states in one pipelined round trip.
+    
+    Returns:
+        Success response with 'entities', 'devices', 'areas', 'states' lists,
+        or error response (first failing command)
+    """
+    if not HA_WEBSOCKET_ENABLED:
+        return create_error_response('WebSocket not enabled', 'WEBSOCKET_DISABLED')
+    
+    keys = ('entities', 'devices', 'areas', 'states')
+    result = ha_websocket_commands([
+        {'type': 'config/entity_registry/list'},
+        {'type': 'config/device_registry/list'},
+        {'type': 'config/area_registry/list'},
+        {'type': 'get_states'}
+    ])
+    if not result.get('success'):
+        return result
+    
+    data = {'via': 'websocket'}
+    for key, response in zip(keys, result['data']):
+        if not response.get('success'):
+            return response
+        data[key] = response.get('data') or []
+    
+    return create_success_response('Registries retrieved', data)
+
+
+# ===== EXPOSURE INDEX =====
+
+class ExposureIndex:
+    """
+    Exposed entity IDs per assistant for one entity registry list.
+    
+    Assistants are the registry option keys carrying should_expose
+    (e.g. 'alexa', 'conversation', 'cloud.alexa'). Entries and exposed IDs
+    are dicts keyed by entity_id, so insertion (registry) order is kept
+    and filter() needs no sort.
+    
+    cache_get returns the cached index itself (no copy), so upsert/remove/
+    rename on it persist without re-caching it. Only apply_registry_event()
+    patches the cached index; everyone else treats it as read-only,
+    including the entry dicts returned by filter()/entries(), which are
+    shared with the cached entity registry.
+    """
+    
+    __slots__ = ('_entries', '_exposed')
+    
+    def __init__(self, entities: List[Dict[str, Any]]):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # assistant -> {entity_id: None}; key None = any default assistant
+        self._exposed: Dict[Optional[str], Dict[str, None]] = {}
+        for entry in entities:
+            self.upsert(entry)
+    
+    def upsert(self, entry: Dict[str, Any]) -> None:
+        """Add or replace one registry entry (a replaced entry keeps its position)."""
+        entity_id = entry.get('entity_id') if isinstance(entry, dict) else None
+        if not entity_id:
+            return
+        self._entries[entity_id] = entry
+        exposed_to = _exposed_assistants(entry)
+        if any(name in exposed_to for name in HA_DEFAULT_EXPOSURE_ASSISTANTS):
+            exposed_to.add(None)
+        for assistant, ids in self._exposed.items():
+            if assistant not in exposed_to:
+                ids.pop(entity_id, None)
+        for assistant in exposed_to:
+            self._exposed.setdefault(assistant, {}).setdefault(entity_id, None)
+    
+    def remove(self, entity_id: str) -> None:
+        """Remove one registry entry."""
+        self._entries.pop(entity_id, None)
+        for ids in self._exposed.values():
+            ids.pop(entity_id, None)
+    
+    def rename(self, old_entity_id: str, new_entity_id: str) -> None:
+        """Move entry to its new entity_id (keeps exposure and position; rare, O(n))."""
+        entry = self._entries.get(old_entity_id)
+        if entry is None:
+            return
+        entry = dict(entry)
+        entry['entity_id'] = new_entity_id
+        self._entries = _renamed(self._entries, old_entity_id, new_entity_id, entry)
+        for assistant, ids in self._exposed.items():
+            if old_entity_id in ids:
+                self._exposed[assistant] = _renamed(ids, old_entity_id, new_entity_id, None)
+    
+    def exposed_ids(self, assistant: Optional[str] = None) -> KeysView[str]:
+        """Exposed IDs for assistant in registry order, read-only view (None = any of HA_DEFAULT_EXPOSURE_ASSISTANTS)."""
+        return self._exposed.get(assistant, {}).keys()
+    
+    def filter(self, assistant: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Exposed registry entries in registry order - O(exposed); new list, shared entry dicts."""
+        entries = self._entries
+        return [entries[entity_id] for entity_id in self.exposed_ids(assistant)]
+    
+    def entries(self) -> List[Dict[str, Any]]:
+        """All registry entries in registry order (new list, shared entry dicts)."""
+        return list(self._entries.values())
+    
+    def assistants(self) -> List[str]:
+        """Assistants with at least one exposed entity."""
+        return sorted(name for name, ids in self._exposed.items() if name is not None and ids)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _exposed_assistants(entry: Dict[str, Any]) -> set:
+    """Registry option keys with should_expose set on entry."""
+    return {assistant for assistant, options in (entry.get('options') or {}).items()
+            if isinstance(options, dict) and options.get('should_expose')}
+
+
+def _renamed(items: Dict[str, Any], old_key: str, new_key: str, value: Any) -> Dict[str, Any]:
+    """Copy of items with old_key replaced by new_key (same position)."""
+    return {(new_key if key == old_key else key): (value if key == old_key else item)
+            for key, item in items.items() if key != new_key}
+
+
+def _get_cached_exposure_index() -> Optional[ExposureIndex]:
+    """Cached exposure index (None on miss)."""
+    index = cache_get(HA_EXPOSURE_INDEX_CACHE_KEY)
+    return index if isinstance(index, ExposureIndex) else None
+
+
+def get_exposure_index() -> Optional[ExposureIndex]:
+    """
+    Get exposure index for the current entity registry.
+    
+    Uses the cached index; otherwise builds it once from the (cached or
+    fetched) entity registry.
+    
+    Returns:
+        ExposureIndex, or None if the registry is unavailable
+    """
+    index = _get_cached_exposure_index()
+    if index is not None:
+        return index
+    
+    registry = get_entity_registry_via_websocket(use_cache=True)
+    if not registry.get('success'):
+        return None
+    
+    index = _get_cached_exposure_index()
+    if index is None:
+        index = ExposureIndex(registry['data']['entities'])
+        cache_set(HA_EXPOSURE_INDEX_CACHE_KEY, index, ttl=HA_WEBSOCKET_CACHE_TTL)
+    return index
+
+
+def apply_registry_event(data: Dict[str, Any]) -> bool:
+    """
+    Apply entity_registry_updated event to cached registry and exposure index.
+    
+    remove / rename are applied locally; create / update re-read the one
+    entry (config/entity_registry/get). If that fails, the cached registry
+    is dropped and rebuilt on the next read.
+    
+    Args:
+        data: Event data ('action', 'entity_id', optional 'old_entity_id')
+        
+    Returns:
+        True if the index was updated in place
+    """
+    index = _get_cached_exposure_index()
+    if index is None:
+        # Nothing to patch; make sure a cached registry isn't left stale
+        cache_delete(HA_ENTITY_REGISTRY_CACHE_KEY)
+        return False
+    
+    action = data.get('action')
+    entity_id = data.get('entity_id')
+    if not entity_id:
+        return False
+    
+    if action == 'remove':
+        index.remove(entity_id)
+    else:
+        if data.get('old_entity_id'):
+            index.rename(data['old_entity_id'], entity_id)
+        result = ha_websocket_command('config/entity_registry/get', {'entity_id': entity_id})
+        if not result.get('success') or not isinstance(result.get('data'), dict):
+            cache_delete(HA_ENTITY_REGISTRY_CACHE_KEY)
+            cache_delete(HA_EXPOSURE_INDEX_CACHE_KEY)
+            increment_counter('ha_exposure_index_invalidated')
+            return False
+        index.upsert(result['data'])
+    
+    # Keep cached registry list consistent with the index (rare event, O(n))
+    registry = cache_get(HA_ENTITY_REGISTRY_CACHE_KEY)
+    if isinstance(registry, dict) and isinstance(registry.get('data'), dict):
+        registry['data']['entities'] = index.entries()
+        registry['data']['count'] = len(index)
+        cache_set(HA_ENTITY_REGISTRY_CACHE_KEY, registry, ttl=HA_WEBSOCKET_CACHE_TTL)
+    increment_counter('ha_exposure_index_incremental_update')
+    return True
+
+
+def _is_exposed(entry: Dict[str, Any], assistant: Optional[str]) -> bool:
+    """Entry exposed to assistant (None = any of HA_DEFAULT_EXPOSURE_ASSISTANTS)."""
+    exposed_to = _exposed_assistants(entry)
+    if assistant is not None:
+        return assistant in exposed_to
+    return any(name in exposed_to for name in HA_DEFAULT_EXPOSURE_ASSISTANTS)
+
+
+def filter_exposed_entities(entities: Optional[List[Dict[str, Any]]] = None,
+                            assistant: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Filter registry entries to exposed ones.
+    
+    With entities=None this is a lookup in the precomputed ExposureIndex
+    of the entity registry. An explicit list is scanned once.
+    
+    Args:
+        entities: Registry entries (None = cached entity registry)
+        assistant: Registry option key, e.g. 'alexa', 'conversation',
+                   'cloud.alexa' (None = exposed to Alexa or Assist)
+        
+    Returns:
+        Exposed registry entries in registry order
+    """
     correlation_id = generate_correlation_id()
     
-    _debug_trace(correlation_id, "filter_exposed_entities START", total=len(entities))
+    _debug_trace(correlation_id, "filter_exposed_entities START", assistant=assistant)
     
     try:
-        exposed = []
-        
-        for entity in entities:
-            # Check if entity is exposed to Alexa/Assist
-            options = entity.get('options', {})
-            
-            # Check multiple exposure flags
-            exposed_to_alexa = options.get('alexa', {}).get('should_expose', False)
-            exposed_to_assist = options.get('conversation', {}).get('should_expose', False)
-            
-            if exposed_to_alexa or exposed_to_assist:
-                exposed.append(entity)
+        if entities is None:
+            index = get_exposure_index()
+            if index is None:
+                return []
+            increment_counter('ha_exposure_index_hit')
+            exposed = index.filter(assistant)
+            total = len(index)
+        else:
+            # One pass over the given list; an index would only be thrown away
+            increment_counter('ha_exposure_index_miss')
+            exposed = [entry for entry in entities
+                       if isinstance(entry, dict) and entry.get('entity_id')
+                       and _is_exposed(entry, assistant)]
+            total = len(entities)
         
         _debug_trace(correlation_id, "filter_exposed_entities COMPLETE", 
-                    exposed=len(exposed), total=len(entities))
-        log_info(f"[{correlation_id}] Filtered to {len(exposed)}/{len(entities)} exposed entities")
+                    exposed=len(exposed), total=total)
+        log_debug(f"[{correlation_id}] Filtered to {len(exposed)}/{total} exposed entities")
         return exposed
         
     except Exception as e:
@@ -525,7 +1038,7 @@ def filter_exposed_entities(entities: List[Dict[str, Any]]) -> List[Dict[str, An
             import traceback
             log_error(f"[{correlation_id}] [TRACEBACK]\n{traceback.format_exc()}")
         
-        return entities
+        return entities or []
 
 
 # ===== FEATURE CHECK =====
@@ -0,0 +1,365 @@
+"""
+http_client_async.py - asyncio HTTP/1.1 Transport for Concurrent Requests
+Version: 2026.10.18.02
+Description: Keep-alive connection pools with per-host concurrency limits on
+             an event loop that lives for one invocation.
+             Internal module - used by http_client_core.py.
+
+CHANGELOG:
+- 2026.10.18.02: Host names resolved through the shared DNS cache
+  (dns_cache.py); a failed connect to cached addresses refreshes the entry
+- 2026.10.18.01: Initial version
+  - AsyncHTTPEngine: HTTP/1.1 over asyncio streams (Content-Length and
+    chunked bodies), idle keep-alive connections reused per host
+  - Per-host semaphore: at most HTTP_ASYNC_MAX_PER_HOST requests in flight
+    per host, the rest wait for a slot
+  - Event loop created on first use, closed with its connections by
+    close() (invocation end hook)
+
+DESIGN DECISION: HTTP/1.1 on asyncio streams instead of aiohttp
+Reason: The deployment package ships urllib3 only, which blocks. The
+requests fanned out are HA REST calls: small JSON bodies, Content-Length
+or chunked responses. A minimal client on asyncio.open_connection covers
+that, loads in milliseconds and adds no dependency to the package.
+Retries, budgets, timeouts and stats stay in http_client_core.py, shared
+with the blocking path.
+
+DESIGN DECISION: One event loop per invocation
+Reason: asyncio connections belong to the loop that opened them, and
+Lambda freezes the process between invocations (idle sockets go stale
+while frozen). The loop is created by the first concurrent batch and
+closed with all its connections at invocation end, so several batches in
+one invocation share keep-alive connections and nothing outlives it.
+
+DESIGN DECISION: Coroutines on the calling thread, no worker threads
+Reason: Unlike a thread pool fan-out, every coroutine runs on the thread
+that called make_requests_concurrently, so the HTTP client's counters,
+latency tracker and budgets are updated without locks (AP-08, DEC-04).
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from urllib3._collections import HTTPHeaderDict
+
+from dns_cache import AddrInfo, get_dns_cache
+
+# Concurrent requests per host (scheme, host, port); more wait for a slot
+HTTP_ASYNC_MAX_PER_HOST = int(os.getenv('HTTP_ASYNC_MAX_PER_HOST', '6'))
+
+# Errors raised when a reused idle connection was closed by the server
+_STALE_CONNECTION_ERRORS = (ConnectionResetError, BrokenPipeError)
+
+# Status codes that never carry a body
+_NO_BODY_STATUS = (204, 304)
+
+# Request headers the engine sets itself
+_ENGINE_HEADERS = frozenset({'host', 'content-length', 'connection', 'transfer-encoding'})
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class AsyncResponse:
+    """Status, headers and raw (still encoded) body of one response."""
+
+    __slots__ = ('status', 'headers', 'data')
+
+    def __init__(self, status: int, headers: HTTPHeaderDict, data: bytes):
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+
+class _Connection:
+    __slots__ = ('reader', 'writer')
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def usable(self) -> bool:
+        return not self.reader.at_eof() and not self.writer.transport.is_closing()
+
+    def abort(self) -> None:
+        # No TLS close_notify round trip: the connection is discarded anyway
+        self.writer.transport.abort()
+
+
+class _HostPool:
+    __slots__ = ('semaphore', 'idle', 'in_flight')
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.idle = []
+        self.in_flight = 0
+
+
+def _encode_head(method: str, target: str, host: str, headers: Dict[str, Any],
+                 body: Optional[bytes]) -> bytes:
+    """Request line and headers of an HTTP/1.1 request."""
+    lines = [f"{method} {target} HTTP/1.1", f"Host: {host}"]
+    for name, value in headers.items():
+        if name.lower() in _ENGINE_HEADERS:
+            continue
+        value = str(value)
+        if '\r' in value or '\n' in value:
+            raise ValueError(f"Invalid header value for '{name}'")
+        lines.append(f"{name}: {value}")
+    if body is not None or method in ('POST', 'PUT', 'PATCH'):
+        lines.append(f"Content-Length: {len(body) if body else 0}")
+    lines.append('\r\n')
+    return '\r\n'.join(lines).encode('latin-1')
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> HTTPHeaderDict:
+    headers = HTTPHeaderDict()
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers.add(name.strip(), value.strip())
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytearray:
+    body = bytearray()
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b';', 1)[0].strip(), 16)
+        if size == 0:
+            break
+        body += await reader.readexactly(size)
+        await reader.readexactly(2)
+    # Trailer section (normally empty)
+    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+        pass
+    return body
+
+
+async def _read_response(reader: asyncio.StreamReader, method: str) -> Tuple[AsyncResponse, bool]:
+    """
+    Read one response.
+
+    Returns:
+        (response, keep_alive)
+
+    Raises:
+        ConnectionResetError: Connection closed before a status line arrived
+    """
+    while True:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed before response')
+        version, _, rest = status_line.decode('latin-1').partition(' ')
+        status = int(rest[:3])
+        headers = await _read_headers(reader)
+        if status >= 200:
+            break  # 1xx interim responses are skipped
+
+    keep_alive = version == 'HTTP/1.1' and (headers.get('Connection') or '').lower() != 'close'
+    if method == 'HEAD' or status in _NO_BODY_STATUS:
+        data = b''
+    elif 'chunked' in (headers.get('Transfer-Encoding') or '').lower():
+        data = await _read_chunked(reader)
+    elif headers.get('Content-Length') is not None:
+        data = await reader.readexactly(int(headers['Content-Length']))
+    else:
+        # Body delimited by connection close
+        data = await reader.read()
+        keep_alive = False
+    return AsyncResponse(status, headers, data), keep_alive
+
+
+class AsyncHTTPEngine:
+    """
+    HTTP/1.1 client on asyncio streams with per-host keep-alive pools.
+
+    Args:
+        ssl_context: SSLContext for https connections
+        max_per_host: Concurrent requests per host
+    """
+
+    def __init__(self, ssl_context, max_per_host: int = HTTP_ASYNC_MAX_PER_HOST):
+        self.ssl_context = ssl_context
+        self.max_per_host = max(1, max_per_host)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pools: Dict[Tuple[str, str, int], _HostPool] = {}
+        self._stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, int]:
+        return {
+            'loops': 0,
+            'batches': 0,
+            'connections_opened': 0,
+            'connections_reused': 0,
+            'stale_reconnects': 0,
+            'host_waits': 0,
+            'max_in_flight': 0
+        }
+
+    @property
+    def active(self) -> bool:
+        """True while the invocation's event loop is open."""
+        return self._loop is not None
+
+    def run(self, coroutine) -> Any:
+        """
+        Run coroutine to completion on the invocation's event loop.
+
+        Raises:
+            RuntimeError: Called while another event loop runs in this thread
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._stats['loops'] += 1
+        self._stats['batches'] += 1
+        return self._loop.run_until_complete(coroutine)
+
+    def close(self) -> None:
+        """Close all connections and the event loop (next run() opens a new one)."""
+        loop = self._loop
+        if loop is None:
+            return
+        self._loop = None
+        for pool in self._pools.values():
+            for conn in pool.idle:
+                conn.abort()
+        self._pools.clear()
+        try:
+            # Let the aborted transports deliver connection_lost
+            loop.run_until_complete(asyncio.sleep(0))
+        finally:
+            loop.close()
+
+    async def request(self, method: str, url: str, headers: Dict[str, Any],
+                      body: Optional[bytes], timeout: float) -> AsyncResponse:
+        """
+        Send one request and read the complete response.
+
+        Args:
+            method: HTTP method
+            url: http(s) URL
+            headers: Request headers (Host/Content-Length are set here)
+            body: Encoded body or None
+            timeout: Seconds for the whole exchange, incl. waiting for a slot
+
+        Raises:
+            asyncio.TimeoutError, OSError, ValueError
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in _DEFAULT_PORTS or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        key = (scheme, parts.hostname, parts.port or _DEFAULT_PORTS[scheme])
+        target = parts.path or '/'
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        head = _encode_head(method.upper(), target, parts.netloc.rpartition('@')[2], headers, body)
+
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _HostPool(self.max_per_host)
+        try:
+            return await asyncio.wait_for(self._send(key, pool, method.upper(), head, body), timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"{method.upper()} {url} timed out after {timeout:.2f}s") from None
+
+    async def _send(self, key: Tuple[str, str, int], pool: _HostPool, method: str,
+                    head: bytes, body: Optional[bytes]) -> AsyncResponse:
+        if pool.semaphore.locked():
+            self._stats['host_waits'] += 1
+        async with pool.semaphore:
+            pool.in_flight += 1
+            if pool.in_flight > self._stats['max_in_flight']:
+                self._stats['max_in_flight'] = pool.in_flight
+            try:
+                conn = self._idle_connection(pool)
+                if conn is not None:
+                    try:
+                        return await self._exchange(pool, conn, method, head, body)
+                    except _STALE_CONNECTION_ERRORS:
+                        # Server closed the idle connection: once more on a new one
+                        self._stats['stale_reconnects'] += 1
+                conn = await self._connect(key)
+                return await self._exchange(pool, conn, method, head, body)
+            finally:
+                pool.in_flight -= 1
+
+    def _idle_connection(self, pool: _HostPool) -> Optional[_Connection]:
+        while pool.idle:
+            conn = pool.idle.pop()
+            if conn.usable():
+                self._stats['connections_reused'] += 1
+                return conn
+            conn.abort()
+        return None
+
+    async def _connect(self, key: Tuple[str, str, int]) -> _Connection:
+        scheme, host, port = key
+        dns = get_dns_cache()
+        # Resolved on the loop thread: a miss blocks once, the rest of the
+        # batch finds the entry (instead of one executor lookup per connection)
+        addresses, from_cache = dns.resolve(host)
+        try:
+            reader, writer = await self._open(scheme, host, port, addresses)
+        except OSError:
+            fresh = dns.refresh_after_error(host, addresses) if from_cache else None
+            if fresh is None:
+                raise
+            reader, writer = await self._open(scheme, host, port, fresh)
+        self._stats['connections_opened'] += 1
+        return _Connection(reader, writer)
+
+    async def _open(self, scheme: str, host: str, port: int, addresses: List[AddrInfo]):
+        """Streams to the first address that accepts (TLS verified against host)."""
+        last_error: Optional[OSError] = None
+        for info in addresses:
+            try:
+                if scheme == 'https':
+                    return await asyncio.open_connection(info[4][0], port, ssl=self.ssl_context,
+                                                         server_hostname=host)
+                return await asyncio.open_connection(info[4][0], port)
+            except OSError as e:
+                last_error = e
+        raise last_error or OSError(f"No addresses for {host}")
+
+    async def _exchange(self, pool: _HostPool, conn: _Connection, method: str,
+                        head: bytes, body: Optional[bytes]) -> AsyncResponse:
+        try:
+            conn.writer.write(head)
+            if body:
+                conn.writer.write(body)
+            await conn.writer.drain()
+            response, keep_alive = await _read_response(conn.reader, method)
+        except BaseException:
+            # Includes cancellation by the timeout: state of the stream unknown
+            conn.abort()
+            raise
+        if keep_alive:
+            pool.idle.append(conn)
+        else:
+            conn.abort()
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats['active'] = self.active
+        stats['max_per_host'] = self.max_per_host
+        stats['hosts'] = len(self._pools)
+        stats['idle_connections'] = sum(len(pool.idle) for pool in self._pools.values())
+        return stats
+
+
+__all__ = [
+    'AsyncHTTPEngine',
+    'AsyncResponse',
+    'HTTP_ASYNC_MAX_PER_HOST',
+]
+
+# EOF
@@ -0,0 +1,221 @@
+"""
+http_client_cache.py - Conditional GET Response Cache
+Version: 2026.10.18.02
+Description: Parsed GET responses with their validators (ETag,
+             Last-Modified) or a content fingerprint, for opt-in
+             cache_policy requests. Internal module - used by
+             http_client_core.py.
+
+CHANGELOG:
+- 2026.10.18.02: Validators looked up case-insensitively (results carry
+  plain dict headers again)
+- 2026.10.18.01: Initial version
+  - ResponseCache: bounded LRU of parsed bodies per URL (+ credentials)
+  - If-None-Match / If-Modified-Since revalidation, 304 = cached body
+  - TTL + content fingerprint when the server sends no validators
+  - resolve_cache_policy(): 'conditional' or {'ttl': s, 'max_age': s}
+
+DESIGN DECISION: Cache inside the HTTP client, not in the CACHE interface
+Reason: Entries hold parsed bodies next to the response headers and
+validators and are only meaningful to the HTTP client. A bounded
+OrderedDict (HTTP_RESPONSE_CACHE_MAX_ENTRIES) keeps lookups O(1) without
+copying multi-megabyte state lists in and out of the generic cache.
+
+DESIGN DECISION: Cached bodies are shared, not copied
+Reason: Copying a parsed /api/states list on every hit would cost about
+what parsing it costs. Callers using cache_policy must treat 'data' as
+read-only.
+
+DESIGN DECISION: Fingerprint instead of re-parsing unchanged bodies
+Reason: Without validators the body has to be downloaded again, but
+hashing it (blake2b) is far cheaper than parsing it. An unchanged
+fingerprint returns the already parsed body.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Entries kept before the least recently used is evicted
+HTTP_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('HTTP_RESPONSE_CACHE_MAX_ENTRIES', '64'))
+
+# Freshness of responses without validators (seconds)
+HTTP_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('HTTP_RESPONSE_CACHE_TTL_SECONDS', '5'))
+
+# cache_policy string values
+CACHE_POLICY_CONDITIONAL = 'conditional'
+
+# Result 'cache' state -> stats counter
+_HIT_COUNTERS = {
+    'fresh': 'fresh_hits',
+    'not_modified': 'not_modified',
+    'fingerprint': 'fingerprint_hits'
+}
+
+
+def resolve_cache_policy(policy: Any) -> Tuple[float, float]:
+    """
+    Turn a cache_policy value into (ttl, max_age) seconds.
+
+    Args:
+        policy: 'conditional' - revalidate on every call, validator-less
+                    responses fresh for HTTP_RESPONSE_CACHE_TTL_SECONDS
+                {'ttl': s, 'max_age': s} - validator-less freshness, and
+                    how long validated responses are used without asking
+
+    Raises:
+        ValueError: Unknown policy
+    """
+    if policy == CACHE_POLICY_CONDITIONAL or policy is True:
+        return HTTP_RESPONSE_CACHE_TTL_SECONDS, 0.0
+    if isinstance(policy, dict):
+        ttl = float(policy.get('ttl', HTTP_RESPONSE_CACHE_TTL_SECONDS))
+        max_age = float(policy.get('max_age', 0.0))
+        if ttl >= 0 and max_age >= 0:
+            return ttl, max_age
+    raise ValueError(f"Invalid cache_policy: {policy!r} "
+                     f"(use '{CACHE_POLICY_CONDITIONAL}' or {{'ttl': s, 'max_age': s}})")
+
+
+def fingerprint_body(body: bytes) -> bytes:
+    """Content fingerprint of a response body."""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def _header(headers: Any, name: str) -> Optional[str]:
+    """Header value by case-insensitive name (plain dict or urllib3 mapping)."""
+    value = headers.get(name)
+    if value is None:
+        lowered = name.lower()
+        for key, header_value in headers.items():
+            if key.lower() == lowered:
+                return header_value
+    return value
+
+
+class CachedResponse:
+    """One cached GET response."""
+
+    __slots__ = ('data', 'headers', 'etag', 'last_modified', 'fingerprint', 'stored_at')
+
+    def __init__(self, data: Any, headers: Any, fingerprint: Optional[bytes]):
+        self.data = data
+        self.headers = headers
+        self.etag = _header(headers, 'ETag')
+        self.last_modified = _header(headers, 'Last-Modified')
+        self.fingerprint = fingerprint
+        self.stored_at = time.monotonic()
+
+    @property
+    def has_validators(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def is_fresh(self, ttl: float, max_age: float) -> bool:
+        """Usable without any request."""
+        age = time.monotonic() - self.stored_at
+        return age < (max_age if self.has_validators else ttl)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_result(self, state: str) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'status_code': 200,
+            'data': self.data,
+            'headers': self.headers,
+            'cache': state
+        }
+
+
+class ResponseCache:
+    """
+    Bounded LRU of CachedResponse per cache key.
+
+    Args:
+        max_entries: Entries kept before evicting the least recently used
+    """
+
+    def __init__(self, max_entries: int = HTTP_RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, int]:
+        return {
+            'misses': 0,
+            'fresh_hits': 0,
+            'not_modified': 0,
+            'fingerprint_hits': 0,
+            'stores': 0,
+            'evictions': 0
+        }
+
+    @staticmethod
+    def key(url: str, headers: Optional[Dict[str, Any]]) -> str:
+        """Cache key: URL plus a digest of the credentials (no cross-user hits)."""
+        authorization = (headers or {}).get('Authorization')
+        if not authorization:
+            return url
+        return f"{url}|{hashlib.blake2b(authorization.encode('utf-8'), digest_size=8).hexdigest()}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: str, result: Dict[str, Any], fingerprint: Optional[bytes]) -> CachedResponse:
+        entry = CachedResponse(result['data'], result['headers'], fingerprint)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._stats['stores'] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+        return entry
+
+    def hit(self, entry: CachedResponse, state: str) -> Dict[str, Any]:
+        """Count a hit ('fresh', 'not_modified', 'fingerprint') and build its result."""
+        self._stats[_HIT_COUNTERS[state]] += 1
+        if state != 'fresh':
+            entry.stored_at = time.monotonic()
+        return entry.to_result(state)
+
+    def miss(self) -> None:
+        self._stats['misses'] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._stats = self._new_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        lookups = stats['misses'] + stats['fresh_hits'] + stats['not_modified'] + stats['fingerprint_hits']
+        stats['entries'] = len(self._entries)
+        stats['hit_rate'] = round((lookups - stats['misses']) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+__all__ = [
+    'ResponseCache',
+    'CachedResponse',
+    'resolve_cache_policy',
+    'fingerprint_body',
+    'CACHE_POLICY_CONDITIONAL',
+    'HTTP_RESPONSE_CACHE_MAX_ENTRIES',
+    'HTTP_RESPONSE_CACHE_TTL_SECONDS',
+]
+
+# EOF
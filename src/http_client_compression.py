@@ -0,0 +1,172 @@
+"""
+http_client_compression.py - HTTP Content Encoding
+Version: 2026.10.18.03
+Description: gzip/deflate response decoding and optional request body
+             compression. Internal module - used by http_client_core.py
+             and http_client_async.py.
+
+CHANGELOG:
+- 2026.10.18.03: Decompressed size capped (HTTP_MAX_DECOMPRESSED_BYTES)
+  - read_body()/decompress_body() inflate with max_length and raise
+    ResponseBodyTooLargeError instead of growing without bound
+- 2026.10.18.02: decompress_body() for bodies read in full (asyncio engine)
+- 2026.10.18.01: Initial version
+  - read_body(): raw chunks decompressed incrementally into one buffer
+  - compress_body(): gzip for request bodies above a size threshold
+
+DESIGN DECISION: Decompress from the raw stream, not from a preloaded body
+Reason: A preloaded response holds the whole compressed body and then the
+whole decompressed body. Reading raw chunks (decode_content=False) and
+feeding a zlib decompressor keeps only one chunk of compressed data at a
+time; the decompressed bytes go into a single bytearray, which json.loads
+accepts without a further copy.
+
+DESIGN DECISION: Bounded inflate, as PerMessageDeflate.inflate
+Reason: A few KB of gzip can inflate to gigabytes. Each decompress() call
+asks for at most one byte more than the limit allows, so an oversized body
+is detected after allocating max_bytes + 1, never the full output.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import gzip
+import os
+import zlib
+from typing import Optional, Tuple, Union
+
+# Raw bytes read per step when decompressing a response
+BODY_CHUNK_SIZE = 65536
+
+# Upper bound on one decompressed response body
+HTTP_MAX_DECOMPRESSED_BYTES = int(os.getenv('HTTP_MAX_DECOMPRESSED_BYTES', str(32 * 1024 * 1024)))
+
+# Content-Encoding values decoded by read_body()
+_COMPRESSED_ENCODINGS = frozenset({'gzip', 'x-gzip', 'deflate'})
+
+# Request bodies are gzipped at this level (speed over ratio for JSON)
+_REQUEST_COMPRESS_LEVEL = 5
+
+
+class ResponseBodyTooLargeError(Exception):
+    """Decompressed response body exceeds the configured limit."""
+
+
+def read_body(response, chunk_size: int = BODY_CHUNK_SIZE,
+              max_bytes: int = HTTP_MAX_DECOMPRESSED_BYTES) -> Union[bytes, bytearray]:
+    """
+    Read a non-preloaded urllib3 response body, decompressing if encoded.
+
+    Args:
+        response: urllib3 response requested with preload_content=False
+        chunk_size: Raw bytes read per step
+        max_bytes: Upper bound on the decompressed body
+
+    Returns:
+        Body bytes (bytearray when it was decompressed)
+
+    Raises:
+        zlib.error: Corrupt compressed body
+        ResponseBodyTooLargeError: Decompressed body over max_bytes
+    """
+    encoding = (response.headers.get('Content-Encoding') or '').strip().lower()
+    if encoding not in _COMPRESSED_ENCODINGS:
+        return response.read()
+
+    # MAX_WBITS | 32 accepts both gzip and zlib headers
+    decoder = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    body = bytearray()
+    first = True
+    try:
+        for chunk in response.stream(chunk_size, decode_content=False):
+            try:
+                body += decoder.decompress(chunk, max_bytes - len(body) + 1)
+            except zlib.error:
+                # Some servers send raw deflate without the zlib header
+                if not first or encoding != 'deflate':
+                    raise
+                decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+                body += decoder.decompress(chunk, max_bytes - len(body) + 1)
+            first = False
+            _check_size(len(body), max_bytes)
+        body += decoder.flush()
+        _check_size(len(body), max_bytes)
+    except (zlib.error, ResponseBodyTooLargeError):
+        # Unread rest of the body: the connection can't be reused
+        response.close()
+        raise
+    return body
+
+
+def decompress_body(body: bytes, encoding: Optional[str],
+                    max_bytes: int = HTTP_MAX_DECOMPRESSED_BYTES) -> bytes:
+    """
+    Decode a completely read response body by its Content-Encoding.
+    
+    Returns:
+        Decoded body (body itself if not encoded)
+    
+    Raises:
+        zlib.error: Corrupt or truncated compressed body
+        ResponseBodyTooLargeError: Decompressed body over max_bytes
+    """
+    encoding = (encoding or '').strip().lower()
+    if encoding not in _COMPRESSED_ENCODINGS or not body:
+        return body
+    try:
+        return _inflate(body, zlib.MAX_WBITS | 32, max_bytes)
+    except zlib.error:
+        if encoding != 'deflate':
+            raise
+        return _inflate(body, -zlib.MAX_WBITS, max_bytes)
+
+
+def _inflate(body: bytes, wbits: int, max_bytes: int) -> bytes:
+    """Inflate a complete stream, producing at most max_bytes + 1 bytes."""
+    decoder = zlib.decompressobj(wbits)
+    data = decoder.decompress(body, max_bytes + 1)
+    _check_size(len(data), max_bytes)
+    data += decoder.flush()
+    _check_size(len(data), max_bytes)
+    if not decoder.eof:
+        raise zlib.error('incomplete or truncated stream')
+    return data
+
+
+def _check_size(size: int, max_bytes: int) -> None:
+    if size > max_bytes:
+        raise ResponseBodyTooLargeError(f'Decompressed body exceeds {max_bytes} bytes')
+
+
+def compress_body(body: bytes, min_bytes: int, force: Optional[bool] = None) -> Tuple[bytes, Optional[str]]:
+    """
+    gzip a request body if it is large enough to be worth it.
+
+    Args:
+        body: Encoded request body
+        min_bytes: Smallest body compressed (0 = only when forced)
+        force: True = always compress, False = never (None = by size)
+
+    Returns:
+        (body, content_encoding) - encoding None if left uncompressed
+    """
+    if force is False or not body:
+        return body, None
+    if force is None and (min_bytes <= 0 or len(body) < min_bytes):
+        return body, None
+    compressed = gzip.compress(body, compresslevel=_REQUEST_COMPRESS_LEVEL)
+    if force is None and len(compressed) >= len(body):
+        return body, None
+    return compressed, 'gzip'
+
+
+__all__ = [
+    'read_body',
+    'decompress_body',
+    'compress_body',
+    'ResponseBodyTooLargeError',
+    'BODY_CHUNK_SIZE',
+    'HTTP_MAX_DECOMPRESSED_BYTES',
+]
+
+# EOF
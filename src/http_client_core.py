@@ -1,8 +1,133 @@
 """
 http_client_core.py - HTTP Client Core Implementation (SINGLETON + Rate Limiting)
-Version: 2025.10.22.SINGLETON_RATE_LIMIT
+Version: 2026.10.18.16
 Description: Phase 1 optimization - SINGLETON pattern, rate limiting, reset operation
 
+CHANGES (2026.10.18.16):
+- FIXED: result['headers'] is a plain dict again (2026.10.18.07 returned
+  urllib3's HTTPHeaderDict, which json.dumps rejects and isinstance(dict)
+  checks miss); raw_headers=True opts into the uncopied mapping
+
+CHANGES (2026.10.18.15):
+- FIXED: Adaptive timeouts never applied to HA calls - every HA path
+  passes timeout=HA_API_TIMEOUT, and only requests without a timeout were
+  adapted. A numeric caller timeout is now the upper limit:
+  min(adaptive, configured)
+
+CHANGES (2026.10.18.14):
+- CHANGED: Hedged GETs run on the asyncio engine's event loop (both
+  requests as coroutines on the calling thread) instead of a
+  ThreadPoolExecutor; the losing request is cancelled, not left running
+  on a worker thread past the invocation
+- REMOVED: HTTP_HEDGE_MAX_WORKERS and the hedge executor
+
+CHANGES (2026.10.18.13):
+- FIXED: Pre-warm reuse report went to stdout via print(); now
+  log_debug (the result stays in stats['prewarm']['first_request_reused'])
+
+CHANGES (2026.10.18.12):
+- FIXED: 304 on a cache revalidation counted as a failed request
+  (skewed success_rate / failure_rate); conditional requests now count
+  it as successful
+
+CHANGES (2026.10.18.11):
+- ADDED: Host names resolved through the shared DNS cache (dns_cache.py)
+  - Pool connections via http_client_dns.py, asyncio engine connects via
+    DNSCache.resolve (one getaddrinfo per host per DNS_CACHE_TTL_SECONDS)
+  - Connect errors on cached addresses refresh the entry
+  - Stats: dns
+
+CHANGES (2026.10.18.10):
+- ADDED: make_requests_concurrently(requests) - asyncio fan-out
+  (http_client_async.py) on an event loop that lives for the invocation
+  - Keep-alive connections per host, at most HTTP_ASYNC_MAX_PER_HOST
+    requests in flight per host
+  - Same rate limit, retry budget, Retry-After, deadline, adaptive timeout,
+    latency and stats handling as make_request
+  - Optional circuit_breaker name per request (CIRCUIT_BREAKER allow/record)
+  - Stats: concurrent
+- CHANGED: Request encoding (_encode_request) and the retry decision
+  (_retry_decision) shared by make_request and the asyncio path
+
+CHANGES (2026.10.18.09):
+- ADDED: Conditional GET cache (http_client_cache.py), opt-in per request
+  with cache_policy ('conditional' or {'ttl': s, 'max_age': s})
+  - If-None-Match / If-Modified-Since from stored validators; 304 returns
+    the cached parsed body
+  - No validators: TTL, then a content fingerprint skips re-parsing an
+    unchanged body
+  - Result 'cache': miss / fresh / not_modified / fingerprint
+  - Stats: response_cache
+
+CHANGES (2026.10.18.08):
+- ADDED: Compressed responses (http_client_compression.py)
+  - Accept-Encoding: gzip, deflate sent by default (HTTP_ACCEPT_ENCODING)
+  - Bodies read unpreloaded and decompressed chunk by chunk into one
+    buffer that json.loads parses directly
+  - Optional gzip request bodies: HTTP_COMPRESS_REQUEST_MIN_BYTES or per
+    request compress=True/False
+  - Stats: compressed_responses, compressed_wire_bytes,
+    compressed_decoded_bytes, compressed_requests
+- CHANGED: Stats counters built by _new_stats() (shared by __init__/reset)
+
+CHANGES (2026.10.18.07):
+- CHANGED: Response bodies parsed as JSON straight from the bytes buffer
+  (parse_json_body) instead of decode() + json.loads(str)
+- CHANGED: 'headers' is the urllib3 header mapping (case-insensitive,
+  no per-request dict copy) - reverted in 2026.10.18.16, now opt-in
+  (raw_headers=True)
+- ADDED: stream=True - body not preloaded; successful results carry the
+  open urllib3 response in 'stream' (caller reads, then release_conn())
+  Peak for a 1.8 MB /api/states body: 7.5 MB parsed vs 0.2 MB streamed
+  (performance_benchmark.benchmark_http_response_parsing)
+
+CHANGES (2026.10.18.06):
+- ADDED: Connection pre-warming and TLS session reuse (http_client_warmup.py)
+  - prewarm(url): DNS + TCP + TLS into the pool during Lambda INIT
+    (HTTP_PREWARM_ENABLED, called from lambda_function.py)
+  - Pool uses a ResumingSSLContext: reconnects offer the previous TLS
+    session (abbreviated handshake)
+  - First request after warm-up reports whether it reused the connection
+  - Stats: tls (handshakes, resumed), prewarm
+- CHANGED: PoolManager creation shared by __init__ and reset() (_create_pool)
+
+CHANGES (2026.10.18.05):
+- ADDED: Retry budget (http_client_retry.py)
+  - Retries allowed as budget_percent of requests (token bucket); when
+    exhausted the failure is returned with retry_skipped='budget'
+  - Full-jitter backoff capped at max_backoff_ms replaces fixed delays
+  - 429/503 Retry-After honored; not retried if it exceeds
+    max_retry_after_seconds or the invocation deadline
+  - Retry skipped unless backoff + endpoint p50 fit the deadline
+  - Stats: retry_budget, retries_skipped_budget, retry_after_honored
+
+CHANGES (2026.10.18.04):
+- ADDED: Hedged GETs (http_client_hedging.py)
+  - GET not answered within the endpoint class p95 gets a second identical
+    request on another pooled connection; first response wins
+  - HedgeBudget caps hedges to budget_percent of eligible requests
+  - Opt-in: HTTP_HEDGE_ENABLED, configure_http_retry(hedge_enabled=...)
+    or per request hedge=True/False
+  - Stats: hedging (hedge_rate, win_rate, budget_exhausted); METRICS
+    counters http_hedge_sent / http_hedge_won
+
+CHANGES (2026.10.18.03):
+- ADDED: Latency-adaptive timeouts (http_client_latency.py)
+  - Streaming p50/p99 per endpoint class ('GET /api/states/*', ...)
+  - Requests without an explicit timeout use multiplier x p99, clamped
+    to [min_seconds, max_seconds], once min_samples were observed
+  - Configured via configure_http_retry (http_client_state.py)
+  - Stats: adaptive_timeouts, latency per endpoint class
+
+CHANGES (2026.10.18.02):
+- CHANGED: Rate limiting via shared GCRA limiter (rate_limiter.py) replaces deque window
+
+CHANGES (2026.10.18.01):
+- ADDED: Deadline-aware make_request (deadline kwarg or invocation deadline)
+- Timeouts capped to remaining invocation budget
+- Retries skipped when backoff + next attempt no longer fit the budget
+- Stats: deadline_exceeded, deadline_capped, retries_skipped_deadline
+
 OPTIMIZATIONS (2025.10.22):
 - Added SINGLETON pattern with get_http_client_manager() (LESS-18)
 - Added rate limiting (500 ops/sec with deque) (LESS-21)
@@ -23,90 +148,220 @@ Licensed under Apache 2.0 (see LICENSE).
 import os
 import json
 import time
-from typing import Dict, Any, Optional
-from collections import deque
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit
+from rate_limiter import get_rate_limiter
+from dns_cache import get_dns_cache_stats
 
 # Import preloaded urllib3 classes (already initialized during Lambda INIT!)
 from lambda_preload import PoolManager, Timeout
 
-from http_client_utilities import get_standard_headers
+from http_client_utilities import get_standard_headers, parse_json_body
+
+from invocation_context import get_invocation_deadline, register_invocation_end_hook
+
+from http_client_latency import LatencyTracker, classify_endpoint
+
+from http_client_hedging import HedgeBudget, run_hedged
+
+from http_client_retry import RequestBudget, full_jitter_backoff, parse_retry_after
+
+from http_client_warmup import TLSSessionCache, create_ssl_context, open_warm_connection
+
+from http_client_compression import read_body, compress_body, decompress_body
+
+from http_client_cache import ResponseCache, resolve_cache_policy, fingerprint_body
+
+from http_client_async import AsyncHTTPEngine
+
+from http_client_dns import use_dns_cache
+
+# Default read timeout (seconds) used when caller passes no timeout
+HTTP_DEFAULT_TIMEOUT_SECONDS = 30.0
+
+# Smallest budget worth starting an attempt with (milliseconds)
+HTTP_MIN_ATTEMPT_BUDGET_MS = 100.0
+
+# Derive timeouts from observed latency when the caller passes none
+HTTP_ADAPTIVE_TIMEOUT_ENABLED = os.getenv('HTTP_ADAPTIVE_TIMEOUT_ENABLED', 'true').lower() == 'true'
+
+# Hedge slow GETs with a second request (opt-in: extra load on HA)
+HTTP_HEDGE_ENABLED = os.getenv('HTTP_HEDGE_ENABLED', 'false').lower() == 'true'
+
+# Hedges allowed as a percentage of hedge-eligible requests
+HTTP_HEDGE_BUDGET_PERCENT = float(os.getenv('HTTP_HEDGE_BUDGET_PERCENT', '10'))
+
+# Retries allowed as a percentage of requests
+HTTP_RETRY_BUDGET_PERCENT = float(os.getenv('HTTP_RETRY_BUDGET_PERCENT', '20'))
+
+# Status codes whose Retry-After header sets the retry delay
+_RETRY_AFTER_STATUS_CODES = (429, 503)
+
+# Response encodings offered to the server ('identity' = no compression)
+HTTP_ACCEPT_ENCODING = os.getenv('HTTP_ACCEPT_ENCODING', 'gzip, deflate').strip()
+if HTTP_ACCEPT_ENCODING.lower() in ('', 'identity', 'none'):
+    HTTP_ACCEPT_ENCODING = None
+
+# gzip request bodies of at least this size (0 = only with compress=True)
+HTTP_COMPRESS_REQUEST_MIN_BYTES = int(os.getenv('HTTP_COMPRESS_REQUEST_MIN_BYTES', '0'))
+
+# Connect timeout for INIT-phase pre-warming (milliseconds)
+HTTP_PREWARM_TIMEOUT_MS = float(os.getenv('HTTP_PREWARM_TIMEOUT_MS', '1000'))
+
+
+def _result_headers(headers: Any, raw: bool) -> Any:
+    """Response headers for a result: plain dict unless raw (mapping as is)."""
+    return headers if raw else dict(headers)
 
 
 class HTTPClientCore:
     """Core HTTP client with retry, circuit breaker, rate limiting, and SINGLETON support."""
     
     def __init__(self):
-        # Read SSL verification setting from environment
-        # Defaults to True (verify SSL) for security
-        verify_ssl_env = os.getenv('HOME_ASSISTANT_VERIFY_SSL', 'true').lower()
-        verify_ssl = verify_ssl_env != 'false'
-        
-        # Set cert_reqs based on verification setting
-        cert_reqs = 'CERT_REQUIRED' if verify_ssl else 'CERT_NONE'
+        # TLS sessions outlive the pool (kept across reset) for resumption
+        self._tls_sessions = TLSSessionCache()
+        self._prewarm = None
+        self._prewarm_pending = False
+        self.http = self._create_pool()
         
-        # Use preloaded classes (NO IMPORT OVERHEAD!)
-        self.http = PoolManager(
-            cert_reqs=cert_reqs,
-            timeout=Timeout(connect=10.0, read=30.0),
-            maxsize=10,
-            retries=False
-        )
-        
-        self._stats = {
-            'requests': 0,
-            'successful': 0,
-            'failed': 0,
-            'retries': 0
-        }
+        self._stats = self._new_stats()
         
         self._retry_config = {
             'max_attempts': 3,
             'backoff_base_ms': 100,
             'backoff_multiplier': 2.0,
+            'max_backoff_ms': 2000.0,
+            'max_retry_after_seconds': 10.0,
             'retriable_status_codes': {408, 429, 500, 502, 503, 504}
         }
+        self._retry_budget = RequestBudget(HTTP_RETRY_BUDGET_PERCENT)
+        
+        # Adaptive timeouts: multiplier x observed p99 per endpoint class
+        self._timeout_config = {
+            'adaptive': HTTP_ADAPTIVE_TIMEOUT_ENABLED,
+            'multiplier': 4.0,
+            'min_seconds': 2.0,
+            'max_seconds': HTTP_DEFAULT_TIMEOUT_SECONDS,
+            'min_samples': 20
+        }
+        self._latency = LatencyTracker()
+        
+        # Hedged GETs: second request after the endpoint class p95
+        self._hedge_config = {
+            'enabled': HTTP_HEDGE_ENABLED,
+            'min_delay_ms': 20.0,
+            'max_delay_ms': 2000.0,
+            'min_samples': 20
+        }
+        self._hedge_budget = HedgeBudget(HTTP_HEDGE_BUDGET_PERCENT)
+        
+        # Conditional GET cache (cache_policy requests only)
+        self._response_cache = ResponseCache()
+        
+        # asyncio engine for make_requests_concurrently (created on first use)
+        self._async_engine = None
         
         # Rate limiting (500 ops/sec - lower than CONFIG due to HTTP overhead)
-        # Uses deque for O(1) operations (LESS-21)
-        self._rate_limiter = deque(maxlen=500)  # 500 requests per second
-        self._rate_limit_window_ms = 1000  # 1 second window
-        self._rate_limited_count = 0
+        # Shared GCRA limiter, O(1) per check (LESS-21)
+        self._rate_limiter = get_rate_limiter('http_client', 500)
+        
+    @staticmethod
+    def _new_stats() -> Dict[str, int]:
+        """Zeroed statistics counters."""
+        return {
+            'requests': 0,
+            'successful': 0,
+            'failed': 0,
+            'retries': 0,
+            'deadline_exceeded': 0,
+            'deadline_capped': 0,
+            'retries_skipped_deadline': 0,
+            'retries_skipped_budget': 0,
+            'retry_after_honored': 0,
+            'adaptive_timeouts': 0,
+            'compressed_responses': 0,
+            'compressed_wire_bytes': 0,
+            'compressed_decoded_bytes': 0,
+            'compressed_requests': 0
+        }
+    
+    @staticmethod
+    def _verify_ssl() -> bool:
+        """SSL verification setting (HOME_ASSISTANT_VERIFY_SSL, default true)."""
+        return os.getenv('HOME_ASSISTANT_VERIFY_SSL', 'true').lower() != 'false'
+    
+    def _create_pool(self) -> PoolManager:
+        """Connection pool with the SSL verification setting and TLS session reuse."""
+        # Defaults to True (verify SSL) for security
+        verify_ssl = self._verify_ssl()
+        
+        # Set cert_reqs based on verification setting
+        cert_reqs = 'CERT_REQUIRED' if verify_ssl else 'CERT_NONE'
         
         # Log SSL configuration (debug only)
         if os.getenv('DEBUG_MODE', 'false').lower() == 'true':
             from gateway import log_debug
             log_debug(f"HTTP client initialized: verify_ssl={verify_ssl}, cert_reqs={cert_reqs}")
+        
+        # Use preloaded classes (NO IMPORT OVERHEAD!)
+        # New connections resolve through the shared DNS cache
+        return use_dns_cache(PoolManager(
+            cert_reqs=cert_reqs,
+            ssl_context=create_ssl_context(verify_ssl, self._tls_sessions),
+            timeout=Timeout(connect=10.0, read=30.0),
+            maxsize=10,
+            retries=False
+        ))
     
-    def _check_rate_limit(self) -> bool:
+    def prewarm(self, url: str, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
-        Check if operation is within rate limits.
+        Open a keep-alive connection to url's host ahead of the first request.
         
-        Returns:
-            bool: True if operation allowed, False if rate limited
-            
-        Rate Limiting Strategy:
-        - 500 operations per second (lower than CONFIG due to HTTP overhead)
-        - Uses deque with maxlen for automatic eviction
-        - O(1) append and popleft operations
-        - Tracks violations for monitoring
+        Meant for Lambda INIT. Never raises; an unreachable host only costs
+        the connect timeout.
         
-        REF: LESS-21 (Rate limiting essential for DoS protection)
-        """
-        now = time.time() * 1000  # Current time in milliseconds
+        Args:
+            url: Any URL on the target host
+            timeout: Connect timeout in seconds (default HTTP_PREWARM_TIMEOUT_MS)
         
-        # Remove timestamps outside the window (older than 1 second)
-        while self._rate_limiter and (now - self._rate_limiter[0]) > self._rate_limit_window_ms:
-            self._rate_limiter.popleft()
+        Returns:
+            Dict with success, host, connect_ms, tls_version (or error)
+        """
+        if timeout is None:
+            timeout = HTTP_PREWARM_TIMEOUT_MS / 1000.0
+        result = open_warm_connection(self.http, url, timeout)
+        result['first_request_reused'] = None
+        self._prewarm = result
+        self._prewarm_pending = result['success']
+        return result
+    
+    def _report_prewarm_reuse(self, url: str) -> None:
+        """After the first request to the warmed host: was the warm connection used?"""
+        prewarm = self._prewarm
+        if urlsplit(url).hostname != prewarm['host']:
+            return
+        self._prewarm_pending = False
+        connections = self.http.connection_from_url(url).num_connections
+        prewarm['first_request_reused'] = connections <= prewarm['connections']
+        if os.getenv('DEBUG_MODE', 'false').lower() == 'true':
+            from gateway import log_debug
+            log_debug(f"First request to {prewarm['host']} "
+                      f"{'reused' if prewarm['first_request_reused'] else 'did NOT reuse'} "
+                      f"the warm connection (connections opened: {connections})")
+    
+    def _check_rate_limit(self) -> bool:
+        """
+        Check if operation is within rate limit.
         
-        # Check if we're at the limit
-        if len(self._rate_limiter) >= 500:
-            self._rate_limited_count += 1
-            return False
+        Shared GCRA limiter 'http_client' (rate_limiter.py): O(1), monotonic clock.
+        No threading locks needed (AP-08, DEC-04).
         
-        # Add current timestamp
-        self._rate_limiter.append(now)
-        return True
-    
+        Returns:
+            bool: True if operation allowed, False if rate limited
+        """
+        return self._rate_limiter.allow()
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get client statistics including rate limiting.
@@ -115,8 +370,17 @@ class HTTPClientCore:
             Dict with stats: requests, successful, failed, retries, rate_limited
         """
         stats = self._stats.copy()
-        stats['rate_limited'] = self._rate_limited_count
-        stats['rate_limiter_size'] = len(self._rate_limiter)
+        stats['rate_limited'] = self._rate_limiter.rejected
+        stats['rate_limiter_size'] = self._rate_limiter.in_use()
+        stats['latency'] = self._latency.get_stats(self._timeout_config)
+        stats['retry_budget'] = self._retry_budget.get_stats()
+        stats['hedging'] = self._hedge_budget.get_stats()
+        stats['hedging']['enabled'] = self._hedge_config['enabled']
+        stats['tls'] = self._tls_sessions.get_stats()
+        stats['response_cache'] = self._response_cache.get_stats()
+        stats['concurrent'] = self._async_engine.get_stats() if self._async_engine else None
+        stats['dns'] = get_dns_cache_stats()
+        stats['prewarm'] = self._prewarm
         return stats
     
     def reset(self) -> bool:
@@ -142,28 +406,20 @@ class HTTPClientCore:
                 self.http.clear()
             
             # Reset statistics
-            self._stats = {
-                'requests': 0,
-                'successful': 0,
-                'failed': 0,
-                'retries': 0
-            }
-            
-            # Reset rate limiter
-            self._rate_limiter.clear()
-            self._rate_limited_count = 0
+            self._stats = self._new_stats()
             
-            # Recreate connection pool
-            verify_ssl_env = os.getenv('HOME_ASSISTANT_VERIFY_SSL', 'true').lower()
-            verify_ssl = verify_ssl_env != 'false'
-            cert_reqs = 'CERT_REQUIRED' if verify_ssl else 'CERT_NONE'
+            # Reset rate limiter, latency history, retry and hedge budgets
+            self._latency.reset()
+            self._retry_budget.reset()
+            self._response_cache.clear()
+            self._hedge_budget.reset()
+            self._rate_limiter.reset()
             
-            self.http = PoolManager(
-                cert_reqs=cert_reqs,
-                timeout=Timeout(connect=10.0, read=30.0),
-                maxsize=10,
-                retries=False
-            )
+            # Recreate connection pool (asyncio engine recreated on next use)
+            self.close_async()
+            self._async_engine = None
+            self.http = self._create_pool()
+            self._prewarm_pending = False
             
             return True
             
@@ -177,19 +433,110 @@ class HTTPClientCore:
         return status_code in self._retry_config['retriable_status_codes']
     
     def _calculate_backoff(self, attempt: int) -> float:
-        """Calculate exponential backoff delay."""
-        base_ms = self._retry_config['backoff_base_ms']
-        multiplier = self._retry_config['backoff_multiplier']
-        delay_ms = base_ms * (multiplier ** attempt)
-        return delay_ms / 1000.0
+        """Calculate exponential backoff delay (full jitter, capped)."""
+        config = self._retry_config
+        return full_jitter_backoff(attempt, config['backoff_base_ms'],
+                                   config['backoff_multiplier'], config['max_backoff_ms'])
+    
+    def _retry_delay(self, attempt: int, result: Dict[str, Any]) -> Optional[float]:
+        """
+        Delay before the next attempt in seconds.
+        
+        Returns:
+            Retry-After for 429/503 when present, else jittered backoff;
+            None if the server asked for a longer wait than we accept
+        """
+        if result.get('status_code') in _RETRY_AFTER_STATUS_CODES:
+            retry_after = parse_retry_after(result.get('headers'))
+            if retry_after is not None:
+                if retry_after > self._retry_config['max_retry_after_seconds']:
+                    return None
+                self._stats['retry_after_honored'] += 1
+                return retry_after
+        return self._calculate_backoff(attempt)
+    
+    def _may_hedge(self) -> bool:
+        """Budget (and rate limit) check when a GET is slower than the hedge delay."""
+        return self._hedge_budget.try_acquire() and self._check_rate_limit()
     
-    def _execute_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+    def _hedge_delay(self, method: str, endpoint_class: str, hedge: Optional[bool]) -> Optional[float]:
+        """Hedge delay in seconds for this request, None = no hedging."""
+        if method.upper() != 'GET':
+            return None
+        if not (self._hedge_config['enabled'] if hedge is None else hedge):
+            return None
+        try:
+            # The engine's loop can't run inside an already running loop
+            asyncio.get_running_loop()
+            return None
+        except RuntimeError:
+            pass
+        return self._latency.hedge_delay_for(endpoint_class, self._hedge_config)
+    
+    def _run_hedged(self, method: str, url: str, headers: Dict[str, Any], body: Optional[bytes],
+                    timeout: Any, delay: float) -> Tuple[Any, float, bool, bool]:
+        """Hedged request on the asyncio engine; returns run_hedged()'s tuple."""
+        engine = self._get_async_engine()
+        if not isinstance(timeout, (int, float)):
+            timeout = HTTP_DEFAULT_TIMEOUT_SECONDS
+        try:
+            return engine.run(run_hedged(
+                lambda: engine.request(method, url, headers, body, timeout),
+                delay,
+                self._may_hedge
+            ))
+        finally:
+            # Outside an invocation no end hook closes the loop
+            if get_invocation_deadline() is None:
+                engine.close()
+    
+    def _decode_engine_body(self, response: Any) -> bytes:
+        """Decompressed body of an asyncio engine response (compression stats counted)."""
+        body_data = decompress_body(response.data, response.headers.get('Content-Encoding'))
+        if body_data is not response.data:
+            self._stats['compressed_responses'] += 1
+            self._stats['compressed_wire_bytes'] += len(response.data)
+            self._stats['compressed_decoded_bytes'] += len(body_data)
+        return body_data
+    
+    def _execute_request(self, method: str, url: str, endpoint_class: Optional[str] = None,
+                         hedge_delay: Optional[float] = None, stream: bool = False,
+                         compress: Optional[bool] = None, fingerprint: bool = False,
+                         previous_fingerprint: Optional[bytes] = None, conditional: bool = False,
+                         raw_headers: bool = False, **kwargs) -> Dict[str, Any]:
         """
         Execute single HTTP request with error handling.
         
+        Streaming:
+        - stream=True: body not preloaded; a successful result carries the
+          open response in 'stream' (data None). Error bodies are read.
+        
+        Compression:
+        - Accept-Encoding offered unless the caller sets it; encoded bodies
+          are decompressed incrementally (read_body)
+        - compress: gzip the request body (None = by size threshold)
+        
+        Fingerprint (conditional GET cache):
+        - fingerprint=True: successful bodies without validators get a
+          'fingerprint'; equal to previous_fingerprint = 'unchanged',
+          body not parsed
+        - conditional=True: request carries If-None-Match/If-Modified-Since;
+          a 304 counts as successful, not failed
+        
         Rate Limiting:
         - Checks rate limit before executing request
         - Returns rate limit error if exceeded
+        
+        Latency:
+        - Duration recorded for endpoint_class (responses and timeouts)
+        
+        Headers:
+        - result 'headers' is a plain dict; raw_headers=True returns the
+          response's case-insensitive mapping without copying it
+        
+        Hedging:
+        - hedge_delay (seconds): second identical request if no response by
+          then; both run on the asyncio engine, the loser is cancelled
         """
         # Check rate limit BEFORE executing request
         if not self._check_rate_limit():
@@ -200,65 +547,115 @@ class HTTPClientCore:
                 'rate_limited': True
             }
         
+        start_time = time.perf_counter()
         try:
             self._stats['requests'] += 1
             
-            # Get headers (add standard headers if not provided)
-            headers = kwargs.get('headers', {})
-            if not headers:
-                headers = get_standard_headers()
-            elif not isinstance(headers, dict):
-                headers = get_standard_headers()
+            headers, body = self._encode_request(kwargs, compress)
             
-            # Handle JSON body encoding (CRITICAL FIX 2025.10.19.JSON_FIX)
-            body = None
+            # Execute request
+            timeout = kwargs.get('timeout')
+            body_data = None
+            if stream:
+                response = self.http.request(
+                    method,
+                    url,
+                    headers=headers,
+                    body=body,
+                    timeout=timeout,
+                    preload_content=False
+                )
+                duration_ms = (time.perf_counter() - start_time) * 1000
+            elif hedge_delay is not None and (not isinstance(timeout, (int, float)) or hedge_delay < timeout):
+                self._hedge_budget.on_request()
+                response, duration_ms, hedged, hedge_won = self._run_hedged(
+                    method, url, headers, body, timeout, hedge_delay)
+                if hedged:
+                    self._record_hedge(hedge_won)
+                body_data = self._decode_engine_body(response)
+            else:
+                response = self.http.request(
+                    method,
+                    url,
+                    headers=headers,
+                    body=body,
+                    timeout=timeout,
+                    preload_content=False
+                )
+                try:
+                    body_data = read_body(response)
+                finally:
+                    response.release_conn()
+                # read_body returns a bytearray only for decompressed bodies
+                if isinstance(body_data, bytearray):
+                    self._stats['compressed_responses'] += 1
+                    self._stats['compressed_wire_bytes'] += response.tell()
+                    self._stats['compressed_decoded_bytes'] += len(body_data)
+                duration_ms = (time.perf_counter() - start_time) * 1000
             
-            if kwargs.get('json'):
-                # JSON mode - encode 'json' kwarg to bytes
-                json_data = kwargs.get('json')
-                body = json.dumps(json_data).encode('utf-8')
-                headers.setdefault('Content-Type', 'application/json')
-            elif kwargs.get('body'):
-                # Body mode - use 'body' kwarg directly
-                body = kwargs.get('body')
-                if isinstance(body, str):
-                    body = body.encode('utf-8')
+            if endpoint_class is not None:
+                self._latency.observe(endpoint_class, duration_ms)
             
-            # Execute request
-            response = self.http.request(
-                method,
-                url,
-                headers=headers,
-                body=body,
-                timeout=kwargs.get('timeout')
-            )
+            # TLS 1.3 tickets arrive with the first response; keep the session
+            self._tls_sessions.capture()
+            if self._prewarm_pending:
+                self._report_prewarm_reuse(url)
             
             # Parse response
             status_code = response.status
             success = 200 <= status_code < 300
             
-            # Try to decode response body
-            response_data = None
-            try:
-                response_body = response.data.decode('utf-8')
-                if response_body:
-                    response_data = json.loads(response_body)
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                response_data = response.data
-            
-            if success:
+            if success or (conditional and status_code == 304):
                 self._stats['successful'] += 1
             else:
                 self._stats['failed'] += 1
             
-            return {
+            # Streamed success: the caller reads the body
+            if stream and success:
+                return {
+                    'success': True,
+                    'status_code': status_code,
+                    'data': None,
+                    'headers': _result_headers(response.headers, raw_headers),
+                    'stream': response
+                }
+            
+            # Parse JSON from the bytes buffer
+            if stream:
+                try:
+                    body_data = read_body(response)
+                finally:
+                    response.release_conn()
+            
+            digest = None
+            if fingerprint and success and body_data and \
+                    'ETag' not in response.headers and 'Last-Modified' not in response.headers:
+                digest = fingerprint_body(body_data)
+                if digest == previous_fingerprint:
+                    return {
+                        'success': True,
+                        'status_code': status_code,
+                        'data': None,
+                        'headers': _result_headers(response.headers, raw_headers),
+                        'fingerprint': digest,
+                        'unchanged': True
+                    }
+            
+            result = {
                 'success': success,
                 'status_code': status_code,
-                'data': response_data,
-                'headers': dict(response.headers)
+                'data': parse_json_body(body_data),
+                'headers': _result_headers(response.headers, raw_headers)
             }
+            if digest is not None:
+                result['fingerprint'] = digest
+            return result
             
         except Exception as e:
+            # Timeouts count as latency so the derived timeout can grow
+            if endpoint_class is not None and 'Timeout' in type(e).__name__:
+                self._latency.observe(endpoint_class, (time.perf_counter() - start_time) * 1000,
+                                      timed_out=True)
             from gateway import log_error
             log_error(f"HTTP request failed: {str(e)}", error=e)
             self._stats['failed'] += 1
@@ -268,34 +665,394 @@ class HTTPClientCore:
                 'error_type': type(e).__name__
             }
     
+    def _encode_request(self, kwargs: Dict[str, Any],
+                        compress: Optional[bool]) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """Request headers and encoded (optionally gzipped) body from headers/json/body kwargs."""
+        # Get headers (add standard headers if not provided)
+        headers = kwargs.get('headers', {})
+        if not headers:
+            headers = get_standard_headers()
+        elif not isinstance(headers, dict):
+            headers = get_standard_headers()
+        
+        # Handle JSON body encoding (CRITICAL FIX 2025.10.19.JSON_FIX)
+        body = None
+        
+        if kwargs.get('json'):
+            # JSON mode - encode 'json' kwarg to bytes
+            json_data = kwargs.get('json')
+            body = json.dumps(json_data).encode('utf-8')
+            headers.setdefault('Content-Type', 'application/json')
+        elif kwargs.get('body'):
+            # Body mode - use 'body' kwarg directly
+            body = kwargs.get('body')
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+        
+        # Content negotiation (copies: headers may be reused on retry)
+        if HTTP_ACCEPT_ENCODING and 'Accept-Encoding' not in headers:
+            headers = {**headers, 'Accept-Encoding': HTTP_ACCEPT_ENCODING}
+        if body is not None and 'Content-Encoding' not in headers:
+            body, content_encoding = compress_body(body, HTTP_COMPRESS_REQUEST_MIN_BYTES, compress)
+            if content_encoding is not None:
+                headers = {**headers, 'Content-Encoding': content_encoding}
+                self._stats['compressed_requests'] += 1
+        return headers, body
+    
+    def _record_hedge(self, hedge_won: bool) -> None:
+        """Count a hedge (and its win) in stats and METRICS."""
+        if hedge_won:
+            self._hedge_budget.won += 1
+        try:
+            from gateway import increment_counter
+            increment_counter('http_hedge_sent')
+            if hedge_won:
+                increment_counter('http_hedge_won')
+        except Exception:
+            pass  # Metrics failure should not fail the request
+    
+    def _deadline_exceeded_result(self, deadline) -> Dict[str, Any]:
+        """Build result for a request abandoned because the deadline passed."""
+        self._stats['deadline_exceeded'] += 1
+        deadline.record_miss()
+        return {
+            'success': False,
+            'error': 'Invocation deadline exceeded',
+            'error_type': 'DeadlineExceeded',
+            'deadline_exceeded': True,
+            'remaining_ms': round(deadline.remaining_ms(), 2)
+        }
+    
+    def _apply_deadline_timeout(self, deadline, kwargs: Dict[str, Any]) -> bool:
+        """
+        Cap the request timeout to the remaining invocation budget.
+        
+        Only numeric (or missing) timeouts are capped; explicit urllib3
+        Timeout objects are left to the caller.
+        
+        Returns:
+            bool: False if the remaining budget is too small to start a request
+        """
+        if deadline.remaining_ms() < HTTP_MIN_ATTEMPT_BUDGET_MS:
+            return False
+        
+        requested = kwargs.get('timeout')
+        if requested is not None and not isinstance(requested, (int, float)):
+            return True
+        
+        requested = HTTP_DEFAULT_TIMEOUT_SECONDS if requested is None else float(requested)
+        capped = deadline.cap_timeout(requested)
+        if capped < requested:
+            self._stats['deadline_capped'] += 1
+        kwargs['timeout'] = capped
+        return True
+    
+    def _cached_get(self, url: str, cache_policy: Any, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        GET through the conditional response cache.
+        
+        Raises:
+            ValueError: Invalid cache_policy
+        """
+        ttl, max_age = resolve_cache_policy(cache_policy)
+        cache = self._response_cache
+        key = cache.key(url, kwargs.get('headers'))
+        entry = cache.get(key)
+        
+        if entry is not None:
+            if entry.is_fresh(ttl, max_age):
+                return cache.hit(entry, 'fresh')
+            if entry.has_validators:
+                kwargs['headers'] = {**(kwargs.get('headers') or get_standard_headers()),
+                                     **entry.conditional_headers()}
+                kwargs['conditional'] = True
+            else:
+                kwargs['previous_fingerprint'] = entry.fingerprint
+        kwargs['fingerprint'] = True
+        
+        result = self.make_request('GET', url, **kwargs)
+        
+        if entry is not None:
+            if result.get('status_code') == 304:
+                return cache.hit(entry, 'not_modified')
+            if result.get('unchanged'):
+                return cache.hit(entry, 'fingerprint')
+        
+        cache.miss()
+        if result.get('success'):
+            cache.store(key, result, result.pop('fingerprint', None))
+            result['cache'] = 'miss'
+        return result
+    
     def make_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
-        """Execute HTTP request with retry logic."""
+        """
+        Execute HTTP request with retry logic bounded by the invocation deadline.
+        
+        Args:
+            method: HTTP method
+            url: Target URL
+            **kwargs: headers, json, body, timeout, deadline
+                timeout: Seconds, upper limit for the adaptive timeout of the
+                    endpoint class (None = adaptive timeout, or the pool
+                    default while there is no history)
+                hedge: GET only - True/False overrides HTTP_HEDGE_ENABLED
+                stream: True = don't preload the body (large responses);
+                    no hedging. On success read result['stream']
+                    (read()/stream(chunk_size)), then release_conn()
+                raw_headers: True = result 'headers' is the response's
+                    case-insensitive header mapping (not copied, not JSON
+                    serializable); default a plain dict
+                cache_policy: GET only - 'conditional' or {'ttl': s, 'max_age': s};
+                    cached 'data' is shared and must not be modified
+                deadline: Optional InvocationDeadline (defaults to the running
+                    invocation's deadline; no deadline = legacy behavior)
+        
+        Returns:
+            Dict with success, status_code, data, headers (or error details)
+        """
+        cache_policy = kwargs.pop('cache_policy', None)
+        if cache_policy is not None and method.upper() == 'GET' and not kwargs.get('stream'):
+            return self._cached_get(url, cache_policy, kwargs)
+        
+        deadline, endpoint_class = self._begin_request(method, url, kwargs)
+        kwargs['endpoint_class'] = endpoint_class
+        kwargs['hedge_delay'] = self._hedge_delay(method, endpoint_class, kwargs.pop('hedge', None))
         max_attempts = self._retry_config['max_attempts']
         
         for attempt in range(max_attempts):
-            result = self._execute_request(method, url, **kwargs)
+            if deadline is not None and not self._apply_deadline_timeout(deadline, kwargs):
+                return self._deadline_exceeded_result(deadline)
             
-            # Don't retry rate limit errors
-            if result.get('rate_limited'):
-                return result
+            result = self._execute_request(method, url, **kwargs)
             
-            if result.get('success'):
+            result, backoff = self._retry_decision(attempt, result, deadline, endpoint_class)
+            if backoff is None:
                 return result
+            time.sleep(backoff)
+        
+        return {
+            'success': False,
+            'error': 'Max retry attempts exceeded',
+            'attempts': max_attempts
+        }
+    
+    def _begin_request(self, method: str, url: str, kwargs: Dict[str, Any]) -> Tuple[Any, str]:
+        """
+        Common start of a request with retries: deadline, endpoint class,
+        retry budget accounting and adaptive timeout (set in kwargs).
+        
+        Returns:
+            (deadline or None, endpoint_class)
+        """
+        deadline = kwargs.pop('deadline', None) or get_invocation_deadline()
+        endpoint_class = classify_endpoint(method, url)
+        self._retry_budget.on_request()
+        configured = kwargs.get('timeout')
+        # urllib3 Timeout objects are left to the caller
+        if self._timeout_config['adaptive'] and (configured is None or isinstance(configured, (int, float))):
+            adaptive_timeout = self._latency.timeout_for(endpoint_class, self._timeout_config)
+            # A configured timeout is the upper limit, not an opt-out
+            if adaptive_timeout is not None and (configured is None or adaptive_timeout < configured):
+                kwargs['timeout'] = adaptive_timeout
+                self._stats['adaptive_timeouts'] += 1
+        return deadline, endpoint_class
+    
+    def _retry_decision(self, attempt: int, result: Dict[str, Any], deadline,
+                        endpoint_class: str) -> Tuple[Dict[str, Any], Optional[float]]:
+        """
+        Decide what follows attempt number attempt (0-based).
+        
+        Returns:
+            (result, backoff seconds before the next attempt);
+            backoff None = result is final (retry_skipped set if a retry
+            was possible but not made)
+        """
+        # Don't retry rate limit errors
+        if result.get('rate_limited'):
+            return result, None
+        
+        if result.get('success'):
+            return result, None
+        
+        # Request cut short by the capped timeout
+        if deadline is not None and 'status_code' not in result and deadline.expired():
+            deadline_result = self._deadline_exceeded_result(deadline)
+            deadline_result['error'] = f"Invocation deadline exceeded: {result.get('error', '')}"
+            return deadline_result, None
+        
+        status_code = result.get('status_code', 0)
+        if attempt >= self._retry_config['max_attempts'] - 1 or not self._is_retriable_error(status_code):
+            return result, None
+        
+        backoff = self._retry_delay(attempt, result)
+        if backoff is None:
+            result['retry_skipped'] = 'retry_after'
+            return result, None
+        
+        # No point sleeping if the next attempt can't finish in time
+        if deadline is not None and not deadline.allows(
+                backoff * 1000 + max(HTTP_MIN_ATTEMPT_BUDGET_MS,
+                                     self._latency.get(endpoint_class).p50.value())):
+            self._stats['retries_skipped_deadline'] += 1
+            deadline.record_miss()
+            result['retry_skipped'] = 'deadline'
+            return result, None
+        
+        # Retries beyond the budget would amplify an outage
+        if not self._retry_budget.try_acquire():
+            self._stats['retries_skipped_budget'] += 1
+            result['retry_skipped'] = 'budget'
+            return result, None
+        
+        self._stats['retries'] += 1
+        return result, backoff
+    
+    # ===== CONCURRENT REQUESTS (asyncio) =====
+    
+    def _get_async_engine(self) -> AsyncHTTPEngine:
+        """asyncio engine (created on first use, closed at invocation end)."""
+        if self._async_engine is None:
+            self._async_engine = AsyncHTTPEngine(create_ssl_context(self._verify_ssl(), self._tls_sessions))
+            register_invocation_end_hook(self.close_async)
+        return self._async_engine
+    
+    def close_async(self) -> None:
+        """Close the invocation's event loop and its connections (invocation end hook)."""
+        if self._async_engine is not None:
+            self._async_engine.close()
+    
+    def make_requests_concurrently(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute several requests concurrently on the invocation's event loop.
+        
+        Each request gets the rate limit, retry/backoff/budget, Retry-After,
+        deadline and adaptive timeout handling of make_request. Requests to
+        the same host share keep-alive connections, at most
+        HTTP_ASYNC_MAX_PER_HOST at a time.
+        
+        Args:
+            requests: Dicts with url, method (default GET) and any of
+                headers, json, body, timeout, deadline, compress, raw_headers, and
+                circuit_breaker (breaker name: rejected while open, failures
+                = no response or 5xx). hedge is ignored; stream and
+                cache_policy are not supported.
+        
+        Returns:
+            Results in request order, same format as make_request
+        
+        Raises:
+            RuntimeError: Called from code running in an event loop
+        """
+        if not requests:
+            return []
+        engine = self._get_async_engine()
+        try:
+            return engine.run(self._gather_async(engine, requests))
+        finally:
+            # Outside an invocation no end hook closes the loop
+            if get_invocation_deadline() is None:
+                engine.close()
+    
+    async def _gather_async(self, engine: AsyncHTTPEngine, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await asyncio.gather(*(self._make_request_async(engine, **request) for request in requests))
+    
+    async def _make_request_async(self, engine: AsyncHTTPEngine, url: str, method: str = 'GET',
+                                  circuit_breaker: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """make_request for one request of a concurrent batch (optionally behind a breaker)."""
+        if circuit_breaker is None:
+            return await self._request_with_retries_async(engine, method, url, kwargs)
+        
+        from gateway import circuit_breaker_allow, circuit_breaker_record
+        if not circuit_breaker_allow(circuit_breaker):
+            return {
+                'success': False,
+                'error': f"Circuit breaker '{circuit_breaker}' is open",
+                'error_type': 'CircuitBreakerOpen',
+                'circuit_open': True
+            }
+        start_time = time.perf_counter()
+        result = await self._request_with_retries_async(engine, method, url, kwargs)
+        failed = not result.get('success') and not result.get('rate_limited') and \
+            result.get('status_code', 500) >= 500
+        circuit_breaker_record(circuit_breaker, not failed, (time.perf_counter() - start_time) * 1000,
+                               error=(result.get('error') or f"HTTP {result.get('status_code')}") if failed else None)
+        return result
+    
+    async def _request_with_retries_async(self, engine: AsyncHTTPEngine, method: str, url: str,
+                                          kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Retry loop of make_request with non-blocking backoff."""
+        kwargs.pop('hedge', None)
+        deadline, endpoint_class = self._begin_request(method, url, kwargs)
+        max_attempts = self._retry_config['max_attempts']
+        
+        for attempt in range(max_attempts):
+            if deadline is not None and not self._apply_deadline_timeout(deadline, kwargs):
+                return self._deadline_exceeded_result(deadline)
             
-            status_code = result.get('status_code', 0)
-            if attempt < max_attempts - 1 and self._is_retriable_error(status_code):
-                self._stats['retries'] += 1
-                backoff = self._calculate_backoff(attempt)
-                time.sleep(backoff)
-                continue
+            result = await self._execute_request_async(engine, method, url, endpoint_class, kwargs)
             
-            return result
+            result, backoff = self._retry_decision(attempt, result, deadline, endpoint_class)
+            if backoff is None:
+                return result
+            await asyncio.sleep(backoff)
         
         return {
             'success': False,
             'error': 'Max retry attempts exceeded',
             'attempts': max_attempts
         }
+    
+    async def _execute_request_async(self, engine: AsyncHTTPEngine, method: str, url: str,
+                                     endpoint_class: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """_execute_request on the asyncio engine (no hedging, no streaming)."""
+        if not self._check_rate_limit():
+            return {
+                'success': False,
+                'error': 'Rate limit exceeded',
+                'error_type': 'RateLimitError',
+                'rate_limited': True
+            }
+        
+        start_time = time.perf_counter()
+        try:
+            self._stats['requests'] += 1
+            headers, body = self._encode_request(kwargs, kwargs.get('compress'))
+            timeout = kwargs.get('timeout')
+            if not isinstance(timeout, (int, float)):
+                timeout = HTTP_DEFAULT_TIMEOUT_SECONDS
+            
+            response = await engine.request(method, url, headers, body, timeout)
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self._latency.observe(endpoint_class, duration_ms)
+            
+            body_data = self._decode_engine_body(response)
+            
+            success = 200 <= response.status < 300
+            if success:
+                self._stats['successful'] += 1
+            else:
+                self._stats['failed'] += 1
+            
+            return {
+                'success': success,
+                'status_code': response.status,
+                'data': parse_json_body(body_data),
+                'headers': _result_headers(response.headers, kwargs.get('raw_headers', False))
+            }
+        
+        except Exception as e:
+            # Timeouts count as latency so the derived timeout can grow
+            if 'Timeout' in type(e).__name__:
+                self._latency.observe(endpoint_class, (time.perf_counter() - start_time) * 1000,
+                                      timed_out=True)
+            from gateway import log_error
+            log_error(f"HTTP request failed: {str(e)}", error=e)
+            self._stats['failed'] += 1
+            return {
+                'success': False,
+                'error': str(e),
+                'error_type': type(e).__name__
+            }
 
 
 # SINGLETON Pattern Implementation (LESS-18)
@@ -417,6 +1174,30 @@ def reset_state_implementation(**kwargs) -> Dict[str, Any]:
     return reset_client_state(**kwargs)
 
 
+def http_prewarm_implementation(**kwargs) -> Dict[str, Any]:
+    """Gateway implementation for connection pre-warming."""
+    client = get_http_client_manager()
+    return client.prewarm(kwargs.get('url', ''), kwargs.get('timeout'))
+
+
+def http_request_concurrent_implementation(**kwargs) -> List[Dict[str, Any]]:
+    """Gateway implementation for concurrent HTTP requests."""
+    client = get_http_client_manager()
+    return client.make_requests_concurrently(kwargs.get('requests') or [])
+
+
+def configure_retry_implementation(**kwargs) -> Dict[str, Any]:
+    """Gateway implementation for retry / adaptive timeout configuration."""
+    from http_client_state import configure_http_retry
+    return configure_http_retry(**kwargs)
+
+
+def get_statistics_implementation(**kwargs) -> Dict[str, Any]:
+    """Gateway implementation for connection statistics."""
+    from http_client_state import get_connection_statistics
+    return get_connection_statistics(**kwargs)
+
+
 __all__ = [
     'HTTPClientCore',
     'get_http_client_manager',
@@ -427,8 +1208,12 @@ __all__ = [
     'http_put_implementation',
     'http_delete_implementation',
     'http_reset_implementation',
+    'http_prewarm_implementation',
+    'http_request_concurrent_implementation',
     'get_state_implementation',
     'reset_state_implementation',
+    'configure_retry_implementation',
+    'get_statistics_implementation',
 ]
 
 # EOF
@@ -0,0 +1,92 @@
+"""
+http_client_dns.py - urllib3 Connections Resolved Through the DNS Cache
+Version: 2026.10.18.01
+Description: Connection and pool classes whose new connections use the
+             shared DNSCache (dns_cache.py) instead of a getaddrinfo per
+             connection. Internal module - used by http_client_core.py.
+
+CHANGELOG:
+- 2026.10.18.01: Initial version
+  - CachedDNSHTTPConnection / CachedDNSHTTPSConnection: _new_conn() via
+    DNSCache.create_connection (TLS is still wrapped by urllib3, so session
+    resumption and certificate checks are unchanged)
+  - use_dns_cache(pool_manager): PoolManager builds pools of these
+
+DESIGN DECISION: Override _new_conn instead of patching urllib3
+Reason: urllib3 resolves in util.connection.create_connection, called from
+HTTPConnection._new_conn. Replacing the module function would affect every
+urllib3 user in the process (boto3 included); pool classes set per
+PoolManager only change the HTTP client's connections.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import socket
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+
+from dns_cache import get_dns_cache
+
+
+class _CachedDNSConnectionMixin:
+    """Replaces the per-connection getaddrinfo with the shared DNS cache."""
+
+    def _new_conn(self) -> socket.socket:
+        # urllib3 passes a sentinel for "socket default timeout"
+        timeout = self.timeout if self.timeout is None or isinstance(self.timeout, (int, float)) \
+            else socket.getdefaulttimeout()
+        try:
+            sock = get_dns_cache().create_connection(
+                (self._dns_host, self.port),
+                timeout,
+                source_address=self.source_address,
+                socket_options=self.socket_options
+            )
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        except socket.timeout as e:
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})"
+            ) from e
+        except OSError as e:
+            raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+        return sock
+
+
+class CachedDNSHTTPConnection(_CachedDNSConnectionMixin, HTTPConnection):
+    pass
+
+
+class CachedDNSHTTPSConnection(_CachedDNSConnectionMixin, HTTPSConnection):
+    pass
+
+
+class CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+
+class CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+
+def use_dns_cache(pool_manager):
+    """Make pool_manager create pools whose connections use the DNS cache."""
+    pool_manager.pool_classes_by_scheme = {
+        'http': CachedDNSHTTPConnectionPool,
+        'https': CachedDNSHTTPSConnectionPool
+    }
+    return pool_manager
+
+
+__all__ = [
+    'CachedDNSHTTPConnection',
+    'CachedDNSHTTPSConnection',
+    'CachedDNSHTTPConnectionPool',
+    'CachedDNSHTTPSConnectionPool',
+    'use_dns_cache',
+]
+
+# EOF
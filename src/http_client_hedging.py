@@ -0,0 +1,129 @@
+"""
+http_client_hedging.py - Hedged HTTP Requests
+Version: 2026.10.18.04
+Description: Hedge budget and hedged execution for idempotent requests.
+             Internal module - used by http_client_core.py.
+
+CHANGELOG:
+- 2026.10.18.04: Hedges run as coroutines on the asyncio engine
+  (http_client_async.py) instead of executor threads; the losing request
+  is cancelled and its connection closed
+- 2026.10.18.03: Design note corrected - workers do touch shared caches
+- 2026.10.18.02: HedgeBudget is a RequestBudget (shared with the retry budget)
+- 2026.10.18.01: Initial version
+  - HedgeBudget: hedges allowed as a percentage of eligible requests
+  - run_hedged(): second identical request after an adaptive delay, first
+    response wins
+
+DESIGN DECISION: Coroutines on the invocation's event loop, no threads
+Reason: urllib3 requests block, so a hedge needs a second request in
+flight. A thread pool would run requests (and their DNS lookups and TLS
+handshakes) outside the calling thread, against AP-08/DEC-04, and a
+blocking loser could not be stopped - it would keep running after the
+handler returned and across the Lambda freeze. Both requests run as tasks
+on the asyncio engine's loop, on the calling thread, so every counter and
+cache is updated without locks.
+
+DESIGN DECISION: Losers are cancelled, not abandoned
+Reason: The first response wins; the other task is cancelled before
+run_hedged() returns. Cancellation aborts its connection (the stream is in
+an unknown state), so nothing is left in flight when the handler returns.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from http_client_retry import RequestBudget
+
+
+class HedgeBudget(RequestBudget):
+    """
+    RequestBudget for hedges, counting how often the hedge won.
+
+    Args:
+        percent: Extra load allowed for hedges (10 = at most ~10% more requests)
+        max_tokens: Burst of hedges allowed after a quiet period
+    """
+
+    __slots__ = ('won',)
+
+    def __init__(self, percent: float = 10.0, max_tokens: float = 5.0):
+        super().__init__(percent, max_tokens)
+        self.won = 0
+
+    def reset(self) -> None:
+        super().reset()
+        self.won = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'eligible': self.requests,
+            'hedged': self.spent,
+            'won': self.won,
+            'budget_exhausted': self.exhausted,
+            'hedge_rate': round(self.spent / self.requests, 4) if self.requests else 0.0,
+            'win_rate': round(self.won / self.spent, 4) if self.spent else 0.0,
+            'tokens': round(self.tokens, 2),
+            'budget_percent': self.percent
+        }
+
+
+async def _timed(send: Callable[[], Awaitable[Any]]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    response = await send()
+    return response, (time.perf_counter() - start) * 1000
+
+
+async def run_hedged(send: Callable[[], Awaitable[Any]], delay_seconds: float,
+                     may_hedge: Callable[[], bool]) -> Tuple[Any, float, bool, bool]:
+    """
+    Await send(); if it hasn't answered after delay_seconds, send again.
+
+    The request still pending when the other one answers is cancelled
+    before this returns.
+
+    Args:
+        send: Returns a coroutine performing the request (raises on error)
+        delay_seconds: Wait before hedging
+        may_hedge: Called once when the delay passes; False = don't hedge
+
+    Returns:
+        (response, duration_ms of the winning request, hedged, hedge_won)
+
+    Raises:
+        Exception: The primary request's error if no request succeeded
+    """
+    primary = asyncio.ensure_future(_timed(send))
+    done, _ = await asyncio.wait({primary}, timeout=delay_seconds)
+    if done or not may_hedge():
+        response, duration_ms = await primary
+        return response, duration_ms, False, False
+
+    hedge = asyncio.ensure_future(_timed(send))
+    pending = {primary, hedge}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    response, duration_ms = task.result()
+                    return response, duration_ms, True, task is hedge
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    raise primary.exception() or hedge.exception()
+
+
+__all__ = [
+    'HedgeBudget',
+    'run_hedged',
+]
+
+# EOF
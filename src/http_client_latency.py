@@ -0,0 +1,257 @@
+"""
+http_client_latency.py - HTTP Latency Tracking and Adaptive Timeouts
+Version: 2026.10.18.02
+Description: Per-endpoint-class streaming latency percentiles and timeouts
+             derived from them. Internal module - used by http_client_core.py.
+
+CHANGELOG:
+- 2026.10.18.02: p95 per endpoint class, hedge_delay_for() (hedged GETs)
+- 2026.10.18.01: Initial version
+  - P2Quantile: streaming quantile estimate, O(1) memory and update
+  - classify_endpoint(): METHOD + path with ids collapsed
+    ('GET /api/states/*'), bounded number of classes
+  - LatencyTracker.timeout_for(): multiple of observed p99, clamped
+
+DESIGN DECISION: P-squared estimator instead of stored samples
+Reason: One estimator is five markers updated in place per observation; no
+sample list grows per request and a percentile read is an attribute access.
+Accuracy is within a few percent for the smooth latency distributions HA
+produces, which is plenty for deriving a timeout multiple.
+
+DESIGN DECISION: Timed-out requests are observed too
+Reason: If HA slows down, requests hit the derived timeout. Recording their
+elapsed time pushes p99 (and so the timeout) up; recording only successes
+would keep the timeout pinned at the old, too-short value.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+# Endpoint classes tracked before new ones fall into 'other'
+HTTP_LATENCY_MAX_CLASSES = 32
+
+# Path segments kept before the rest is collapsed to '*'
+_CLASS_PATH_SEGMENTS = 2
+
+# Below this many samples the empirical p99 is the maximum
+_P99_MIN_SAMPLES = 100
+
+# Below this many samples the p95 estimate is too rough to hedge on
+_P95_MIN_SAMPLES = 20
+
+
+class P2Quantile:
+    """
+    P-squared streaming quantile estimator (Jain & Chlamtac, 1985).
+
+    Args:
+        quantile: Target quantile (0-1)
+    """
+
+    __slots__ = ('quantile', 'count', '_heights', '_positions', '_desired', '_increments')
+
+    def __init__(self, quantile: float):
+        self.quantile = quantile
+        self.count = 0
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1.0, 1 + 2 * quantile, 1 + 4 * quantile, 3 + 2 * quantile, 5.0]
+        self._increments = [0.0, quantile / 2, quantile, (1 + quantile) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        # Find cell k and update extreme markers
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+
+        positions = self._positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        desired = self._desired
+        increments = self._increments
+        for i in range(5):
+            desired[i] += increments[i]
+
+        # Adjust middle markers
+        for i in (1, 2, 3):
+            d = desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or \
+               (d <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = heights[i] + step * (heights[i + step] - heights[i]) / \
+                        (positions[i + step] - positions[i])
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q = self._heights
+        n = self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float:
+        """Current estimate (0.0 before the first observation)."""
+        if self.count > 5:
+            return self._heights[2]
+        if not self._heights:
+            return 0.0
+        ordered = self._heights
+        index = min(len(ordered) - 1, int(round(self.quantile * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class EndpointLatency:
+    """Streaming p50/p95/p99 (milliseconds) for one endpoint class."""
+
+    __slots__ = ('p50', 'p95', 'p99', 'count', 'timeouts', 'max_ms')
+
+    def __init__(self):
+        self.p50 = P2Quantile(0.5)
+        self.p95 = P2Quantile(0.95)
+        self.p99 = P2Quantile(0.99)
+        self.count = 0
+        self.timeouts = 0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float, timed_out: bool = False) -> None:
+        self.p50.add(duration_ms)
+        self.p95.add(duration_ms)
+        self.p99.add(duration_ms)
+        self.count += 1
+        if timed_out:
+            self.timeouts += 1
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def p99_ms(self) -> float:
+        """p99 estimate (the maximum until there are enough samples)."""
+        if self.count < _P99_MIN_SAMPLES:
+            return self.max_ms
+        return self.p99.value()
+
+
+def classify_endpoint(method: str, url: str) -> str:
+    """
+    Endpoint class for latency tracking.
+
+    Keeps the first two path segments and collapses the rest, so entity
+    ids and service names don't create a class each:
+        GET  https://ha:8123/api/states               -> 'GET /api/states'
+        GET  https://ha:8123/api/states/light.kitchen -> 'GET /api/states/*'
+        POST https://ha:8123/api/services/light/on    -> 'POST /api/services/*'
+    """
+    path = urlsplit(url).path if '://' in url else url.split('?', 1)[0]
+    segments = [segment for segment in path.split('/') if segment]
+    endpoint = '/' + '/'.join(segments[:_CLASS_PATH_SEGMENTS])
+    if len(segments) > _CLASS_PATH_SEGMENTS:
+        endpoint += '/*'
+    return f"{method.upper()} {endpoint}"
+
+
+class LatencyTracker:
+    """
+    Latency per endpoint class and the timeouts derived from it.
+
+    Args:
+        max_classes: Classes tracked before new ones share 'other'
+    """
+
+    def __init__(self, max_classes: int = HTTP_LATENCY_MAX_CLASSES):
+        self.max_classes = max_classes
+        self._endpoints: Dict[str, EndpointLatency] = {}
+
+    def get(self, endpoint_class: str) -> EndpointLatency:
+        latency = self._endpoints.get(endpoint_class)
+        if latency is None:
+            if len(self._endpoints) >= self.max_classes:
+                endpoint_class = 'other'
+                latency = self._endpoints.get(endpoint_class)
+            if latency is None:
+                latency = self._endpoints[endpoint_class] = EndpointLatency()
+        return latency
+
+    def observe(self, endpoint_class: str, duration_ms: float, timed_out: bool = False) -> None:
+        """Record one request duration."""
+        self.get(endpoint_class).observe(duration_ms, timed_out)
+
+    def timeout_for(self, endpoint_class: str, config: Dict[str, Any]) -> Optional[float]:
+        """
+        Derived timeout in seconds, or None while there is too little data.
+
+        Args:
+            endpoint_class: Class from classify_endpoint()
+            config: multiplier, min_seconds, max_seconds, min_samples
+        """
+        latency = self._endpoints.get(endpoint_class)
+        if latency is None or latency.count < config['min_samples']:
+            return None
+        seconds = latency.p99_ms() * config['multiplier'] / 1000.0
+        return min(config['max_seconds'], max(config['min_seconds'], seconds))
+
+    def hedge_delay_for(self, endpoint_class: str, config: Dict[str, Any]) -> Optional[float]:
+        """
+        Hedge delay in seconds (observed p95, clamped), or None without enough data.
+
+        Args:
+            endpoint_class: Class from classify_endpoint()
+            config: min_delay_ms, max_delay_ms, min_samples
+        """
+        latency = self._endpoints.get(endpoint_class)
+        if latency is None or latency.count < max(_P95_MIN_SAMPLES, config['min_samples']):
+            return None
+        delay_ms = min(config['max_delay_ms'], max(config['min_delay_ms'], latency.p95.value()))
+        return delay_ms / 1000.0
+
+    def get_stats(self, config: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """Percentiles (and derived timeout if config given) per endpoint class."""
+        stats = {}
+        for endpoint_class, latency in self._endpoints.items():
+            entry = {
+                'count': latency.count,
+                'timeouts': latency.timeouts,
+                'p50_ms': round(latency.p50.value(), 2),
+                'p95_ms': round(latency.p95.value(), 2),
+                'p99_ms': round(latency.p99_ms(), 2),
+                'max_ms': round(latency.max_ms, 2)
+            }
+            if config is not None:
+                timeout = self.timeout_for(endpoint_class, config)
+                entry['timeout_seconds'] = round(timeout, 3) if timeout is not None else None
+            stats[endpoint_class] = entry
+        return stats
+
+    def reset(self) -> None:
+        self._endpoints.clear()
+
+
+__all__ = [
+    'P2Quantile',
+    'EndpointLatency',
+    'LatencyTracker',
+    'classify_endpoint',
+    'HTTP_LATENCY_MAX_CLASSES',
+]
+
+# EOF
@@ -0,0 +1,140 @@
+"""
+http_client_retry.py - HTTP Retry Policy Helpers
+Version: 2026.10.18.02
+Description: Request budgets, jittered backoff and Retry-After parsing.
+             Internal module - used by http_client_core.py.
+
+CHANGELOG:
+- 2026.10.18.02: parse_retry_after() reads zone-less HTTP-dates as UTC
+  - parsedate_to_datetime() returns a naive datetime for '-0000'; its
+    timestamp() used the container's local time zone
+- 2026.10.18.01: Initial version
+  - RequestBudget: token bucket allowing extra requests (retries, hedges)
+    as a percentage of recent requests
+  - full_jitter_backoff(): random delay in [0, min(cap, base * mult^n)]
+  - parse_retry_after(): delta-seconds or HTTP-date
+
+DESIGN DECISION: Full jitter instead of fixed exponential delays
+Reason: With fixed 100ms * 2^n delays, every request that failed at the
+same moment retries at the same moment, hitting a struggling HA in waves.
+Uniformly random delays spread the retries out; on average they wait half
+as long as the fixed schedule.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import random
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+
+class RequestBudget:
+    """
+    Token bucket allowing extra requests as a percentage of recent ones.
+
+    Every request adds percent/100 tokens (up to max_tokens); one extra
+    request (retry, hedge) costs one token.
+
+    Args:
+        percent: Extra load allowed (20 = at most ~20% more requests)
+        max_tokens: Extra requests allowed after a quiet period
+    """
+
+    __slots__ = ('percent', 'max_tokens', 'tokens', 'requests', 'spent', 'exhausted')
+
+    def __init__(self, percent: float = 20.0, max_tokens: float = 5.0):
+        self.percent = percent
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.requests = 0
+        self.spent = 0
+        self.exhausted = 0
+
+    def on_request(self) -> None:
+        """Count one request (earns percent/100 of a token)."""
+        self.requests += 1
+        tokens = self.tokens + self.percent / 100.0
+        self.tokens = tokens if tokens < self.max_tokens else self.max_tokens
+
+    def try_acquire(self) -> bool:
+        """Take a token for one extra request; False if the budget is exhausted."""
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.spent += 1
+            return True
+        self.exhausted += 1
+        return False
+
+    def reset(self) -> None:
+        self.tokens = self.max_tokens
+        self.requests = 0
+        self.spent = 0
+        self.exhausted = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'spent': self.spent,
+            'budget_exhausted': self.exhausted,
+            'tokens': round(self.tokens, 2),
+            'budget_percent': self.percent
+        }
+
+
+def full_jitter_backoff(attempt: int, base_ms: float, multiplier: float, cap_ms: float) -> float:
+    """
+    Backoff in seconds for retry number attempt (0-based), full jitter.
+
+    Returns:
+        Uniform random delay in [0, min(cap_ms, base_ms * multiplier^attempt)]
+    """
+    return random.uniform(0.0, min(cap_ms, base_ms * (multiplier ** attempt))) / 1000.0
+
+
+def parse_retry_after(headers: Optional[Dict[str, Any]]) -> Optional[float]:
+    """
+    Retry-After header in seconds.
+
+    Args:
+        headers: Response headers (any key case)
+
+    Returns:
+        Seconds to wait (>= 0), or None if absent or unparseable
+    """
+    if not headers:
+        return None
+    value = headers.get('Retry-After')
+    if value is None:
+        for key, header_value in headers.items():
+            if key.lower() == 'retry-after':
+                value = header_value
+                break
+        else:
+            return None
+
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        # '-0000' parses naive; HTTP-dates are always GMT
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    try:
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (ValueError, OverflowError):
+        return None
+
+
+__all__ = [
+    'RequestBudget',
+    'full_jitter_backoff',
+    'parse_retry_after',
+]
+
+# EOF
@@ -1,10 +1,20 @@
 """
 http_client_state.py - HTTP Client State Management
-Version: 2025.10.16.02
+Version: 2026.10.18.05
 Description: State management, configuration, and statistics for HTTP client.
              Internal module - accessed via http_client.py interface.
 
 CHANGELOG:
+- 2026.10.18.05: statistics include response_cache and concurrent (asyncio engine)
+- 2026.10.18.04: statistics include tls (session resumption) and prewarm
+- 2026.10.18.03: configure_http_retry configures the retry budget
+                 (retry_budget_percent, max_backoff_ms, max_retry_after_seconds);
+                 statistics include retry_budget
+- 2026.10.18.02: configure_http_retry configures hedged GETs (hedge_enabled,
+                 hedge_budget_percent); statistics include hedging
+- 2026.10.18.01: configure_http_retry configures adaptive timeouts
+                 (adaptive_timeout, timeout_multiplier, timeout_min/max_seconds,
+                 timeout_min_samples); parameters left None keep current values
 - 2025.10.16.02: Added missing functions configure_http_retry and get_connection_statistics
                  Improved error handling and state management
 
@@ -162,15 +172,38 @@ def reset_client_state(client_type: Optional[str] = None, **kwargs) -> Dict[str,
         }
 
 
-def configure_http_retry(max_attempts: int = 3, backoff_base_ms: int = 100, 
-                        backoff_multiplier: float = 2.0, **kwargs) -> Dict[str, Any]:
+def configure_http_retry(max_attempts: Optional[int] = None, backoff_base_ms: Optional[int] = None,
+                        backoff_multiplier: Optional[float] = None,
+                        adaptive_timeout: Optional[bool] = None,
+                        timeout_multiplier: Optional[float] = None,
+                        timeout_min_seconds: Optional[float] = None,
+                        timeout_max_seconds: Optional[float] = None,
+                        timeout_min_samples: Optional[int] = None,
+                        hedge_enabled: Optional[bool] = None,
+                        hedge_budget_percent: Optional[float] = None,
+                        retry_budget_percent: Optional[float] = None,
+                        max_backoff_ms: Optional[float] = None,
+                        max_retry_after_seconds: Optional[float] = None,
+                        **kwargs) -> Dict[str, Any]:
     """
-    Configure HTTP retry behavior.
+    Configure HTTP retry and timeout behavior.
+    
+    Parameters left as None keep their current value.
     
     Args:
         max_attempts: Maximum retry attempts (1-10)
         backoff_base_ms: Base backoff time in milliseconds (50-1000)
         backoff_multiplier: Backoff multiplier (1.0-5.0)
+        adaptive_timeout: Derive timeouts from observed latency per endpoint class
+        timeout_multiplier: Adaptive timeout = multiplier x p99 (1.0-20.0)
+        timeout_min_seconds: Lower clamp for adaptive timeouts (0.1-60)
+        timeout_max_seconds: Upper clamp for adaptive timeouts (0.1-60)
+        timeout_min_samples: Observations per endpoint class before adapting (1-1000)
+        hedge_enabled: Hedge slow GETs with a second request after the p95
+        hedge_budget_percent: Hedges allowed as % of eligible GETs (0-50)
+        retry_budget_percent: Retries allowed as % of requests (0-100)
+        max_backoff_ms: Cap for the jittered backoff (50-30000)
+        max_retry_after_seconds: Longest Retry-After waited for (0-60)
         
     Returns:
         Dict with success status and configuration
@@ -179,40 +212,123 @@ def configure_http_retry(max_attempts: int = 3, backoff_base_ms: int = 100,
     
     try:
         # Validate parameters
-        if not (1 <= max_attempts <= 10):
+        if max_attempts is not None and not (1 <= max_attempts <= 10):
             return create_error_response(
                 'max_attempts must be between 1 and 10',
                 'VALIDATION_ERROR'
             )
         
-        if not (50 <= backoff_base_ms <= 1000):
+        if backoff_base_ms is not None and not (50 <= backoff_base_ms <= 1000):
             return create_error_response(
                 'backoff_base_ms must be between 50 and 1000',
                 'VALIDATION_ERROR'
             )
         
-        if not (1.0 <= backoff_multiplier <= 5.0):
+        if backoff_multiplier is not None and not (1.0 <= backoff_multiplier <= 5.0):
             return create_error_response(
                 'backoff_multiplier must be between 1.0 and 5.0',
                 'VALIDATION_ERROR'
             )
         
+        if timeout_multiplier is not None and not (1.0 <= timeout_multiplier <= 20.0):
+            return create_error_response(
+                'timeout_multiplier must be between 1.0 and 20.0',
+                'VALIDATION_ERROR'
+            )
+        
+        for name, value in (('timeout_min_seconds', timeout_min_seconds),
+                            ('timeout_max_seconds', timeout_max_seconds)):
+            if value is not None and not (0.1 <= value <= 60.0):
+                return create_error_response(
+                    f'{name} must be between 0.1 and 60',
+                    'VALIDATION_ERROR'
+                )
+        
+        if timeout_min_samples is not None and not (1 <= timeout_min_samples <= 1000):
+            return create_error_response(
+                'timeout_min_samples must be between 1 and 1000',
+                'VALIDATION_ERROR'
+            )
+        
+        if hedge_budget_percent is not None and not (0.0 <= hedge_budget_percent <= 50.0):
+            return create_error_response(
+                'hedge_budget_percent must be between 0 and 50',
+                'VALIDATION_ERROR'
+            )
+        
+        if retry_budget_percent is not None and not (0.0 <= retry_budget_percent <= 100.0):
+            return create_error_response(
+                'retry_budget_percent must be between 0 and 100',
+                'VALIDATION_ERROR'
+            )
+        
+        if max_backoff_ms is not None and not (50 <= max_backoff_ms <= 30000):
+            return create_error_response(
+                'max_backoff_ms must be between 50 and 30000',
+                'VALIDATION_ERROR'
+            )
+        
+        if max_retry_after_seconds is not None and not (0.0 <= max_retry_after_seconds <= 60.0):
+            return create_error_response(
+                'max_retry_after_seconds must be between 0 and 60',
+                'VALIDATION_ERROR'
+            )
+        
         # Get current client
         from http_client_core import get_http_client
         client = get_http_client()
         
+        timeout_config = client._timeout_config
+        min_seconds = timeout_config['min_seconds'] if timeout_min_seconds is None else timeout_min_seconds
+        max_seconds = timeout_config['max_seconds'] if timeout_max_seconds is None else timeout_max_seconds
+        if min_seconds > max_seconds:
+            return create_error_response(
+                'timeout_min_seconds must not exceed timeout_max_seconds',
+                'VALIDATION_ERROR'
+            )
+        
         # Update retry configuration
-        client._retry_config['max_attempts'] = max_attempts
-        client._retry_config['backoff_base_ms'] = backoff_base_ms
-        client._retry_config['backoff_multiplier'] = backoff_multiplier
+        for key, value in (('max_attempts', max_attempts), ('backoff_base_ms', backoff_base_ms),
+                           ('backoff_multiplier', backoff_multiplier),
+                           ('max_backoff_ms', max_backoff_ms),
+                           ('max_retry_after_seconds', max_retry_after_seconds)):
+            if value is not None:
+                client._retry_config[key] = value
+        if retry_budget_percent is not None:
+            client._retry_budget.percent = retry_budget_percent
+        
+        # Update adaptive timeout configuration
+        for key, value in (('adaptive', adaptive_timeout), ('multiplier', timeout_multiplier),
+                           ('min_seconds', timeout_min_seconds), ('max_seconds', timeout_max_seconds),
+                           ('min_samples', timeout_min_samples)):
+            if value is not None:
+                timeout_config[key] = value
+        
+        # Update hedging configuration
+        if hedge_enabled is not None:
+            client._hedge_config['enabled'] = hedge_enabled
+        if hedge_budget_percent is not None:
+            client._hedge_budget.percent = hedge_budget_percent
         
-        log_info(f"Configured HTTP retry: max_attempts={max_attempts}, "
-                f"backoff_base_ms={backoff_base_ms}, backoff_multiplier={backoff_multiplier}")
+        retry_config = client._retry_config
+        log_info(f"Configured HTTP retry: max_attempts={retry_config['max_attempts']}, "
+                f"backoff_base_ms={retry_config['backoff_base_ms']}, "
+                f"backoff_multiplier={retry_config['backoff_multiplier']}, "
+                f"retry_budget_percent={client._retry_budget.percent}, "
+                f"adaptive_timeout={timeout_config}, "
+                f"hedge_enabled={client._hedge_config['enabled']}, "
+                f"hedge_budget_percent={client._hedge_budget.percent}")
         
         return create_success_response('HTTP retry configured', {
-            'max_attempts': max_attempts,
-            'backoff_base_ms': backoff_base_ms,
-            'backoff_multiplier': backoff_multiplier
+            'max_attempts': retry_config['max_attempts'],
+            'backoff_base_ms': retry_config['backoff_base_ms'],
+            'backoff_multiplier': retry_config['backoff_multiplier'],
+            'max_backoff_ms': retry_config['max_backoff_ms'],
+            'max_retry_after_seconds': retry_config['max_retry_after_seconds'],
+            'retry_budget_percent': client._retry_budget.percent,
+            'timeout_config': timeout_config.copy(),
+            'hedge_enabled': client._hedge_config['enabled'],
+            'hedge_budget_percent': client._hedge_budget.percent
         })
         
     except Exception as e:
@@ -253,7 +369,15 @@ def get_connection_statistics(**kwargs) -> Dict[str, Any]:
             'retries': retries,
             'success_rate': round(success_rate, 2),
             'failure_rate': round(failure_rate, 2),
-            'retry_config': client._retry_config.copy()
+            'retry_config': client._retry_config.copy(),
+            'timeout_config': client._timeout_config.copy(),
+            'latency': stats.get('latency', {}),
+            'retry_budget': stats.get('retry_budget', {}),
+            'hedging': stats.get('hedging', {}),
+            'tls': stats.get('tls', {}),
+            'prewarm': stats.get('prewarm'),
+            'response_cache': stats.get('response_cache', {}),
+            'concurrent': stats.get('concurrent')
         }
         
         return create_success_response('Statistics retrieved', statistics)
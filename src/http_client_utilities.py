@@ -1,9 +1,13 @@
 """
 http_client_utilities.py - HTTP Client Utilities
-Version: 2025.10.14.01
+Version: 2026.10.18.02
 Description: Utility functions for HTTP operations (headers, query strings, parsing).
              Internal module - accessed via http_client.py interface.
 
+CHANGELOG:
+- 2026.10.18.02: parse_json_body accepts bytearray (decompressed bodies)
+- 2026.10.18.01: Added parse_json_body (JSON parsed from the bytes buffer)
+
 Copyright 2025 Joseph Hersey
 
    Licensed under the Apache License, Version 2.0 (the "License");
@@ -19,7 +23,8 @@ Copyright 2025 Joseph Hersey
    limitations under the License.
 """
 
-from typing import Dict, Any, Optional
+import json
+from typing import Dict, Any, Optional, Union
 from urllib.parse import urlencode
 
 
@@ -63,6 +68,24 @@ def parse_response_headers_fast(headers: Dict[str, Any]) -> Dict[str, Any]:
     return parse_response_headers(headers)
 
 
+def parse_json_body(data: Union[bytes, bytearray]) -> Any:
+    """
+    Parse a response body as JSON straight from the bytes buffer.
+    
+    json.loads() detects the encoding of bytes itself; the decoded text
+    only exists for the duration of the parse.
+    
+    Returns:
+        Parsed JSON, None for an empty body, the raw bytes if not JSON
+    """
+    if not data:
+        return None
+    try:
+        return json.loads(data)
+    except ValueError:  # JSONDecodeError and UnicodeDecodeError
+        return bytes(data) if isinstance(data, bytearray) else data
+
+
 def process_response(response_data: Dict[str, Any], expected_format: str = 'json',
                     validation_rules: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Process and validate HTTP response."""
@@ -76,6 +99,7 @@ __all__ = [
     'build_query_string_fast',
     'parse_response_headers',
     'parse_response_headers_fast',
+    'parse_json_body',
     'process_response',
 ]
 
@@ -0,0 +1,221 @@
+"""
+http_client_warmup.py - Connection Pre-Warming and TLS Session Reuse
+Version: 2026.10.18.01
+Description: Opens pooled keep-alive connections during Lambda INIT and keeps
+             TLS sessions for resumption on reconnect.
+             Internal module - used by http_client_core.py.
+
+CHANGELOG:
+- 2026.10.18.01: Initial version
+  - TLSSessionCache / ResumingSSLContext: last TLS session per host is
+    offered on the next handshake (abbreviated handshake on reconnect)
+  - open_warm_connection(): DNS + TCP + TLS into the urllib3 pool, no
+    HTTP request sent
+
+DESIGN DECISION: Connect only, no HTTP request
+Reason: A request to HA before the token is known would be an
+unauthenticated call, which HA logs (and can ip-ban) as a failed login.
+The expensive part is DNS + TCP + TLS anyway; the opened connection is put
+into the pool that the first real request takes its connection from.
+
+DESIGN DECISION: TLS 1.3 session tickets are read during warm-up
+Reason: TLS 1.3 servers send session tickets after the handshake. Left
+unread, they make the idle socket readable, and urllib3 treats a readable
+idle socket as dropped - it would discard the warm connection. Reading
+them (non-blocking, at most TLS_TICKET_WAIT_SECONDS) also makes the
+session available for resumption.
+
+DESIGN DECISION: Sessions captured from live sockets
+Reason: A socket's session can only be read while it is open, and urllib3
+closes dropped connections just before opening the replacement. The
+client captures the session after responses, so the replacement
+handshake can still resume it.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import select
+import ssl
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+# Longest wait for TLS 1.3 session tickets after a warm handshake
+TLS_TICKET_WAIT_SECONDS = 0.2
+
+
+class TLSSessionCache:
+    """Last TLS session per server hostname, plus handshake counters."""
+
+    def __init__(self):
+        self._sessions: Dict[str, ssl.SSLSession] = {}
+        self._live: Dict[str, ssl.SSLSocket] = {}
+        self.handshakes = 0
+        self.resumed = 0
+
+    def get(self, hostname: Optional[str]) -> Optional[ssl.SSLSession]:
+        """Session to offer for hostname (None = full handshake)."""
+        if hostname is None:
+            return None
+        self._capture(hostname)
+        return self._sessions.get(hostname)
+
+    def track(self, hostname: Optional[str], sock: ssl.SSLSocket) -> None:
+        """Record a completed handshake and keep the socket for session capture."""
+        self.handshakes += 1
+        if sock.session_reused:
+            self.resumed += 1
+        if hostname is not None:
+            self._live[hostname] = sock
+            self._capture(hostname)
+
+    def capture(self) -> None:
+        """Capture sessions (incl. TLS 1.3 tickets received since) from live sockets."""
+        for hostname in self._live:
+            self._capture(hostname)
+
+    def _capture(self, hostname: str) -> None:
+        sock = self._live.get(hostname)
+        if sock is None:
+            return
+        try:
+            session = sock.session
+        except (AttributeError, ValueError, OSError):
+            session = None
+        if session is not None:
+            self._sessions[hostname] = session
+
+    def clear(self) -> None:
+        self._sessions.clear()
+        self._live.clear()
+        self.handshakes = 0
+        self.resumed = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'handshakes': self.handshakes,
+            'resumed': self.resumed,
+            'resumption_rate': round(self.resumed / self.handshakes, 4) if self.handshakes else 0.0,
+            'sessions': len(self._sessions)
+        }
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """SSLContext offering the cached session of the same host on every handshake."""
+
+    sessions: TLSSessionCache
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None:
+            session = self.sessions.get(server_hostname)
+        tls_sock = super().wrap_socket(sock, *args, server_hostname=server_hostname,
+                                       session=session, **kwargs)
+        self.sessions.track(server_hostname, tls_sock)
+        return tls_sock
+
+
+def create_ssl_context(verify_ssl: bool, sessions: TLSSessionCache) -> ResumingSSLContext:
+    """
+    Client SSLContext with session resumption (urllib3 ssl_context).
+
+    Args:
+        verify_ssl: Verify certificates and hostnames (system CA store)
+        sessions: Session cache shared by all connections of the client
+    """
+    context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.sessions = sessions
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    if verify_ssl:
+        context.load_default_certs()
+    else:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def _read_session_tickets(sock: ssl.SSLSocket, wait_seconds: float) -> None:
+    """Process TLS 1.3 post-handshake messages without consuming application data."""
+    if sock.version() != 'TLSv1.3':
+        return
+    previous_timeout = sock.gettimeout()
+    try:
+        sock.setblocking(False)
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                return
+            try:
+                # A server sends no data before a request, so this only
+                # processes ticket records; EOF is left to urllib3's
+                # dropped-connection check
+                sock.recv(1)
+                return
+            except ssl.SSLWantReadError:
+                deadline = min(deadline, time.monotonic() + 0.02)
+    finally:
+        sock.settimeout(previous_timeout)
+
+
+def open_warm_connection(pool_manager, url: str, timeout: float) -> Dict[str, Any]:
+    """
+    Open one keep-alive connection to url's host and put it into the pool.
+
+    Args:
+        pool_manager: urllib3 PoolManager of the HTTP client
+        url: Any URL on the target host (path is ignored)
+        timeout: Connect timeout in seconds (DNS + TCP + TLS)
+
+    Returns:
+        Dict with success, host, connect_ms, tls_version, connections
+        (pool connection count after warming) or error details
+
+    Never raises - the first real request simply connects itself.
+    """
+    start = time.perf_counter()
+    parts = urlsplit(url)
+    result: Dict[str, Any] = {'host': parts.hostname, 'scheme': parts.scheme}
+    conn = None
+    pool = None
+    try:
+        pool = pool_manager.connection_from_url(url)
+        conn = pool._get_conn()
+        conn.timeout = timeout
+        conn.connect()
+        tls_version = None
+        if isinstance(conn.sock, ssl.SSLSocket):
+            tls_version = conn.sock.version()
+            _read_session_tickets(conn.sock, min(timeout, TLS_TICKET_WAIT_SECONDS))
+        result.update({
+            'success': True,
+            'connect_ms': round((time.perf_counter() - start) * 1000, 2),
+            'tls_version': tls_version,
+            'connections': pool.num_connections
+        })
+    except Exception as e:
+        if conn is not None:
+            conn.close()
+            conn = None
+        result.update({
+            'success': False,
+            'connect_ms': round((time.perf_counter() - start) * 1000, 2),
+            'error': str(e),
+            'error_type': type(e).__name__
+        })
+    finally:
+        # Always hand the slot back (None = empty slot, as urllib3 does)
+        if pool is not None:
+            pool._put_conn(conn)
+    return result
+
+
+__all__ = [
+    'TLSSessionCache',
+    'ResumingSSLContext',
+    'create_ssl_context',
+    'open_warm_connection',
+    'TLS_TICKET_WAIT_SECONDS',
+]
+
+# EOF
@@ -1,9 +1,10 @@
 """
 initialization_core.py
-Version: 2025.10.22.01
+Version: 2026.10.18.01
 Description: Lambda initialization with SINGLETON pattern, rate limiting, NO threading locks
 
 CHANGELOG:
+- 2026.10.18.01: Rate limiting via shared GCRA limiter (rate_limiter.py) replaces deque window
 - 2025.10.22.01: Phase 1 + 3 optimizations (Session 6)
   - REMOVED threading locks (CRITICAL FIX - was violating AP-08, DEC-04)
   - ADDED SINGLETON pattern with get_initialization_manager()
@@ -23,7 +24,7 @@ import os
 import sys
 import time
 from typing import Dict, Any, Optional
-from collections import deque
+from rate_limiter import get_rate_limiter
 from enum import Enum
 
 _USE_GENERIC_OPERATIONS = os.environ.get('USE_GENERIC_OPERATIONS', 'true').lower() == 'true'
@@ -59,32 +60,20 @@ class InitializationCore:
         self._init_duration_ms: Optional[float] = None
         
         # Rate limiting (1000 ops/sec for infrastructure - LESS-21)
-        self._rate_limiter = deque(maxlen=1000)
-        self._rate_limit_window_ms = 1000
-        self._rate_limited_count = 0
+        self._rate_limiter = get_rate_limiter('initialization', 1000)
     
     def _check_rate_limit(self) -> bool:
         """
-        Check rate limit (1000 ops/sec).
+        Check if operation is within rate limit.
+        
+        Shared GCRA limiter 'initialization' (rate_limiter.py): O(1), monotonic clock.
+        No threading locks needed (AP-08, DEC-04).
         
         Returns:
-            True if within rate limit, False if rate limited
+            bool: True if operation allowed, False if rate limited
         """
-        now = time.time() * 1000
-        
-        # Remove timestamps outside window
-        while self._rate_limiter and (now - self._rate_limiter[0]) > self._rate_limit_window_ms:
-            self._rate_limiter.popleft()
-        
-        # Check if at limit
-        if len(self._rate_limiter) >= 1000:
-            self._rate_limited_count += 1
-            return False
-        
-        # Add timestamp
-        self._rate_limiter.append(now)
-        return True
-    
+        return self._rate_limiter.allow()
+
     def initialize(self, config: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Initialize Lambda environment with idempotency (Issue #44).
@@ -179,8 +168,7 @@ class InitializationCore:
         self._init_duration_ms = None
         
         # Reset rate limiter
-        self._rate_limiter.clear()
-        self._rate_limited_count = 0
+        self._rate_limiter.reset()
         
         return {
             'status': 'reset',
@@ -207,7 +195,7 @@ class InitializationCore:
             'uptime_seconds': (time.time() - self._init_timestamp) if self._init_timestamp else None,
             'flag_count': len(self._flags),
             'config_keys': list(self._config.keys()) if self._initialized else [],
-            'rate_limited_count': self._rate_limited_count,
+            'rate_limited_count': self._rate_limiter.rejected,
             'use_generic_operations': _USE_GENERIC_OPERATIONS
         }
     
@@ -1,9 +1,11 @@
 """
 interface_circuit_breaker.py - Circuit Breaker Interface Router
-Version: 2025.10.22.02
+Version: 2026.10.18.01
 Description: Router/Firewall for circuit breaker interface with import protection
 
 CHANGELOG:
+- 2026.10.18.01: Added allow and record operations (protection for calls
+                 that can't be passed as a function, e.g. asyncio requests)
 - 2025.10.22.02: Added get_stats and reset operations
 - 2025.10.17.15: FIXED Issue #20 - Added import error protection
   - Added try/except wrapper for circuit_breaker_core imports
@@ -24,6 +26,8 @@ try:
     from circuit_breaker_core import (
         get_breaker_implementation,
         execute_with_breaker_implementation,
+        allow_implementation,
+        record_implementation,
         get_all_states_implementation,
         reset_all_implementation,
         get_stats_implementation,
@@ -36,13 +40,15 @@ except ImportError as e:
     _CIRCUIT_BREAKER_IMPORT_ERROR = str(e)
     get_breaker_implementation = None
     execute_with_breaker_implementation = None
+    allow_implementation = None
+    record_implementation = None
     get_all_states_implementation = None
     reset_all_implementation = None
     get_stats_implementation = None
     reset_implementation = None
 
 
-_VALID_CIRCUIT_BREAKER_OPERATIONS = ['get', 'call', 'get_all_states', 'reset_all', 'get_stats', 'reset']
+_VALID_CIRCUIT_BREAKER_OPERATIONS = ['get', 'call', 'allow', 'record', 'get_all_states', 'reset_all', 'get_stats', 'reset']
 
 
 def execute_circuit_breaker_operation(operation: str, **kwargs) -> Any:
@@ -91,6 +97,17 @@ def execute_circuit_breaker_operation(operation: str, **kwargs) -> Any:
             raise TypeError(f"circuit_breaker.call 'func' must be callable, got {type(kwargs['func']).__name__}")
         return execute_with_breaker_implementation(**kwargs)
     
+    elif operation in ('allow', 'record'):
+        if 'name' not in kwargs:
+            raise ValueError(f"circuit_breaker.{operation} requires 'name' parameter")
+        if not isinstance(kwargs['name'], str):
+            raise TypeError(f"circuit_breaker.{operation} 'name' must be str, got {type(kwargs['name']).__name__}")
+        if operation == 'allow':
+            return allow_implementation(**kwargs)
+        if 'success' not in kwargs or 'duration_ms' not in kwargs:
+            raise ValueError("circuit_breaker.record requires 'success' and 'duration_ms' parameters")
+        return record_implementation(**kwargs)
+    
     elif operation == 'get_all_states':
         return get_all_states_implementation(**kwargs)
     
@@ -1,8 +1,13 @@
 """
 interface_http.py - HTTP Interface Router (SUGA-ISP Architecture)
-Version: 2025.10.17.17
+Version: 2026.10.18.03
 Description: Router for HTTP interface with dispatch dictionary pattern
 
+CHANGELOG:
+- 2026.10.18.03: request_concurrent operation (asyncio fan-out)
+- 2026.10.18.02: prewarm operation (INIT-phase connection pre-warming)
+- 2026.10.18.01: configure_retry and get_statistics routed to http_client_state
+
 Copyright 2025 Joseph Hersey
 Licensed under the Apache License, Version 2.0
 """
@@ -19,8 +24,12 @@ try:
         http_put_implementation,
         http_delete_implementation,
         http_reset_implementation,
+        http_prewarm_implementation,
+        http_request_concurrent_implementation,
         get_state_implementation,
-        reset_state_implementation
+        reset_state_implementation,
+        configure_retry_implementation,
+        get_statistics_implementation
     )
     _HTTP_AVAILABLE = True
     _HTTP_IMPORT_ERROR = None
@@ -33,8 +42,12 @@ except ImportError as e:
     http_put_implementation = None
     http_delete_implementation = None
     http_reset_implementation = None
+    http_prewarm_implementation = None
+    http_request_concurrent_implementation = None
     get_state_implementation = None
     reset_state_implementation = None
+    configure_retry_implementation = None
+    get_statistics_implementation = None
 
 
 # ===== VALIDATION HELPERS =====
@@ -65,6 +78,29 @@ def _validate_request_params(kwargs: Dict[str, Any]) -> None:
         )
 
 
+def _validate_concurrent_params(kwargs: Dict[str, Any]) -> None:
+    """Validate request_concurrent parameters (list of request dicts)."""
+    requests = kwargs.get('requests')
+    if not isinstance(requests, list):
+        raise TypeError(
+            f"http.request_concurrent 'requests' must be list, got {type(requests).__name__}"
+        )
+    for index, request in enumerate(requests):
+        if not isinstance(request, dict):
+            raise TypeError(
+                f"http.request_concurrent requests[{index}] must be dict, got {type(request).__name__}"
+            )
+        if not isinstance(request.get('url'), str):
+            raise ValueError(f"http.request_concurrent requests[{index}] requires str 'url'")
+        if not isinstance(request.get('method', 'GET'), str):
+            raise TypeError(f"http.request_concurrent requests[{index}] 'method' must be str")
+        for unsupported in ('stream', 'cache_policy'):
+            if request.get(unsupported):
+                raise ValueError(
+                    f"http.request_concurrent requests[{index}]: '{unsupported}' is not supported"
+                )
+
+
 def _not_implemented_operation(operation: str):
     """Return function that raises NotImplementedError for unimplemented operations."""
     def _raise_not_implemented(**kwargs):
@@ -106,12 +142,21 @@ def _build_dispatch_dict() -> Dict[str, Callable]:
         )[1],
         
         'reset': http_reset_implementation,
+        
+        'prewarm': lambda **kwargs: (
+            _validate_url_param(kwargs, 'prewarm'),
+            http_prewarm_implementation(**kwargs)
+        )[1],
+        
+        'request_concurrent': lambda **kwargs: (
+            _validate_concurrent_params(kwargs),
+            http_request_concurrent_implementation(**kwargs)
+        )[1],
+        
         'get_state': get_state_implementation,
         'reset_state': reset_state_implementation,
-        
-        # Not yet implemented operations (Issue #17 fix)
-        'configure_retry': _not_implemented_operation('configure_retry'),
-        'get_statistics': _not_implemented_operation('get_statistics'),
+        'configure_retry': configure_retry_implementation,
+        'get_statistics': get_statistics_implementation,
     }
 
 _OPERATION_DISPATCH = _build_dispatch_dict() if _HTTP_AVAILABLE else {}
@@ -1,9 +1,13 @@
 # Filename: interface_logging.py
 """
 interface_logging.py - Logging Router (SECURITY HARDENED)
-Version: 2025.10.22.01
+Version: 2026.10.18.01
 Description: Firewall router for LOGGING interface with security sanitization
 
+CHANGES (2026.10.18.01):
+- Added get_logger operation (structured logger handle, no per-event
+  dispatch; the handle redacts/truncates fields itself)
+
 CHANGES (2025.10.22.01):
 - Added reset operation to dispatch table (Phase 1 compliance)
 
@@ -27,6 +31,7 @@ from logging_core import (
     _execute_log_operation_success_implementation,
     _execute_log_operation_failure_implementation,
     _execute_log_reset_implementation,
+    _execute_get_logger_implementation,
 )
 
 # ===== DEBUG_MODE SUPPORT =====
@@ -156,6 +161,7 @@ _OPERATION_DISPATCH: Dict[str, Callable] = {
     'log_operation_start': _execute_log_operation_start_implementation,
     'log_operation_success': _execute_log_operation_success_implementation,
     'log_operation_failure': _execute_log_operation_failure_implementation,
+    'get_logger': _execute_get_logger_implementation,
     'reset': _execute_log_reset_implementation,
     'reset_logging': _execute_log_reset_implementation,
 }
@@ -1,10 +1,16 @@
 """
 interface_metrics.py - Metrics interface layer (SUGA compliant)
 
-Version: 2025.11.29.REFACTOR_01
+Version: 2026.10.18.03
 Description: PHASE 2 - Rewrite to proper SUGA pattern
 
 CHANGELOG:
+- 2026.10.18.03: 'counter' / 'distribution' operations (interned metric
+  handles - resolve once, then inc()/observe() without dispatch)
+- 2026.10.18.02: 'gauge' / 'set_gauge' and 'flush_emf' operations
+  (CloudWatch EMF export, metrics_emf.py)
+- 2026.10.18.01: 'histogram' / 'record_histogram' / 'merge_histogram'
+  operations (quantile sketches in metrics_core)
 - 2025.11.29.REFACTOR_01: Complete SUGA refactoring
   - REMOVED: All private function imports from metrics_operations
   - REMOVED: metrics_operations.py dependency (will be deleted)
@@ -66,6 +72,14 @@ def execute_metrics_operation(operation: str, **kwargs) -> Any:
         'get_dispatcher_metrics': metrics_core.get_dispatcher_stats,
         'get_operation_metrics': metrics_core.get_operation_metrics,
         'get_performance_report': metrics_core.get_performance_report,
+        'histogram': metrics_core.record_histogram,
+        'record_histogram': metrics_core.record_histogram,
+        'merge_histogram': metrics_core.merge_histogram,
+        'gauge': metrics_core.set_gauge,
+        'set_gauge': metrics_core.set_gauge,
+        'flush_emf': metrics_core.flush_emf,
+        'counter': metrics_core.counter,
+        'distribution': metrics_core.distribution,
         'reset': metrics_core.reset_metrics,
         'reset_metrics': metrics_core.reset_metrics,
     }
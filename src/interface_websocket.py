@@ -1,6 +1,6 @@
 """
 interface_websocket.py - WebSocket CLIENT Interface Router (SUGA-ISP Architecture)
-Version: 2025.10.22.02
+Version: 2026.10.18.03
 Description: Firewall router for WebSocket CLIENT interface with free tier compliance.
              Gateway calls only this file. Internal implementations in websocket_core.
 
@@ -29,7 +29,13 @@ If WebSocket SERVER functionality is ever needed:
 
 To maintain permanent free tier compliance, this implementation is CLIENT-ONLY.
 
+NOTE: Persistent CLIENT sessions (session_request) keep an OUTBOUND socket open
+in the warm container between invocations. This is still client-only and free tier.
+
 CHANGELOG:
+- 2026.10.18.03: Added session_subscribe, session_poll operations
+- 2026.10.18.02: Added session_pipeline operation
+- 2026.10.18.01: Added session_request, session_close, session_stats operations
 - 2025.10.22.02: Added get_stats and reset operations
 - 2025.10.18.01: Added free tier compliance documentation
 - 2025.10.17.14: FIXED Issue #20 - Added import error protection
@@ -61,6 +67,12 @@ try:
         websocket_receive_implementation,
         websocket_close_implementation,
         websocket_request_implementation,
+        websocket_session_request_implementation,
+        websocket_session_pipeline_implementation,
+        websocket_session_subscribe_implementation,
+        websocket_session_poll_implementation,
+        websocket_session_close_implementation,
+        websocket_session_stats_implementation,
         websocket_get_stats_implementation,
         websocket_reset_implementation
     )
@@ -74,6 +86,12 @@ except ImportError as e:
     websocket_receive_implementation = None
     websocket_close_implementation = None
     websocket_request_implementation = None
+    websocket_session_request_implementation = None
+    websocket_session_pipeline_implementation = None
+    websocket_session_subscribe_implementation = None
+    websocket_session_poll_implementation = None
+    websocket_session_close_implementation = None
+    websocket_session_stats_implementation = None
     websocket_get_stats_implementation = None
     websocket_reset_implementation = None
 
@@ -110,6 +128,19 @@ def _validate_request_params(kwargs: Dict[str, Any]) -> None:
     _validate_message_param(kwargs, 'request')
 
 
+def _validate_session_request_params(kwargs: Dict[str, Any]) -> None:
+    """Validate session_request operation parameters."""
+    _validate_url_param(kwargs, 'session_request')
+    _validate_message_param(kwargs, 'session_request')
+
+
+def _validate_session_pipeline_params(kwargs: Dict[str, Any]) -> None:
+    """Validate session_pipeline operation parameters."""
+    _validate_url_param(kwargs, 'session_pipeline')
+    if 'messages' not in kwargs:
+        raise ValueError("websocket.session_pipeline requires 'messages' parameter")
+
+
 # ===== DISPATCH DICTIONARY =====
 
 def _build_dispatch_dict() -> Dict[str, Callable]:
@@ -145,6 +176,31 @@ def _build_dispatch_dict() -> Dict[str, Callable]:
             websocket_request_implementation(**kwargs)
         )[1],
         
+        'session_request': lambda **kwargs: (
+            _validate_session_request_params(kwargs),
+            websocket_session_request_implementation(**kwargs)
+        )[1],
+        
+        'session_pipeline': lambda **kwargs: (
+            _validate_session_pipeline_params(kwargs),
+            websocket_session_pipeline_implementation(**kwargs)
+        )[1],
+        
+        'session_subscribe': lambda **kwargs: (
+            _validate_url_param(kwargs, 'session_subscribe'),
+            _validate_message_param(kwargs, 'session_subscribe'),
+            websocket_session_subscribe_implementation(**kwargs)
+        )[2],
+        
+        'session_poll': lambda **kwargs: (
+            _validate_url_param(kwargs, 'session_poll'),
+            websocket_session_poll_implementation(**kwargs)
+        )[1],
+        
+        'session_close': lambda **kwargs: websocket_session_close_implementation(**kwargs),
+        
+        'session_stats': lambda **kwargs: websocket_session_stats_implementation(**kwargs),
+        
         'get_stats': lambda **kwargs: websocket_get_stats_implementation(),
         
         'reset': lambda **kwargs: websocket_reset_implementation(),
@@ -0,0 +1,248 @@
+"""
+invocation_context.py - Per-Invocation Context (Deadline Budgeting)
+Version: 2026.10.18.03
+Description: Invocation deadline derived from Lambda remaining time
+
+CHANGELOG:
+- 2026.10.18.03: Invocation correlation ID, end hooks actually run
+  - get_correlation_id() - aws_request_id of the running invocation, so
+    hot paths don't generate a UUID per call
+  - end_invocation() now runs the registered end hooks (they were stored
+    but never called)
+- 2026.10.18.02: Invocation end hooks
+  - register_invocation_end_hook() - callbacks run by end_invocation(), i.e.
+    right before the container may be frozen
+- 2026.10.18.01: Initial version
+  - InvocationDeadline built from context.get_remaining_time_in_millis()
+  - Capped by ALEXA_RESPONSE_BUDGET_MS (Alexa gives us 8 seconds)
+  - begin_invocation()/end_invocation() lifecycle called by lambda_function
+  - Deadline misses tracked for monitoring
+
+DESIGN DECISION: Module-level current deadline
+Reason: Lambda processes one event per container at a time (DEC-04), so the
+deadline of the running invocation can live at module level. Callers may
+still pass deadline= explicitly; the module-level value is the fallback
+when nothing is threaded through.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+# Alexa Smart Home skills must answer within 8 seconds
+ALEXA_RESPONSE_BUDGET_MS = int(os.getenv('ALEXA_RESPONSE_BUDGET_MS', '8000'))
+
+# Time kept back for building and returning the response
+DEADLINE_SAFETY_MARGIN_MS = int(os.getenv('DEADLINE_SAFETY_MARGIN_MS', '250'))
+
+# Below this remaining budget, optional work (enrichment, refreshes) is skipped
+DEADLINE_LOW_BUDGET_MS = int(os.getenv('DEADLINE_LOW_BUDGET_MS', '1500'))
+
+
+class InvocationDeadline:
+    """
+    Absolute deadline for the current invocation.
+
+    Uses time.monotonic() so wall-clock adjustments never shift the budget.
+    """
+
+    __slots__ = ('_expires_at', 'budget_ms', 'low_budget_ms', 'misses')
+
+    def __init__(self, budget_ms: float, low_budget_ms: float = DEADLINE_LOW_BUDGET_MS):
+        self.budget_ms = max(0.0, float(budget_ms))
+        self.low_budget_ms = low_budget_ms
+        self._expires_at = time.monotonic() + (self.budget_ms / 1000.0)
+        self.misses = 0
+
+    @classmethod
+    def from_context(cls, context: Any, cap_ms: Optional[float] = None,
+                     safety_margin_ms: float = DEADLINE_SAFETY_MARGIN_MS) -> 'InvocationDeadline':
+        """
+        Build deadline from Lambda context.
+
+        Args:
+            context: Lambda context object (may be None outside Lambda)
+            cap_ms: Optional upper bound (e.g. ALEXA_RESPONSE_BUDGET_MS)
+            safety_margin_ms: Time reserved for returning the response
+
+        Returns:
+            InvocationDeadline instance
+        """
+        remaining_ms = None
+        try:
+            remaining_ms = float(context.get_remaining_time_in_millis())
+        except Exception:
+            remaining_ms = None
+
+        if remaining_ms is None:
+            remaining_ms = float(cap_ms) if cap_ms else float(ALEXA_RESPONSE_BUDGET_MS)
+        elif cap_ms:
+            remaining_ms = min(remaining_ms, float(cap_ms))
+
+        return cls(remaining_ms - safety_margin_ms)
+
+    def remaining_ms(self) -> float:
+        """Milliseconds left before the deadline (never negative)."""
+        return max(0.0, (self._expires_at - time.monotonic()) * 1000.0)
+
+    def remaining_seconds(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Check if the deadline has passed."""
+        return time.monotonic() >= self._expires_at
+
+    def is_low(self, threshold_ms: Optional[float] = None) -> bool:
+        """Check if remaining budget is below the low-budget threshold."""
+        threshold = self.low_budget_ms if threshold_ms is None else threshold_ms
+        return self.remaining_ms() < threshold
+
+    def allows(self, duration_ms: float) -> bool:
+        """Check if an operation of duration_ms still fits in the budget."""
+        return self.remaining_ms() > duration_ms
+
+    def cap_timeout(self, timeout_seconds: Optional[float]) -> float:
+        """
+        Cap a timeout to the remaining budget.
+
+        Args:
+            timeout_seconds: Requested timeout (None = use remaining budget)
+
+        Returns:
+            Timeout in seconds, 0.0 if the deadline has already passed
+        """
+        remaining = self.remaining_seconds()
+        if timeout_seconds is None:
+            return remaining
+        return min(float(timeout_seconds), remaining)
+
+    def record_miss(self) -> None:
+        """Count an operation abandoned or cut short by the deadline."""
+        self.misses += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Deadline snapshot for logging and diagnostics."""
+        return {
+            'budget_ms': self.budget_ms,
+            'remaining_ms': round(self.remaining_ms(), 2),
+            'expired': self.expired(),
+            'misses': self.misses
+        }
+
+
+# ===== CURRENT INVOCATION =====
+
+_CURRENT_DEADLINE: Optional[InvocationDeadline] = None
+
+_CURRENT_CORRELATION_ID: Optional[str] = None
+
+_END_HOOKS: List[Callable[[], None]] = []
+
+_STATS = {
+    'invocations': 0,
+    'deadline_missed_invocations': 0,
+    'deadline_misses': 0,
+    'end_hook_errors': 0
+}
+
+
+def begin_invocation(context: Any, cap_ms: Optional[float] = ALEXA_RESPONSE_BUDGET_MS) -> InvocationDeadline:
+    """
+    Start a new invocation and set its deadline.
+
+    Args:
+        context: Lambda context
+        cap_ms: Upper bound on the budget (None = Lambda remaining time only)
+
+    Returns:
+        The deadline for this invocation
+    """
+    global _CURRENT_DEADLINE, _CURRENT_CORRELATION_ID
+    _CURRENT_DEADLINE = InvocationDeadline.from_context(context, cap_ms=cap_ms)
+    _CURRENT_CORRELATION_ID = getattr(context, 'aws_request_id', None) or str(uuid.uuid4())
+    _STATS['invocations'] += 1
+    return _CURRENT_DEADLINE
+
+
+def end_invocation() -> Dict[str, Any]:
+    """
+    Finish the current invocation and clear its deadline.
+
+    Returns:
+        Deadline summary (empty dict if no invocation was active)
+    """
+    global _CURRENT_DEADLINE, _CURRENT_CORRELATION_ID
+    deadline = _CURRENT_DEADLINE
+    _CURRENT_DEADLINE = None
+
+    if deadline is None:
+        _CURRENT_CORRELATION_ID = None
+        return {}
+
+    summary = deadline.to_dict()
+    if deadline.misses or deadline.expired():
+        _STATS['deadline_missed_invocations'] += 1
+        _STATS['deadline_misses'] += deadline.misses
+
+    # Hooks still see the correlation ID of the invocation they close
+    for callback in _END_HOOKS:
+        try:
+            callback()
+        except Exception:
+            _STATS['end_hook_errors'] += 1
+    _CURRENT_CORRELATION_ID = None
+    return summary
+
+
+def register_invocation_end_hook(callback: Callable[[], None]) -> None:
+    """
+    Run callback at the end of every invocation (before a possible freeze).
+    
+    Registering the same callback twice has no effect. Hook errors are
+    counted, never raised.
+    """
+    if callback not in _END_HOOKS:
+        _END_HOOKS.append(callback)
+
+
+def get_invocation_deadline() -> Optional[InvocationDeadline]:
+    """Get deadline of the running invocation (None outside an invocation)."""
+    return _CURRENT_DEADLINE
+
+
+def get_correlation_id() -> Optional[str]:
+    """
+    Get correlation ID of the running invocation.
+
+    Lambda's aws_request_id (a UUID generated once per invocation when the
+    context has none). None outside an invocation.
+    """
+    return _CURRENT_CORRELATION_ID
+
+
+def get_invocation_stats() -> Dict[str, Any]:
+    """Get invocation deadline statistics."""
+    stats = _STATS.copy()
+    stats['active'] = _CURRENT_DEADLINE is not None
+    return stats
+
+
+__all__ = [
+    'InvocationDeadline',
+    'begin_invocation',
+    'end_invocation',
+    'register_invocation_end_hook',
+    'get_invocation_deadline',
+    'get_correlation_id',
+    'get_invocation_stats',
+    'ALEXA_RESPONSE_BUDGET_MS',
+    'DEADLINE_SAFETY_MARGIN_MS',
+    'DEADLINE_LOW_BUDGET_MS',
+]
+
+# EOF
@@ -1,9 +1,33 @@
 # lambda_function.py
 """
 lambda_function.py - AWS Lambda Entry Point (SELECTIVE IMPORTS + LUGS + HA-SUGA)
-Version: 2025.12.06.1
+Version: 2026.10.18.4
 Description: Production code with lambda_preload + HA-SUGA subdirectory + LWA OAuth
 
+CHANGES (2026.10.18.4 - STRUCTURED LOGGING):
+- MODIFIED: _extract_oauth_token logs structured DEBUG events (fields,
+  formatted only when DEBUG is on) instead of ~10 INFO f-strings with
+  key-list dumps per directive
+- MODIFIED: No-token failure logs the directive/endpoint/payload keys
+  instead of json.dumps(event, indent=2)
+
+CHANGES (2026.10.18.3 - EMF METRICS):
+- ADDED: flush_emf_metrics() after end_invocation() - one CloudWatch EMF
+  line per invocation on stdout (EMF_ENABLED=true), including
+  lambda_deadline_missed
+
+CHANGES (2026.10.18.2 - INIT PRE-WARMING):
+- ADDED: Opt-in connection pre-warming during INIT (HTTP_PREWARM_ENABLED)
+  - Opens a keep-alive (TLS) connection to HOME_ASSISTANT_URL
+  - HTTP_PREWARM_SSM=true also fetches the HA token from SSM (warm SSM
+    connection, token cached for the first invocation)
+  - Failures are logged and ignored; the first request connects itself
+
+CHANGES (2026.10.18.1 - DEADLINE BUDGETING):
+- ADDED: Per-invocation deadline from context.get_remaining_time_in_millis()
+- Alexa requests capped to ALEXA_RESPONSE_BUDGET_MS (8s Alexa limit)
+- ADDED: lambda_deadline_missed metric when an invocation overruns its budget
+
 CHANGES (2025.12.06.1 - DEBUG EVENT STRUCTURE):
 - ADDED: Full event structure logging for OAuth debugging
 - ADDED: Multiple token location checks
@@ -22,7 +46,6 @@ if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
  
 # ===== STANDARD IMPORTS =====
-import json
 import time
 from typing import Dict, Any
 
@@ -50,8 +73,11 @@ from gateway import (
     log_info, log_error, log_debug,
     execute_operation, GatewayInterface,
     increment_counter, format_response,
-    validate_request, validate_token
+    validate_request, validate_token,
+    begin_invocation, end_invocation,
+    flush_emf_metrics, get_logger
 )
+from invocation_context import ALEXA_RESPONSE_BUDGET_MS
 
 _gateway_time = (time.perf_counter() - _timing_start) * 1000
 _print_timing(f"Gateway imports complete: {_gateway_time:.2f}ms")
@@ -78,8 +104,58 @@ else:
     _print_timing("HOME_ASSISTANT_ENABLE=false, HA-SUGA not loaded")
 
 
+# ===== OPTIONAL: INIT-PHASE CONNECTION PRE-WARMING =====
+
+HTTP_PREWARM_ENABLED = os.getenv('HTTP_PREWARM_ENABLED', 'false').lower() == 'true'
+HTTP_PREWARM_SSM = os.getenv('HTTP_PREWARM_SSM', 'false').lower() == 'true'
+
+
+def _prewarm_connections() -> None:
+    """
+    Open connections during INIT (not billed to, and not slowing, the first invocation).
+    
+    DESIGN DECISION: Degrade to a cold first request, never fail INIT
+    Reason: If HA or SSM is unreachable now it may not be later; the first
+    request simply connects itself, as it would without pre-warming.
+    """
+    ha_url = os.getenv('HOME_ASSISTANT_URL', '').strip()
+    if ha_url:
+        _prewarm_start = time.perf_counter()
+        try:
+            from gateway import http_prewarm
+            result = http_prewarm(ha_url)
+            if result.get('success'):
+                _print_timing(f"Pre-warmed {result['host']}: {result['connect_ms']:.2f}ms "
+                              f"(tls={result.get('tls_version')})")
+            else:
+                _print_timing(f"Pre-warm of {result.get('host')} failed after "
+                              f"{result.get('connect_ms', 0):.2f}ms: {result.get('error')}")
+                log_info(f"Connection pre-warm skipped: {result.get('error_type')}: {result.get('error')}")
+        except Exception as e:
+            _print_timing(f"Pre-warm failed after {(time.perf_counter() - _prewarm_start) * 1000:.2f}ms: {e}")
+            log_error(f"Connection pre-warm failed: {e}")
+    
+    if HTTP_PREWARM_SSM and lambda_preload._USE_PARAMETER_STORE:
+        _ssm_start = time.perf_counter()
+        try:
+            from config_param_store import get_ha_token
+            token = get_ha_token()
+            _print_timing(f"Pre-warmed SSM: {(time.perf_counter() - _ssm_start) * 1000:.2f}ms "
+                          f"(token {'cached' if token else 'not found'})")
+        except Exception as e:
+            _print_timing(f"SSM pre-warm failed after {(time.perf_counter() - _ssm_start) * 1000:.2f}ms: {e}")
+            log_error(f"SSM pre-warm failed: {e}")
+
+
+if HTTP_PREWARM_ENABLED and HA_AVAILABLE:
+    _prewarm_connections()
+
+
 # ===== LWA OAUTH TOKEN EXTRACTION (ENHANCED) =====
 
+_token_log = get_logger('lambda.token')
+
+
 def _extract_oauth_token(event: Dict[str, Any]) -> str:
     """
     Extract OAuth token from Alexa directive.
@@ -98,59 +174,49 @@ def _extract_oauth_token(event: Dict[str, Any]) -> str:
     directive = event.get('directive', {})
     header = directive.get('header', {})
     
-    # ADDED: Log full event structure for debugging
-    log_info(f"[TOKEN_DEBUG] Checking event for OAuth token")
-    log_info(f"[TOKEN_DEBUG] Namespace: {header.get('namespace')}, Name: {header.get('name')}")
-    
-    # ADDED: Log directive keys to see structure
-    log_info(f"[TOKEN_DEBUG] Directive keys: {list(directive.keys())}")
+    # Debug events: key lists are built only when DEBUG is enabled
+    _token_log.debug("Checking event for OAuth token", namespace=header.get('namespace'),
+                     name=header.get('name'), directive_keys=list(directive))
     
     # Check 1: directive.endpoint.scope.token (control directives)
     endpoint = directive.get('endpoint', {})
     if endpoint:
-        log_info(f"[TOKEN_DEBUG] Endpoint keys: {list(endpoint.keys())}")
         scope = endpoint.get('scope', {})
         if scope:
-            log_info(f"[TOKEN_DEBUG] Endpoint.scope keys: {list(scope.keys())}")
             token = scope.get('token')
             if token:
-                log_info(f'[TOKEN_DEBUG] ✓ Token found in directive.endpoint.scope (length={len(token)})')
+                _token_log.debug("Token found in %s", 'directive.endpoint.scope', token_length=len(token))
                 return token
     
     # Check 2: directive.payload.scope.token (discovery/grant)
     payload = directive.get('payload', {})
     if payload:
-        log_info(f"[TOKEN_DEBUG] Payload keys: {list(payload.keys())}")
         scope = payload.get('scope', {})
         if scope:
-            log_info(f"[TOKEN_DEBUG] Payload.scope keys: {list(scope.keys())}")
             token = scope.get('token')
             if token:
-                log_info(f'[TOKEN_DEBUG] ✓ Token found in directive.payload.scope (length={len(token)})')
+                _token_log.debug("Token found in %s", 'directive.payload.scope', token_length=len(token))
                 return token
     
     # Check 3: directive.payload.grantee.token (AcceptGrant)
     if payload:
         grantee = payload.get('grantee', {})
         if grantee:
-            log_info(f"[TOKEN_DEBUG] Payload.grantee keys: {list(grantee.keys())}")
             token = grantee.get('token')
             if token:
-                log_info(f'[TOKEN_DEBUG] ✓ Token found in directive.payload.grantee (length={len(token)})')
+                _token_log.debug("Token found in %s", 'directive.payload.grantee', token_length=len(token))
                 return token
     
     # Check 4: directive.payload.grant.code (authorization code grant)
     if payload:
         grant = payload.get('grant', {})
-        if grant:
-            log_info(f"[TOKEN_DEBUG] Payload.grant keys: {list(grant.keys())}")
-            code = grant.get('code')
-            if code:
-                log_info(f'[TOKEN_DEBUG] Found authorization code in directive.payload.grant (not a token)')
+        if grant and grant.get('code'):
+            _token_log.debug("Found authorization code in directive.payload.grant (not a token)")
     
-    # ADDED: Dump full event structure if no token found
-    log_error('[TOKEN_DEBUG] ✗ No token found in any location')
-    log_error(f'[TOKEN_DEBUG] Full event structure: {json.dumps(event, indent=2, default=str)}')
+    # Structure only (keys), never values - the event may carry credentials
+    _token_log.error("No OAuth token in any location", directive_keys=list(directive),
+                     endpoint_keys=list(endpoint) if isinstance(endpoint, dict) else None,
+                     payload_keys=list(payload) if isinstance(payload, dict) else None)
     
     raise ValueError('No OAuth token in directive')
 
@@ -244,6 +310,13 @@ def lambda_handler_normal(event: Dict[str, Any], context: Any) -> Dict[str, Any]
         type_time = (time.perf_counter() - normal_start) * 1000
         _print_timing(f"Request type determined ({request_type}): +{type_time:.2f}ms")
         
+        # Deadline budget: Alexa must be answered within 8s regardless of Lambda timeout
+        deadline = begin_invocation(
+            context,
+            cap_ms=ALEXA_RESPONSE_BUDGET_MS if request_type == 'alexa' else None
+        )
+        _print_timing(f"Invocation budget: {deadline.budget_ms:.0f}ms")
+        
         # Route based on request type
         if request_type == 'alexa':
             result = handle_alexa_request(event, context)
@@ -264,6 +337,13 @@ def lambda_handler_normal(event: Dict[str, Any], context: Any) -> Dict[str, Any]
                  request_id=context.aws_request_id,
                  error_type=type(e).__name__)
         return format_response(500, {"error": str(e)})
+    
+    finally:
+        deadline_summary = end_invocation()
+        if deadline_summary.get('expired') or deadline_summary.get('misses'):
+            increment_counter('lambda_deadline_missed')
+            _print_timing(f"!!! Deadline missed: {deadline_summary}")
+        flush_emf_metrics()
 
 
 def determine_request_type(event: Dict[str, Any]) -> str:
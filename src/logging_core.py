@@ -1,9 +1,34 @@
 # Filename: logging_core.py
 """
 logging_core.py - Unified logging interface (SECURITY HARDENED)
-Version: 2025.10.22.01
+Version: 2026.10.18.03
 Description: Gateway compatibility layer with exception sanitization
 
+CHANGES (2026.10.18.03):
+- FIXED: Event fields redacted recursively (nested dicts/lists), so a
+  directive's endpoint.scope.token is no longer written in full
+- FIXED: Sensitive keys matched on name segments, not substrings
+  (token_length / author kept, oauth_token / accessToken redacted)
+- FIXED: _sanitize_exception_details raised UnboundLocalError for
+  'token=' messages without 'password=' (re imported at module level)
+
+CHANGES (2026.10.18.02):
+- ADDED: StructuredLogger (get_logger via gateway) - template + args,
+  level checked before anything is formatted, one JSON record per event
+  with fields instead of concatenated text
+- log_info / log_debug / ... wrappers unchanged (compatibility layer)
+
+DESIGN DECISION: Logger handle instead of a new gateway operation per event
+Reason: A gateway call costs validation, sanitization and dispatch before
+the level is known; for a disabled DEBUG line that is all waste. The
+handle is resolved once per module and checks the level first, so a
+disabled call costs one isEnabledFor() and the arguments are never
+formatted.
+
+CHANGES (2026.10.18.01):
+- FIXED: log_error(..., error=e) raised instead of logging (sanitized error
+  was passed to log_error_with_tracking both as error= and inside kwargs)
+
 CHANGES (2025.10.22.01):
 - Added _execute_log_reset_implementation() for Phase 1 compliance
 
@@ -18,11 +43,16 @@ Licensed under the Apache License, Version 2.0
 """
 
 import os
+import re
+import json
+import time
 import traceback
 from typing import Union, Optional, Dict, Any
-from logging_manager import get_logging_core
+from logging_manager import get_logging_core, _RATE_LIMITER
 from logging_types import ErrorLogLevel
+from invocation_context import get_correlation_id
 import logging
+import sys
 
 # ===== CONFIGURATION =====
 
@@ -100,7 +130,6 @@ def _sanitize_exception_details(error: Union[str, Exception],
     
     # Remove potential credentials in connection strings
     if 'password=' in sanitized_msg.lower():
-        import re
         sanitized_msg = re.sub(r'password=[^;\s]+', 'password=***', sanitized_msg, flags=re.IGNORECASE)
     if 'token=' in sanitized_msg.lower():
         sanitized_msg = re.sub(r'token=[^;\s]+', 'token=***', sanitized_msg, flags=re.IGNORECASE)
@@ -116,7 +145,6 @@ def _sanitize_exception_details(error: Union[str, Exception],
                 # Extract only the last frame (where error occurred)
                 last_frame = tb_lines[-1]
                 # Remove file path, keep only filename and line number
-                import re
                 match = re.search(r'File "([^"]+)", line (\d+)', last_frame)
                 if match:
                     filepath, lineno = match.groups()
@@ -128,6 +156,161 @@ def _sanitize_exception_details(error: Union[str, Exception],
     
     return result
 
+# ===== STRUCTURED LOGGING =====
+
+# Event records are whole JSON lines: own handler, no text prefix
+_EVENT_LOGGER_ROOT = 'SUGA-ISP.events'
+_MAX_EVENT_MESSAGE_LENGTH = 500
+_MAX_EVENT_FIELD_LENGTH = 200
+_MAX_EVENT_FIELD_DEPTH = 6
+_REDACTED = '***REDACTED***'
+# Field names are split into segments (snake_case, camelCase, dashes); a key
+# is sensitive when its last segment, or the whole name, is in these sets.
+# token_length / author / oauth_config stay readable, oauth_token does not.
+_SENSITIVE_KEY_SEGMENTS = frozenset({
+    'password', 'passwd', 'token', 'secret', 'credential', 'credentials',
+    'authorization', 'auth', 'cookie', 'apikey'
+})
+_SENSITIVE_KEY_NAMES = frozenset({'api_key', 'private_key', 'client_secret', 'x_api_key'})
+_KEY_SEGMENT_PATTERN = re.compile(r'[^a-z0-9]+')
+_CAMEL_CASE_PATTERN = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+_SENSITIVE_KEY_CACHE: Dict[str, bool] = {}
+_LEVEL_NAMES = {
+    logging.DEBUG: 'DEBUG',
+    logging.INFO: 'INFO',
+    logging.WARNING: 'WARNING',
+    logging.ERROR: 'ERROR',
+    logging.CRITICAL: 'CRITICAL'
+}
+
+
+def _is_sensitive_key(key: str) -> bool:
+    """'oauth_token' / 'accessToken' -> True; 'token_length' / 'author' -> False."""
+    sensitive = _SENSITIVE_KEY_CACHE.get(key)
+    if sensitive is None:
+        normalized = _KEY_SEGMENT_PATTERN.sub('_', _CAMEL_CASE_PATTERN.sub('_', key).lower()).strip('_')
+        segments = normalized.split('_')
+        sensitive = normalized in _SENSITIVE_KEY_NAMES or segments[-1] in _SENSITIVE_KEY_SEGMENTS
+        if len(_SENSITIVE_KEY_CACHE) < 1024:
+            _SENSITIVE_KEY_CACHE[key] = sensitive
+    return sensitive
+
+
+def _redact_value(value: Any, depth: int = 0) -> Any:
+    """Field value with sensitive keys redacted at any depth and long strings truncated."""
+    if isinstance(value, str):
+        return value[:_MAX_EVENT_FIELD_LENGTH] if len(value) > _MAX_EVENT_FIELD_LENGTH else value
+    if isinstance(value, dict):
+        if depth >= _MAX_EVENT_FIELD_DEPTH:
+            return '{...}'
+        return {key: _REDACTED if isinstance(key, str) and _is_sensitive_key(key)
+                else _redact_value(item, depth + 1)
+                for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        if depth >= _MAX_EVENT_FIELD_DEPTH:
+            return '[...]'
+        return [_redact_value(item, depth + 1) for item in value]
+    return value
+
+
+def _event_logger(name: str) -> logging.Logger:
+    root = logging.getLogger(_EVENT_LOGGER_ROOT)
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        root.addHandler(handler)
+        root.propagate = False
+    return logging.getLogger(f"{_EVENT_LOGGER_ROOT}.{name}") if name else root
+
+
+class StructuredLogger:
+    """
+    Level-gated structured logger.
+    
+    Messages are %-style templates with args (as stdlib logging); nothing is
+    formatted or serialized unless the level is enabled. Each event is one
+    JSON line: timestamp, level, logger, message, correlation_id and the
+    keyword fields (sensitive keys redacted at any depth, long strings
+    truncated).
+    
+    DEBUG additionally requires DEBUG_MODE=true, as log_debug() does.
+    
+    Example:
+        >>> log = get_logger('ha_alexa')
+        >>> log.debug("Directive %s.%s", namespace, name, endpoint_id=endpoint_id)
+    """
+    
+    __slots__ = ('name', '_logger')
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._logger = _event_logger(name)
+    
+    def is_enabled(self, level: int) -> bool:
+        """True if events at level would be written."""
+        if not self._logger.isEnabledFor(level):
+            return False
+        return level > logging.DEBUG or _is_debug_mode()
+    
+    def debug(self, template: str, *args, **fields) -> None:
+        if self._logger.isEnabledFor(logging.DEBUG) and _is_debug_mode():
+            self._emit(logging.DEBUG, template, args, fields)
+    
+    def info(self, template: str, *args, **fields) -> None:
+        if self._logger.isEnabledFor(logging.INFO):
+            self._emit(logging.INFO, template, args, fields)
+    
+    def warning(self, template: str, *args, **fields) -> None:
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._emit(logging.WARNING, template, args, fields)
+    
+    def error(self, template: str, *args, **fields) -> None:
+        """Error event; an exception in error= is sanitized (CVE-LOG-004)."""
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, template, args, fields)
+    
+    def critical(self, template: str, *args, **fields) -> None:
+        if self._logger.isEnabledFor(logging.CRITICAL):
+            self._emit(logging.CRITICAL, template, args, fields)
+    
+    def _emit(self, level: int, template: str, args: tuple, fields: Dict[str, Any]) -> None:
+        if not _RATE_LIMITER.increment():
+            return
+        try:
+            message = template % args if args else template
+        except (TypeError, ValueError, KeyError):
+            message = f"{template} {args!r}"
+        record = {
+            'timestamp': int(time.time() * 1000),
+            'level': _LEVEL_NAMES.get(level, str(level)),
+            'logger': self.name,
+            'message': message[:_MAX_EVENT_MESSAGE_LENGTH]
+        }
+        correlation_id = get_correlation_id()
+        if correlation_id:
+            record['correlation_id'] = correlation_id
+        for key, value in fields.items():
+            if _is_sensitive_key(key):
+                value = _REDACTED
+            elif isinstance(value, BaseException):
+                record.setdefault('error_type', type(value).__name__)
+                value = _sanitize_exception_details(value, include_traceback=_is_debug_mode())
+            else:
+                value = _redact_value(value)
+            record[key] = value
+        self._logger.log(level, json.dumps(record, default=str, separators=(',', ':')))
+
+
+_STRUCTURED_LOGGERS: Dict[str, StructuredLogger] = {}
+
+
+def get_structured_logger(name: str = '') -> StructuredLogger:
+    """Structured logger for name (one instance per name)."""
+    logger = _STRUCTURED_LOGGERS.get(name)
+    if logger is None:
+        logger = _STRUCTURED_LOGGERS[name] = StructuredLogger(name)
+    return logger
+
 # ===== IMPLEMENTATION FUNCTIONS =====
 
 def _execute_log_info_implementation(message: str, **kwargs) -> None:
@@ -153,9 +336,9 @@ def _execute_log_error_implementation(message: str, error: Union[str, Exception]
     core = get_logging_core()
     
     # Sanitize exception details (SECURITY CRITICAL)
+    sanitized_error = None
     if error:
         sanitized_error = _sanitize_exception_details(error, include_traceback=_is_debug_mode())
-        kwargs['error'] = sanitized_error
         
         # Add error type for tracking
         if isinstance(error, Exception):
@@ -166,7 +349,7 @@ def _execute_log_error_implementation(message: str, error: Union[str, Exception]
     if 'level' in kwargs:
         level = kwargs.pop('level')
     
-    core.log_error_with_tracking(message, error=kwargs.get('error'), level=level, **kwargs)
+    core.log_error_with_tracking(message, error=sanitized_error, level=level, **kwargs)
 
 def _execute_log_debug_implementation(message: str, **kwargs) -> None:
     """Log debug message (only if DEBUG_MODE enabled)."""
@@ -231,6 +414,10 @@ def _execute_log_operation_failure_implementation(operation_name: str, error: Un
         **kwargs
     )
 
+def _execute_get_logger_implementation(name: str = '', **kwargs) -> StructuredLogger:
+    """Structured logger handle (level-gated, one JSON record per event)."""
+    return get_structured_logger(name)
+
 def _execute_log_reset_implementation(**kwargs) -> bool:
     """
     Reset logging core state (Phase 1 requirement).
@@ -245,6 +432,9 @@ def _execute_log_reset_implementation(**kwargs) -> bool:
 # ===== EXPORTS =====
 
 __all__ = [
+    'StructuredLogger',
+    'get_structured_logger',
+    '_execute_get_logger_implementation',
     '_execute_log_info_implementation',
     '_execute_log_warning_implementation',
     '_execute_log_error_implementation',
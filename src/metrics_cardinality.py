@@ -0,0 +1,152 @@
+"""
+metrics_cardinality.py - Metric Series Cardinality Governor
+Version: 2026.10.18.01
+Description: Bounds the number of metric series MetricsCore keeps for the
+             life of a container. Drops high-cardinality tag keys by policy,
+             caps series per metric name and overall, and folds the overflow
+             into '__other__' series. Internal module - used by metrics_core.py.
+
+CHANGELOG:
+- 2026.10.18.01: Initial version
+  - resolve(name, dimensions): policy tag drop (METRICS_DROP_TAG_KEYS),
+    per-name cap (METRICS_MAX_SERIES_PER_NAME), overall budget
+    (METRICS_MAX_SERIES)
+  - Overflow folded, not discarded: dimension values become '__other__'
+    (name over its cap) or the name becomes '__other__' (budget spent)
+  - rejected_series / dropped_tags reported in get_stats()
+
+DESIGN DECISION: Fold overflow into '__other__' instead of dropping it
+Reason: Dropped records make totals wrong without a trace. Folded records
+still count (alexa_directive[namespace=__other__] keeps the sum right), the
+number of series stays bounded and rejected_series shows that folding
+happened.
+
+DESIGN DECISION: Tag keys dropped by name, not by value inspection
+Reason: correlation_id, request_id and url are unique (or nearly) per call,
+so every record would be a new series. Dropping the key keeps the record in
+the series of its other tags; detecting "high cardinality" from values
+would need per-key history.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import os
+from typing import Any, Callable, Dict, FrozenSet, Optional, Set, Tuple
+
+# Distinct dimension combinations kept per metric name
+METRICS_MAX_SERIES_PER_NAME = int(os.getenv('METRICS_MAX_SERIES_PER_NAME', '50'))
+
+# Distinct series kept overall (new names past this fold into '__other__')
+METRICS_MAX_SERIES = int(os.getenv('METRICS_MAX_SERIES', '1000'))
+
+# Tag keys never kept as dimensions (unique per call)
+METRICS_DROP_TAG_KEYS = os.getenv('METRICS_DROP_TAG_KEYS', 'correlation_id,request_id,url')
+
+# Name / dimension value of folded series
+OTHER_SERIES = '__other__'
+
+
+def parse_tag_keys(spec: str) -> FrozenSet[str]:
+    """'correlation_id, url' -> frozenset({'correlation_id', 'url'})."""
+    return frozenset(key.strip() for key in spec.split(',') if key.strip())
+
+
+class CardinalityGovernor:
+    """
+    Series admission for MetricsCore.
+
+    Args:
+        max_series_per_name: Dimension combinations kept per metric name
+        max_series: Series kept overall
+        drop_tag_keys: Dimension keys removed from every record
+    """
+
+    def __init__(self, max_series_per_name: int = METRICS_MAX_SERIES_PER_NAME,
+                 max_series: int = METRICS_MAX_SERIES,
+                 drop_tag_keys: Optional[FrozenSet[str]] = None):
+        self.max_series_per_name = max(1, max_series_per_name)
+        self.max_series = max(1, max_series)
+        self.drop_tag_keys = parse_tag_keys(METRICS_DROP_TAG_KEYS) if drop_tag_keys is None \
+            else frozenset(drop_tag_keys)
+        self._series: Dict[str, Set[str]] = {}
+        self._total = 0
+        self.rejected_series = 0
+        self.dropped_tags = 0
+
+    def resolve(self, name: str, dimensions: Optional[Dict[str, Any]],
+                build_key: Callable[[str, Optional[Dict[str, Any]]], str]
+                ) -> Tuple[str, Optional[Dict[str, Any]], str, bool]:
+        """
+        Series a record is stored in.
+
+        Args:
+            name: Metric name
+            dimensions: Record dimensions (not modified)
+            build_key: MetricsCore key builder (name, dimensions) -> key
+
+        Returns:
+            (name, dimensions, key, folded) - folded is True when the record
+            went to an '__other__' series
+        """
+        if dimensions:
+            drop = self.drop_tag_keys
+            for key in dimensions:
+                if key in drop:
+                    self.dropped_tags += 1
+                    dimensions = {k: v for k, v in dimensions.items() if k not in drop}
+                    break
+        key = build_key(name, dimensions)
+        series = self._series.get(name)
+        if series is not None and key in series:
+            return name, dimensions, key, False
+
+        if series is None:
+            if self._total >= self.max_series:
+                self.rejected_series += 1
+                return OTHER_SERIES, None, OTHER_SERIES, True
+            series = self._series[name] = set()
+        elif len(series) >= self.max_series_per_name or self._total >= self.max_series:
+            self.rejected_series += 1
+            folded = {k: OTHER_SERIES for k in dimensions} if dimensions else None
+            return name, folded, build_key(name, folded), True
+        series.add(key)
+        self._total += 1
+        return name, dimensions, key, False
+
+    def register(self, name: str, key: str) -> None:
+        """Count an existing series (e.g. an interned handle after reset())."""
+        series = self._series.setdefault(name, set())
+        if key not in series:
+            series.add(key)
+            self._total += 1
+
+    def get_stats(self, top: int = 5) -> Dict[str, Any]:
+        largest = sorted(self._series.items(), key=lambda item: len(item[1]), reverse=True)[:top]
+        return {
+            'names': len(self._series),
+            'series': self._total,
+            'rejected_series': self.rejected_series,
+            'dropped_tags': self.dropped_tags,
+            'max_series_per_name': self.max_series_per_name,
+            'max_series': self.max_series,
+            'largest_names': {name: len(keys) for name, keys in largest}
+        }
+
+    def reset(self) -> None:
+        self._series.clear()
+        self._total = 0
+        self.rejected_series = 0
+        self.dropped_tags = 0
+
+
+__all__ = [
+    'CardinalityGovernor',
+    'parse_tag_keys',
+    'OTHER_SERIES',
+    'METRICS_MAX_SERIES_PER_NAME',
+    'METRICS_MAX_SERIES',
+    'METRICS_DROP_TAG_KEYS',
+]
+
+# EOF
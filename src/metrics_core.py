@@ -1,10 +1,44 @@
 """
 metrics_core.py - Core metrics implementation with public API
 
-Version: 2025.11.29.REFACTOR_01
+Version: 2026.10.18.04
 Description: PHASE 1 - Add public API functions for SUGA compliance
 
 CHANGELOG:
+- 2026.10.18.04: Series cardinality governor (metrics_cardinality.py)
+  - Every new series (record_metric, counters, gauges, histograms,
+    interned handles) is admitted by CardinalityGovernor: correlation_id /
+    request_id / url tags dropped, per-name and overall series caps,
+    overflow folded into '__other__' series
+  - get_stats()['cardinality']: series, rejected_series, dropped_tags
+  - record_metric() accepts tags= (alias of dimensions, as passed by
+    utility_cross_interface)
+
+- 2026.10.18.03: Interned metric handles
+  - ADDED: counter(name, **dimensions) / distribution(name, ...) return a
+    handle whose series key is built once; inc() / observe() are a dict
+    update (no dimension sort/join, no gateway dispatch per call)
+  - record_operation/cache/api/response/error helpers reuse interned
+    series per argument combination instead of building dimension dicts
+    and keys on every call
+
+- 2026.10.18.02: CloudWatch EMF export (metrics_emf.py, EMF_ENABLED)
+  - Counters, record_metric() values, gauges and histograms are also
+    aggregated per invocation and written as EMF lines by flush_emf()
+  - record_metric(): '.count' names export as counts, '_ms' names as
+    timing histograms, everything else as gauges
+  - ADDED: set_gauge(), flush_emf(); get_stats()['emf']
+
+- 2026.10.18.01: Timing series in fixed-memory quantile sketches
+  - Operation durations, dispatcher timings and histograms use
+    metrics_sketch.QuantileSketch instead of ever-growing lists
+  - O(1) insert; p50/p95/p99 within 1% without sorting samples
+  - ADDED: record_histogram(), merge_histogram() (mergeable sketch state)
+  - get_operation_metrics(): count/total/avg/percentiles per operation
+    (no 'durations' sample list)
+  - get_dispatcher_stats(): adds p50/p95/p99
+  - get_stats()['histograms']: sketch summaries instead of sample lists
+
 - 2025.11.29.REFACTOR_01: Add public API layer
   - ADDED: 18 public wrapper functions (no underscores)
   - PATTERN: Public functions delegate to _MANAGER
@@ -15,11 +49,98 @@ Copyright 2025 Joseph Hersey
 Licensed under the Apache License, Version 2.0
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
 from collections import defaultdict
 
 from metrics_types import MetricOperation, ResponseType, ResponseMetrics, HTTPClientMetrics, CircuitBreakerMetrics
+from metrics_sketch import QuantileSketch
+from metrics_emf import EMFExporter
+from metrics_cardinality import CardinalityGovernor
+
+
+class _OperationTiming:
+    """Count, total and duration sketch of one operation."""
+    
+    __slots__ = ('count', 'total_ms', 'durations')
+    
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.durations = QuantileSketch()
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_ms': self.total_ms,
+            'avg_ms': self.total_ms / self.count if self.count else 0,
+            'p50_ms': self.durations.quantile(0.5),
+            'p95_ms': self.durations.quantile(0.95),
+            'p99_ms': self.durations.quantile(0.99),
+            'max_ms': self.durations.max if self.durations.count else 0
+        }
+
+
+# ===== INTERNED SERIES HANDLES =====
+
+class _SeriesHandle:
+    """One (name, dimensions) series with its key resolved once."""
+    
+    __slots__ = ('name', 'key', 'dimensions', 'folded', '_core')
+    
+    def __init__(self, core: 'MetricsCore', name: str, dimensions: Dict[str, str], folded: bool = False):
+        self.name = name
+        self.key = core._build_metric_key(name, dimensions)
+        # Sorted items: EMFExporter's group key, no per-call sort
+        self.dimensions = tuple(sorted(dimensions.items()))
+        # True = an '__other__' series (cardinality limit reached)
+        self.folded = folded
+        self._core = core
+
+
+class CounterHandle(_SeriesHandle):
+    """Interned counter - from counter()."""
+    
+    __slots__ = ()
+    
+    def inc(self, value: int = 1) -> None:
+        core = self._core
+        core._counters[self.key] += value
+        emf = core._emf
+        if emf.enabled:
+            emf.count(self.name, value, self.dimensions)
+
+
+class DistributionHandle(_SeriesHandle):
+    """Interned timing/value distribution (quantile sketch) - from distribution()."""
+    
+    __slots__ = ()
+    
+    def observe(self, value: float) -> None:
+        core = self._core
+        core._histograms[self.key].add(value)
+        emf = core._emf
+        if emf.enabled:
+            emf.observe(self.name, value, self.dimensions)
+
+
+class _ValueHandle(_SeriesHandle):
+    """record_metric() semantics (last value) for the record_* helpers."""
+    
+    __slots__ = ()
+    
+    def record(self, value: float) -> None:
+        core = self._core
+        core._metrics[self.key] = value
+        emf = core._emf
+        if emf.enabled:
+            name = self.name
+            if name.endswith('.count'):
+                emf.count(name, value, self.dimensions)
+            elif name.endswith('_ms'):
+                emf.observe(name, value, self.dimensions)
+            else:
+                emf.gauge(name, value, self.dimensions)
 
 
 # ===== METRICS CORE CLASS (PRIVATE) =====
@@ -27,82 +148,185 @@ from metrics_types import MetricOperation, ResponseType, ResponseMetrics, HTTPCl
 class MetricsCore:
     """Core metrics manager - singleton implementation."""
     
-    def __init__(self):
+    def __init__(self, emf: Optional[EMFExporter] = None, governor: Optional[CardinalityGovernor] = None):
         self._metrics = defaultdict(float)
         self._counters = defaultdict(int)
         self._gauges = defaultdict(float)
-        self._histograms = defaultdict(list)
+        # Timing series: fixed-memory sketches, O(1) insert (no sample lists)
+        self._histograms = defaultdict(QuantileSketch)
         self._response_metrics = ResponseMetrics()
         self._http_metrics = HTTPClientMetrics()
         self._circuit_breaker_metrics = {}
-        self._dispatcher_timings = defaultdict(list)
-        self._dispatcher_call_counts = defaultdict(int)
-        self._operation_metrics = defaultdict(lambda: {'count': 0, 'total_ms': 0, 'durations': []})
+        self._dispatcher_timings = defaultdict(QuantileSketch)
+        self._operation_metrics = defaultdict(_OperationTiming)
+        # Per-invocation EMF aggregation (disabled unless EMF_ENABLED=true)
+        self._emf = emf or EMFExporter()
+        # Interned handles: (class, name, dimensions) -> handle
+        self._handles: Dict[tuple, _SeriesHandle] = {}
+        # record_* helper arguments -> (count, duration) value handles
+        self._helper_series: Dict[tuple, tuple] = {}
+        # Series admission: bounded series for the container's lifetime
+        self._governor = governor or CardinalityGovernor()
     
     def record_metric(self, name: str, value: float, dimensions: Optional[Dict[str, str]] = None) -> bool:
         """Record a metric value."""
-        key = self._build_metric_key(name, dimensions)
+        name, dimensions, key, _ = self._governor.resolve(name, dimensions, self._build_metric_key)
         self._metrics[key] = value
+        emf = self._emf
+        if emf.enabled:
+            if name.endswith('.count'):
+                emf.count(name, value, dimensions)
+            elif name.endswith('_ms'):
+                emf.observe(name, value, dimensions)
+            else:
+                emf.gauge(name, value, dimensions)
         return True
     
     def increment_counter(self, name: str, value: int = 1) -> int:
         """Increment a counter."""
+        name = self._governor.resolve(name, None, self._build_metric_key)[0]
         self._counters[name] += value
+        self._emf.count(name, value)
         return self._counters[name]
     
+    def set_gauge(self, name: str, value: float) -> bool:
+        """Set a gauge to its current value."""
+        name = self._governor.resolve(name, None, self._build_metric_key)[0]
+        self._gauges[name] = value
+        self._emf.gauge(name, value)
+        return True
+    
+    def _intern(self, handle_class: type, name: str, dimensions: Optional[Dict[str, Any]]) -> _SeriesHandle:
+        """Existing handle for the series, or a new one (key built once)."""
+        dimensions = {key: str(value) for key, value in dimensions.items()} if dimensions else {}
+        handle = self._handles.get((handle_class, name, tuple(sorted(dimensions.items()))))
+        if handle is not None:
+            return handle
+        # Only the admitted (or folded) series is interned, so dropped tags
+        # and rejected series don't grow the handle table
+        name, dimensions, _, folded = self._governor.resolve(name, dimensions, self._build_metric_key)
+        dimensions = dimensions or {}
+        intern_key = (handle_class, name, tuple(sorted(dimensions.items())))
+        handle = self._handles.get(intern_key)
+        if handle is None:
+            handle = self._handles[intern_key] = handle_class(self, name, dimensions, folded)
+        return handle
+    
+    def counter(self, name: str, dimensions: Optional[Dict[str, Any]] = None) -> CounterHandle:
+        """Interned counter handle - keep it and call inc()."""
+        return self._intern(CounterHandle, name, dimensions)
+    
+    def distribution(self, name: str, dimensions: Optional[Dict[str, Any]] = None) -> DistributionHandle:
+        """Interned distribution handle - keep it and call observe()."""
+        return self._intern(DistributionHandle, name, dimensions)
+    
+    def _helper_pair(self, cache_key: tuple, prefix: str, dimensions: Dict[str, str]) -> tuple:
+        """(prefix.count, prefix.duration_ms) value handles, cached by helper arguments."""
+        pair = (self._intern(_ValueHandle, f'{prefix}.count', dimensions),
+                self._intern(_ValueHandle, f'{prefix}.duration_ms', dimensions))
+        if not (pair[0].folded or pair[1].folded):
+            self._helper_series[cache_key] = pair
+        return pair
+    
+    def flush_emf(self) -> int:
+        """Write this invocation's metrics as EMF lines (0 if EMF is disabled)."""
+        return self._emf.flush()
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get all statistics."""
         return {
             'metrics': dict(self._metrics),
             'counters': dict(self._counters),
             'gauges': dict(self._gauges),
-            'histograms': {k: list(v) for k, v in self._histograms.items()}
+            'histograms': {k: v.summary() for k, v in self._histograms.items()},
+            'emf': self._emf.get_stats(),
+            'cardinality': self._governor.get_stats()
         }
     
+    def record_histogram(self, name: str, value: float) -> bool:
+        """Add a value to the named histogram sketch."""
+        name = self._governor.resolve(name, None, self._build_metric_key)[0]
+        self._histograms[name].add(value)
+        self._emf.observe(name, value)
+        return True
+    
+    def merge_histogram(self, name: str, sketch: Union[QuantileSketch, Dict[str, Any]]) -> bool:
+        """Merge a sketch (or its to_dict() state) into the named histogram."""
+        if isinstance(sketch, dict):
+            sketch = QuantileSketch.from_dict(sketch)
+        name = self._governor.resolve(name, None, self._build_metric_key)[0]
+        self._histograms[name].merge(sketch)
+        self._emf.merge_sketch(name, sketch)
+        return True
+    
+    def get_histogram(self, name: str) -> Optional[QuantileSketch]:
+        """Sketch of the named histogram (None if never recorded)."""
+        return self._histograms.get(name)
+    
     def record_operation_metric(self, operation_name: str, success: bool, duration_ms: float, error_type: Optional[str]) -> bool:
         """Record operation metric."""
-        dimensions = {'operation': operation_name, 'success': str(success)}
-        if error_type:
-            dimensions['error_type'] = error_type
-        self.record_metric(f'operation.{operation_name}.count', 1.0, dimensions)
+        cache_key = ('operation', operation_name, success, error_type)
+        series = self._helper_series.get(cache_key)
+        if series is None:
+            dimensions = {'operation': operation_name, 'success': str(success)}
+            if error_type:
+                dimensions['error_type'] = error_type
+            series = self._helper_pair(cache_key, f'operation.{operation_name}', dimensions)
+        series[0].record(1.0)
         if duration_ms > 0:
-            self.record_metric(f'operation.{operation_name}.duration_ms', duration_ms, dimensions)
-            op_key = operation_name
-            self._operation_metrics[op_key]['count'] += 1
-            self._operation_metrics[op_key]['total_ms'] += duration_ms
-            self._operation_metrics[op_key]['durations'].append(duration_ms)
+            series[1].record(duration_ms)
+            timing = self._operation_metrics[operation_name]
+            timing.count += 1
+            timing.total_ms += duration_ms
+            timing.durations.add(duration_ms)
         return True
     
     def record_error_response(self, error_type: str, severity: str, category: str) -> bool:
         """Record error response."""
-        dimensions = {'error_type': error_type, 'severity': severity, 'category': category}
-        self.record_metric('error.response.count', 1.0, dimensions)
+        cache_key = ('error', error_type, severity, category)
+        series = self._helper_series.get(cache_key)
+        if series is None:
+            dimensions = {'error_type': error_type, 'severity': severity, 'category': category}
+            series = self._helper_pair(cache_key, 'error.response', dimensions)
+        series[0].record(1.0)
         return True
     
     def record_cache_metric(self, operation_name: str, hit: bool, miss: bool, duration_ms: float) -> bool:
         """Record cache metric."""
-        dimensions = {'operation': operation_name, 'hit': str(hit), 'miss': str(miss)}
-        self.record_metric(f'cache.{operation_name}.count', 1.0, dimensions)
+        cache_key = ('cache', operation_name, hit, miss)
+        series = self._helper_series.get(cache_key)
+        if series is None:
+            dimensions = {'operation': operation_name, 'hit': str(hit), 'miss': str(miss)}
+            series = self._helper_pair(cache_key, f'cache.{operation_name}', dimensions)
+        series[0].record(1.0)
         if duration_ms > 0:
-            self.record_metric(f'cache.{operation_name}.duration_ms', duration_ms, dimensions)
+            series[1].record(duration_ms)
         return True
     
     def record_api_metric(self, api_name: str, endpoint: str, success: bool, duration_ms: float, status_code: Optional[int]) -> bool:
         """Record API metric."""
-        dimensions = {'api': api_name, 'endpoint': endpoint, 'success': str(success)}
-        if status_code:
-            dimensions['status_code'] = str(status_code)
-        self.record_metric(f'api.{api_name}.count', 1.0, dimensions)
+        cache_key = ('api', api_name, endpoint, success, status_code)
+        series = self._helper_series.get(cache_key)
+        if series is None:
+            dimensions = {'api': api_name, 'endpoint': endpoint, 'success': str(success)}
+            if status_code:
+                dimensions['status_code'] = str(status_code)
+            series = self._helper_pair(cache_key, f'api.{api_name}', dimensions)
+        series[0].record(1.0)
         if duration_ms > 0:
-            self.record_metric(f'api.{api_name}.duration_ms', duration_ms, dimensions)
+            series[1].record(duration_ms)
         return True
     
     def record_response_metric(self, response_type: str, success: bool, error_type: Optional[str]) -> bool:
         """Record response metric."""
-        dimensions = {'response_type': response_type, 'success': str(success)}
-        if error_type:
-            dimensions['error_type'] = error_type
-        self.record_metric('response.count', 1.0, dimensions)
+        cache_key = ('response', response_type, success, error_type)
+        series = self._helper_series.get(cache_key)
+        if series is None:
+            dimensions = {'response_type': response_type, 'success': str(success)}
+            if error_type:
+                dimensions['error_type'] = error_type
+            series = self._helper_pair(cache_key, 'response', dimensions)
+        series[0].record(1.0)
         return True
     
     def record_http_metric(self, method: str, url: str, status_code: int, duration_ms: float, response_size: int) -> bool:
@@ -155,9 +379,7 @@ class MetricsCore:
     
     def record_dispatcher_timing(self, interface_name: str, operation_name: str, duration_ms: float) -> bool:
         """Record dispatcher timing."""
-        key = f"{interface_name}.{operation_name}"
-        self._dispatcher_timings[key].append(duration_ms)
-        self._dispatcher_call_counts[key] += 1
+        self._dispatcher_timings[f"{interface_name}.{operation_name}"].add(duration_ms)
         return True
     
     def get_dispatcher_stats(self) -> Dict[str, Any]:
@@ -165,16 +387,19 @@ class MetricsCore:
         stats = {}
         for key, timings in self._dispatcher_timings.items():
             stats[key] = {
-                'count': self._dispatcher_call_counts[key],
-                'avg_ms': sum(timings) / len(timings) if timings else 0,
-                'min_ms': min(timings) if timings else 0,
-                'max_ms': max(timings) if timings else 0
+                'count': timings.count,
+                'avg_ms': timings.total / timings.count if timings.count else 0,
+                'min_ms': timings.min if timings.count else 0,
+                'max_ms': timings.max if timings.count else 0,
+                'p50_ms': timings.quantile(0.5),
+                'p95_ms': timings.quantile(0.95),
+                'p99_ms': timings.quantile(0.99)
             }
         return stats
     
     def get_operation_metrics(self) -> Dict[str, Any]:
-        """Get operation metrics."""
-        return dict(self._operation_metrics)
+        """Get operation metrics (count, total/avg/max ms, p50/p95/p99 ms)."""
+        return {name: timing.summary() for name, timing in self._operation_metrics.items()}
     
     def reset_metrics(self) -> bool:
         """Reset all metrics."""
@@ -186,23 +411,26 @@ class MetricsCore:
         self._http_metrics = HTTPClientMetrics()
         self._circuit_breaker_metrics.clear()
         self._dispatcher_timings.clear()
-        self._dispatcher_call_counts.clear()
         self._operation_metrics.clear()
+        self._emf.reset()
+        self._governor.reset()
+        for handle in self._handles.values():
+            if not handle.folded:
+                self._governor.register(handle.name, handle.key)
         return True
     
     def get_performance_report(self, slow_threshold_ms: float = 100.0) -> Dict[str, Any]:
         """Generate performance report."""
         operations = {}
-        for op_name, metrics in self._operation_metrics.items():
-            if metrics['count'] > 0:
-                durations = metrics['durations']
-                sorted_durations = sorted(durations)
+        for op_name, timing in self._operation_metrics.items():
+            if timing.count > 0:
+                summary = timing.summary()
                 operations[op_name] = {
-                    'count': metrics['count'],
-                    'avg_ms': metrics['total_ms'] / metrics['count'],
-                    'p50_ms': sorted_durations[len(sorted_durations) // 2] if sorted_durations else 0,
-                    'p95_ms': sorted_durations[int(len(sorted_durations) * 0.95)] if sorted_durations else 0,
-                    'p99_ms': sorted_durations[int(len(sorted_durations) * 0.99)] if sorted_durations else 0,
+                    'count': summary['count'],
+                    'avg_ms': summary['avg_ms'],
+                    'p50_ms': summary['p50_ms'],
+                    'p95_ms': summary['p95_ms'],
+                    'p99_ms': summary['p99_ms'],
                 }
         
         slow_ops = [
@@ -235,8 +463,11 @@ _MANAGER = MetricsCore()
 
 # ===== PUBLIC API FUNCTIONS =====
 
-def record_metric(name: str, value: float, dimensions: Optional[Dict[str, str]] = None) -> bool:
-    """Record a metric value."""
+def record_metric(name: str, value: float, dimensions: Optional[Dict[str, str]] = None,
+                  tags: Optional[Dict[str, str]] = None) -> bool:
+    """Record a metric value (tags: alias of dimensions)."""
+    if tags:
+        dimensions = {**tags, **dimensions} if dimensions else tags
     return _MANAGER.record_metric(name, value, dimensions)
 
 def increment_counter(name: str, value: int = 1) -> int:
@@ -307,11 +538,47 @@ def get_performance_report(slow_threshold_ms: float = 100.0) -> Dict[str, Any]:
     """Generate performance report."""
     return _MANAGER.get_performance_report(slow_threshold_ms)
 
+def record_histogram(name: str, value: float) -> bool:
+    """Add a value to a histogram (quantile sketch)."""
+    return _MANAGER.record_histogram(name, value)
+
+def merge_histogram(name: str, sketch: Union[QuantileSketch, Dict[str, Any]]) -> bool:
+    """Merge a sketch or its state (QuantileSketch.to_dict()) into a histogram."""
+    return _MANAGER.merge_histogram(name, sketch)
+
+def set_gauge(name: str, value: float) -> bool:
+    """Set a gauge metric."""
+    return _MANAGER.set_gauge(name, value)
+
+def counter(name: str, dimensions: Optional[Dict[str, Any]] = None, **extra_dimensions) -> CounterHandle:
+    """
+    Interned counter handle: resolve once, then handle.inc() per event.
+    
+    Example:
+        >>> directives = counter('alexa_directive', namespace='Alexa.Discovery')
+        >>> directives.inc()
+    """
+    if extra_dimensions:
+        dimensions = {**(dimensions or {}), **extra_dimensions}
+    return _MANAGER.counter(name, dimensions)
+
+def distribution(name: str, dimensions: Optional[Dict[str, Any]] = None, **extra_dimensions) -> DistributionHandle:
+    """Interned distribution handle: resolve once, then handle.observe(value)."""
+    if extra_dimensions:
+        dimensions = {**(dimensions or {}), **extra_dimensions}
+    return _MANAGER.distribution(name, dimensions)
+
+def flush_emf() -> int:
+    """Write the invocation's metrics to stdout as CloudWatch EMF (lines written)."""
+    return _MANAGER.flush_emf()
+
 
 # ===== EXPORTS =====
 
 __all__ = [
     'MetricsCore',
+    'CounterHandle',
+    'DistributionHandle',
     '_MANAGER',
     'record_metric',
     'increment_counter',
@@ -331,6 +598,12 @@ __all__ = [
     'get_operation_metrics',
     'reset_metrics',
     'get_performance_report',
+    'record_histogram',
+    'merge_histogram',
+    'set_gauge',
+    'flush_emf',
+    'counter',
+    'distribution',
 ]
 
 # EOF
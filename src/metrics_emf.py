@@ -0,0 +1,367 @@
+"""
+metrics_emf.py - CloudWatch Embedded Metric Format Exporter
+Version: 2026.10.18.02
+Description: Aggregates counters, gauges and timing sketches during an
+             invocation and writes them as EMF JSON lines to stdout at its
+             end. CloudWatch Logs extracts the metrics - no PutMetricData,
+             no network calls. Internal module - used by metrics_core.py.
+
+CHANGELOG:
+- 2026.10.18.02: dimensions may be passed as sorted (key, value) tuples
+  (interned metric handles resolve them once, no sort per record)
+- 2026.10.18.01: Initial version
+  - EMFExporter: count() / gauge() / observe() / merge_sketch() per
+    (name, dimensions) series, flush() once per invocation
+  - Timings exported as EMF histograms (Values/Counts/Min/Max/Count/Sum)
+    from metrics_sketch.QuantileSketch - at most 100 value/count pairs
+  - One compact line per dimension group (all series without per-series
+    dimensions share one line), at most 100 metrics per line (EMF limit)
+  - Cardinality limits per invocation: EMF_MAX_DIMENSION_GROUPS and
+    EMF_MAX_SERIES; rejected series counted and reported
+  - Dimension sets from EMF_DIMENSION_SETS ('*' = the series' own keys)
+
+DESIGN DECISION: Aggregate per invocation, not one line per record
+Reason: A warm Alexa directive records dozens of metrics. One EMF line per
+record would multiply log volume (ingestion is billed per GB) and per-line
+JSON encoding cost. Counters are summed, gauges keep the last value and
+timings go into a sketch, so an invocation costs a handful of lines however
+many records it made.
+
+DESIGN DECISION: Limits drop new series instead of growing
+Reason: Every distinct dimension value combination is a separate custom
+metric in CloudWatch (billed per metric). A dimension fed by request data
+could create thousands. New groups/series past the limits are rejected and
+counted (emf_rejected_series in the next line), so the cost is bounded and
+the overflow is visible.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from metrics_sketch import QuantileSketch
+
+# Global switch (read once per container)
+EMF_ENABLED = os.getenv('EMF_ENABLED', 'false').lower() == 'true'
+
+# CloudWatch namespace of all exported metrics
+EMF_NAMESPACE = os.getenv('EMF_NAMESPACE', 'LEE')
+
+# Dimensions of every series (service = Lambda function name)
+EMF_SERVICE_NAME = os.getenv('EMF_SERVICE_NAME', os.getenv('AWS_LAMBDA_FUNCTION_NAME', 'LEE'))
+
+# Dimension sets: ';' separates sets, ',' keys; '*' = the series' own keys
+EMF_DIMENSION_SETS = os.getenv('EMF_DIMENSION_SETS', 'service,*')
+
+# Distinct dimension value combinations per invocation (series without
+# dimensions of their own are always accepted)
+EMF_MAX_DIMENSION_GROUPS = int(os.getenv('EMF_MAX_DIMENSION_GROUPS', '20'))
+
+# Distinct (name, dimensions) series per invocation
+EMF_MAX_SERIES = int(os.getenv('EMF_MAX_SERIES', '200'))
+
+# EMF specification limits
+EMF_MAX_METRICS_PER_DIRECTIVE = 100
+EMF_MAX_VALUES = 100
+EMF_MAX_DIMENSIONS = 30
+_MAX_DIMENSION_VALUE_LENGTH = 1024
+
+# Series kinds
+_COUNTER = 'counter'
+_GAUGE = 'gauge'
+_TIMING = 'timing'
+
+# Name suffix -> CloudWatch unit
+_UNIT_SUFFIXES = (
+    ('_ms', 'Milliseconds'),
+    ('.duration_ms', 'Milliseconds'),
+    ('_bytes', 'Bytes'),
+    ('.bytes', 'Bytes'),
+    ('.count', 'Count'),
+    ('_count', 'Count'),
+)
+
+Dimensions = Tuple[Tuple[str, str], ...]
+
+# Series dimensions: dict, or already sorted (key, value) items
+DimensionsArg = Optional[Union[Dict[str, str], Dimensions]]
+
+
+def parse_dimension_sets(spec: str) -> List[List[str]]:
+    """'service,*;service' -> [['service', '*'], ['service']]."""
+    sets = []
+    for part in spec.split(';'):
+        keys = [key.strip() for key in part.split(',') if key.strip()]
+        if keys:
+            sets.append(keys)
+    return sets or [['*']]
+
+
+def infer_unit(name: str, kind: str) -> Optional[str]:
+    """CloudWatch unit from the metric name (counters default to Count)."""
+    for suffix, unit in _UNIT_SUFFIXES:
+        if name.endswith(suffix):
+            return unit
+    return 'Count' if kind == _COUNTER else None
+
+
+class _Series:
+    __slots__ = ('kind', 'value', 'sketch', 'unit')
+
+    def __init__(self, kind: str, unit: Optional[str]):
+        self.kind = kind
+        self.value = 0.0
+        self.sketch = QuantileSketch() if kind == _TIMING else None
+        self.unit = unit
+
+    def emf_value(self) -> Any:
+        if self.kind != _TIMING:
+            return self.value
+        sketch = self.sketch
+        values, counts = sketch.value_counts(EMF_MAX_VALUES)
+        return {
+            'Values': values,
+            'Counts': counts,
+            'Min': sketch.min,
+            'Max': sketch.max,
+            'Count': sketch.count,
+            'Sum': sketch.total
+        }
+
+
+def _stdout_writer(line: str) -> None:
+    sys.stdout.write(line + '\n')
+    sys.stdout.flush()
+
+
+class EMFExporter:
+    """
+    Per-invocation EMF aggregation and output.
+
+    Args:
+        namespace: CloudWatch namespace
+        dimensions: Dimensions added to every series (default service)
+        dimension_sets: Key lists per EMF DimensionSet ('*' = series keys)
+        max_groups: Distinct dimension value combinations per flush
+        max_series: Distinct series per flush
+        writer: Called with each EMF line (default: stdout)
+        clock: Wall clock in seconds for the EMF Timestamp
+        enabled: False = recording calls return immediately
+    """
+
+    def __init__(self, namespace: str = EMF_NAMESPACE,
+                 dimensions: Optional[Dict[str, str]] = None,
+                 dimension_sets: Optional[List[List[str]]] = None,
+                 max_groups: int = EMF_MAX_DIMENSION_GROUPS,
+                 max_series: int = EMF_MAX_SERIES,
+                 writer: Optional[Callable[[str], None]] = None,
+                 clock: Callable[[], float] = time.time,
+                 enabled: bool = EMF_ENABLED):
+        self.namespace = namespace
+        self.dimensions = {'service': EMF_SERVICE_NAME} if dimensions is None else dict(dimensions)
+        self.dimension_sets = dimension_sets or parse_dimension_sets(EMF_DIMENSION_SETS)
+        self.max_groups = max_groups
+        self.max_series = max_series
+        self.enabled = enabled
+        self._writer = writer or _stdout_writer
+        self._clock = clock
+        self._groups: Dict[Dimensions, Dict[str, _Series]] = {}
+        self._series_count = 0
+        self._rejected = 0
+        self._stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, int]:
+        return {
+            'flushes': 0,
+            'lines_written': 0,
+            'bytes_written': 0,
+            'series_written': 0,
+            'rejected_series': 0,
+            'write_errors': 0
+        }
+
+    # ===== RECORDING =====
+
+    def count(self, name: str, value: float = 1, dimensions: DimensionsArg = None) -> None:
+        """Add value to a counter (summed over the invocation)."""
+        if self.enabled:
+            series = self._series(name, dimensions, _COUNTER, None)
+            if series is not None:
+                series.value += value
+
+    def gauge(self, name: str, value: float, dimensions: DimensionsArg = None,
+              unit: Optional[str] = None) -> None:
+        """Set a gauge (last value of the invocation is exported)."""
+        if self.enabled:
+            series = self._series(name, dimensions, _GAUGE, unit)
+            if series is not None:
+                series.value = value
+
+    def observe(self, name: str, value: float, dimensions: DimensionsArg = None,
+                unit: Optional[str] = None) -> None:
+        """Add a value to a timing/distribution (exported as an EMF histogram)."""
+        if self.enabled:
+            series = self._series(name, dimensions, _TIMING, unit)
+            if series is not None:
+                series.sketch.add(value)
+
+    def merge_sketch(self, name: str, sketch: QuantileSketch,
+                     dimensions: DimensionsArg = None, unit: Optional[str] = None) -> None:
+        """Merge an already aggregated sketch into a timing series."""
+        if self.enabled and sketch.count:
+            series = self._series(name, dimensions, _TIMING, unit)
+            if series is not None:
+                series.sketch.merge(sketch)
+
+    def _series(self, name: str, dimensions: DimensionsArg, kind: str,
+                unit: Optional[str]) -> Optional[_Series]:
+        """Series for (name, dimensions), None if rejected by a cardinality limit."""
+        if dimensions.__class__ is tuple:
+            group_key: Dimensions = dimensions
+        else:
+            group_key = tuple(sorted(dimensions.items())) if dimensions else ()
+        group = self._groups.get(group_key)
+        if group is not None:
+            series = group.get(name)
+            if series is not None:
+                return series if series.kind == kind else self._reject()
+        elif group_key and (len(self._groups) >= self.max_groups
+                            or len(group_key) + len(self.dimensions) > EMF_MAX_DIMENSIONS):
+            return self._reject()
+        if self._series_count >= self.max_series or name in self.dimensions or \
+                any(name == key for key, _ in group_key):
+            return self._reject()
+        if group is None:
+            group = self._groups[group_key] = {}
+        series = group[name] = _Series(kind, unit or infer_unit(name, kind))
+        self._series_count += 1
+        return series
+
+    def _reject(self) -> None:
+        self._rejected += 1
+        return None
+
+    # ===== OUTPUT =====
+
+    def _dimension_sets_for(self, group_key: Dimensions) -> List[List[str]]:
+        series_keys = [key for key, _ in group_key]
+        available = set(self.dimensions) | set(series_keys)
+        sets = []
+        for spec in self.dimension_sets:
+            keys = []
+            for key in spec:
+                for expanded in (series_keys if key == '*' else [key]):
+                    if expanded in available and expanded not in keys:
+                        keys.append(expanded)
+            if keys and keys not in sets:
+                sets.append(keys)
+        return sets or [[]]
+
+    def build_documents(self) -> List[Dict[str, Any]]:
+        """EMF documents for everything recorded since the last flush."""
+        timestamp = int(self._clock() * 1000)
+        documents = []
+        if self._rejected:
+            # Reported in the group without series dimensions
+            self._groups.setdefault((), {})['emf_rejected_series'] = rejected = _Series(_COUNTER, 'Count')
+            rejected.value = self._rejected
+
+        for group_key, group in self._groups.items():
+            dimension_sets = self._dimension_sets_for(group_key)
+            names = list(group)
+            for start in range(0, len(names), EMF_MAX_METRICS_PER_DIRECTIVE):
+                chunk = names[start:start + EMF_MAX_METRICS_PER_DIRECTIVE]
+                metrics = []
+                document: Dict[str, Any] = {}
+                for name in chunk:
+                    series = group[name]
+                    definition = {'Name': name}
+                    if series.unit:
+                        definition['Unit'] = series.unit
+                    metrics.append(definition)
+                    document[name] = series.emf_value()
+                document.update(self.dimensions)
+                for key, value in group_key:
+                    document[key] = str(value)[:_MAX_DIMENSION_VALUE_LENGTH]
+                document['_aws'] = {
+                    'Timestamp': timestamp,
+                    'CloudWatchMetrics': [{
+                        'Namespace': self.namespace,
+                        'Dimensions': dimension_sets,
+                        'Metrics': metrics
+                    }]
+                }
+                documents.append(document)
+        return documents
+
+    def flush(self) -> int:
+        """
+        Write the invocation's metrics as EMF lines and start over.
+
+        Never raises (writer errors are counted).
+
+        Returns:
+            Number of lines written
+        """
+        if not self.enabled or (not self._groups and not self._rejected):
+            return 0
+        rejected = self._rejected
+        documents = self.build_documents()
+        self._stats['flushes'] += 1
+        self._stats['rejected_series'] += rejected
+        self._stats['series_written'] += sum(len(group) for group in self._groups.values())
+        self._groups = {}
+        self._series_count = 0
+        self._rejected = 0
+
+        written = 0
+        for document in documents:
+            line = json.dumps(document, separators=(',', ':'))
+            try:
+                self._writer(line)
+            except Exception:
+                self._stats['write_errors'] += 1
+                continue
+            written += 1
+            self._stats['bytes_written'] += len(line) + 1
+        self._stats['lines_written'] += written
+        return written
+
+    def pending_series(self) -> int:
+        """Series recorded since the last flush."""
+        return self._series_count
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats['enabled'] = self.enabled
+        stats['namespace'] = self.namespace
+        stats['pending_series'] = self._series_count
+        stats['pending_groups'] = len(self._groups)
+        return stats
+
+    def reset(self) -> None:
+        """Drop pending series and zero the counters."""
+        self._groups = {}
+        self._series_count = 0
+        self._rejected = 0
+        self._stats = self._new_stats()
+
+
+__all__ = [
+    'EMFExporter',
+    'parse_dimension_sets',
+    'infer_unit',
+    'EMF_ENABLED',
+    'EMF_NAMESPACE',
+    'EMF_DIMENSION_SETS',
+    'EMF_MAX_DIMENSION_GROUPS',
+    'EMF_MAX_SERIES',
+]
+
+# EOF
@@ -1,9 +1,13 @@
 """
 metrics_operations.py - Gateway implementation functions for metrics
-Version: 2025.11.29.01
+Version: 2026.10.18.01
 Description: FIXED missing function export causing circular import failure
 
 CHANGELOG:
+- 2026.10.18.01: Performance report reads p50/p95/p99 from
+  get_operation_metrics() (quantile sketches) instead of sorting the
+  removed 'durations' sample lists
+
 - 2025.11.29.01: BUG FIX - Missing export in __all__
   - FIXED: Added _execute_get_performance_report_implementation to __all__
   - CAUSE: Function existed but wasn't exported, causing ImportError
@@ -246,12 +250,13 @@ def _execute_get_performance_report_implementation(slow_threshold_ms: float = 10
         operations = {}
         for op_name, metrics in operation_metrics.items():
             if metrics['count'] > 0:
+                # Percentiles come from the operation's quantile sketch
                 operations[op_name] = {
                     'count': metrics['count'],
-                    'avg_ms': metrics['total_ms'] / metrics['count'],
-                    'p50_ms': _calculate_percentiles(metrics.get('durations', []), [50])[50],
-                    'p95_ms': _calculate_percentiles(metrics.get('durations', []), [95])[95],
-                    'p99_ms': _calculate_percentiles(metrics.get('durations', []), [99])[99],
+                    'avg_ms': metrics['avg_ms'],
+                    'p50_ms': metrics['p50_ms'],
+                    'p95_ms': metrics['p95_ms'],
+                    'p99_ms': metrics['p99_ms'],
                 }
         
         # Get cache efficiency
@@ -0,0 +1,253 @@
+"""
+metrics_sketch.py - Mergeable Quantile Sketch for Timing Series
+Version: 2026.10.18.02
+Description: Fixed-memory streaming quantiles (DDSketch style logarithmic
+             buckets) with relative accuracy guarantees. Used by metrics_core
+             for operation durations, dispatcher timings and histograms.
+
+CHANGELOG:
+- 2026.10.18.02: value_counts() - bucket values and counts, at most
+  max_values pairs (EMF histogram export, metrics_emf.py)
+- 2026.10.18.01: Initial version
+  - QuantileSketch: O(1) add(), quantile() within SKETCH_RELATIVE_ACCURACY
+    of the exact value, bounded to SKETCH_MAX_BUCKETS buckets
+  - merge(): bucket-wise addition (sketches from other series, invocations
+    or containers combine without losing accuracy)
+  - to_dict() / from_dict(): plain state for export and merging elsewhere
+
+DESIGN DECISION: Logarithmic buckets instead of P-squared markers
+Reason: P-squared (http_client_latency.py) tracks one quantile per
+estimator and can't be merged. A log bucket index covers every quantile at
+once, the error is relative (1% of 2ms is 0.02ms, of 2s is 20ms - what
+timing percentiles need), and two sketches merge by adding counts, so
+per-invocation or per-container sketches can be combined exactly.
+
+DESIGN DECISION: Sparse dict of buckets, lowest buckets collapsed at the cap
+Reason: Timings of one series span a few decades, i.e. a few hundred
+buckets at 1% accuracy; a dict keeps only the occupied ones. If a series
+ever exceeds SKETCH_MAX_BUCKETS, the lowest buckets are folded together
+(as DDSketch does): the fast end loses resolution, p50-p99 keep theirs.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+# Relative error bound of quantile() (0.01 = within 1% of the exact value)
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Occupied buckets kept per sketch before the lowest are collapsed
+SKETCH_MAX_BUCKETS = 1024
+
+# Values at or below this are counted in the zero bucket
+_MIN_INDEXABLE = 1e-9
+
+_log = math.log
+_ceil = math.ceil
+
+
+class QuantileSketch:
+    """
+    DDSketch style quantile sketch for non-negative values.
+
+    Args:
+        relative_accuracy: Relative error bound of quantile()
+        max_buckets: Occupied buckets kept before the lowest are collapsed
+    """
+
+    __slots__ = ('relative_accuracy', 'max_buckets', 'count', 'total', 'min', 'max',
+                 'zero_count', 'collapsed', '_buckets', '_floor', '_gamma', '_inv_log_gamma')
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY,
+                 max_buckets: int = SKETCH_MAX_BUCKETS):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be between 0 and 1, got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max(1, max_buckets)
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1.0 / math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        # Lowest bucket key after a collapse; smaller keys are counted in it
+        self._floor: Optional[int] = None
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.zero_count = 0
+        self.collapsed = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add value (count times)."""
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= _MIN_INDEXABLE:
+            self.zero_count += count
+            return
+        key = _ceil(_log(value) * self._inv_log_gamma)
+        floor = self._floor
+        if floor is not None and key < floor:
+            key = floor
+        buckets = self._buckets
+        if key in buckets:
+            buckets[key] += count
+        else:
+            buckets[key] = count
+            if len(buckets) > self.max_buckets:
+                self._collapse()
+
+    def _collapse(self) -> None:
+        """Fold the two lowest buckets into one."""
+        lowest, second = sorted(self._buckets)[:2]
+        self._buckets[second] += self._buckets.pop(lowest)
+        self._floor = second
+        self.collapsed += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Value at quantile q (0-1), 0.0 for an empty sketch.
+
+        Within relative_accuracy of the exact sorted_values[int(q * (count - 1))].
+        """
+        if not self.count:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return max(self.min, 0.0)
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if seen > rank:
+                estimate = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Add other's observations to this sketch.
+
+        Raises:
+            ValueError: Sketches use different relative accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if not other.count:
+            return self
+        buckets = self._buckets
+        floors = [floor for floor in (self._floor, other._floor) if floor is not None]
+        floor = max(floors) if floors else None
+        if floor is not None:
+            for key in [key for key in buckets if key < floor]:
+                buckets[floor] = buckets.get(floor, 0) + buckets.pop(key)
+        for key, bucket_count in other._buckets.items():
+            if floor is not None and key < floor:
+                key = floor
+            buckets[key] = buckets.get(key, 0) + bucket_count
+        self._floor = floor
+        while len(buckets) > self.max_buckets:
+            self._collapse()
+        self.count += other.count
+        self.total += other.total
+        self.zero_count += other.zero_count
+        self.collapsed += other.collapsed
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def bucket_count(self) -> int:
+        """Occupied buckets (memory use is proportional to this)."""
+        return len(self._buckets)
+
+    def summary(self, digits: int = 3) -> Dict[str, Any]:
+        """count, avg, min, max and p50/p95/p99 (rounded)."""
+        if not self.count:
+            return {'count': 0, 'avg': 0.0, 'min': 0.0, 'max': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        return {
+            'count': self.count,
+            'avg': round(self.total / self.count, digits),
+            'min': round(self.min, digits),
+            'max': round(self.max, digits),
+            'p50': round(self.quantile(0.5), digits),
+            'p95': round(self.quantile(0.95), digits),
+            'p99': round(self.quantile(0.99), digits)
+        }
+
+    def value_counts(self, max_values: int = 100) -> Tuple[List[float], List[int]]:
+        """
+        Ascending bucket values with their counts.
+
+        Neighbouring buckets are combined (count-weighted value) until at
+        most max_values pairs remain.
+        """
+        pairs = [[0.0, self.zero_count]] if self.zero_count else []
+        gamma = self._gamma
+        for key in sorted(self._buckets):
+            value = 2 * gamma ** key / (gamma + 1)
+            pairs.append([min(max(value, self.min), self.max), self._buckets[key]])
+        while len(pairs) > max_values:
+            combined = []
+            for index in range(0, len(pairs) - 1, 2):
+                (low, low_count), (high, high_count) = pairs[index], pairs[index + 1]
+                total = low_count + high_count
+                combined.append([(low * low_count + high * high_count) / total, total])
+            if len(pairs) % 2:
+                combined.append(pairs[-1])
+            pairs = combined
+        return [value for value, _ in pairs], [count for _, count in pairs]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain state (JSON serializable) - from_dict() restores it."""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'zero_count': self.zero_count,
+            'floor': self._floor,
+            'buckets': {str(key): value for key, value in self._buckets.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any], max_buckets: Optional[int] = None) -> 'QuantileSketch':
+        sketch = cls(state['relative_accuracy'], max_buckets or SKETCH_MAX_BUCKETS)
+        sketch.count = state['count']
+        sketch.total = state['total']
+        if state['count']:
+            sketch.min = state['min']
+            sketch.max = state['max']
+        sketch.zero_count = state['zero_count']
+        sketch._buckets = {int(key): value for key, value in state['buckets'].items()}
+        sketch._floor = state.get('floor')
+        while len(sketch._buckets) > sketch.max_buckets:
+            sketch._collapse()
+        return sketch
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._floor = None
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.zero_count = 0
+        self.collapsed = 0
+
+
+__all__ = [
+    'QuantileSketch',
+    'SKETCH_RELATIVE_ACCURACY',
+    'SKETCH_MAX_BUCKETS',
+]
+
+# EOF
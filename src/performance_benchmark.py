@@ -1,8 +1,18 @@
 """
 performance_benchmark.py
-Version: 2025.10.14.01
+Version: 2026.10.18.08
 Description: Performance benchmarking utilities for optimization validation
 
+CHANGELOG:
+- 2026.10.18.08: Added sequential vs concurrent (asyncio) HTTP fan-out benchmark
+- 2026.10.18.07: Added gzip vs identity throughput benchmark (local stand-in server)
+- 2026.10.18.06: Added HTTP response parsing allocation benchmark (tracemalloc)
+- 2026.10.18.05: Added circuit breaker call overhead benchmark
+- 2026.10.18.04: Added rate limiter cost-per-op micro-benchmark
+- 2026.10.18.03: Added permessage-deflate byte-transfer/latency benchmark
+- 2026.10.18.02: Added pipelined vs sequential WebSocket command benchmark
+- 2026.10.18.01: Added Alexa property mapping micro-benchmark
+
 Copyright 2025 Joseph Hersey
 
    Licensed under the Apache License, Version 2.0 (the "License");
@@ -259,6 +269,523 @@ def run_comprehensive_benchmark() -> Dict[str, Any]:
     return results
 
 
+# ===== HOME ASSISTANT BENCHMARKS =====
+
+def _build_entity_state_corpus(size: int = 200) -> List[Dict[str, Any]]:
+    """Build a mixed corpus of HA entity states for mapping benchmarks."""
+    templates = [
+        ('light', 'on', {'brightness': 180, 'color_temp_kelvin': 2700, 'hs_color': [30.0, 60.0]}),
+        ('light', 'off', {}),
+        ('switch', 'on', {}),
+        ('fan', 'on', {'percentage': 66}),
+        ('lock', 'locked', {}),
+        ('cover', 'open', {'current_position': 75}),
+        ('cover', 'closed', {}),
+        ('media_player', 'playing', {'volume_level': 0.4, 'is_volume_muted': False}),
+        ('sensor', '21.5', {'device_class': 'temperature', 'unit_of_measurement': '°C'}),
+        ('sensor', '48', {'device_class': 'humidity', 'unit_of_measurement': '%'}),
+        ('binary_sensor', 'on', {'device_class': 'door'}),
+        ('binary_sensor', 'off', {'device_class': 'motion'}),
+        ('climate', 'heat', {'current_temperature': 68, 'temperature': 70}),
+        ('automation', 'on', {}),
+    ]
+    corpus = []
+    for i in range(size):
+        domain, state, attributes = templates[i % len(templates)]
+        corpus.append({
+            'entity_id': f'{domain}.entity_{i}',
+            'state': state,
+            'attributes': dict(attributes)
+        })
+    return corpus
+
+
+def benchmark_alexa_property_mapping(corpus_size: int = 200) -> Dict[str, Any]:
+    """
+    Benchmark compiled Alexa context.properties mapping over mixed entity states.
+    
+    Measures one full pass over the corpus per iteration (one shared
+    timestamp per pass, as in a batched ReportState response).
+    """
+    try:
+        from home_assistant.ha_alexa_properties import (
+            build_context_properties, build_properties_for_states, format_time_of_sample
+        )
+    except ImportError as e:
+        return {'error': f'Home Assistant extension unavailable: {e}'}
+    
+    corpus = _build_entity_state_corpus(corpus_size)
+    
+    def single_entity_pass():
+        for entity_state in corpus:
+            build_context_properties(entity_state['entity_id'], entity_state, format_time_of_sample())
+    
+    def batched_pass():
+        build_properties_for_states(corpus)
+    
+    single = benchmark_operation(single_entity_pass, iterations=200, warmup=20)
+    batched = benchmark_operation(batched_pass, iterations=200, warmup=20)
+    
+    property_count = sum(len(p) for p in build_properties_for_states(corpus).values())
+    
+    result = {
+        'corpus_size': corpus_size,
+        'properties_per_pass': property_count,
+        'per_entity_timestamp': single,
+        'shared_timestamp': batched
+    }
+    
+    if 'avg_ms' in batched and batched['avg_ms'] > 0:
+        result['avg_us_per_entity'] = round(batched['avg_ms'] * 1000 / corpus_size, 3)
+        result['properties_per_second'] = round(property_count / (batched['avg_ms'] / 1000))
+    
+    return result
+
+
+# ===== WEBSOCKET BENCHMARKS =====
+
+def benchmark_websocket_pipelining(command_count: int = 8, latency_ms: float = 20.0,
+                                   rounds: int = 10) -> Dict[str, Any]:
+    """
+    Benchmark N pipelined vs N sequential commands on one WebSocket session.
+    
+    Runs against a local stand-in server that answers each command
+    latency_ms after it arrives (commands are processed concurrently, like
+    Home Assistant). Session connect/auth is excluded from the timings.
+    """
+    from websocket_session import WebSocketSession
+    from websocket_standin import StandInWebSocketServer, StandInClientSocket
+    
+    command_types = ['config/entity_registry/list', 'get_states',
+                     'config/device_registry/list', 'config/area_registry/list']
+    messages = [{'type': command_types[i % len(command_types)]} for i in range(command_count)]
+    
+    with StandInWebSocketServer(latency_ms=latency_ms) as server:
+        session = WebSocketSession(
+            server.url,
+            auth_message={'type': 'auth', 'access_token': 'benchmark'},
+            socket_factory=StandInClientSocket.factory
+        )
+        session.acquire()
+        
+        def sequential():
+            for message in messages:
+                session.request(message)
+        
+        def pipelined():
+            session.pipeline(messages)
+        
+        sequential_result = benchmark_operation(sequential, iterations=rounds, warmup=1)
+        pipelined_result = benchmark_operation(pipelined, iterations=rounds, warmup=1)
+        session_stats = session.get_stats()
+        session.close()
+    
+    result = {
+        'command_count': command_count,
+        'server_latency_ms': latency_ms,
+        'sequential': sequential_result,
+        'pipelined': pipelined_result,
+        'max_in_flight': session_stats['max_in_flight'],
+        'connects': session_stats['connects']
+    }
+    
+    if 'avg_ms' in sequential_result and pipelined_result.get('avg_ms'):
+        result['speedup'] = round(sequential_result['avg_ms'] / pipelined_result['avg_ms'], 2)
+    
+    return result
+
+
+def _synthetic_ha_states(entity_count: int) -> List[Dict[str, Any]]:
+    """get_states-shaped payload with realistic repetition between entities."""
+    domains = ['light', 'switch', 'sensor', 'binary_sensor', 'climate', 'cover']
+    states = []
+    for i in range(entity_count):
+        domain = domains[i % len(domains)]
+        states.append({
+            'entity_id': f'{domain}.device_{i}',
+            'state': 'on' if i % 3 else 'off',
+            'attributes': {
+                'friendly_name': f'Device {i}',
+                'supported_features': i % 64,
+                'device_class': domain,
+                'icon': f'mdi:{domain}'
+            },
+            'last_changed': f'2026-10-18T10:{i % 60:02d}:00.000000+00:00',
+            'last_updated': f'2026-10-18T10:{i % 60:02d}:00.000000+00:00',
+            'context': {'id': f'01J{i:023d}', 'parent_id': None, 'user_id': None}
+        })
+    return states
+
+
+def benchmark_websocket_compression(entity_count: int = 2000, rounds: int = 10,
+                                    window_bits: int = 15) -> Dict[str, Any]:
+    """
+    Benchmark get_states over permessage-deflate vs an uncompressed stand-in.
+    
+    Both runs use websocket_deflate.DeflateWebSocket on one session; only
+    the server's compression differs. Reports bytes on the wire per
+    get_states and request latency (connect/auth excluded).
+    """
+    from websocket_session import WebSocketSession
+    from websocket_deflate import DeflateWebSocket
+    from websocket_standin import StandInWebSocketServer
+    
+    states = _synthetic_ha_states(entity_count)
+    result = {'entity_count': entity_count, 'window_bits': window_bits}
+    
+    for label, compression in (('uncompressed', False), ('deflate', True)):
+        with StandInWebSocketServer(handlers={'get_states': lambda message: states},
+                                    compression=compression) as server:
+            session = WebSocketSession(
+                server.url,
+                auth_message={'type': 'auth', 'access_token': 'benchmark'},
+                connect_options={'compression': compression, 'window_bits': window_bits},
+                socket_factory=DeflateWebSocket.factory
+            )
+            session.acquire()
+            bytes_before = server.stats['bytes_sent']
+            timing = benchmark_operation(lambda: session.request({'type': 'get_states'}),
+                                         iterations=rounds, warmup=1)
+            transport = session.get_stats()['transport']
+            session.close()
+        
+        timing['wire_bytes_per_request'] = (server.stats['bytes_sent'] - bytes_before) // (rounds + 1)
+        timing['negotiated'] = transport['compression'] is not None
+        result[label] = timing
+    
+    plain_bytes = result['uncompressed']['wire_bytes_per_request']
+    deflate_bytes = result['deflate']['wire_bytes_per_request']
+    if deflate_bytes:
+        result['byte_reduction'] = round(plain_bytes / deflate_bytes, 2)
+    if result['uncompressed'].get('avg_ms') and result['deflate'].get('avg_ms'):
+        result['latency_ratio'] = round(result['deflate']['avg_ms'] / result['uncompressed']['avg_ms'], 2)
+    
+    return result
+
+
+def benchmark_rate_limiter(iterations: int = 100000) -> Dict[str, Any]:
+    """
+    Benchmark limiter cost per operation.
+    
+    Compares the former per-core deque sliding window (reproduced here),
+    the shared GCRA limiter and a disabled limiter. Limits are set high
+    enough that every call takes the 'allowed' path.
+    """
+    from collections import deque
+    from rate_limiter import RateLimiter
+    
+    max_ops = iterations * 10
+    window = deque(maxlen=max_ops)
+    
+    def deque_window():
+        now = time.time() * 1000
+        while window and (now - window[0]) > 1000:
+            window.popleft()
+        if len(window) >= max_ops:
+            return False
+        window.append(now)
+        return True
+    
+    gcra = RateLimiter('benchmark', rate_per_second=max_ops)
+    disabled = RateLimiter('benchmark_disabled', rate_per_second=max_ops, enabled=False)
+    
+    def per_op_ns(check: Callable[[], bool]) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            check()
+        return round((time.perf_counter() - start) / iterations * 1e9, 1)
+    
+    result = {
+        'iterations': iterations,
+        'deque_window_ns': per_op_ns(deque_window),
+        'gcra_ns': per_op_ns(gcra.allow),
+        'disabled_ns': per_op_ns(disabled.allow),
+        'gcra_state_floats': 1,
+        'deque_window_entries': len(window)
+    }
+    if result['gcra_ns']:
+        result['speedup'] = round(result['deque_window_ns'] / result['gcra_ns'], 2)
+    return result
+
+
+def benchmark_circuit_breaker(iterations: int = 100000) -> Dict[str, Any]:
+    """
+    Benchmark circuit breaker overhead per protected call.
+    
+    Measures a bare function call, CircuitBreaker.call() and the gateway
+    execute_with_circuit_breaker() path around the same no-op function.
+    """
+    from circuit_breaker_core import CircuitBreaker
+    import gateway
+    
+    def noop():
+        return None
+    
+    breaker = CircuitBreaker('benchmark')
+    
+    def per_call_ns(func: Callable, *args) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func(*args)
+        return round((time.perf_counter() - start) / iterations * 1e9, 1)
+    
+    direct_ns = per_call_ns(noop)
+    breaker_ns = per_call_ns(breaker.call, noop)
+    gateway_iterations = min(iterations, 900)  # stay under the 1000 ops/sec limit
+    start = time.perf_counter()
+    for _ in range(gateway_iterations):
+        gateway.execute_with_circuit_breaker('benchmark', noop)
+    gateway_ns = round((time.perf_counter() - start) / gateway_iterations * 1e9, 1)
+    
+    return {
+        'iterations': iterations,
+        'direct_call_ns': direct_ns,
+        'breaker_call_ns': breaker_ns,
+        'breaker_overhead_ns': round(breaker_ns - direct_ns, 1),
+        'gateway_call_ns': gateway_ns
+    }
+
+
+# ===== HTTP BENCHMARKS =====
+
+def benchmark_http_response_parsing(entity_count: int = 5000, rounds: int = 5) -> Dict[str, Any]:
+    """
+    Allocation cost of turning an /api/states response into a result.
+    
+    Uses tracemalloc around urllib3 responses built in memory (no network):
+    - legacy: response.data.decode() + json.loads(str) + dict(headers)
+    - bytes: parse_json_body(response.data), headers by reference (raw_headers=True)
+    - stream: preload_content=False, body consumed in 64 KiB chunks
+    
+    Peak is the most memory held at once above the starting point; blocks
+    is the number of allocations still live at the end of one round.
+    """
+    import io
+    import json
+    import tracemalloc
+    from urllib3 import HTTPResponse
+    from http_client_utilities import parse_json_body
+    
+    body = json.dumps(_synthetic_ha_states(entity_count)).encode('utf-8')
+    headers = {'Content-Type': 'application/json', 'Content-Length': str(len(body)),
+               'Server': 'Python/3.12 aiohttp/3.10', 'Date': 'Sun, 18 Oct 2026 10:00:00 GMT'}
+    
+    def legacy():
+        response = HTTPResponse(body=io.BytesIO(body), headers=headers, status=200)
+        return json.loads(response.data.decode('utf-8')), dict(response.headers)
+    
+    def from_bytes():
+        response = HTTPResponse(body=io.BytesIO(body), headers=headers, status=200)
+        return parse_json_body(response.data), response.headers
+    
+    def streamed():
+        response = HTTPResponse(body=io.BytesIO(body), headers=headers, status=200,
+                                preload_content=False)
+        received = 0
+        for chunk in response.stream(65536):
+            received += len(chunk)
+        response.release_conn()
+        return received, response.headers
+    
+    def measure(func: Callable) -> Dict[str, Any]:
+        func()  # warm imports and caches
+        peaks, blocks, times = [], [], []
+        for _ in range(rounds):
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            start_size = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            result = func()
+            times.append((time.perf_counter() - start) * 1000)
+            peaks.append(tracemalloc.get_traced_memory()[1] - start_size)
+            after = tracemalloc.take_snapshot()
+            blocks.append(sum(stat.count_diff for stat in after.compare_to(before, 'filename')))
+            tracemalloc.stop()
+            del result
+        return {
+            'peak_kb': round(min(peaks) / 1024, 1),
+            'live_blocks': min(blocks),
+            'ms': round(sorted(times)[len(times) // 2], 2)
+        }
+    
+    return {
+        'entity_count': entity_count,
+        'body_kb': round(len(body) / 1024, 1),
+        'legacy': measure(legacy),
+        'bytes': measure(from_bytes),
+        'stream': measure(streamed)
+    }
+
+
+def benchmark_http_compression(entity_count: int = 2000, rounds: int = 10,
+                               uplink_mbit: float = 20.0) -> Dict[str, Any]:
+    """
+    Throughput of /api/states-sized GETs with and without gzip.
+    
+    Runs a local compressing stand-in server (ThreadingHTTPServer on
+    127.0.0.1) that throttles its writes to uplink_mbit, like a home
+    uplink in front of HA, and fetches through HTTPClientCore with
+    Accept-Encoding gzip vs identity.
+    """
+    import gzip
+    import json
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from http_client_core import HTTPClientCore
+    
+    body = json.dumps(_synthetic_ha_states(entity_count)).encode('utf-8')
+    compressed = gzip.compress(body, compresslevel=6)
+    bytes_per_second = uplink_mbit * 1_000_000 / 8
+    
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def do_GET(self):
+            use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+            payload = compressed if use_gzip else body
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            if use_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+            self.end_headers()
+            for offset in range(0, len(payload), 16384):
+                chunk = payload[offset:offset + 16384]
+                self.wfile.write(chunk)
+                time.sleep(len(chunk) / bytes_per_second)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/api/states'
+    client = HTTPClientCore()
+    
+    def measure(accept_encoding: str) -> Dict[str, Any]:
+        times = []
+        for _ in range(rounds + 1):
+            start = time.perf_counter()
+            result = client.make_request('GET', url, headers={'Accept-Encoding': accept_encoding},
+                                         timeout=60.0)
+            times.append((time.perf_counter() - start) * 1000)
+            if not result.get('success') or len(result['data']) != entity_count:
+                raise RuntimeError(f"stand-in fetch failed: {result.get('error')}")
+        times = sorted(times[1:])  # first request opens the connection
+        median_ms = times[len(times) // 2]
+        return {
+            'median_ms': round(median_ms, 2),
+            'throughput_mb_s': round(len(body) / 1_000_000 / (median_ms / 1000), 2)
+        }
+    
+    try:
+        identity = measure('identity')
+        gzipped = measure('gzip, deflate')
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    return {
+        'entity_count': entity_count,
+        'uplink_mbit': uplink_mbit,
+        'body_kb': round(len(body) / 1024, 1),
+        'gzip_kb': round(len(compressed) / 1024, 1),
+        'identity': identity,
+        'gzip': gzipped,
+        'speedup': round(identity['median_ms'] / gzipped['median_ms'], 2)
+    }
+
+
+def benchmark_http_fanout(request_count: int = 20, server_latency_ms: float = 25.0,
+                          rounds: int = 5) -> Dict[str, Any]:
+    """
+    Wall time of request_count GETs: sequential make_request vs
+    make_requests_concurrently.
+    
+    Runs a local stand-in server (ThreadingHTTPServer on 127.0.0.1) that
+    answers each request after server_latency_ms, like HA handling a
+    state read. Concurrent batches run with the default per-host limit
+    and with one slot per request.
+    """
+    import json
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from http_client_core import HTTPClientCore
+    from http_client_async import HTTP_ASYNC_MAX_PER_HOST
+    
+    body = json.dumps({'entity_id': 'light.kitchen', 'state': 'on', 'attributes': {}}).encode('utf-8')
+    
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body are separate writes; Nagle would hold the body
+        disable_nagle_algorithm = True
+        
+        def do_GET(self):
+            time.sleep(server_latency_ms / 1000)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    class StandInServer(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 64  # default 5 drops simultaneous connects
+    
+    server = StandInServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}/api/states/light.kitchen_'
+    urls = [f'{base_url}{index}' for index in range(request_count)]
+    client = HTTPClientCore()
+    
+    def check(results: List[Dict[str, Any]]) -> None:
+        failed = [result for result in results if not result.get('success')]
+        if failed:
+            raise RuntimeError(f"stand-in fetch failed: {failed[0].get('error')}")
+    
+    def median_ms(run: Callable[[], None]) -> float:
+        times = []
+        for _ in range(rounds + 1):
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) * 1000)
+        times = sorted(times[1:])  # first round opens the connections
+        return round(times[len(times) // 2], 2)
+    
+    def concurrent_ms(max_per_host: int) -> Dict[str, Any]:
+        engine = client._get_async_engine()
+        engine.max_per_host = max_per_host
+        waits_before = engine.get_stats()['host_waits']
+        result = median_ms(lambda: check(client.make_requests_concurrently([{'url': url} for url in urls])))
+        return {
+            'max_per_host': max_per_host,
+            'median_ms': result,
+            'host_waits_per_batch': round((engine.get_stats()['host_waits'] - waits_before) / (rounds + 1), 1)
+        }
+    
+    try:
+        sequential = median_ms(lambda: check([client.make_request('GET', url, timeout=10.0) for url in urls]))
+        limited = concurrent_ms(HTTP_ASYNC_MAX_PER_HOST)
+        unlimited = concurrent_ms(request_count)
+    finally:
+        client.close_async()
+        server.shutdown()
+        server.server_close()
+    
+    return {
+        'request_count': request_count,
+        'server_latency_ms': server_latency_ms,
+        'sequential_ms': sequential,
+        'concurrent': limited,
+        'concurrent_unlimited': unlimited,
+        'speedup': round(sequential / limited['median_ms'], 2),
+        'speedup_unlimited': round(sequential / unlimited['median_ms'], 2)
+    }
+
+
 # ===== REPORT GENERATION =====
 
 def generate_benchmark_report(results: Dict[str, Any]) -> str:
@@ -306,6 +833,14 @@ __all__ = [
     'benchmark_cache_operations',
     'benchmark_metrics_operations',
     'benchmark_logging_operations',
+    'benchmark_alexa_property_mapping',
+    'benchmark_websocket_pipelining',
+    'benchmark_websocket_compression',
+    'benchmark_rate_limiter',
+    'benchmark_circuit_breaker',
+    'benchmark_http_response_parsing',
+    'benchmark_http_compression',
+    'benchmark_http_fanout',
     'compare_optimizations',
     'run_comprehensive_benchmark',
     'generate_benchmark_report'
@@ -0,0 +1,234 @@
+"""
+rate_limiter.py - Shared Rate Limiter Engine
+Version: 2026.10.18.01
+Description: Named GCRA (token bucket equivalent) limiters with O(1) state,
+             monotonic clock and per-limiter stats. Used directly by the
+             interface cores (not routed through the gateway - gateway calls
+             are themselves rate limited).
+
+CHANGELOG:
+- 2026.10.18.01: Initial version
+  - Replaces the per-core deque-of-timestamps sliding windows (LESS-21)
+  - Limits per configuration tier (variables.RATE_LIMIT_INTERFACE_CONFIG),
+    user_config 'rate_limits' overrides, RATE_LIMIT_ENABLED /
+    RATE_LIMIT_DISABLED environment switches
+
+DESIGN DECISION: GCRA instead of a sliding window of timestamps
+Reason: The deque window called time.time() and popped expired entries on
+every operation, keeping up to N floats per core. GCRA keeps one float
+(theoretical arrival time) per limiter: one clock read, one compare, one
+add. It allows the same sustained rate, with bursts up to 'burst'
+operations, like a token bucket of that size.
+
+DESIGN DECISION: Limiters can be disabled per name
+Reason: Cache and singleton lookups run many times per request; a DoS limit
+there protects nothing the outer limits don't already cover. A disabled
+limiter's allow() returns before reading the clock.
+
+COMPLIANCE:
+- AP-08: No threading locks (Lambda single-threaded)
+- DEC-04: Lambda single-threaded model
+- LESS-21: Rate limiting for DoS protection
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Fallback when a name has no tier entry
+DEFAULT_RATE_PER_SECOND = 1000.0
+
+# Global switches (read once per container)
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_DISABLED = frozenset(
+    name.strip() for name in os.getenv('RATE_LIMIT_DISABLED', '').split(',') if name.strip()
+)
+
+
+class RateLimiter:
+    """
+    GCRA rate limiter: rate_per_second sustained, bursts up to burst ops.
+
+    Args:
+        name: Limiter key (e.g. 'cache')
+        rate_per_second: Sustained operations per second
+        burst: Operations allowed back to back (default: one second's worth)
+        enabled: False = allow() always succeeds without reading the clock
+        clock: Monotonic time source in seconds (injectable for tests)
+    """
+
+    __slots__ = ('name', 'rate_per_second', 'burst', 'enabled',
+                 '_interval', '_tolerance', '_tat', '_clock',
+                 'allowed', 'rejected')
+
+    def __init__(self, name: str, rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+                 burst: Optional[int] = None, enabled: bool = True,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self._clock = clock
+        self.allowed = 0
+        self.rejected = 0
+        self._tat = 0.0
+        self.enabled = enabled
+        self.configure(rate_per_second, burst)
+
+    def configure(self, rate_per_second: Optional[float] = None, burst: Optional[int] = None,
+                  enabled: Optional[bool] = None) -> None:
+        """Change limits in place (state is kept)."""
+        if rate_per_second is not None:
+            self.rate_per_second = float(rate_per_second)
+            if burst is None:
+                burst = max(1, int(self.rate_per_second))
+        if burst is not None:
+            self.burst = max(1, int(burst))
+        if enabled is not None:
+            self.enabled = enabled
+        self._interval = 1.0 / self.rate_per_second if self.rate_per_second > 0 else float('inf')
+        self._tolerance = self._interval * (self.burst - 1)
+
+    def allow(self) -> bool:
+        """Take one operation; False if over the limit."""
+        if not self.enabled:
+            return True
+        now = self._clock()
+        tat = self._tat if self._tat > now else now
+        if tat - now > self._tolerance:
+            self.rejected += 1
+            return False
+        self._tat = tat + self._interval
+        self.allowed += 1
+        return True
+
+    def in_use(self) -> int:
+        """Operations currently counted against the burst (0 = idle)."""
+        backlog = self._tat - self._clock()
+        if backlog <= 0:
+            return 0
+        return min(self.burst, int(backlog / self._interval + 0.999999))
+
+    def reset(self) -> None:
+        """Clear state and counters (limits kept)."""
+        self._tat = 0.0
+        self.allowed = 0
+        self.rejected = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.allowed + self.rejected
+        return {
+            'name': self.name,
+            'enabled': self.enabled,
+            'rate_per_second': self.rate_per_second,
+            'burst': self.burst,
+            'allowed': self.allowed,
+            'rejected': self.rejected,
+            'reject_rate': round(self.rejected / total, 4) if total else 0.0,
+            'in_use': self.in_use() if self.enabled else 0
+        }
+
+
+# ===== REGISTRY =====
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_CONFIG: Optional[Dict[str, Any]] = None
+
+
+def _load_config() -> Dict[str, Any]:
+    """Tier limits for CONFIGURATION_TIER merged with user_config 'rate_limits'."""
+    global _CONFIG
+    if _CONFIG is not None:
+        return _CONFIG
+
+    config: Dict[str, Any] = {'enabled': True, 'limits': {}}
+    try:
+        from variables import ConfigurationTier, RATE_LIMIT_INTERFACE_CONFIG
+        try:
+            tier = ConfigurationTier(os.getenv('CONFIGURATION_TIER', 'standard').lower())
+        except ValueError:
+            tier = ConfigurationTier.STANDARD
+        tier_config = RATE_LIMIT_INTERFACE_CONFIG.get(tier) or RATE_LIMIT_INTERFACE_CONFIG[ConfigurationTier.STANDARD]
+        config['enabled'] = tier_config.get('enabled', True)
+        config['limits'] = {name: dict(limits) for name, limits in tier_config.get('limits', {}).items()}
+    except ImportError:
+        pass
+
+    try:
+        from user_config import USER_CUSTOM_CONFIG
+        overrides = (USER_CUSTOM_CONFIG or {}).get('rate_limits') or {}
+        if 'enabled' in overrides:
+            config['enabled'] = overrides['enabled']
+        for name, limits in (overrides.get('limits') or {}).items():
+            config['limits'].setdefault(name, {}).update(limits)
+    except ImportError:
+        pass
+
+    _CONFIG = config
+    return config
+
+
+def _is_enabled(name: str, limits: Dict[str, Any]) -> bool:
+    config = _load_config()
+    return (RATE_LIMIT_ENABLED and config['enabled']
+            and name not in RATE_LIMIT_DISABLED and limits.get('enabled', True))
+
+
+def get_rate_limiter(name: str, rate_per_second: Optional[float] = None,
+                     burst: Optional[int] = None) -> RateLimiter:
+    """
+    Get (or create) the shared limiter for name.
+
+    Configured limits (tier/user_config) win over the given defaults, so a
+    core passes its historical rate and deployments can still change it.
+
+    Args:
+        name: Limiter key
+        rate_per_second: Default sustained rate if not configured
+        burst: Default burst if not configured
+
+    Returns:
+        RateLimiter (same instance for the same name)
+    """
+    limiter = _LIMITERS.get(name)
+    if limiter is None:
+        limits = _load_config()['limits'].get(name, {})
+        limiter = RateLimiter(
+            name,
+            rate_per_second=limits.get('rate_per_second', rate_per_second or DEFAULT_RATE_PER_SECOND),
+            burst=limits.get('burst', burst),
+            enabled=_is_enabled(name, limits)
+        )
+        _LIMITERS[name] = limiter
+    return limiter
+
+
+def configure_rate_limiter(name: str, rate_per_second: Optional[float] = None,
+                           burst: Optional[int] = None, enabled: Optional[bool] = None) -> RateLimiter:
+    """Change a limiter at runtime (creates it if needed)."""
+    limiter = get_rate_limiter(name, rate_per_second, burst)
+    limiter.configure(rate_per_second, burst, enabled)
+    return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for all limiters by name."""
+    return {name: limiter.get_stats() for name, limiter in _LIMITERS.items()}
+
+
+def reset_rate_limiters() -> None:
+    """Reset state and counters of all limiters."""
+    for limiter in _LIMITERS.values():
+        limiter.reset()
+
+
+__all__ = [
+    'RateLimiter',
+    'get_rate_limiter',
+    'configure_rate_limiter',
+    'get_rate_limiter_stats',
+    'reset_rate_limiters',
+    'DEFAULT_RATE_PER_SECOND',
+]
+
+# EOF
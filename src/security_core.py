@@ -1,9 +1,12 @@
 # Filename: security_core.py
 """
 security_core.py - Security core orchestrator with Phase 1 enhancements
-Version: 2025.10.22.01
+Version: 2026.10.18.01
 Description: COMPLETE - All original code + Phase 1 (SINGLETON, rate limiting, reset)
 
+CHANGES (2026.10.18.01):
+- Rate limiting via shared GCRA limiter (rate_limiter.py) replaces deque window
+
 CHANGES (2025.10.22.01): PHASE 1 ENHANCEMENTS
 - Added SINGLETON registration pattern (try gateway, fallback to module)
 - Added rate limiting (1000 ops/sec) with deque-based tracker
@@ -21,7 +24,7 @@ import time
 import re
 import math
 from typing import Dict, Any, Optional
-from collections import deque
+from rate_limiter import get_rate_limiter
 
 from security_types import SecurityOperation
 from security_validation import SecurityValidator
@@ -141,32 +144,20 @@ class SecurityCore:
         self._crypto = SecurityCrypto()
         
         # PHASE 1: Rate limiting (1000 ops/sec)
-        self._rate_limiter = deque(maxlen=1000)
-        self._rate_limit_window_ms = 1000
-        self._rate_limited_count = 0
+        self._rate_limiter = get_rate_limiter('security', 1000)
     
     def _check_rate_limit(self) -> bool:
         """
-        Check rate limit (Phase 1 requirement).
+        Check if operation is within rate limit.
+        
+        Shared GCRA limiter 'security' (rate_limiter.py): O(1), monotonic clock.
+        No threading locks needed (AP-08, DEC-04).
         
         Returns:
             bool: True if operation allowed, False if rate limited
         """
-        now = time.time() * 1000
-        
-        # Remove timestamps outside the window
-        while self._rate_limiter and (now - self._rate_limiter[0]) > self._rate_limit_window_ms:
-            self._rate_limiter.popleft()
-        
-        # Check if limit exceeded
-        if len(self._rate_limiter) >= 1000:
-            self._rate_limited_count += 1
-            return False
-        
-        # Record this operation
-        self._rate_limiter.append(now)
-        return True
-    
+        return self._rate_limiter.allow()
+
     def reset(self) -> bool:
         """
         Reset security core state (Phase 1 requirement).
@@ -180,8 +171,7 @@ class SecurityCore:
             bool: True on success
         """
         # Reset rate limiter
-        self._rate_limiter.clear()
-        self._rate_limited_count = 0
+        self._rate_limiter.reset()
         
         # Note: Validator and Crypto have their own internal state
         # that we don't reset (e.g., operation counts are informational)
@@ -194,7 +184,7 @@ class SecurityCore:
         if not self._check_rate_limit():
             raise RuntimeError(
                 f"Rate limit exceeded: 1000 operations per second. "
-                f"Total rate limited: {self._rate_limited_count}"
+                f"Total rate limited: {self._rate_limiter.rejected}"
             )
         
         start_time = time.time()
@@ -357,10 +347,11 @@ class SecurityCore:
         
         # PHASE 1: Add rate limiting stats
         rate_limit_stats = {
-            'current_operations': len(self._rate_limiter),
-            'rate_limit': 1000,
-            'rate_limited_count': self._rate_limited_count,
-            'window_ms': self._rate_limit_window_ms
+            'current_operations': self._rate_limiter.in_use(),
+            'rate_limit': self._rate_limiter.rate_per_second,
+            'rate_limited_count': self._rate_limiter.rejected,
+            'burst': self._rate_limiter.burst,
+            'enabled': self._rate_limiter.enabled
         }
         
         prefixed_stats = {}
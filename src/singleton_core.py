@@ -1,9 +1,15 @@
 """
 singleton_core.py
-Version: 2025.10.22.01
+Version: 2026.10.18.02
 Description: Singleton management with SINGLETON pattern, rate limiting, NO threading locks
 
 CHANGELOG:
+- 2026.10.18.02: get_singleton_manager() returns the module-level instance
+  - It looked itself up via gateway singleton_get, which calls
+    get_singleton_manager() again: every singleton operation recursed to
+    RecursionError before falling back (~4ms per call, and each level
+    counted against the 'singleton' rate limit)
+- 2026.10.18.01: Rate limiting via shared GCRA limiter (rate_limiter.py) replaces deque window
 - 2025.10.22.01: Phase 1 + 3 optimizations (Session 6)
   - REMOVED threading locks (CRITICAL FIX - was violating AP-08, DEC-04)
   - ADDED SINGLETON pattern with get_singleton_manager()
@@ -53,7 +59,7 @@ import os
 import sys
 import time
 from typing import Any, Dict, Callable, Optional
-from collections import deque
+from rate_limiter import get_rate_limiter
 from enum import Enum
 
 _USE_GENERIC_OPERATIONS = os.environ.get('USE_GENERIC_OPERATIONS', 'true').lower() == 'true'
@@ -89,32 +95,20 @@ class SingletonCore:
         self._access_counts: Dict[str, int] = {}
         
         # Rate limiting (1000 ops/sec for infrastructure - LESS-21)
-        self._rate_limiter = deque(maxlen=1000)
-        self._rate_limit_window_ms = 1000
-        self._rate_limited_count = 0
+        self._rate_limiter = get_rate_limiter('singleton', 1000)
     
     def _check_rate_limit(self) -> bool:
         """
-        Check rate limit (1000 ops/sec).
+        Check if operation is within rate limit.
+        
+        Shared GCRA limiter 'singleton' (rate_limiter.py): O(1), monotonic clock.
+        No threading locks needed (AP-08, DEC-04).
         
         Returns:
-            True if within rate limit, False if rate limited
+            bool: True if operation allowed, False if rate limited
         """
-        now = time.time() * 1000
-        
-        # Remove timestamps outside window
-        while self._rate_limiter and (now - self._rate_limiter[0]) > self._rate_limit_window_ms:
-            self._rate_limiter.popleft()
-        
-        # Check if at limit
-        if len(self._rate_limiter) >= 1000:
-            self._rate_limited_count += 1
-            return False
-        
-        # Add timestamp
-        self._rate_limiter.append(now)
-        return True
-    
+        return self._rate_limiter.allow()
+
     def get(self, name: str, factory_func: Optional[Callable] = None, **kwargs) -> Any:
         """
         Get or create singleton instance.
@@ -266,7 +260,7 @@ class SingletonCore:
             'estimated_memory_kb': total_memory / 1024,
             'estimated_memory_mb': total_memory / (1024 * 1024),
             'memory_note': 'Estimates are shallow size only (sys.getsizeof)',
-            'rate_limited_count': self._rate_limited_count,
+            'rate_limited_count': self._rate_limiter.rejected,
             'timestamp': time.time()
         }
     
@@ -282,8 +276,7 @@ class SingletonCore:
         
         try:
             # Reset rate limiter
-            self._rate_limiter.clear()
-            self._rate_limited_count = 0
+            self._rate_limiter.reset()
             return True
         except Exception:
             return False
@@ -311,29 +304,15 @@ def get_singleton_manager() -> SingletonCore:
         SingletonCore instance
         
     Note:
-        Uses SINGLETON pattern for lifecycle management.
-        Ironic: SINGLETON interface using SINGLETON pattern for itself!
+        Module-level instance only. The registry cannot be looked up
+        through itself (gateway singleton_get calls back into this
+        function).
     """
     global _manager_core
     
-    try:
-        # Try to use gateway's SINGLETON system if available
-        from gateway import singleton_get, singleton_register
-        
-        manager = singleton_get('singleton_manager')
-        if manager is None:
-            # Create and register
-            if _manager_core is None:
-                _manager_core = SingletonCore()
-            singleton_register('singleton_manager', _manager_core)
-            manager = _manager_core
-        
-        return manager
-    except (ImportError, Exception):
-        # Fallback: use module-level singleton
-        if _manager_core is None:
-            _manager_core = SingletonCore()
-        return _manager_core
+    if _manager_core is None:
+        _manager_core = SingletonCore()
+    return _manager_core
 
 
 # ===== OPERATION MAP =====
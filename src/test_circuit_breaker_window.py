@@ -0,0 +1,272 @@
+# test_circuit_breaker_window.py
+"""
+test_circuit_breaker_window.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Simulation tests for the sliding window circuit breaker
+
+Drives SlidingWindowCircuitBreaker with synthetic request traces on a
+simulated clock: each request arrives at a fixed interval, and the called
+function advances the clock by its latency and fails or succeeds as the
+trace says. No sleeping, no network.
+
+Covers:
+- Healthy trace with background errors never opens
+- Hard outage opens after minimum_calls, rejected calls never reach HA
+- Slow-call rate opens the breaker even when every call succeeds
+- Limited HALF_OPEN probes
+- Exponentially increasing (capped) open durations, reset on recovery
+- Partial degradation: far fewer calls sent than the consecutive breaker
+- Policy selection per name via the manager
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import random
+import sys
+from typing import Dict, Any, Callable, List, Tuple
+
+from circuit_breaker_core import (
+    CircuitBreakerCore,
+    SlidingWindowCircuitBreaker,
+    CircuitState,
+    POLICY_SLIDING_WINDOW,
+)
+
+
+class SimulatedClock:
+    """Monotonic clock advanced explicitly by the simulation."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# Trace entry: (success, latency_ms)
+Trace = List[Tuple[bool, float]]
+
+
+def simulate(breaker: Any, trace: Trace, clock: SimulatedClock,
+             interval_seconds: float = 1.0) -> Dict[str, Any]:
+    """
+    Replay a trace through breaker.call().
+
+    Returns:
+        Counts of calls sent / rejected, failed calls sent and the state
+        after every request
+    """
+    result = {'sent': 0, 'rejected': 0, 'failed_sent': 0, 'states': [], 'opened': 0}
+    previous = breaker.state
+    for success, latency_ms in trace:
+        def request():
+            clock.now += latency_ms / 1000.0
+            result['sent'] += 1
+            if not success:
+                result['failed_sent'] += 1
+                raise ConnectionError('simulated HA failure')
+            return True
+
+        try:
+            breaker.call(request)
+        except ConnectionError:
+            pass
+        except Exception:
+            result['rejected'] += 1
+
+        if breaker.state is CircuitState.OPEN and previous is not CircuitState.OPEN:
+            result['opened'] += 1
+        previous = breaker.state
+        result['states'].append(breaker.state)
+        clock.now += interval_seconds
+    return result
+
+
+def _trace(count: int, failure_rate: float, latency_ms: float = 50.0, seed: int = 7) -> Trace:
+    rng = random.Random(seed)
+    return [(rng.random() >= failure_rate, latency_ms) for _ in range(count)]
+
+
+def _breaker(clock: SimulatedClock, **options) -> SlidingWindowCircuitBreaker:
+    options.setdefault('timeout', 30)
+    return SlidingWindowCircuitBreaker('simulated', clock=clock, **options)
+
+
+def test_healthy_trace() -> Dict[str, Any]:
+    """5% background errors over 1000 requests never open the breaker."""
+    clock = SimulatedClock()
+    breaker = _breaker(clock)
+    result = simulate(breaker, _trace(1000, 0.05), clock)
+    ok = result['opened'] == 0 and result['rejected'] == 0
+    return {"success": ok, "message": f"opened={result['opened']}, sent={result['sent']}"}
+
+
+def test_hard_outage() -> Dict[str, Any]:
+    """Total outage: opens once minimum_calls failed, then calls are rejected."""
+    clock = SimulatedClock()
+    breaker = _breaker(clock, minimum_calls=10)
+    result = simulate(breaker, [(False, 50.0)] * 25, clock)
+    first_open = result['states'].index(CircuitState.OPEN) + 1
+    ok = first_open == 10 and result['sent'] == 10 and result['rejected'] == 15
+    return {"success": ok, "message": f"opened after {first_open} calls, sent={result['sent']}"}
+
+
+def test_slow_calls_open() -> Dict[str, Any]:
+    """All calls succeed but take 3s: slow-call rate opens the breaker."""
+    clock = SimulatedClock()
+    breaker = _breaker(clock, slow_call_duration_ms=2000, slow_call_rate_threshold=0.8)
+    result = simulate(breaker, [(True, 3000.0)] * 15, clock)
+    state = breaker.get_state()
+    ok = result['opened'] == 1 and result['failed_sent'] == 0 and state['statistics']['slow_calls'] == 10
+    return {"success": ok, "message": f"opened={result['opened']}, slow={state['statistics']['slow_calls']}"}
+
+
+def test_half_open_probe_limit() -> Dict[str, Any]:
+    """HALF_OPEN lets through half_open_max_probes calls, rejects the rest."""
+    clock = SimulatedClock()
+    breaker = _breaker(clock, half_open_max_probes=3)
+    simulate(breaker, [(False, 50.0)] * 10, clock)
+    clock.now += 31
+    permits = [breaker.allow_request() for _ in range(5)]
+    ok = permits == [True, True, True, False, False] and breaker.state is CircuitState.HALF_OPEN
+    return {"success": ok, "message": f"permits={permits}"}
+
+
+def test_exponential_open_duration() -> Dict[str, Any]:
+    """Failed probes double the open duration up to the cap; recovery resets it."""
+    clock = SimulatedClock()
+    breaker = _breaker(clock, timeout=30, open_backoff=2.0, max_open_duration=200)
+    simulate(breaker, [(False, 0.0)] * 10, clock, interval_seconds=0)
+
+    durations = []
+    for _ in range(5):
+        durations.append(round(breaker._open_until - clock.now))
+        clock.now = breaker._open_until
+        simulate(breaker, [(False, 0.0)] * 2, clock, interval_seconds=0)
+
+    clock.now = breaker._open_until
+    simulate(breaker, [(True, 50.0)] * 3, clock)
+    recovered = breaker.state is CircuitState.CLOSED and breaker.get_state()['open']['consecutive_opens'] == 0
+
+    ok = durations == [30, 60, 120, 200, 200] and recovered
+    return {"success": ok, "message": f"open durations={durations}, recovered={recovered}"}
+
+
+def test_partial_degradation() -> Dict[str, Any]:
+    """
+    HA failing 60% of calls with 5s timeouts for 10 minutes.
+
+    The consecutive breaker rarely sees 5 failures in a row and closes on a
+    single HALF_OPEN success; the sliding window breaker stays open with
+    growing durations and sends far fewer doomed requests.
+    """
+    trace = [(ok, 50.0 if ok else 5000.0) for ok, _ in _trace(600, 0.6, seed=11)]
+
+    clock = SimulatedClock()
+    window = simulate(_breaker(clock), trace, clock)
+
+    # Reference: consecutive policy semantics (5 in a row, close on 1 success)
+    failures, sent, failed_sent, open_until, now = 0, 0, 0, 0.0, 0.0
+    for success, latency_ms in trace:
+        if now >= open_until:
+            sent += 1
+            now += latency_ms / 1000.0
+            if success:
+                failures = 0
+            else:
+                failed_sent += 1
+                failures += 1
+                if failures >= 5:
+                    open_until = now + 30
+                    failures = 0
+        now += 1.0
+
+    ok = window['failed_sent'] * 3 < failed_sent
+    return {"success": ok, "message": (f"sliding window sent {window['sent']} ({window['failed_sent']} failed), "
+                                       f"consecutive sent {sent} ({failed_sent} failed)")}
+
+
+def test_policy_selection() -> Dict[str, Any]:
+    """manager.get(name, policy=...) picks the policy per breaker name."""
+    manager = CircuitBreakerCore()
+    window = manager.get('ha_window', policy=POLICY_SLIDING_WINDOW, window_size=10)
+    same = manager.get('ha_window')
+    legacy = manager.get('ha_legacy')
+    try:
+        manager.get('bad', policy='nope')
+        rejected = False
+    except ValueError:
+        rejected = True
+    ok = (isinstance(window, SlidingWindowCircuitBreaker) and same is window and
+          window.window_size == 10 and legacy.policy == 'consecutive' and rejected)
+    return {"success": ok, "message": f"window={window.policy}, legacy={legacy.policy}, unknown rejected={rejected}"}
+
+
+def run_circuit_breaker_window_tests() -> Dict[str, Any]:
+    """
+    Run all sliding window circuit breaker simulation tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_healthy_trace, test_hard_outage, test_slow_calls_open, test_half_open_probe_limit,
+        test_exponential_open_duration, test_partial_degradation, test_policy_selection
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_circuit_breaker_window_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'SimulatedClock',
+    'simulate',
+    'run_circuit_breaker_window_tests',
+    'test_healthy_trace',
+    'test_hard_outage',
+    'test_slow_calls_open',
+    'test_half_open_probe_limit',
+    'test_exponential_open_duration',
+    'test_partial_degradation',
+    'test_policy_selection'
+]
+
+# EOF
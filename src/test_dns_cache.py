@@ -0,0 +1,327 @@
+# test_dns_cache.py
+"""
+test_dns_cache.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for the shared DNS cache with a local stub resolver
+
+The stub resolver answers from a dict (or raises gaierror) and counts its
+calls; a fake clock moves TTLs forward. Connection tests use listening
+sockets on 127.0.0.1 - 127.0.0.2 on the same port refuses, which stands in
+for an address the host no longer has. No DNS traffic, no sleeping.
+
+Covers:
+- Positive entries answered from the cache until the TTL expires
+- Failed lookups cached for the negative TTL
+- Stale-if-error: expired addresses served while the resolver fails
+- Forced refresh and refresh(host)
+- Connect failure on cached addresses refreshes and retries new addresses
+- Happy eyeballs: refused first address, connected via the next one
+- Address families interleaved for racing
+- IP literals never reach the resolver
+- urllib3 pool connections (http_client_dns) resolve through the cache
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, Any, Callable, List, Optional
+
+import dns_cache
+from dns_cache import DNSCache, _interleave
+
+
+class FakeClock:
+    """Monotonic clock advanced explicitly by the test."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StubResolver:
+    """getaddrinfo stand-in: host -> list of IPv4 addresses, or failure."""
+
+    def __init__(self, answers: Dict[str, Optional[List[str]]]):
+        self.answers = answers
+        self.calls = 0
+
+    def __call__(self, host, port, family=0, type=0, proto=0, flags=0):
+        self.calls += 1
+        addresses = self.answers.get(host)
+        if addresses is None:
+            raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+        return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (ip, port or 0))
+                for ip in addresses]
+
+
+def _cache(resolver: StubResolver, clock: FakeClock, **options) -> DNSCache:
+    settings = dict(ttl=60, negative_ttl=5, stale_seconds=300, happy_eyeballs=False, enabled=True)
+    settings.update(options)
+    return DNSCache(resolver=resolver, clock=clock, **settings)
+
+
+def _listener() -> socket.socket:
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(8)
+    return server
+
+
+def test_ttl_hit_and_expiry() -> Dict[str, Any]:
+    """Lookups within the TTL hit the cache; after it the resolver is asked again."""
+    clock = FakeClock()
+    resolver = StubResolver({'ha.local': ['192.0.2.10']})
+    cache = _cache(resolver, clock)
+    sources = [cache.resolve('ha.local')[1] for _ in range(3)]
+    clock.now += 61
+    addresses, from_cache = cache.resolve('ha.local')
+    stats = cache.get_stats()
+    ok = (sources == [False, True, True] and not from_cache and resolver.calls == 2
+          and addresses[0][4][0] == '192.0.2.10' and stats['hits'] == 2 and stats['misses'] == 2)
+    return {"success": ok, "message": f"resolver calls={resolver.calls}, hits={stats['hits']}"}
+
+
+def test_negative_caching() -> Dict[str, Any]:
+    """A failed lookup is answered from the cache until the negative TTL expires."""
+    clock = FakeClock()
+    resolver = StubResolver({})
+    cache = _cache(resolver, clock)
+    errors = 0
+    for _ in range(3):
+        try:
+            cache.resolve('missing.local')
+        except socket.gaierror:
+            errors += 1
+    calls_cached = resolver.calls
+    clock.now += 6
+    try:
+        cache.resolve('missing.local')
+    except socket.gaierror:
+        errors += 1
+    stats = cache.get_stats()
+    ok = errors == 4 and calls_cached == 1 and resolver.calls == 2 and stats['negative_hits'] == 2
+    return {"success": ok, "message": f"errors={errors}, resolver calls={resolver.calls}"}
+
+
+def test_stale_if_error() -> Dict[str, Any]:
+    """Expired addresses are served while the resolver fails, until stale_seconds pass."""
+    clock = FakeClock()
+    resolver = StubResolver({'ha.local': ['192.0.2.10']})
+    cache = _cache(resolver, clock)
+    cache.resolve('ha.local')
+    resolver.answers['ha.local'] = None
+    clock.now += 100
+    addresses, from_cache = cache.resolve('ha.local')
+    clock.now += 300
+    try:
+        cache.resolve('ha.local')
+        expired_raised = False
+    except socket.gaierror:
+        expired_raised = True
+    stats = cache.get_stats()
+    ok = (addresses[0][4][0] == '192.0.2.10' and from_cache and expired_raised
+          and stats['stale_served'] == 1)
+    return {"success": ok, "message": f"stale_served={stats['stale_served']}, expired_raised={expired_raised}"}
+
+
+def test_force_refresh() -> Dict[str, Any]:
+    """force=True and refresh(host) both make the next answer come from the resolver."""
+    clock = FakeClock()
+    resolver = StubResolver({'ha.local': ['192.0.2.10']})
+    cache = _cache(resolver, clock)
+    cache.resolve('ha.local')
+    resolver.answers['ha.local'] = ['192.0.2.20']
+    forced, forced_cached = cache.resolve('ha.local', force=True)
+    resolver.answers['ha.local'] = ['192.0.2.30']
+    dropped = cache.refresh('ha.local')
+    refreshed, _ = cache.resolve('ha.local')
+    ok = (forced[0][4][0] == '192.0.2.20' and not forced_cached and dropped == 1
+          and refreshed[0][4][0] == '192.0.2.30' and resolver.calls == 3)
+    return {"success": ok, "message": f"forced={forced[0][4][0]}, refreshed={refreshed[0][4][0]}"}
+
+
+def test_error_refresh_reconnects() -> Dict[str, Any]:
+    """Host moved: the cached address refuses, the refreshed one connects."""
+    server = _listener()
+    port = server.getsockname()[1]
+    try:
+        clock = FakeClock()
+        resolver = StubResolver({'ha.local': ['127.0.0.2']})
+        cache = _cache(resolver, clock)
+        cache.resolve('ha.local')
+        resolver.answers['ha.local'] = ['127.0.0.1']
+        sock = cache.create_connection(('ha.local', port), timeout=2)
+        peer = sock.getpeername()[0]
+        sock.close()
+
+        # Unchanged answer: the error is raised, no second attempt
+        resolver.answers['ha.local'] = ['127.0.0.2']
+        cache.refresh('ha.local')
+        cache.resolve('ha.local')
+        try:
+            cache.create_connection(('ha.local', port), timeout=2)
+            unchanged_raised = False
+        except OSError:
+            unchanged_raised = True
+    finally:
+        server.close()
+    stats = cache.get_stats()
+    ok = (peer == '127.0.0.1' and unchanged_raised and stats['error_refreshes'] == 2
+          and stats['error_retries'] == 1)
+    return {"success": ok, "message": f"peer={peer}, error_refreshes={stats['error_refreshes']}, "
+                                      f"retries={stats['error_retries']}"}
+
+
+def test_happy_eyeballs_fallback() -> Dict[str, Any]:
+    """Racing: the refused first address doesn't wait out the delay, the next one wins."""
+    server = _listener()
+    port = server.getsockname()[1]
+    try:
+        resolver = StubResolver({'ha.local': ['127.0.0.2', '127.0.0.1']})
+        cache = _cache(resolver, FakeClock(), happy_eyeballs=True, happy_eyeballs_delay=5.0)
+        sock = cache.create_connection(('ha.local', port), timeout=2)
+        peer = sock.getpeername()[0]
+        blocking = sock.gettimeout() == 2
+        sock.close()
+    finally:
+        server.close()
+    stats = cache.get_stats()
+    ok = (peer == '127.0.0.1' and blocking and stats['happy_eyeballs_races'] == 1
+          and stats['happy_eyeballs_fallbacks'] == 1)
+    return {"success": ok, "message": f"peer={peer}, fallbacks={stats['happy_eyeballs_fallbacks']}"}
+
+
+def test_family_interleaving() -> Dict[str, Any]:
+    """Racing order alternates families, starting with the resolver's first choice."""
+    v6 = [(socket.AF_INET6, socket.SOCK_STREAM, 6, '', (f'2001:db8::{i}', 0, 0, 0)) for i in (1, 2)]
+    v4 = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (f'192.0.2.{i}', 0)) for i in (1, 2, 3)]
+    order = [info[4][0] for info in _interleave(v6 + v4)]
+    expected = ['2001:db8::1', '192.0.2.1', '2001:db8::2', '192.0.2.2', '192.0.2.3']
+    return {"success": order == expected, "message": f"order={order}"}
+
+
+def test_ip_literal_bypass() -> Dict[str, Any]:
+    """IP literals are used as-is, without resolver calls or cache entries."""
+    resolver = StubResolver({})
+    cache = _cache(resolver, FakeClock())
+    v4, _ = cache.resolve('127.0.0.1')
+    v6, _ = cache.resolve('::1')
+    ok = (resolver.calls == 0 and v4[0][0] == socket.AF_INET and v6[0][0] == socket.AF_INET6
+          and cache.get_stats()['entries'] == 0)
+    return {"success": ok, "message": f"resolver calls={resolver.calls}"}
+
+
+class _CloseHandler(BaseHTTPRequestHandler):
+    # HTTP/1.0: every response closes the connection
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_urllib3_pool_uses_cache() -> Dict[str, Any]:
+    """New pool connections resolve an unresolvable name via the shared cache, once."""
+    from urllib3 import PoolManager
+    from http_client_dns import use_dns_cache
+
+    server = HTTPServer(('127.0.0.1', 0), _CloseHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    resolver = StubResolver({'ha.test': ['127.0.0.1']})
+    previous = dns_cache._DNS_CACHE
+    dns_cache._DNS_CACHE = _cache(resolver, FakeClock())
+    try:
+        http = use_dns_cache(PoolManager(retries=False))
+        url = f'http://ha.test:{server.server_address[1]}/api/'
+        statuses = [http.request('GET', url, timeout=2).status for _ in range(3)]
+        stats = dns_cache.get_dns_cache_stats()
+    finally:
+        dns_cache._DNS_CACHE = previous
+        server.shutdown()
+        server.server_close()
+    # The server closes every connection: three connects, one lookup
+    ok = statuses == [200, 200, 200] and stats['lookups'] == 3 and resolver.calls == 1 and stats['hits'] == 2
+    return {"success": ok, "message": f"connects={stats['lookups']}, resolver calls={resolver.calls}"}
+
+
+def run_dns_cache_tests() -> Dict[str, Any]:
+    """
+    Run all DNS cache tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_ttl_hit_and_expiry, test_negative_caching, test_stale_if_error, test_force_refresh,
+        test_error_refresh_reconnects, test_happy_eyeballs_fallback, test_family_interleaving,
+        test_ip_literal_bypass, test_urllib3_pool_uses_cache
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_dns_cache_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'FakeClock',
+    'StubResolver',
+    'run_dns_cache_tests',
+    'test_ttl_hit_and_expiry',
+    'test_negative_caching',
+    'test_stale_if_error',
+    'test_force_refresh',
+    'test_error_refresh_reconnects',
+    'test_happy_eyeballs_fallback',
+    'test_family_interleaving',
+    'test_ip_literal_bypass',
+    'test_urllib3_pool_uses_cache'
+]
+
+# EOF
@@ -0,0 +1,113 @@
+# test_ha_alexa_properties.py
+"""
+test_ha_alexa_properties.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for the HA state -> Alexa property table
+
+Covers:
+- cover.position ModeController values match HA's Alexa mode names
+- cover.position RangeController reports current_position
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import sys
+from typing import Dict, Any, Callable, List, Optional
+
+from home_assistant.ha_alexa_properties import build_context_properties
+
+
+def _property(properties: List[Dict[str, Any]], namespace: str) -> Optional[Dict[str, Any]]:
+    for prop in properties:
+        if prop['namespace'] == namespace:
+            return prop
+    return None
+
+
+def test_cover_mode_values() -> Dict[str, Any]:
+    """Open/close-only covers report position.<state>, as HA does."""
+    expected = {
+        'open': 'position.open',
+        'closed': 'position.closed',
+        'opening': 'position.opening',
+        'closing': 'position.closing',
+    }
+    reported = {}
+    for state in expected:
+        properties = build_context_properties('cover.garage', {'state': state, 'attributes': {'supported_features': 3}})
+        prop = _property(properties, 'Alexa.ModeController')
+        reported[state] = (prop['value'], prop['instance']) if prop else None
+    ok = reported == {state: (value, 'cover.position') for state, value in expected.items()}
+    return {"success": ok, "message": f"reported={reported}"}
+
+
+def test_cover_range_value() -> Dict[str, Any]:
+    """Positionable covers report current_position through RangeController."""
+    properties = build_context_properties(
+        'cover.blinds', {'state': 'open', 'attributes': {'current_position': 40, 'supported_features': 15}})
+    prop = _property(properties, 'Alexa.RangeController')
+    mode = _property(properties, 'Alexa.ModeController')
+    ok = prop is not None and prop['value'] == 40 and prop['instance'] == 'cover.position' and mode is None
+    return {"success": ok, "message": f"range={prop}"}
+
+
+def run_ha_alexa_properties_tests() -> Dict[str, Any]:
+    """
+    Run all Alexa property mapping tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_cover_mode_values, test_cover_range_value
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_ha_alexa_properties_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_ha_alexa_properties_tests',
+    'test_cover_mode_values',
+    'test_cover_range_value'
+]
+
+# EOF
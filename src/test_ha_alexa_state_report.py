@@ -0,0 +1,242 @@
+# test_ha_alexa_state_report.py
+"""
+test_ha_alexa_state_report.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for answering ReportState from the state snapshot
+
+Covers:
+- Disabled by default (HA_STATE_REPORT_ENABLED=false)
+- Endpoints not discovered in this container are forwarded
+- Mapped domains answered locally with exactly the discovered properties
+  (light, switch, fan, lock, cover, media_player, sensor, binary_sensor,
+  climate)
+- Endpoints with properties the table doesn't map are forwarded
+  (climate dual setpoints / PowerController, cover tilt)
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import os
+import sys
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from home_assistant import ha_alexa_state_report
+from home_assistant.ha_alexa_state_report import (
+    handle_report_state, record_discovered_endpoints, reset_state_report_store
+)
+
+
+def _capability(interface: str, *names: str, instance: Optional[str] = None) -> Dict[str, Any]:
+    capability = {'type': 'AlexaInterface', 'interface': interface, 'version': '3',
+                  'properties': {'supported': [{'name': name} for name in names],
+                                 'retrievable': True, 'proactivelyReported': True}}
+    if instance:
+        capability['instance'] = instance
+    return capability
+
+
+_HEALTH = _capability('Alexa.EndpointHealth', 'connectivity')
+_ALEXA = {'type': 'AlexaInterface', 'interface': 'Alexa', 'version': '3'}
+
+# entity_id -> (discovered capabilities, HA state attributes, state, expected {namespace: value})
+_MAPPED_DOMAINS: Dict[str, Tuple[List[Dict[str, Any]], Dict[str, Any], str, Dict[str, Any]]] = {
+    'light.kitchen': (
+        [_capability('Alexa.PowerController', 'powerState'),
+         _capability('Alexa.BrightnessController', 'brightness'), _HEALTH, _ALEXA],
+        {'brightness': 255, 'hs_color': [30, 50]}, 'on',
+        {'Alexa.PowerController': 'ON', 'Alexa.BrightnessController': 100,
+         'Alexa.EndpointHealth': {'value': 'OK'}}),
+    'switch.heater': (
+        [_capability('Alexa.PowerController', 'powerState'), _HEALTH],
+        {}, 'off', {'Alexa.PowerController': 'OFF', 'Alexa.EndpointHealth': {'value': 'OK'}}),
+    'fan.ceiling': (
+        [_capability('Alexa.PowerController', 'powerState'), _capability('Alexa.PercentageController', 'percentage')],
+        {'percentage': 33}, 'on', {'Alexa.PowerController': 'ON', 'Alexa.PercentageController': 33}),
+    'lock.front': (
+        [_capability('Alexa.LockController', 'lockState'), _HEALTH],
+        {}, 'locked', {'Alexa.LockController': 'LOCKED', 'Alexa.EndpointHealth': {'value': 'OK'}}),
+    'cover.garage': (
+        [_capability('Alexa.ModeController', 'mode', instance='cover.position'), _HEALTH],
+        {'supported_features': 3}, 'closed',
+        {'Alexa.ModeController': 'position.closed', 'Alexa.EndpointHealth': {'value': 'OK'}}),
+    'cover.blinds': (
+        [_capability('Alexa.RangeController', 'rangeValue', instance='cover.position')],
+        {'supported_features': 15, 'current_position': 70}, 'open', {'Alexa.RangeController': 70}),
+    'media_player.tv': (
+        [_capability('Alexa.PowerController', 'powerState'), _capability('Alexa.Speaker', 'volume', 'muted')],
+        {'volume_level': 0.25, 'is_volume_muted': False}, 'playing',
+        {'Alexa.PowerController': 'ON', 'Alexa.Speaker': [25, False]}),
+    'sensor.outside': (
+        [_capability('Alexa.TemperatureSensor', 'temperature')],
+        {'device_class': 'temperature', 'unit_of_measurement': '°C'}, '12.5',
+        {'Alexa.TemperatureSensor': {'value': 12.5, 'scale': 'CELSIUS'}}),
+    'binary_sensor.door': (
+        [_capability('Alexa.ContactSensor', 'detectionState')],
+        {'device_class': 'door'}, 'on', {'Alexa.ContactSensor': 'DETECTED'}),
+    'climate.hall': (
+        [_capability('Alexa.ThermostatController', 'targetSetpoint', 'thermostatMode'),
+         _capability('Alexa.TemperatureSensor', 'temperature')],
+        {'temperature': 21, 'current_temperature': 19.5, 'unit_of_measurement': '°C'}, 'heat',
+        {'Alexa.ThermostatController': [{'value': 21, 'scale': 'CELSIUS'}, 'HEAT'],
+         'Alexa.TemperatureSensor': {'value': 19.5, 'scale': 'CELSIUS'}}),
+}
+
+
+def _setup(endpoints: Dict[str, List[Dict[str, Any]]], states: Dict[str, Tuple[Dict[str, Any], str]]) -> None:
+    reset_state_report_store()
+    record_discovered_endpoints([
+        {'endpointId': entity_id.replace('.', '#'), 'capabilities': capabilities}
+        for entity_id, capabilities in endpoints.items()
+    ])
+    ha_alexa_state_report._STORE.update_states([
+        {'entity_id': entity_id, 'state': state, 'attributes': attributes}
+        for entity_id, (attributes, state) in states.items()
+    ], full_snapshot=True)
+
+
+def _report_state(entity_id: str) -> Optional[Dict[str, Any]]:
+    event = {'directive': {
+        'header': {'namespace': 'Alexa', 'name': 'ReportState', 'correlationToken': 'ct', 'payloadVersion': '3'},
+        'endpoint': {'endpointId': entity_id.replace('.', '#'), 'scope': {'type': 'BearerToken', 'token': 't'}},
+        'payload': {}}}
+    enabled = ha_alexa_state_report.HA_STATE_REPORT_ENABLED
+    ha_alexa_state_report.HA_STATE_REPORT_ENABLED = True
+    try:
+        return handle_report_state(event, oauth_token='t', correlation_id='test')
+    finally:
+        ha_alexa_state_report.HA_STATE_REPORT_ENABLED = enabled
+
+
+def _values(response: Dict[str, Any]) -> Dict[str, Any]:
+    values: Dict[str, Any] = {}
+    for prop in response['context']['properties']:
+        namespace = prop['namespace']
+        values[namespace] = [values[namespace], prop['value']] if namespace in values else prop['value']
+    return values
+
+
+def test_disabled_by_default() -> Dict[str, Any]:
+    """The module default forwards every ReportState (opt-in)."""
+    if 'HA_STATE_REPORT_ENABLED' in os.environ:
+        return {"success": True, "message": "skipped (HA_STATE_REPORT_ENABLED set in environment)"}
+    return {"success": ha_alexa_state_report.HA_STATE_REPORT_ENABLED is False,
+            "message": f"HA_STATE_REPORT_ENABLED={ha_alexa_state_report.HA_STATE_REPORT_ENABLED}"}
+
+
+def test_undiscovered_forwarded() -> Dict[str, Any]:
+    """A known state without discovery in this container is forwarded."""
+    _setup({}, {'light.kitchen': ({'brightness': 128}, 'on')})
+    response = _report_state('light.kitchen')
+    stats = ha_alexa_state_report.get_state_report_stats()
+    ok = response is None and stats['hits'] == 0
+    return {"success": ok, "message": f"response={response}, hits={stats['hits']}"}
+
+
+def test_mapped_domains() -> Dict[str, Any]:
+    """Each mapped domain reports exactly its discovered properties."""
+    _setup({entity_id: case[0] for entity_id, case in _MAPPED_DOMAINS.items()},
+           {entity_id: (case[1], case[2]) for entity_id, case in _MAPPED_DOMAINS.items()})
+    mismatched = {}
+    for entity_id, (_, _, _, expected) in _MAPPED_DOMAINS.items():
+        response = _report_state(entity_id)
+        values = _values(response) if response else None
+        if values != expected:
+            mismatched[entity_id] = values
+    return {"success": not mismatched, "message": f"{len(_MAPPED_DOMAINS)} domains, mismatched={mismatched}"}
+
+
+def test_unadvertised_properties_dropped() -> Dict[str, Any]:
+    """Properties the table maps but discovery didn't advertise are left out."""
+    _setup({'light.desk': [_capability('Alexa.PowerController', 'powerState')]},
+           {'light.desk': ({'brightness': 128, 'color_temp_kelvin': 3000}, 'on')})
+    response = _report_state('light.desk')
+    namespaces = [prop['namespace'] for prop in response['context']['properties']] if response else None
+    ok = namespaces == ['Alexa.PowerController'] and response['event']['header']['name'] == 'StateReport'
+    return {"success": ok, "message": f"namespaces={namespaces}"}
+
+
+def test_uncovered_forwarded() -> Dict[str, Any]:
+    """Dual setpoints, climate PowerController and cover tilt go to HA."""
+    _setup({
+        'climate.dual': [_capability('Alexa.ThermostatController', 'targetSetpoint', 'lowerSetpoint',
+                                     'upperSetpoint', 'thermostatMode')],
+        'climate.power': [_capability('Alexa.ThermostatController', 'targetSetpoint'),
+                          _capability('Alexa.PowerController', 'powerState')],
+        'cover.tilt': [_capability('Alexa.RangeController', 'rangeValue', instance='cover.position'),
+                       _capability('Alexa.RangeController', 'rangeValue', instance='cover.tilt')],
+    }, {
+        'climate.dual': ({'target_temp_low': 18, 'target_temp_high': 24}, 'heat_cool'),
+        'climate.power': ({'temperature': 20}, 'heat'),
+        'cover.tilt': ({'current_position': 50, 'supported_features': 255}, 'open'),
+    })
+    responses = {entity_id: _report_state(entity_id) for entity_id in ('climate.dual', 'climate.power', 'cover.tilt')}
+    stats = ha_alexa_state_report.get_state_report_stats()
+    ok = all(response is None for response in responses.values()) and stats['hits'] == 0
+    return {"success": ok, "message": f"answered={[e for e, r in responses.items() if r]}, hits={stats['hits']}"}
+
+
+def run_ha_alexa_state_report_tests() -> Dict[str, Any]:
+    """
+    Run all state report tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_disabled_by_default, test_undiscovered_forwarded, test_mapped_domains,
+        test_unadvertised_properties_dropped, test_uncovered_forwarded
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    reset_state_report_store()
+    return results
+
+
+def main():
+    results = run_ha_alexa_state_report_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_ha_alexa_state_report_tests',
+    'test_disabled_by_default',
+    'test_undiscovered_forwarded',
+    'test_mapped_domains',
+    'test_unadvertised_properties_dropped',
+    'test_uncovered_forwarded'
+]
+
+# EOF
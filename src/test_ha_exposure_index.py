@@ -0,0 +1,240 @@
+# test_ha_exposure_index.py
+"""
+test_ha_exposure_index.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for the entity exposure index (ha_websocket.ExposureIndex)
+
+No live Home Assistant instance required: config/entity_registry/get is
+answered by a replacement for ha_websocket_command.
+
+Covers:
+- Exposed entries per assistant in registry order
+- upsert (new entity appended, changed exposure, position kept)
+- remove
+- rename (position and exposure kept)
+- entity_registry_updated through apply_registry_event() on the cached index
+- Explicit entity list filtered without an index
+- Cached index returned uncopied; exposed_ids()/filter() results can't
+  change it
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import sys
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, List
+
+from gateway import cache_set, cache_delete
+from home_assistant import ha_websocket
+from home_assistant.ha_websocket import (
+    ExposureIndex, apply_registry_event, filter_exposed_entities,
+    HA_ENTITY_REGISTRY_CACHE_KEY, HA_EXPOSURE_INDEX_CACHE_KEY, HA_WEBSOCKET_CACHE_TTL
+)
+
+
+def _entry(entity_id: str, *assistants: str) -> Dict[str, Any]:
+    return {'entity_id': entity_id,
+            'options': {name: {'should_expose': True} for name in assistants}}
+
+
+def _registry() -> List[Dict[str, Any]]:
+    return [
+        _entry('light.kitchen', 'alexa', 'conversation'),
+        _entry('sensor.power'),
+        _entry('switch.heater', 'conversation'),
+        _entry('lock.front', 'alexa'),
+        _entry('cover.garage', 'cloud.alexa'),
+    ]
+
+
+def _ids(entries: List[Dict[str, Any]]) -> List[str]:
+    return [entry['entity_id'] for entry in entries]
+
+
+@contextmanager
+def _cached_index(registry_get: Dict[str, Dict[str, Any]]):
+    """Cached registry + index; config/entity_registry/get answered from registry_get."""
+    entities = _registry()
+    index = ExposureIndex(entities)
+    cache_set(HA_ENTITY_REGISTRY_CACHE_KEY, {'success': True, 'data': {'entities': entities,
+                                                                       'count': len(entities)}},
+              ttl=HA_WEBSOCKET_CACHE_TTL)
+    cache_set(HA_EXPOSURE_INDEX_CACHE_KEY, index, ttl=HA_WEBSOCKET_CACHE_TTL)
+    original = ha_websocket.ha_websocket_command
+
+    def _command(message_type: str, params: Dict[str, Any] = None, **kwargs) -> Dict[str, Any]:
+        entry = registry_get.get((params or {}).get('entity_id'))
+        return {'success': True, 'data': entry} if entry else {'success': False, 'error': 'not found'}
+
+    ha_websocket.ha_websocket_command = _command
+    try:
+        yield index
+    finally:
+        ha_websocket.ha_websocket_command = original
+        cache_delete(HA_ENTITY_REGISTRY_CACHE_KEY)
+        cache_delete(HA_EXPOSURE_INDEX_CACHE_KEY)
+
+
+def test_filter_registry_order() -> Dict[str, Any]:
+    """Each assistant's exposed entries come back in registry order."""
+    index = ExposureIndex(_registry())
+    result = {name: _ids(index.filter(name)) for name in ('alexa', 'conversation', 'cloud.alexa', None)}
+    ok = (result == {'alexa': ['light.kitchen', 'lock.front'],
+                     'conversation': ['light.kitchen', 'switch.heater'],
+                     'cloud.alexa': ['cover.garage'],
+                     None: ['light.kitchen', 'switch.heater', 'lock.front']}
+          and index.assistants() == ['alexa', 'cloud.alexa', 'conversation'])
+    return {"success": ok, "message": f"filtered={result}"}
+
+
+def test_upsert() -> Dict[str, Any]:
+    """New entries append; updates change exposure and keep the entry's position."""
+    index = ExposureIndex(_registry())
+    index.upsert(_entry('fan.ceiling', 'alexa'))
+    index.upsert(_entry('light.kitchen', 'conversation'))
+    index.upsert(_entry('sensor.power', 'alexa'))
+    alexa = _ids(index.filter('alexa'))
+    entries = _ids(index.entries())
+    ok = (alexa == ['lock.front', 'fan.ceiling', 'sensor.power']
+          and entries == ['light.kitchen', 'sensor.power', 'switch.heater', 'lock.front', 'cover.garage',
+                          'fan.ceiling']
+          and _ids(index.filter('conversation')) == ['light.kitchen', 'switch.heater'])
+    return {"success": ok, "message": f"alexa={alexa}, entries={entries}"}
+
+
+def test_remove() -> Dict[str, Any]:
+    """Removed entries leave every assistant and the entry list."""
+    index = ExposureIndex(_registry())
+    index.remove('light.kitchen')
+    index.remove('does.not_exist')
+    ok = (_ids(index.filter('alexa')) == ['lock.front'] and _ids(index.filter(None)) == ['switch.heater', 'lock.front']
+          and len(index) == 4)
+    return {"success": ok, "message": f"alexa={_ids(index.filter('alexa'))}, size={len(index)}"}
+
+
+def test_rename() -> Dict[str, Any]:
+    """Renamed entries keep their exposure and registry position."""
+    index = ExposureIndex(_registry())
+    index.rename('light.kitchen', 'light.kitchen_main')
+    index.rename('does.not_exist', 'light.other')
+    alexa = _ids(index.filter('alexa'))
+    ok = (alexa == ['light.kitchen_main', 'lock.front'] and _ids(index.entries())[0] == 'light.kitchen_main'
+          and index.filter('alexa')[0]['entity_id'] == 'light.kitchen_main' and len(index) == 5)
+    return {"success": ok, "message": f"alexa={alexa}"}
+
+
+def test_registry_event() -> Dict[str, Any]:
+    """entity_registry_updated create/update/rename/remove patch the cached index and registry."""
+    registry_get = {'fan.ceiling': _entry('fan.ceiling', 'alexa'),
+                    'lock.back_door': _entry('lock.back_door', 'alexa'),
+                    'switch.heater': _entry('switch.heater')}
+    with _cached_index(registry_get) as index:
+        applied = [
+            apply_registry_event({'action': 'create', 'entity_id': 'fan.ceiling'}),
+            apply_registry_event({'action': 'update', 'entity_id': 'lock.back_door', 'old_entity_id': 'lock.front'}),
+            apply_registry_event({'action': 'update', 'entity_id': 'switch.heater'}),
+            apply_registry_event({'action': 'remove', 'entity_id': 'light.kitchen'}),
+        ]
+        alexa = _ids(filter_exposed_entities(assistant='alexa'))
+        default = _ids(filter_exposed_entities())
+        registry = ha_websocket.cache_get(HA_ENTITY_REGISTRY_CACHE_KEY)
+        failed = apply_registry_event({'action': 'update', 'entity_id': 'unknown.entity'})
+        invalidated = ha_websocket.cache_get(HA_EXPOSURE_INDEX_CACHE_KEY)
+    ok = (applied == [True] * 4 and alexa == ['lock.back_door', 'fan.ceiling'] and default == alexa
+          and _ids(registry['data']['entities']) == ['sensor.power', 'switch.heater', 'lock.back_door',
+                                                     'cover.garage', 'fan.ceiling']
+          and registry['data']['count'] == 5 and failed is False and not isinstance(invalidated, ExposureIndex))
+    return {"success": ok, "message": f"applied={applied}, alexa={alexa}, default={default}"}
+
+
+def test_explicit_list() -> Dict[str, Any]:
+    """An explicit entity list is filtered directly, in list order."""
+    entities = list(reversed(_registry())) + [{'options': {}}, 'not-a-dict']
+    alexa = _ids(filter_exposed_entities(entities, assistant='alexa'))
+    default = _ids(filter_exposed_entities(entities))
+    ok = alexa == ['lock.front', 'light.kitchen'] and default == ['lock.front', 'switch.heater', 'light.kitchen']
+    return {"success": ok, "message": f"alexa={alexa}, default={default}"}
+
+
+def test_read_only_views() -> Dict[str, Any]:
+    """cache_get hands out the cached index itself; its views don't let callers change it."""
+    with _cached_index({}) as index:
+        cached = ha_websocket.cache_get(HA_EXPOSURE_INDEX_CACHE_KEY)
+        ids = index.exposed_ids('alexa')
+        writable = hasattr(ids, 'pop') or hasattr(ids, '__setitem__')
+        exposed = index.filter('alexa')
+        exposed.clear()
+        entries = index.entries()
+        entries.pop()
+        after = _ids(index.filter('alexa'))
+    ok = (cached is index and not writable and list(ids) == ['light.kitchen', 'lock.front']
+          and after == ['light.kitchen', 'lock.front'] and len(index) == 5)
+    return {"success": ok, "message": f"same_object={cached is index}, writable={writable}, after={after}"}
+
+
+def run_ha_exposure_index_tests() -> Dict[str, Any]:
+    """
+    Run all exposure index tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_filter_registry_order, test_upsert, test_remove, test_rename,
+        test_registry_event, test_explicit_list, test_read_only_views
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_ha_exposure_index_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_ha_exposure_index_tests',
+    'test_filter_registry_order',
+    'test_upsert',
+    'test_remove',
+    'test_rename',
+    'test_registry_event',
+    'test_explicit_list',
+    'test_read_only_views'
+]
+
+# EOF
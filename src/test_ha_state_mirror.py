@@ -0,0 +1,301 @@
+# test_ha_state_mirror.py
+"""
+test_ha_state_mirror.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Replay tests for the event-fed HA state mirror
+
+Replays scripted HA event streams from the local stand-in WebSocket server
+(websocket_standin) into ha_state_mirror.StateMirror over a real
+WebSocketSession. No live Home Assistant instance required.
+
+Covers:
+- Initial sync (subscribe + get_states)
+- state_changed deltas, stale events dropped
+- entity_registry_updated remove / rename
+- Resync on missed event, reconnect and long freeze
+- Self-disable after repeated resync failures
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import sys
+from typing import Dict, Any, List, Optional
+
+from websocket_session import WebSocketSession
+from websocket_standin import StandInWebSocketServer, StandInClientSocket
+
+
+def _state(entity_id: str, state: str, updated: str) -> Dict[str, Any]:
+    return {'entity_id': entity_id, 'state': state, 'attributes': {},
+            'last_changed': updated, 'last_updated': updated}
+
+
+def _state_changed(entity_id: str, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {'event_type': 'state_changed',
+            'data': {'entity_id': entity_id, 'old_state': old, 'new_state': new}}
+
+
+class _Replay:
+    """Stand-in server + session + mirror wired together for one scenario."""
+
+    def __init__(self, states: List[Dict[str, Any]], **mirror_options):
+        from home_assistant.ha_state_mirror import StateMirror
+
+        self.states = list(states)
+        self.get_states_calls = 0
+        self.server = StandInWebSocketServer(handlers={'get_states': self._get_states}).start()
+        self.session = WebSocketSession(
+            self.server.url,
+            auth_message={'type': 'auth', 'access_token': 'replay'},
+            socket_factory=StandInClientSocket.factory
+        )
+        self.mirror = StateMirror(subscribe=self.subscribe, poll=self.poll,
+                                  fetch_states=self.fetch_states, **mirror_options)
+
+    def _get_states(self, message):
+        self.get_states_calls += 1
+        return self.states
+
+    # --- transport adapters (same result shapes as ha_websocket) ---
+
+    def subscribe(self, event_type: str) -> Dict[str, Any]:
+        try:
+            sub_id = self.session.subscribe({'type': 'subscribe_events', 'event_type': event_type}, timeout=2)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        return {'success': True, 'data': {'subscription_id': sub_id, 'generation': self.session.generation}}
+
+    def poll(self, subscription_ids: List[int]) -> Dict[str, Any]:
+        self.session.poll(wait=0.05)
+        return {'success': True, 'data': {
+            'events': self.session.drain_events(set(subscription_ids)),
+            'connected': self.session.connected,
+            'generation': self.session.generation,
+            'frames_dropped': self.session.get_stats()['frames_dropped']
+        }}
+
+    def fetch_states(self) -> Dict[str, Any]:
+        try:
+            reply = self.session.request({'type': 'get_states'}, timeout=2)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        if not reply.get('success'):
+            return {'success': False, 'error': reply.get('error', {}).get('message')}
+        return {'success': True, 'data': reply.get('result')}
+
+    def push(self, event: Dict[str, Any]) -> None:
+        self.server.push_event(event)
+
+    def close(self) -> None:
+        self.session.close()
+        self.server.stop()
+
+
+_T0 = '2026-10-18T10:00:00.000000+00:00'
+_T1 = '2026-10-18T10:00:01.000000+00:00'
+_T2 = '2026-10-18T10:00:02.000000+00:00'
+_T3 = '2026-10-18T10:00:03.000000+00:00'
+
+
+def _initial_states() -> List[Dict[str, Any]]:
+    return [
+        _state('light.kitchen', 'off', _T0),
+        _state('switch.fan', 'on', _T0),
+        _state('sensor.temp', '21.0', _T0),
+    ]
+
+
+def test_initial_sync() -> Dict[str, Any]:
+    """Mirror subscribes to both event types and loads get_states."""
+    replay = _Replay(_initial_states())
+    try:
+        states = replay.mirror.read_states()
+        stats = replay.mirror.get_stats()
+        ok = (states is not None and len(states) == 3
+              and stats['subscriptions'] == 2 and replay.get_states_calls == 1)
+        return {"success": ok, "message": f"synced {len(states or [])} entities, stats={stats}"}
+    finally:
+        replay.close()
+
+
+def test_state_deltas() -> Dict[str, Any]:
+    """state_changed deltas are applied; events older than the snapshot are dropped."""
+    replay = _Replay(_initial_states())
+    try:
+        replay.mirror.read_states()
+        replay.server.wait_for_subscriptions(2)
+
+        old = _state('light.kitchen', 'off', _T0)
+        replay.push(_state_changed('light.kitchen', old, _state('light.kitchen', 'on', _T1)))
+        replay.push(_state_changed('sensor.temp', _state('sensor.temp', '20.5', '2026-10-18T09:59:00+00:00'),
+                                   _state('sensor.temp', '21.0', _T0)))  # not newer than snapshot
+        replay.push(_state_changed('light.new', None, _state('light.new', 'on', _T1)))
+
+        light = replay.mirror.read_state('light.kitchen')
+        new_light = replay.mirror.read_state('light.new')
+        stats = replay.mirror.get_stats()
+
+        ok = (light is not None and light['state'] == 'on'
+              and new_light is not None
+              and stats['events_stale'] == 1
+              and replay.get_states_calls == 1)
+        return {"success": ok, "message": f"light={light and light['state']}, stats={stats}"}
+    finally:
+        replay.close()
+
+
+def test_registry_events() -> Dict[str, Any]:
+    """entity_registry_updated remove drops the entity, rename moves it."""
+    replay = _Replay(_initial_states())
+    try:
+        replay.mirror.read_states()
+        replay.server.wait_for_subscriptions(2)
+
+        replay.push({'event_type': 'entity_registry_updated',
+                     'data': {'action': 'remove', 'entity_id': 'switch.fan'}})
+        replay.push({'event_type': 'entity_registry_updated',
+                     'data': {'action': 'update', 'entity_id': 'sensor.kitchen_temp',
+                              'old_entity_id': 'sensor.temp'}})
+
+        ids = sorted(s['entity_id'] for s in replay.mirror.read_states())
+        ok = ids == ['light.kitchen', 'sensor.kitchen_temp']
+        return {"success": ok, "message": f"entities={ids}"}
+    finally:
+        replay.close()
+
+
+def test_gap_resync() -> Dict[str, Any]:
+    """An event whose old_state is newer than the mirror triggers a full resync."""
+    replay = _Replay(_initial_states())
+    try:
+        replay.mirror.read_states()
+        replay.server.wait_for_subscriptions(2)
+
+        # HA changed light.kitchen at T1 but we never saw that event
+        replay.states[0] = _state('light.kitchen', 'off', _T2)
+        replay.push(_state_changed('light.kitchen', _state('light.kitchen', 'on', _T1),
+                                   _state('light.kitchen', 'off', _T2)))
+
+        light = replay.mirror.read_state('light.kitchen')
+        stats = replay.mirror.get_stats()
+        ok = (replay.get_states_calls == 2 and stats['resync_reasons'].get('gap') == 1
+              and light['last_updated'] == _T2)
+        return {"success": ok, "message": f"get_states_calls={replay.get_states_calls}, stats={stats}"}
+    finally:
+        replay.close()
+
+
+def test_reconnect_resync() -> Dict[str, Any]:
+    """Dropped connection: session reconnects, mirror resubscribes and resyncs."""
+    replay = _Replay(_initial_states())
+    try:
+        replay.mirror.read_states()
+        replay.server.wait_for_subscriptions(2)
+
+        replay.states[1] = _state('switch.fan', 'off', _T3)
+        replay.server.drop_connections()
+
+        fan = replay.mirror.read_state('switch.fan')
+        replay.server.wait_for_subscriptions(2)
+        stats = replay.mirror.get_stats()
+        ok = (fan is not None and fan['state'] == 'off'
+              and stats['resync_reasons'].get('reconnect') == 1
+              and replay.session.generation == 2)
+        return {"success": ok, "message": f"fan={fan and fan['state']}, stats={stats}"}
+    finally:
+        replay.close()
+
+
+def test_freeze_resync() -> Dict[str, Any]:
+    """Freeze longer than max_freeze_seconds forces resync on the next read."""
+    replay = _Replay(_initial_states(), max_freeze_seconds=0.0)
+    try:
+        replay.mirror.read_states()
+        replay.mirror.suspend()
+        replay.mirror.read_states()
+        stats = replay.mirror.get_stats()
+        ok = stats['resync_reasons'].get('freeze') == 1 and replay.get_states_calls == 2
+        return {"success": ok, "message": f"stats={stats}"}
+    finally:
+        replay.close()
+
+
+def test_disable_after_failures() -> Dict[str, Any]:
+    """Repeated resync failures disable the mirror; reads fall back (None)."""
+    replay = _Replay(_initial_states(), max_failures=2, retry_seconds=60)
+    try:
+        replay.server.handlers['get_states'] = lambda message: (_ for _ in ()).throw(RuntimeError('boom'))
+        first = replay.mirror.read_states()
+        second = replay.mirror.read_states()
+        third = replay.mirror.read_states()
+        stats = replay.mirror.get_stats()
+        ok = (first is None and second is None and third is None
+              and stats['disabled_count'] == 1 and stats['resync_failures'] == 2)
+        return {"success": ok, "message": f"stats={stats}"}
+    finally:
+        replay.close()
+
+
+def run_state_mirror_tests() -> Dict[str, Any]:
+    """
+    Run all state mirror replay tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    for test in (test_initial_sync, test_state_deltas, test_registry_events, test_gap_resync,
+                 test_reconnect_resync, test_freeze_resync, test_disable_after_failures):
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_state_mirror_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_state_mirror_tests',
+    'test_initial_sync',
+    'test_state_deltas',
+    'test_registry_events',
+    'test_gap_resync',
+    'test_reconnect_resync',
+    'test_freeze_resync',
+    'test_disable_after_failures'
+]
+
+# EOF
@@ -0,0 +1,254 @@
+# test_http_client_async.py
+"""
+test_http_client_async.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for the asyncio HTTP engine and make_requests_concurrently
+
+Runs against a local stand-in server (ThreadingHTTPServer on 127.0.0.1).
+No network access required.
+
+Covers:
+- Chunked and Content-Length response bodies
+- Keep-alive: idle connection reused by the next request and batch
+- Per-host limit: requests beyond max_per_host wait for a slot
+- Idle connection closed by the server: discarded before use, or (closed
+  when the request arrives) the request is resent on a new connection
+- make_requests_concurrently: per-request timeout, error results in
+  request order next to successful ones
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Callable, List
+
+from http_client_async import AsyncHTTPEngine
+from http_client_core import HTTPClientCore
+
+# /slow answers after this long
+_SLOW_SECONDS = 1.0
+
+_STATES = [{'entity_id': f'sensor.s{i}', 'state': str(i)} for i in range(300)]
+
+
+class _StandInState:
+    """Mutable server state shared with the handler."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = set()
+        self.drop_next = False
+
+
+@contextmanager
+def _stand_in_server():
+    state = _StandInState()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            state.requests += 1
+            state.connections.add(self.client_address)
+            if state.drop_next:
+                # Closed without a response, as when a server times out the idle connection
+                state.drop_next = False
+                self.close_connection = True
+                return
+            if self.path == '/arm-drop':
+                state.drop_next = True
+            if self.path == '/slow':
+                time.sleep(_SLOW_SECONDS)
+            if self.path == '/chunked':
+                return self._send_chunked(json.dumps(_STATES).encode('utf-8'))
+            status = 404 if self.path == '/missing' else 200
+            body = json.dumps({'path': self.path} if status == 200 else {'message': 'Not found'}).encode('utf-8')
+            try:
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                return  # Client gave up (timed out)
+            if self.path == '/close-after':
+                # Keep-alive implied, then the idle connection is closed
+                self.close_connection = True
+
+        def _send_chunked(self, body: bytes) -> None:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for offset in range(0, len(body), 4096):
+                chunk = body[offset:offset + 4096]
+                self.wfile.write(f'{len(chunk):x}\r\n'.encode('ascii') + chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}', state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _get(engine: AsyncHTTPEngine, url: str, timeout: float = 5.0):
+    return engine.run(engine.request('GET', url, {}, None, timeout))
+
+
+async def _gather(engine: AsyncHTTPEngine, urls: List[str]):
+    return await asyncio.gather(*(engine.request('GET', url, {}, None, 5.0) for url in urls))
+
+
+def test_chunked_and_length_bodies() -> Dict[str, Any]:
+    """Chunked and Content-Length bodies are read completely, on one connection."""
+    engine = AsyncHTTPEngine(ssl_context=None)
+    with _stand_in_server() as (base_url, server):
+        try:
+            chunked = _get(engine, f'{base_url}/chunked')
+            length = _get(engine, f'{base_url}/api/states')
+            stats = engine.get_stats()
+        finally:
+            engine.close()
+    ok = (chunked.status == 200 and json.loads(chunked.data) == _STATES
+          and 'Content-Length' not in chunked.headers
+          and length.status == 200 and json.loads(length.data) == {'path': '/api/states'}
+          and stats['connections_opened'] == 1 and stats['connections_reused'] == 1)
+    return {"success": ok, "message": f"chunked={len(chunked.data)}B, length={len(length.data)}B, "
+                                      f"opened={stats['connections_opened']}, reused={stats['connections_reused']}"}
+
+
+def test_keep_alive_and_host_limit() -> Dict[str, Any]:
+    """Four concurrent requests on max_per_host=2 use two connections, reused by the next batch."""
+    engine = AsyncHTTPEngine(ssl_context=None, max_per_host=2)
+    with _stand_in_server() as (base_url, server):
+        try:
+            first = engine.run(_gather(engine, [f'{base_url}/api/states/{i}' for i in range(4)]))
+            second = _get(engine, f'{base_url}/api/states')
+            stats = engine.get_stats()
+        finally:
+            engine.close()
+    ok = (all(response.status == 200 for response in first + [second])
+          and [json.loads(r.data)['path'] for r in first] == [f'/api/states/{i}' for i in range(4)]
+          and stats['connections_opened'] == 2 and stats['max_in_flight'] == 2 and stats['host_waits'] == 2
+          and stats['connections_reused'] == 3 and len(server.connections) == 2)
+    return {"success": ok, "message": f"stats={stats}"}
+
+
+def test_stale_connection_reconnect() -> Dict[str, Any]:
+    """Pooled connections the server closed are replaced; the requests succeed."""
+    engine = AsyncHTTPEngine(ssl_context=None)
+    with _stand_in_server() as (base_url, server):
+        try:
+            _get(engine, f'{base_url}/close-after')
+            time.sleep(0.05)
+            after_close = _get(engine, f'{base_url}/api/states')
+            _get(engine, f'{base_url}/arm-drop')
+            after_drop = _get(engine, f'{base_url}/api/states')
+            stats = engine.get_stats()
+        finally:
+            engine.close()
+    ok = (after_close.status == 200 and after_drop.status == 200
+          and json.loads(after_drop.data) == {'path': '/api/states'}
+          and stats['connections_opened'] == 3 and stats['stale_reconnects'] == 1)
+    return {"success": ok, "message": f"opened={stats['connections_opened']}, "
+                                      f"stale_reconnects={stats['stale_reconnects']}"}
+
+
+def test_concurrent_timeout_and_errors() -> Dict[str, Any]:
+    """A timed-out and a failed request come back as error results, in request order."""
+    client = HTTPClientCore()
+    client._retry_config['max_attempts'] = 1
+    with _stand_in_server() as (base_url, server):
+        start = time.perf_counter()
+        results = client.make_requests_concurrently([
+            {'url': f'{base_url}/slow', 'timeout': 0.2},
+            {'url': f'{base_url}/api/states'},
+            {'url': f'{base_url}/missing'},
+            {'url': 'http://127.0.0.1:9/api/states', 'timeout': 1.0},
+        ])
+        elapsed = time.perf_counter() - start
+    slow, ok_result, missing, refused = results
+    ok = (not slow['success'] and slow.get('error_type') == 'TimeoutError' and elapsed < _SLOW_SECONDS
+          and ok_result['success'] and ok_result['data'] == {'path': '/api/states'}
+          and not missing['success'] and missing['status_code'] == 404
+          and missing['data'] == {'message': 'Not found'}
+          and not refused['success'] and 'error_type' in refused)
+    return {"success": ok, "message": f"elapsed={elapsed * 1000:.0f}ms, "
+                                      f"errors={[r.get('error_type', r.get('status_code')) for r in results]}"}
+
+
+def run_http_client_async_tests() -> Dict[str, Any]:
+    """
+    Run all asyncio engine tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_chunked_and_length_bodies, test_keep_alive_and_host_limit,
+        test_stale_connection_reconnect, test_concurrent_timeout_and_errors
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_http_client_async_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_http_client_async_tests',
+    'test_chunked_and_length_bodies',
+    'test_keep_alive_and_host_limit',
+    'test_stale_connection_reconnect',
+    'test_concurrent_timeout_and_errors'
+]
+
+# EOF
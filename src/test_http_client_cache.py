@@ -0,0 +1,223 @@
+# test_http_client_cache.py
+"""
+test_http_client_cache.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for the conditional GET response cache
+
+Runs HTTPClientCore against a local stand-in server (ThreadingHTTPServer on
+127.0.0.1). No network access required.
+
+Covers:
+- ETag revalidation (If-None-Match -> 304 -> cached body), counted successful
+- Last-Modified revalidation (If-Modified-Since -> 304)
+- Fingerprint: unchanged validator-less body not re-parsed, changed body stored
+- TTL: fresh validator-less entries answered without a request
+- LRU eviction at max_entries
+- Entries keyed by credentials (no cross-token hits)
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import json
+import sys
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Callable, List
+
+from http_client_core import HTTPClientCore
+from http_client_cache import ResponseCache
+
+_ETAG = '"states-v1"'
+_LAST_MODIFIED = 'Sun, 18 Oct 2026 12:00:00 GMT'
+
+
+class _StandInState:
+    """Mutable server state shared with the handler."""
+
+    def __init__(self):
+        self.version = 1
+        self.requests: List[Dict[str, str]] = []
+
+
+@contextmanager
+def _stand_in_server():
+    state = _StandInState()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            state.requests.append({'path': self.path, **{k: v for k, v in self.headers.items()}})
+            body = json.dumps({'path': self.path, 'version': state.version}).encode('utf-8')
+            if self.path == '/etag' and self.headers.get('If-None-Match') == _ETAG:
+                return self._send(304, b'', {'ETag': _ETAG})
+            if self.path == '/last-modified' and self.headers.get('If-Modified-Since') == _LAST_MODIFIED:
+                return self._send(304, b'', {'Last-Modified': _LAST_MODIFIED})
+            validators = {'/etag': {'ETag': _ETAG}, '/last-modified': {'Last-Modified': _LAST_MODIFIED}}
+            self._send(200, body, validators.get(self.path, {}))
+
+        def _send(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if status != 304:
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}', state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_etag_revalidation() -> Dict[str, Any]:
+    """304 on If-None-Match returns the cached body and counts as successful."""
+    client = HTTPClientCore()
+    with _stand_in_server() as (base_url, server):
+        results = [client.make_request('GET', f'{base_url}/etag', cache_policy='conditional') for _ in range(3)]
+    stats = client.get_stats()
+    states = [result.get('cache') for result in results]
+    ok = (states == ['miss', 'not_modified', 'not_modified'] and results[2]['data'] is results[0]['data']
+          and server.requests[1].get('If-None-Match') == _ETAG
+          and stats['successful'] == 3 and stats['failed'] == 0)
+    return {"success": ok, "message": f"cache={states}, successful={stats['successful']}, failed={stats['failed']}"}
+
+
+def test_last_modified_revalidation() -> Dict[str, Any]:
+    """If-Modified-Since sent from the stored Last-Modified; 304 is a hit."""
+    client = HTTPClientCore()
+    with _stand_in_server() as (base_url, server):
+        results = [client.make_request('GET', f'{base_url}/last-modified', cache_policy='conditional')
+                   for _ in range(2)]
+    states = [result.get('cache') for result in results]
+    ok = (states == ['miss', 'not_modified'] and server.requests[1].get('If-Modified-Since') == _LAST_MODIFIED
+          and client.get_stats()['failed'] == 0)
+    return {"success": ok, "message": f"cache={states}"}
+
+
+def test_fingerprint() -> Dict[str, Any]:
+    """Validator-less bodies: unchanged -> 'fingerprint' hit, changed -> new data stored."""
+    client = HTTPClientCore()
+    policy = {'ttl': 0}
+    with _stand_in_server() as (base_url, server):
+        first = client.make_request('GET', f'{base_url}/plain', cache_policy=policy)
+        unchanged = client.make_request('GET', f'{base_url}/plain', cache_policy=policy)
+        server.version = 2
+        changed = client.make_request('GET', f'{base_url}/plain', cache_policy=policy)
+    ok = (first['cache'] == 'miss' and unchanged['cache'] == 'fingerprint' and unchanged['data'] is first['data']
+          and changed['cache'] == 'miss' and changed['data']['version'] == 2 and len(server.requests) == 3)
+    return {"success": ok, "message": f"cache={[first['cache'], unchanged['cache'], changed['cache']]}"}
+
+
+def test_ttl_fresh() -> Dict[str, Any]:
+    """Within the TTL a validator-less entry is returned without a request."""
+    client = HTTPClientCore()
+    with _stand_in_server() as (base_url, server):
+        results = [client.make_request('GET', f'{base_url}/plain', cache_policy={'ttl': 60}) for _ in range(3)]
+    states = [result.get('cache') for result in results]
+    ok = states == ['miss', 'fresh', 'fresh'] and len(server.requests) == 1
+    return {"success": ok, "message": f"cache={states}, server requests={len(server.requests)}"}
+
+
+def test_lru_eviction() -> Dict[str, Any]:
+    """The least recently used entry is evicted at max_entries."""
+    cache = ResponseCache(max_entries=2)
+    for key in ('a', 'b'):
+        cache.store(key, {'data': key, 'headers': {}}, None)
+    cache.get('a')
+    cache.store('c', {'data': 'c', 'headers': {}}, None)
+    ok = (cache.get('b') is None and cache.get('a') is not None and cache.get('c') is not None
+          and cache.get_stats()['evictions'] == 1)
+    return {"success": ok, "message": f"stats={cache.get_stats()}"}
+
+
+def test_credential_keys() -> Dict[str, Any]:
+    """Different Authorization headers never share an entry."""
+    client = HTTPClientCore()
+    token_a = {'Authorization': 'Bearer token-a'}
+    token_b = {'Authorization': 'Bearer token-b'}
+    with _stand_in_server() as (base_url, server):
+        url = f'{base_url}/plain'
+        first = client.make_request('GET', url, headers=dict(token_a), cache_policy={'ttl': 60})
+        other = client.make_request('GET', url, headers=dict(token_b), cache_policy={'ttl': 60})
+        again = client.make_request('GET', url, headers=dict(token_a), cache_policy={'ttl': 60})
+    keys = {ResponseCache.key(url, token_a), ResponseCache.key(url, token_b), ResponseCache.key(url, None)}
+    ok = (first['cache'] == 'miss' and other['cache'] == 'miss' and again['cache'] == 'fresh'
+          and len(server.requests) == 2 and len(keys) == 3 and not any('token-a' in key for key in keys))
+    return {"success": ok, "message": f"cache={[first['cache'], other['cache'], again['cache']]}"}
+
+
+def run_http_client_cache_tests() -> Dict[str, Any]:
+    """
+    Run all conditional GET cache tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_etag_revalidation, test_last_modified_revalidation, test_fingerprint,
+        test_ttl_fresh, test_lru_eviction, test_credential_keys
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_http_client_cache_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_http_client_cache_tests',
+    'test_etag_revalidation',
+    'test_last_modified_revalidation',
+    'test_fingerprint',
+    'test_ttl_fresh',
+    'test_lru_eviction',
+    'test_credential_keys'
+]
+
+# EOF
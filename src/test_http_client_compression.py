@@ -0,0 +1,213 @@
+# test_http_client_compression.py
+"""
+test_http_client_compression.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for compressed response decoding
+
+Runs against a local stand-in server (ThreadingHTTPServer on 127.0.0.1)
+serving pre-encoded bodies. No network access required.
+
+Covers:
+- gzip response decoded by make_request (compression stats counted)
+- deflate: zlib-wrapped and raw deflate (no zlib header) fallback
+- Corrupt and truncated bodies fail cleanly
+- Decompressed size capped (read_body and decompress_body): an oversized
+  body raises ResponseBodyTooLargeError, a body of exactly the limit passes
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import gzip
+import json
+import sys
+import threading
+import zlib
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Callable, List, Tuple
+
+import urllib3
+
+from http_client_core import HTTPClientCore
+from http_client_compression import read_body, decompress_body, ResponseBodyTooLargeError
+
+_STATES = json.dumps([{'entity_id': f'sensor.s{i}', 'state': str(i)} for i in range(500)]).encode('utf-8')
+
+# Inflates to this many bytes from a few KB of gzip
+_BOMB_SIZE = 8 * 1024 * 1024
+
+
+def _raw_deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+# path -> (Content-Encoding, body)
+_BODIES: Dict[str, Tuple[str, bytes]] = {
+    '/gzip': ('gzip', gzip.compress(_STATES)),
+    '/zlib-deflate': ('deflate', zlib.compress(_STATES)),
+    '/raw-deflate': ('deflate', _raw_deflate(_STATES)),
+    '/corrupt': ('gzip', b'\x1f\x8b' + b'not a gzip stream' * 8),
+    '/bomb': ('gzip', gzip.compress(b'\0' * _BOMB_SIZE)),
+}
+
+
+@contextmanager
+def _stand_in_server():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            encoding, body = _BODIES[self.path]
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Encoding', encoding)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except OSError:
+                pass  # Client gave up (body rejected)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _read(url: str, max_bytes: int) -> bytes:
+    """read_body() on a raw urllib3 response."""
+    response = urllib3.PoolManager().request('GET', url, preload_content=False)
+    try:
+        return read_body(response, max_bytes=max_bytes)
+    finally:
+        response.release_conn()
+
+
+def test_gzip_response() -> Dict[str, Any]:
+    """A gzip body is decoded and counted in the compression stats."""
+    client = HTTPClientCore()
+    with _stand_in_server() as base_url:
+        result = client.make_request('GET', f'{base_url}/gzip')
+    stats = client.get_stats()
+    ok = (result['success'] and len(result['data']) == 500 and stats['compressed_responses'] == 1
+          and stats['compressed_decoded_bytes'] == len(_STATES))
+    return {"success": ok, "message": f"entities={len(result.get('data') or [])}, "
+                                      f"wire={stats['compressed_wire_bytes']}, "
+                                      f"decoded={stats['compressed_decoded_bytes']}"}
+
+
+def test_deflate_fallback() -> Dict[str, Any]:
+    """Content-Encoding: deflate is decoded with and without the zlib header."""
+    client = HTTPClientCore()
+    with _stand_in_server() as base_url:
+        wrapped = client.make_request('GET', f'{base_url}/zlib-deflate')
+        raw = client.make_request('GET', f'{base_url}/raw-deflate')
+    full_body = decompress_body(_BODIES['/raw-deflate'][1], 'deflate')
+    ok = (wrapped['success'] and raw['success'] and wrapped['data'] == raw['data']
+          and len(raw['data']) == 500 and full_body == _STATES)
+    return {"success": ok, "message": f"wrapped={wrapped['success']}, raw={raw['success']}"}
+
+
+def test_corrupt_body() -> Dict[str, Any]:
+    """Corrupt or truncated bodies give an error result / zlib.error."""
+    client = HTTPClientCore()
+    with _stand_in_server() as base_url:
+        result = client.make_request('GET', f'{base_url}/corrupt')
+    errors = []
+    for body in (_BODIES['/corrupt'][1], _BODIES['/gzip'][1][:100]):
+        try:
+            decompress_body(body, 'gzip')
+        except zlib.error:
+            errors.append('zlib.error')
+    ok = not result['success'] and result.get('error_type') == 'error' and errors == ['zlib.error'] * 2
+    return {"success": ok, "message": f"error_type={result.get('error_type')}, decompress_body={errors}"}
+
+
+def test_decompressed_size_capped() -> Dict[str, Any]:
+    """Bodies inflating past max_bytes are rejected; exactly max_bytes passes."""
+    limit = 1024 * 1024
+    rejected = []
+    with _stand_in_server() as base_url:
+        try:
+            _read(f'{base_url}/bomb', limit)
+        except ResponseBodyTooLargeError:
+            rejected.append('read_body')
+        at_limit = len(_read(f'{base_url}/bomb', _BOMB_SIZE))
+    try:
+        decompress_body(_BODIES['/bomb'][1], 'gzip', max_bytes=limit)
+    except ResponseBodyTooLargeError:
+        rejected.append('decompress_body')
+    full = len(decompress_body(_BODIES['/bomb'][1], 'gzip', max_bytes=_BOMB_SIZE))
+    ok = rejected == ['read_body', 'decompress_body'] and at_limit == _BOMB_SIZE and full == _BOMB_SIZE
+    return {"success": ok, "message": f"rejected={rejected}, at_limit={at_limit}, full={full}"}
+
+
+def run_http_client_compression_tests() -> Dict[str, Any]:
+    """
+    Run all compressed response tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_gzip_response, test_deflate_fallback, test_corrupt_body, test_decompressed_size_capped
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_http_client_compression_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_http_client_compression_tests',
+    'test_gzip_response',
+    'test_deflate_fallback',
+    'test_corrupt_body',
+    'test_decompressed_size_capped'
+]
+
+# EOF
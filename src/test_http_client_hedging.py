@@ -0,0 +1,181 @@
+# test_http_client_hedging.py
+"""
+test_http_client_hedging.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for hedged GETs on the asyncio engine
+
+Runs HTTPClientCore against a local stand-in server (ThreadingHTTPServer on
+127.0.0.1). No network access required.
+
+Covers:
+- Slow primary: hedge sent after the p95 delay, hedge wins, the primary
+  is cancelled (its connection aborted) before make_request returns
+- Fast primary: no hedge sent, no budget spent
+- No worker threads left behind by hedged requests
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Callable, List
+
+from http_client_core import HTTPClientCore
+from http_client_latency import classify_endpoint
+
+# First request to /slow-first is held this long; later ones answer at once
+_SLOW_SECONDS = 1.0
+
+
+class _StandInState:
+    """Mutable server state shared with the handler."""
+
+    def __init__(self):
+        self.requests = 0
+        self.disconnects = 0
+
+
+@contextmanager
+def _stand_in_server():
+    state = _StandInState()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            state.requests += 1
+            if self.path == '/slow-first' and state.requests == 1:
+                time.sleep(_SLOW_SECONDS)
+            body = json.dumps({'request': state.requests}).encode('utf-8')
+            try:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                state.disconnects += 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}', state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _client_with_history(url: str, duration_ms: float = 20.0) -> HTTPClientCore:
+    """Client with enough latency history for url's class to hedge."""
+    client = HTTPClientCore()
+    endpoint_class = classify_endpoint('GET', url)
+    for _ in range(client._hedge_config['min_samples']):
+        client._latency.observe(endpoint_class, duration_ms)
+    return client
+
+
+def test_slow_primary_hedged() -> Dict[str, Any]:
+    """The hedge answers first; the primary is cancelled, not awaited."""
+    with _stand_in_server() as (base_url, server):
+        client = _client_with_history(f'{base_url}/slow-first')
+        start = time.perf_counter()
+        result = client.make_request('GET', f'{base_url}/slow-first', hedge=True)
+        elapsed = time.perf_counter() - start
+        hedging = client.get_stats()['hedging']
+    ok = (result['success'] and result['data'] == {'request': 2} and elapsed < _SLOW_SECONDS / 2
+          and hedging['hedged'] == 1 and hedging['won'] == 1)
+    return {"success": ok, "message": f"elapsed={elapsed * 1000:.0f}ms, data={result.get('data')}, "
+                                      f"hedging={hedging}"}
+
+
+def test_fast_primary_not_hedged() -> Dict[str, Any]:
+    """A primary answering within the delay spends no hedge."""
+    with _stand_in_server() as (base_url, server):
+        client = _client_with_history(f'{base_url}/fast', duration_ms=500.0)
+        result = client.make_request('GET', f'{base_url}/fast', hedge=True)
+        hedging = client.get_stats()['hedging']
+    ok = result['success'] and hedging['eligible'] == 1 and hedging['hedged'] == 0 and server.requests == 1
+    return {"success": ok, "message": f"requests={server.requests}, hedging={hedging}"}
+
+
+def test_no_worker_threads() -> Dict[str, Any]:
+    """Hedged requests leave no threads of their own behind."""
+    with _stand_in_server() as (base_url, server):
+        before = {thread.ident for thread in threading.enumerate()}
+        client = _client_with_history(f'{base_url}/slow-first')
+        client.make_request('GET', f'{base_url}/slow-first', hedge=True)
+        # Server handler threads are the stand-in's; only count client-side ones
+        extra = [thread.name for thread in threading.enumerate()
+                 if thread.ident not in before and 'process_request' not in thread.name]
+    ok = not extra
+    return {"success": ok, "message": f"new threads={extra}"}
+
+
+def run_http_client_hedging_tests() -> Dict[str, Any]:
+    """
+    Run all hedged request tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_slow_primary_hedged, test_fast_primary_not_hedged, test_no_worker_threads
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_http_client_hedging_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_http_client_hedging_tests',
+    'test_slow_primary_hedged',
+    'test_fast_primary_not_hedged',
+    'test_no_worker_threads'
+]
+
+# EOF
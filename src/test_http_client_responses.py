@@ -0,0 +1,198 @@
+# test_http_client_responses.py
+"""
+test_http_client_responses.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for the make_request result shape and stream=True
+
+Runs HTTPClientCore against a local stand-in server (ThreadingHTTPServer on
+127.0.0.1). No network access required.
+
+Covers:
+- 'headers' is a plain, JSON-serializable dict (success, error, concurrent)
+- raw_headers=True returns the case-insensitive urllib3 mapping
+- stream=True: open response in 'stream', read in chunks, released
+- stream=True error: body read and parsed like a preloaded request
+- Cache validators found regardless of header name case
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import json
+import sys
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Callable, List
+
+from http_client_core import HTTPClientCore
+
+# Entities in the /api/states body
+_ENTITY_COUNT = 2000
+
+
+def _states_body() -> bytes:
+    return json.dumps([{'entity_id': f'sensor.s{i}', 'state': str(i), 'attributes': {}}
+                       for i in range(_ENTITY_COUNT)]).encode('utf-8')
+
+
+@contextmanager
+def _stand_in_server():
+    states = _states_body()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.path == '/api/states':
+                return self._send(200, states, {'X-HA-Version': '2026.10'})
+            if self.path == '/lower-etag':
+                return self._send(200, b'{"cached": true}', {'etag': '"v1"'}) \
+                    if self.headers.get('If-None-Match') != '"v1"' else self._send(304, b'', {'etag': '"v1"'})
+            self._send(404, b'{"message": "Entity not found."}', {})
+
+        def _send(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if status != 304:
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_plain_dict_headers() -> Dict[str, Any]:
+    """Success, error and concurrent results carry JSON-serializable dict headers."""
+    client = HTTPClientCore()
+    with _stand_in_server() as base_url:
+        ok_result = client.make_request('GET', f'{base_url}/api/states')
+        error_result = client.make_request('GET', f'{base_url}/api/states/missing')
+        concurrent = client.make_requests_concurrently([{'url': f'{base_url}/api/states'}])[0]
+    results = (ok_result, error_result, concurrent)
+    serialized = [json.dumps(result['headers']) for result in results]
+    ok = (all(type(result['headers']) is dict for result in results)
+          and ok_result['headers']['X-HA-Version'] == '2026.10' and len(ok_result['data']) == _ENTITY_COUNT
+          and error_result['status_code'] == 404 and len(serialized) == 3)
+    return {"success": ok, "message": f"types={[type(result['headers']).__name__ for result in results]}"}
+
+
+def test_raw_headers_opt_in() -> Dict[str, Any]:
+    """raw_headers=True returns the case-insensitive mapping as is."""
+    client = HTTPClientCore()
+    with _stand_in_server() as base_url:
+        result = client.make_request('GET', f'{base_url}/api/states', raw_headers=True)
+    headers = result['headers']
+    ok = not isinstance(headers, dict) and headers.get('x-ha-version') == '2026.10'
+    return {"success": ok, "message": f"type={type(headers).__name__}"}
+
+
+def test_stream_success() -> Dict[str, Any]:
+    """stream=True hands over the open response; chunks add up to the full body."""
+    client = HTTPClientCore()
+    with _stand_in_server() as base_url:
+        result = client.make_request('GET', f'{base_url}/api/states', stream=True,
+                                     headers={'Accept-Encoding': 'identity'})
+        response = result['stream']
+        chunks = [len(chunk) for chunk in response.stream(16384)]
+        response.release_conn()
+        pool = client.http.connection_from_url(base_url).pool
+    ok = (result['success'] and result['data'] is None and type(result['headers']) is dict
+          and sum(chunks) == len(_states_body()) and len(chunks) > 1 and pool.qsize() >= 1)
+    return {"success": ok, "message": f"chunks={len(chunks)}, bytes={sum(chunks)}"}
+
+
+def test_stream_error_body_read() -> Dict[str, Any]:
+    """stream=True on an error reads and parses the body; no open stream returned."""
+    client = HTTPClientCore()
+    with _stand_in_server() as base_url:
+        result = client.make_request('GET', f'{base_url}/missing', stream=True)
+    ok = (not result['success'] and result['status_code'] == 404 and 'stream' not in result
+          and result['data'] == {'message': 'Entity not found.'})
+    return {"success": ok, "message": f"result={result}"}
+
+
+def test_cache_lowercase_validator() -> Dict[str, Any]:
+    """An 'etag' header (any case) is still used for revalidation."""
+    client = HTTPClientCore()
+    with _stand_in_server() as base_url:
+        first = client.make_request('GET', f'{base_url}/lower-etag', cache_policy='conditional')
+        second = client.make_request('GET', f'{base_url}/lower-etag', cache_policy='conditional')
+    ok = first['cache'] == 'miss' and second['cache'] == 'not_modified' and second['data'] == {'cached': True}
+    return {"success": ok, "message": f"cache={[first['cache'], second['cache']]}"}
+
+
+def run_http_client_responses_tests() -> Dict[str, Any]:
+    """
+    Run all result shape and streaming tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_plain_dict_headers, test_raw_headers_opt_in, test_stream_success,
+        test_stream_error_body_read, test_cache_lowercase_validator
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_http_client_responses_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_http_client_responses_tests',
+    'test_plain_dict_headers',
+    'test_raw_headers_opt_in',
+    'test_stream_success',
+    'test_stream_error_body_read',
+    'test_cache_lowercase_validator'
+]
+
+# EOF
@@ -0,0 +1,168 @@
+# test_http_client_retry.py
+"""
+test_http_client_retry.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for HTTP retry decisions, retry budget and Retry-After
+
+No network access required (retry decisions are made on result dicts).
+
+Covers:
+- RequestBudget: extra requests limited to the earned tokens, exhaustion
+  counted; a retry over budget is skipped ('budget')
+- Retry-After as HTTP-date (GMT and zone-less '-0000', any local TZ)
+- Retry skipped when backoff + attempt doesn't fit the deadline ('deadline')
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from email.utils import formatdate
+from typing import Dict, Any, Callable, List
+
+from http_client_core import HTTPClientCore
+from http_client_retry import RequestBudget, parse_retry_after
+from invocation_context import InvocationDeadline
+
+
+@contextmanager
+def _local_timezone(name: str):
+    """Run with a non-UTC local time zone (no-op where tzset is unavailable)."""
+    if not hasattr(time, 'tzset'):
+        yield
+        return
+    saved = os.environ.get('TZ')
+    os.environ['TZ'] = name
+    time.tzset()
+    try:
+        yield
+    finally:
+        if saved is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = saved
+        time.tzset()
+
+
+def test_budget_exhaustion() -> Dict[str, Any]:
+    """Tokens run out after max_tokens extras and refill at percent per request."""
+    budget = RequestBudget(percent=50.0, max_tokens=2.0)
+    initial = [budget.try_acquire() for _ in range(3)]
+    for _ in range(2):
+        budget.on_request()
+    refilled = [budget.try_acquire(), budget.try_acquire()]
+    stats = budget.get_stats()
+    ok = (initial == [True, True, False] and refilled == [True, False]
+          and stats['spent'] == 3 and stats['budget_exhausted'] == 2 and stats['requests'] == 2)
+    return {"success": ok, "message": f"initial={initial}, refilled={refilled}, stats={stats}"}
+
+
+def test_retry_skipped_over_budget() -> Dict[str, Any]:
+    """A retriable failure is not retried once the client's retry budget is spent."""
+    client = HTTPClientCore()
+    client._retry_budget = RequestBudget(percent=0.0, max_tokens=1.0)
+    first, first_backoff = client._retry_decision(0, {'success': False, 'status_code': 502}, None, 'test')
+    second, second_backoff = client._retry_decision(0, {'success': False, 'status_code': 502}, None, 'test')
+    stats = client.get_stats()
+    ok = (first_backoff is not None and 'retry_skipped' not in first
+          and second_backoff is None and second.get('retry_skipped') == 'budget'
+          and stats['retries_skipped_budget'] == 1)
+    return {"success": ok, "message": f"second={second.get('retry_skipped')}, "
+                                      f"skipped_budget={stats['retries_skipped_budget']}"}
+
+
+def test_retry_after_http_date() -> Dict[str, Any]:
+    """HTTP-date Retry-After gives the seconds until that time, also for '-0000' dates off UTC."""
+    retry_at = time.time() + 5
+    gmt = formatdate(retry_at, usegmt=True)
+    zoneless = formatdate(retry_at).rsplit(' ', 1)[0] + ' -0000'
+    with _local_timezone('America/New_York'):
+        waits = {
+            'gmt': parse_retry_after({'Retry-After': gmt}),
+            'zoneless': parse_retry_after({'retry-after': zoneless}),
+            'past': parse_retry_after({'Retry-After': 'Thu, 01 Jan 2015 00:00:00 GMT'}),
+            'invalid': parse_retry_after({'Retry-After': 'soon'}),
+        }
+    ok = (all(waits[key] is not None and 3.5 <= waits[key] <= 5.0 for key in ('gmt', 'zoneless'))
+          and waits['past'] == 0.0 and waits['invalid'] is None)
+    return {"success": ok, "message": f"waits={waits}"}
+
+
+def test_retry_skipped_at_deadline() -> Dict[str, Any]:
+    """A Retry-After longer than the remaining budget skips the retry and records a miss."""
+    client = HTTPClientCore()
+    deadline = InvocationDeadline(500)
+    result = {'success': False, 'status_code': 503, 'headers': {'Retry-After': '2'}}
+    decided, backoff = client._retry_decision(0, result, deadline, 'test')
+    stats = client.get_stats()
+    ok = (backoff is None and decided.get('retry_skipped') == 'deadline'
+          and stats['retries_skipped_deadline'] == 1 and deadline.misses == 1
+          and client._retry_budget.get_stats()['spent'] == 0)
+    return {"success": ok, "message": f"retry_skipped={decided.get('retry_skipped')}, misses={deadline.misses}"}
+
+
+def run_http_client_retry_tests() -> Dict[str, Any]:
+    """
+    Run all HTTP retry tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_budget_exhaustion, test_retry_skipped_over_budget,
+        test_retry_after_http_date, test_retry_skipped_at_deadline
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_http_client_retry_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_http_client_retry_tests',
+    'test_budget_exhaustion',
+    'test_retry_skipped_over_budget',
+    'test_retry_after_http_date',
+    'test_retry_skipped_at_deadline'
+]
+
+# EOF
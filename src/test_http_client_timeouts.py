@@ -0,0 +1,176 @@
+# test_http_client_timeouts.py
+"""
+test_http_client_timeouts.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for latency-adaptive HTTP timeouts
+
+Runs against a local stand-in server (ThreadingHTTPServer on 127.0.0.1).
+No network access or live Home Assistant instance required.
+
+Covers:
+- HA call (call_ha_api_impl, timeout=HA_API_TIMEOUT from config) gets the
+  adaptive timeout of its endpoint class
+- A configured timeout shorter than the adaptive one is kept
+- Without latency history the configured timeout is used
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Callable, List
+
+from http_client_core import HTTPClientCore, get_http_client_manager
+from http_client_latency import classify_endpoint
+
+# /api/slow answers after this long
+_SLOW_SECONDS = 0.5
+
+
+@contextmanager
+def _stand_in_server():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.path.startswith('/api/slow'):
+                time.sleep(_SLOW_SECONDS)
+            body = b'{"message": "API running."}'
+            try:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                pass  # Client gave up (timed out)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def _fast_history(client: HTTPClientCore, url: str, duration_ms: float = 10.0):
+    """Latency history making url's adaptive timeout 0.1s; client config restored afterwards."""
+    saved = dict(client._timeout_config)
+    client._timeout_config['min_seconds'] = 0.1
+    endpoint_class = classify_endpoint('GET', url)
+    for _ in range(client._timeout_config['min_samples']):
+        client._latency.observe(endpoint_class, duration_ms)
+    try:
+        yield
+    finally:
+        client._timeout_config.update(saved)
+        client._latency.reset()
+
+
+def test_ha_call_adaptive() -> Dict[str, Any]:
+    """An HA call passing timeout=30 times out at the adaptive 0.1s, not after 30s."""
+    from home_assistant.ha_devices_helpers import call_ha_api_impl
+
+    client = get_http_client_manager()
+    with _stand_in_server() as base_url, _fast_history(client, f'{base_url}/api/slow'):
+        before = client.get_stats()['adaptive_timeouts']
+        start = time.perf_counter()
+        result = call_ha_api_impl('/api/slow', config={'enabled': True, 'base_url': base_url,
+                                                       'access_token': 'test', 'timeout': 30})
+        elapsed = time.perf_counter() - start
+        adapted = client.get_stats()['adaptive_timeouts'] - before
+    ok = not result.get('success') and elapsed < _SLOW_SECONDS and adapted == 1
+    return {"success": ok, "message": f"elapsed={elapsed * 1000:.0f}ms, adaptive_timeouts=+{adapted}"}
+
+
+def test_shorter_configured_kept() -> Dict[str, Any]:
+    """The adaptive timeout never raises a shorter configured one."""
+    client = HTTPClientCore()
+    url = 'http://127.0.0.1:9/api/states'
+    with _fast_history(client, url, duration_ms=200.0):
+        kwargs = {'timeout': 0.05}
+        client._begin_request('GET', url, kwargs)
+        longer = {'timeout': 30}
+        client._begin_request('GET', url, longer)
+    ok = kwargs['timeout'] == 0.05 and longer['timeout'] == 0.8
+    return {"success": ok, "message": f"configured 0.05 -> {kwargs['timeout']}, 30 -> {longer['timeout']}"}
+
+
+def test_no_history_configured() -> Dict[str, Any]:
+    """Without enough history the configured timeout is left as is."""
+    client = HTTPClientCore()
+    kwargs = {'timeout': 30}
+    client._begin_request('GET', 'http://127.0.0.1:9/api/states', kwargs)
+    ok = kwargs['timeout'] == 30 and client.get_stats()['adaptive_timeouts'] == 0
+    return {"success": ok, "message": f"timeout={kwargs['timeout']}"}
+
+
+def run_http_client_timeouts_tests() -> Dict[str, Any]:
+    """
+    Run all adaptive timeout tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_ha_call_adaptive, test_shorter_configured_kept, test_no_history_configured
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_http_client_timeouts_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_http_client_timeouts_tests',
+    'test_ha_call_adaptive',
+    'test_shorter_configured_kept',
+    'test_no_history_configured'
+]
+
+# EOF
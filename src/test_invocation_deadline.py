@@ -0,0 +1,294 @@
+# test_invocation_deadline.py
+"""
+test_invocation_deadline.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for deadline-aware request budgeting
+
+Runs against a local stand-in server (ThreadingHTTPServer on 127.0.0.1);
+HA API calls and state lookups are replaced where the test is about what
+happens around them. No network access or live Home Assistant required.
+
+Covers:
+- Request timeout capped to the remaining budget; no request started once
+  the budget is below HTTP_MIN_ATTEMPT_BUDGET_MS
+- Retry skipped when Retry-After doesn't fit the deadline (one request sent)
+- call_ha_api_impl short-circuits with DEADLINE_EXCEEDED after the deadline
+- Device states served from the stale snapshot on a deadline error and on a
+  low budget (API not called)
+- Alexa state enrichment skipped on a low budget, done otherwise
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Callable, List
+
+from gateway import cache_set, cache_delete, create_error_response, create_success_response
+from http_client_core import HTTPClientCore
+from invocation_context import InvocationDeadline, begin_invocation, end_invocation
+
+# /api/slow answers after this long
+_SLOW_SECONDS = 1.0
+
+
+class _StandInState:
+    """Mutable server state shared with the handler."""
+
+    def __init__(self):
+        self.requests = 0
+
+
+class _LambdaContext:
+    """Lambda context with a fixed remaining time."""
+
+    def __init__(self, remaining_ms: int):
+        self.remaining_ms = remaining_ms
+        self.aws_request_id = 'test-request'
+
+    def get_remaining_time_in_millis(self) -> int:
+        return self.remaining_ms
+
+
+@contextmanager
+def _stand_in_server():
+    state = _StandInState()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            state.requests += 1
+            if self.path == '/api/slow':
+                time.sleep(_SLOW_SECONDS)
+            status, headers = (503, {'Retry-After': '2'}) if self.path == '/api/busy' else (200, {})
+            body = b'{"message": "API running."}'
+            try:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                pass  # Client gave up (timed out)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}', state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def _invocation(remaining_ms: int):
+    """Running invocation with remaining_ms left (cleared afterwards)."""
+    deadline = begin_invocation(_LambdaContext(remaining_ms), cap_ms=None)
+    try:
+        yield deadline
+    finally:
+        end_invocation()
+
+
+@contextmanager
+def _replaced(module: Any, name: str, replacement: Any):
+    original = getattr(module, name)
+    setattr(module, name, replacement)
+    try:
+        yield
+    finally:
+        setattr(module, name, original)
+
+
+@contextmanager
+def _stale_snapshot(entities: List[Dict[str, Any]]):
+    """Only the long-lived stale snapshot cached; fresh state cache empty."""
+    from home_assistant.ha_devices_core import HA_STATES_CACHE_KEY, HA_STATES_STALE_CACHE_KEY
+
+    cache_delete(HA_STATES_CACHE_KEY)
+    cache_set(HA_STATES_STALE_CACHE_KEY, create_success_response('States retrieved', entities), ttl=3600)
+    try:
+        yield
+    finally:
+        cache_delete(HA_STATES_CACHE_KEY)
+        cache_delete(HA_STATES_STALE_CACHE_KEY)
+
+
+def test_timeout_capped() -> Dict[str, Any]:
+    """A 30s timeout is cut to the remaining budget; an exhausted budget sends nothing."""
+    client = HTTPClientCore()
+    with _stand_in_server() as (base_url, server):
+        start = time.perf_counter()
+        capped = client.make_request('GET', f'{base_url}/api/slow', timeout=30, deadline=InvocationDeadline(300))
+        elapsed = time.perf_counter() - start
+        requests_before = server.requests
+        exhausted = client.make_request('GET', f'{base_url}/api/states', timeout=30, deadline=InvocationDeadline(50))
+        sent_exhausted = server.requests - requests_before
+    stats = client.get_stats()
+    ok = (not capped['success'] and elapsed < _SLOW_SECONDS and stats['deadline_capped'] >= 1
+          and exhausted.get('deadline_exceeded') is True and sent_exhausted == 0)
+    return {"success": ok, "message": f"elapsed={elapsed * 1000:.0f}ms, capped={stats['deadline_capped']}, "
+                                      f"exhausted_sent={sent_exhausted}"}
+
+
+def test_retry_skipped_near_deadline() -> Dict[str, Any]:
+    """A 503 with Retry-After: 2 inside a 1s budget is returned without a retry."""
+    client = HTTPClientCore()
+    deadline = InvocationDeadline(1000)
+    with _stand_in_server() as (base_url, server):
+        result = client.make_request('GET', f'{base_url}/api/busy', deadline=deadline)
+    ok = (result['status_code'] == 503 and result.get('retry_skipped') == 'deadline'
+          and server.requests == 1 and deadline.misses == 1)
+    return {"success": ok, "message": f"requests={server.requests}, retry_skipped={result.get('retry_skipped')}"}
+
+
+def test_ha_api_deadline_short_circuit() -> Dict[str, Any]:
+    """call_ha_api_impl after the deadline returns DEADLINE_EXCEEDED without a request."""
+    from home_assistant.ha_devices_helpers import call_ha_api_impl
+
+    with _stand_in_server() as (base_url, server), _invocation(0) as deadline:
+        result = call_ha_api_impl('/api/states', config={'enabled': True, 'base_url': base_url,
+                                                         'access_token': 'test', 'timeout': 30})
+    ok = result.get('error_code') == 'DEADLINE_EXCEEDED' and server.requests == 0 and deadline.misses == 1
+    return {"success": ok, "message": f"error_code={result.get('error_code')}, requests={server.requests}"}
+
+
+def test_stale_states_on_deadline_error() -> Dict[str, Any]:
+    """A deadline error from the API is answered from the stale snapshot."""
+    from home_assistant import ha_devices_core
+
+    entities = [{'entity_id': 'light.kitchen', 'state': 'on'}, {'entity_id': 'lock.front', 'state': 'locked'}]
+
+    def _deadline_error(endpoint: str, **kwargs) -> Dict[str, Any]:
+        return create_error_response('Invocation deadline exceeded', 'DEADLINE_EXCEEDED')
+
+    with _stale_snapshot(entities), _replaced(ha_devices_core, '_helper_call_ha_api_impl', _deadline_error):
+        result = ha_devices_core.get_states_impl(['lock.front'])
+    ok = result.get('success') and result.get('stale') is True and result['data'] == [entities[1]]
+    return {"success": ok, "message": f"stale={result.get('stale')}, data={result.get('data')}"}
+
+
+def test_stale_states_on_low_budget() -> Dict[str, Any]:
+    """With a low budget the stale snapshot is served and HA is not called."""
+    from home_assistant import ha_devices_core
+
+    entities = [{'entity_id': 'light.kitchen', 'state': 'on'}]
+    calls = []
+
+    def _record_call(endpoint: str, **kwargs) -> Dict[str, Any]:
+        calls.append(endpoint)
+        return create_success_response('States retrieved', [])
+
+    with _stale_snapshot(entities), _replaced(ha_devices_core, '_helper_call_ha_api_impl', _record_call), \
+            _invocation(1000):
+        states = ha_devices_core.get_states_impl()
+        entity = ha_devices_core.get_by_id_impl('light.kitchen')
+    ok = (states.get('stale') is True and states['data'] == entities
+          and entity.get('stale') is True and entity['data'] == entities[0] and not calls)
+    return {"success": ok, "message": f"api_calls={calls}, states_stale={states.get('stale')}, "
+                                      f"entity_stale={entity.get('stale')}"}
+
+
+def test_alexa_enrichment_budget() -> Dict[str, Any]:
+    """Enrichment is skipped on a low budget and done with time to spare."""
+    from home_assistant import ha_alexa_core, ha_alexa_state_report
+    import home_assistant.ha_interconnect as ha_interconnect
+
+    lookups = []
+    event = {'directive': {'header': {'namespace': 'Alexa.PowerController', 'name': 'TurnOn'},
+                           'endpoint': {'endpointId': 'light#kitchen'}}}
+
+    def _ha_response(endpoint: str, **kwargs) -> Dict[str, Any]:
+        return create_success_response('OK', {'event': {'header': {'name': 'Response'}}})
+
+    def _entity_state(entity_id: str, *args, **kwargs):
+        lookups.append(entity_id)
+        return {'entity_id': entity_id, 'state': 'on', 'attributes': {}}, 'test'
+
+    with _replaced(ha_interconnect, 'devices_call_ha_api', _ha_response), \
+            _replaced(ha_alexa_state_report, 'get_entity_state', _entity_state):
+        with _invocation(1000):
+            low = ha_alexa_core._forward_to_ha_alexa(event, 'token', 'test')
+        low_lookups = len(lookups)
+        with _invocation(10000):
+            ample = ha_alexa_core._forward_to_ha_alexa(event, 'token', 'test')
+    ok = ('context' not in low and low_lookups == 0
+          and lookups == ['light.kitchen'] and 'properties' in ample.get('context', {}))
+    return {"success": ok, "message": f"low_lookups={low_lookups}, lookups={lookups}, "
+                                      f"enriched={'context' in ample}"}
+
+
+def run_invocation_deadline_tests() -> Dict[str, Any]:
+    """
+    Run all invocation deadline tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_timeout_capped, test_retry_skipped_near_deadline, test_ha_api_deadline_short_circuit,
+        test_stale_states_on_deadline_error, test_stale_states_on_low_budget, test_alexa_enrichment_budget
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_invocation_deadline_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_invocation_deadline_tests',
+    'test_timeout_capped',
+    'test_retry_skipped_near_deadline',
+    'test_ha_api_deadline_short_circuit',
+    'test_stale_states_on_deadline_error',
+    'test_stale_states_on_low_budget',
+    'test_alexa_enrichment_budget'
+]
+
+# EOF
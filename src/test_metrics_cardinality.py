@@ -0,0 +1,169 @@
+# test_metrics_cardinality.py
+"""
+test_metrics_cardinality.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for the metric series cardinality governor
+
+Covers:
+- correlation_id / url tags dropped by policy (one series, not one per call)
+- Per-name cap folds new dimension values into an '__other__' series
+- Overall budget folds new metric names into '__other__'
+- Folded records still count (totals preserved)
+- Interned handles and record_* helper caches stay bounded
+- reset_metrics() keeps interned handles accounted
+- tags= alias of record_metric() dimensions
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import sys
+from typing import Dict, Any, Callable, List
+
+import metrics_core
+from metrics_core import MetricsCore
+from metrics_cardinality import CardinalityGovernor, OTHER_SERIES
+
+
+def _core(**limits) -> MetricsCore:
+    return MetricsCore(governor=CardinalityGovernor(**limits))
+
+
+def test_policy_tags_dropped() -> Dict[str, Any]:
+    """Unique correlation_id / url tags don't create series."""
+    core = _core()
+    for index in range(500):
+        core.record_metric('ha_api_duration_ms', float(index),
+                           {'domain': 'light', 'correlation_id': f'req-{index}', 'url': f'/api/states/{index}'})
+    metrics = core.get_stats()['metrics']
+    cardinality = core.get_stats()['cardinality']
+    ok = (list(metrics) == ['ha_api_duration_ms[domain=light]'] and cardinality['dropped_tags'] == 500
+          and cardinality['series'] == 1)
+    return {"success": ok, "message": f"keys={list(metrics)}, dropped_tags={cardinality['dropped_tags']}"}
+
+
+def test_per_name_cap_folds() -> Dict[str, Any]:
+    """Dimension values past the per-name cap go to name[key=__other__]; the sum is kept."""
+    core = _core(max_series_per_name=10)
+    for index in range(200):
+        core.counter('alexa_directive', {'namespace': f'Vendor.Namespace{index}'}).inc()
+    counters = core.get_stats()['counters']
+    other_key = f'alexa_directive[namespace={OTHER_SERIES}]'
+    rejected = core.get_stats()['cardinality']['rejected_series']
+    ok = (len(counters) == 11 and counters[other_key] == 190 and sum(counters.values()) == 200
+          and rejected == 190 and len(core._handles) == 11)
+    return {"success": ok, "message": f"{len(counters)} series, other={counters.get(other_key)}, handles={len(core._handles)}"}
+
+
+def test_budget_folds_new_names() -> Dict[str, Any]:
+    """Dynamic names past the overall budget fold into '__other__'."""
+    core = _core(max_series=20)
+    for index in range(100):
+        core.increment_counter(f'ha_cache_domain_invalidation_domain{index}')
+    core.increment_counter('ha_cache_domain_invalidation_domain0')
+    counters = core.get_stats()['counters']
+    ok = (len(counters) == 21 and counters[OTHER_SERIES] == 80 and sum(counters.values()) == 101
+          and counters['ha_cache_domain_invalidation_domain0'] == 2)
+    return {"success": ok, "message": f"{len(counters)} counters, __other__={counters.get(OTHER_SERIES)}"}
+
+
+def test_helper_cache_bounded() -> Dict[str, Any]:
+    """record_api_metric() with unbounded endpoints keeps bounded series and helper cache."""
+    core = _core(max_series_per_name=25)
+    for index in range(1000):
+        core.record_api_metric('ha', f'/api/states/sensor.s{index}', True, 12.0, 200)
+    stats = core.get_stats()
+    ok = (len(stats['metrics']) <= 52 and len(core._helper_series) <= 25 and len(core._handles) <= 52
+          and stats['cardinality']['rejected_series'] > 0)
+    return {"success": ok, "message": f"metrics={len(stats['metrics'])}, helper cache={len(core._helper_series)}, "
+                                      f"handles={len(core._handles)}"}
+
+
+def test_reset_keeps_handles_accounted() -> Dict[str, Any]:
+    """After reset_metrics(), interned handles still count against the budget."""
+    core = _core(max_series=3)
+    handles = [core.counter(f'c{index}') for index in range(3)]
+    core.reset_metrics()
+    for handle in handles:
+        handle.inc()
+    core.increment_counter('late_name')
+    counters = core.get_stats()['counters']
+    ok = counters == {'c0': 1, 'c1': 1, 'c2': 1, OTHER_SERIES: 1} and core.get_stats()['cardinality']['series'] == 3
+    return {"success": ok, "message": f"counters={counters}"}
+
+
+def test_tags_alias() -> Dict[str, Any]:
+    """record_metric(tags=...) records dimensions; correlation_id dropped."""
+    metrics_core.reset_metrics()
+    metrics_core.record_metric('HTTP_get_duration', 0.25,
+                               tags={'interface': 'HTTP', 'operation': 'get', 'correlation_id': 'abc'})
+    metrics = metrics_core.get_stats()['metrics']
+    ok = metrics == {'HTTP_get_duration[interface=HTTP,operation=get]': 0.25}
+    metrics_core.reset_metrics()
+    return {"success": ok, "message": f"metrics={metrics}"}
+
+
+def run_metrics_cardinality_tests() -> Dict[str, Any]:
+    """
+    Run all cardinality governor tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_policy_tags_dropped, test_per_name_cap_folds, test_budget_folds_new_names,
+        test_helper_cache_bounded, test_reset_keeps_handles_accounted, test_tags_alias
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_metrics_cardinality_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_metrics_cardinality_tests',
+    'test_policy_tags_dropped',
+    'test_per_name_cap_folds',
+    'test_budget_folds_new_names',
+    'test_helper_cache_bounded',
+    'test_reset_keeps_handles_accounted',
+    'test_tags_alias'
+]
+
+# EOF
@@ -0,0 +1,293 @@
+# test_metrics_emf.py
+"""
+test_metrics_emf.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Offline schema tests for the CloudWatch EMF exporter
+
+Captures the lines EMFExporter writes and validates them against the
+Embedded Metric Format specification without calling AWS: _aws root node,
+integer millisecond Timestamp, CloudWatchMetrics directives whose
+dimension keys and metric names resolve to root members, at most 100
+metrics per directive and 30 keys per dimension set, histogram values
+with equal length Values/Counts arrays.
+
+Covers:
+- One compact JSON line per invocation for series without dimensions
+- Counters summed, gauges last value, timings as EMF histograms
+- Dimension sets ('*' expansion, missing keys dropped)
+- Cardinality limits (groups and series) and emf_rejected_series
+- More than 100 metrics split into several documents
+- MetricsCore aggregation and flush through the METRICS dispatch
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import json
+import sys
+from typing import Dict, Any, Callable, List
+
+from metrics_emf import EMFExporter, EMF_MAX_METRICS_PER_DIRECTIVE, EMF_MAX_VALUES, EMF_MAX_DIMENSIONS
+from metrics_core import MetricsCore
+
+_HISTOGRAM_KEYS = {'Values', 'Counts', 'Min', 'Max', 'Count', 'Sum'}
+_UNITS = {'Seconds', 'Microseconds', 'Milliseconds', 'Bytes', 'Kilobytes', 'Megabytes', 'Count',
+          'Percent', 'Count/Second', 'None'}
+
+
+def validate_emf(document: Dict[str, Any]) -> List[str]:
+    """EMF specification violations of one document (empty list = valid)."""
+    errors = []
+    aws = document.get('_aws')
+    if not isinstance(aws, dict):
+        return ['missing _aws object']
+    if not isinstance(aws.get('Timestamp'), int) or aws['Timestamp'] < 10 ** 12:
+        errors.append(f"Timestamp must be epoch milliseconds, got {aws.get('Timestamp')!r}")
+    directives = aws.get('CloudWatchMetrics')
+    if not isinstance(directives, list) or not directives:
+        return errors + ['CloudWatchMetrics must be a non-empty list']
+    for directive in directives:
+        if not isinstance(directive.get('Namespace'), str) or not directive['Namespace']:
+            errors.append('Namespace must be a non-empty string')
+        for dimension_set in directive.get('Dimensions', []):
+            if len(dimension_set) > EMF_MAX_DIMENSIONS:
+                errors.append(f"dimension set with {len(dimension_set)} keys")
+            for key in dimension_set:
+                if not isinstance(document.get(key), str):
+                    errors.append(f"dimension {key!r} missing or not a string at root")
+        metrics = directive.get('Metrics', [])
+        if not metrics or len(metrics) > EMF_MAX_METRICS_PER_DIRECTIVE:
+            errors.append(f"{len(metrics)} metrics in directive")
+        for metric in metrics:
+            name = metric.get('Name')
+            if 'Unit' in metric and metric['Unit'] not in _UNITS:
+                errors.append(f"{name}: invalid unit {metric['Unit']!r}")
+            value = document.get(name)
+            if isinstance(value, dict):
+                if set(value) != _HISTOGRAM_KEYS:
+                    errors.append(f"{name}: histogram keys {sorted(value)}")
+                elif (len(value['Values']) != len(value['Counts']) or len(value['Values']) > EMF_MAX_VALUES
+                      or sum(value['Counts']) != value['Count']):
+                    errors.append(f"{name}: inconsistent Values/Counts")
+            elif not isinstance(value, (int, float)) or isinstance(value, bool):
+                errors.append(f"{name}: no numeric value at root")
+    return errors
+
+
+class CaptureWriter:
+    """Collects written EMF lines."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def __call__(self, line: str) -> None:
+        self.lines.append(line)
+
+    def documents(self) -> List[Dict[str, Any]]:
+        return [json.loads(line) for line in self.lines]
+
+
+def _exporter(**options) -> (EMFExporter, CaptureWriter):
+    writer = CaptureWriter()
+    options.setdefault('dimensions', {'service': 'lee-test'})
+    exporter = EMFExporter(namespace='LEE/Test', writer=writer, clock=lambda: 1700000000.123,
+                           enabled=True, **options)
+    return exporter, writer
+
+
+def _all_valid(documents: List[Dict[str, Any]]) -> List[str]:
+    return [error for document in documents for error in validate_emf(document)]
+
+
+def test_single_line_invocation() -> Dict[str, Any]:
+    """Counters, gauges and timings without dimensions: one valid, compact line."""
+    exporter, writer = _exporter()
+    for duration in (12.0, 15.5, 40.0, 12.2):
+        exporter.count('alexa_directive')
+        exporter.observe('ha_call_ms', duration)
+    exporter.gauge('cache_entries', 17)
+    exporter.gauge('cache_entries', 19)
+    written = exporter.flush()
+    document = writer.documents()[0]
+    errors = _all_valid(writer.documents())
+    histogram = document['ha_call_ms']
+    ok = (written == 1 and len(writer.lines) == 1 and ' ' not in writer.lines[0] and not errors
+          and document['alexa_directive'] == 4 and document['cache_entries'] == 19
+          and histogram['Count'] == 4 and histogram['Min'] == 12.0 and histogram['Max'] == 40.0
+          and document['_aws']['Timestamp'] == 1700000000123 and document['service'] == 'lee-test'
+          and exporter.flush() == 0)
+    return {"success": ok, "message": f"{len(writer.lines[0])} bytes, errors={errors}"}
+
+
+def test_units_inferred() -> Dict[str, Any]:
+    """Counters are Count, *_ms Milliseconds, *_bytes Bytes, gauges without a unit."""
+    exporter, writer = _exporter()
+    exporter.count('requests')
+    exporter.observe('latency_ms', 3.0)
+    exporter.gauge('payload_bytes', 512)
+    exporter.gauge('queue_depth', 2)
+    exporter.flush()
+    units = {metric['Name']: metric.get('Unit')
+             for metric in writer.documents()[0]['_aws']['CloudWatchMetrics'][0]['Metrics']}
+    expected = {'requests': 'Count', 'latency_ms': 'Milliseconds', 'payload_bytes': 'Bytes', 'queue_depth': None}
+    return {"success": units == expected, "message": f"units={units}"}
+
+
+def test_histogram_value_limit() -> Dict[str, Any]:
+    """A wide timing distribution is exported with at most 100 values, counts preserved."""
+    exporter, writer = _exporter()
+    for index in range(20000):
+        exporter.observe('wide_ms', 0.01 * 1.001 ** index)
+    exporter.flush()
+    histogram = writer.documents()[0]['wide_ms']
+    errors = _all_valid(writer.documents())
+    ok = not errors and len(histogram['Values']) <= EMF_MAX_VALUES and histogram['Count'] == 20000
+    return {"success": ok, "message": f"{len(histogram['Values'])} values, errors={errors}"}
+
+
+def test_dimension_sets() -> Dict[str, Any]:
+    """'*' expands to the series' keys; one line per dimension value group."""
+    exporter, writer = _exporter(dimension_sets=[['service', '*'], ['service'], ['region']])
+    exporter.count('ha_calls', dimensions={'domain': 'light'})
+    exporter.count('ha_calls', dimensions={'domain': 'light'})
+    exporter.count('ha_calls', dimensions={'domain': 'switch'})
+    exporter.count('cold_starts')
+    exporter.flush()
+    documents = writer.documents()
+    by_domain = {document.get('domain'): document for document in documents}
+    light_sets = by_domain['light']['_aws']['CloudWatchMetrics'][0]['Dimensions']
+    plain_sets = by_domain[None]['_aws']['CloudWatchMetrics'][0]['Dimensions']
+    errors = _all_valid(documents)
+    ok = (len(documents) == 3 and not errors and by_domain['light']['ha_calls'] == 2
+          and light_sets == [['service', 'domain'], ['service']] and plain_sets == [['service']])
+    return {"success": ok, "message": f"light={light_sets}, plain={plain_sets}, errors={errors}"}
+
+
+def test_cardinality_limits() -> Dict[str, Any]:
+    """Groups and series past the limits are rejected and reported."""
+    exporter, writer = _exporter(max_groups=3, max_series=10)
+    for index in range(50):
+        exporter.count('by_request', dimensions={'request': f'r{index}'})
+    for index in range(20):
+        exporter.count(f'metric_{index}')
+    exporter.flush()
+    documents = writer.documents()
+    plain = next(document for document in documents if 'request' not in document)
+    series = sum(len(document['_aws']['CloudWatchMetrics'][0]['Metrics']) for document in documents)
+    stats = exporter.get_stats()
+    ok = (len(documents) == 4 and not _all_valid(documents) and plain['emf_rejected_series'] == 60
+          and series == 11 and stats['rejected_series'] == 60)
+    return {"success": ok, "message": f"{len(documents)} lines, {series} metrics, rejected={plain['emf_rejected_series']}"}
+
+
+def test_metrics_per_document_limit() -> Dict[str, Any]:
+    """More than 100 metrics in one group are split into several documents."""
+    exporter, writer = _exporter(max_series=500)
+    for index in range(250):
+        exporter.count(f'm{index}')
+    written = exporter.flush()
+    sizes = [len(document['_aws']['CloudWatchMetrics'][0]['Metrics']) for document in writer.documents()]
+    ok = written == 3 and sizes == [100, 100, 50] and not _all_valid(writer.documents())
+    return {"success": ok, "message": f"documents={sizes}"}
+
+
+def test_disabled_writes_nothing() -> Dict[str, Any]:
+    """enabled=False records nothing and writes nothing."""
+    writer = CaptureWriter()
+    exporter = EMFExporter(writer=writer, enabled=False)
+    exporter.count('x')
+    exporter.observe('y_ms', 1.0)
+    ok = exporter.flush() == 0 and not writer.lines and exporter.pending_series() == 0
+    return {"success": ok, "message": f"lines={len(writer.lines)}"}
+
+
+def test_metrics_core_flush() -> Dict[str, Any]:
+    """MetricsCore feeds the exporter; flush_emf() writes one invocation's metrics."""
+    exporter, writer = _exporter()
+    core = MetricsCore(emf=exporter)
+    core.increment_counter('alexa_directive')
+    core.increment_counter('alexa_directive')
+    core.set_gauge('ws_open_connections', 1)
+    core.record_histogram('ha_roundtrip_ms', 42.0)
+    core.record_operation_metric('ha_get_state', True, 18.5, None)
+    written = core.flush_emf()
+    documents = writer.documents()
+    plain = next(document for document in documents if 'operation' not in document)
+    operation = next(document for document in documents if 'operation' in document)
+    ok = (written == 2 and not _all_valid(documents) and plain['alexa_directive'] == 2
+          and plain['ws_open_connections'] == 1 and plain['ha_roundtrip_ms']['Count'] == 1
+          and operation['operation.ha_get_state.count'] == 1
+          and operation['operation.ha_get_state.duration_ms']['Sum'] == 18.5
+          and core.get_stats()['emf']['lines_written'] == 2)
+    return {"success": ok, "message": f"{written} lines: {[sorted(document)[:4] for document in documents]}"}
+
+
+def run_metrics_emf_tests() -> Dict[str, Any]:
+    """
+    Run all EMF exporter tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_single_line_invocation, test_units_inferred, test_histogram_value_limit,
+        test_dimension_sets, test_cardinality_limits, test_metrics_per_document_limit,
+        test_disabled_writes_nothing, test_metrics_core_flush
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_metrics_emf_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'validate_emf',
+    'CaptureWriter',
+    'run_metrics_emf_tests',
+    'test_single_line_invocation',
+    'test_units_inferred',
+    'test_histogram_value_limit',
+    'test_dimension_sets',
+    'test_cardinality_limits',
+    'test_metrics_per_document_limit',
+    'test_disabled_writes_nothing',
+    'test_metrics_core_flush'
+]
+
+# EOF
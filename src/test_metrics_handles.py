@@ -0,0 +1,194 @@
+# test_metrics_handles.py
+"""
+test_metrics_handles.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for interned metric handles
+
+Covers:
+- counter() / distribution() return the same handle for the same series
+  (dimension order and value types don't matter)
+- Handle keys equal the keys record_metric() builds
+- record_* helpers keep their metric keys with interned series
+- Handles stay valid across reset_metrics()
+- Handle dimensions reach the EMF exporter
+- Per-call cost: handle.inc() vs increment_counter() through the gateway
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import json
+import sys
+import time
+from typing import Dict, Any, Callable, List
+
+from metrics_core import MetricsCore, CounterHandle, DistributionHandle
+from metrics_emf import EMFExporter
+
+
+def test_handles_interned() -> Dict[str, Any]:
+    """Same name and dimensions -> same handle object."""
+    core = MetricsCore()
+    first = core.counter('alexa_directive', {'namespace': 'Alexa', 'attempt': 1})
+    second = core.counter('alexa_directive', {'attempt': '1', 'namespace': 'Alexa'})
+    other = core.counter('alexa_directive', {'namespace': 'Alexa.Discovery'})
+    timing = core.distribution('alexa_directive', {'namespace': 'Alexa', 'attempt': 1})
+    ok = (first is second and first is not other and isinstance(first, CounterHandle)
+          and isinstance(timing, DistributionHandle) and len(core._handles) == 3)
+    return {"success": ok, "message": f"key={first.key}, handles={len(core._handles)}"}
+
+
+def test_handle_keys_match_record_metric() -> Dict[str, Any]:
+    """Handle series use the key record_metric() builds for the same dimensions."""
+    core = MetricsCore()
+    dimensions = {'namespace': 'Alexa.PowerController', 'b': 'x'}
+    counter = core.counter('alexa_directive', dimensions)
+    counter.inc()
+    counter.inc(2)
+    core.distribution('ha_call_ms').observe(12.5)
+    expected_key = core._build_metric_key('alexa_directive', dimensions)
+    stats = core.get_stats()
+    ok = (counter.key == expected_key and stats['counters'] == {expected_key: 3}
+          and stats['histograms']['ha_call_ms']['count'] == 1)
+    return {"success": ok, "message": f"counters={stats['counters']}"}
+
+
+def test_helpers_keep_keys() -> Dict[str, Any]:
+    """record_* helpers produce the same metric keys as before interning."""
+    core = MetricsCore()
+    for _ in range(3):
+        core.record_cache_metric('ha_states', True, False, 1.5)
+        core.record_api_metric('ha', '/api/states', True, 40.0, 200)
+        core.record_operation_metric('get_state', False, 7.0, 'Timeout')
+        core.record_response_metric('alexa', True, None)
+        core.record_error_response('Timeout', 'high', 'network')
+    build = core._build_metric_key
+    expected = {
+        build('cache.ha_states.count', {'operation': 'ha_states', 'hit': 'True', 'miss': 'False'}): 1.0,
+        build('cache.ha_states.duration_ms', {'operation': 'ha_states', 'hit': 'True', 'miss': 'False'}): 1.5,
+        build('api.ha.count', {'api': 'ha', 'endpoint': '/api/states', 'success': 'True', 'status_code': '200'}): 1.0,
+        build('api.ha.duration_ms', {'api': 'ha', 'endpoint': '/api/states', 'success': 'True', 'status_code': '200'}): 40.0,
+        build('operation.get_state.count', {'operation': 'get_state', 'success': 'False', 'error_type': 'Timeout'}): 1.0,
+        build('operation.get_state.duration_ms', {'operation': 'get_state', 'success': 'False', 'error_type': 'Timeout'}): 7.0,
+        build('response.count', {'response_type': 'alexa', 'success': 'True'}): 1.0,
+        build('error.response.count', {'error_type': 'Timeout', 'severity': 'high', 'category': 'network'}): 1.0,
+    }
+    metrics = core.get_stats()['metrics']
+    ok = metrics == expected and core.get_operation_metrics()['get_state']['count'] == 3
+    missing = sorted(set(expected) ^ set(metrics))
+    return {"success": ok, "message": f"{len(metrics)} keys, mismatched={missing}"}
+
+
+def test_handles_survive_reset() -> Dict[str, Any]:
+    """reset_metrics() clears values; existing handles keep recording."""
+    core = MetricsCore()
+    counter = core.counter('ws_reconnect')
+    timing = core.distribution('ws_connect_ms')
+    counter.inc()
+    timing.observe(5.0)
+    core.reset_metrics()
+    counter.inc()
+    timing.observe(9.0)
+    stats = core.get_stats()
+    ok = stats['counters'] == {'ws_reconnect': 1} and stats['histograms']['ws_connect_ms']['max'] == 9.0
+    return {"success": ok, "message": f"counters={stats['counters']}"}
+
+
+def test_handles_feed_emf() -> Dict[str, Any]:
+    """Handle dimensions arrive in the EMF document."""
+    lines: List[str] = []
+    exporter = EMFExporter(namespace='LEE/Test', dimensions={'service': 'lee-test'},
+                           writer=lines.append, enabled=True)
+    core = MetricsCore(emf=exporter)
+    directives = core.counter('alexa_directive', {'namespace': 'Alexa'})
+    directives.inc()
+    directives.inc()
+    core.distribution('ha_call_ms').observe(20.0)
+    core.flush_emf()
+    documents = {document.get('namespace'): document for document in map(json.loads, lines)}
+    ok = (len(lines) == 2 and documents['Alexa']['alexa_directive'] == 2
+          and documents[None]['ha_call_ms']['Count'] == 1)
+    return {"success": ok, "message": f"{len(lines)} lines"}
+
+
+def test_handle_faster_than_gateway() -> Dict[str, Any]:
+    """handle.inc() costs less than increment_counter() through the gateway."""
+    import gateway
+    iterations = 20000
+    counter = gateway.metrics_counter('handle_benchmark', namespace='Alexa')
+    start = time.perf_counter()
+    for _ in range(iterations):
+        counter.inc()
+    handle_us = (time.perf_counter() - start) * 1e6 / iterations
+    start = time.perf_counter()
+    for _ in range(iterations):
+        gateway.increment_counter('handle_benchmark_Alexa')
+    gateway_us = (time.perf_counter() - start) * 1e6 / iterations
+    ok = handle_us * 2 < gateway_us
+    return {"success": ok, "message": f"handle {handle_us:.2f}us vs gateway {gateway_us:.2f}us per increment"}
+
+
+def run_metrics_handles_tests() -> Dict[str, Any]:
+    """
+    Run all metric handle tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_handles_interned, test_handle_keys_match_record_metric, test_helpers_keep_keys,
+        test_handles_survive_reset, test_handles_feed_emf, test_handle_faster_than_gateway
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_metrics_handles_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_metrics_handles_tests',
+    'test_handles_interned',
+    'test_handle_keys_match_record_metric',
+    'test_helpers_keep_keys',
+    'test_handles_survive_reset',
+    'test_handles_feed_emf',
+    'test_handle_faster_than_gateway'
+]
+
+# EOF
@@ -0,0 +1,214 @@
+# test_metrics_sketch.py
+"""
+test_metrics_sketch.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Accuracy tests for the metrics quantile sketch
+
+Feeds seeded synthetic latency distributions into QuantileSketch and
+compares p50/p90/p95/p99/p99.9 with the exact percentile of the sorted
+samples (sorted[int(q * (n - 1))]). The sketch guarantees a relative
+error of at most SKETCH_RELATIVE_ACCURACY against that value.
+
+Covers:
+- Log-normal, exponential and bimodal (cache hit / HA round trip) timings
+- Merging per-invocation sketches equals one sketch over all samples
+- Memory bounded by max_buckets over nine decades of values
+- Upper quantiles stay accurate after the lowest buckets collapse
+- to_dict() / from_dict() round trip
+- MetricsCore keeps sketches, not sample lists, and reports accurate p95
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import json
+import random
+import sys
+from typing import Dict, Any, Callable, List
+
+from metrics_sketch import QuantileSketch, SKETCH_RELATIVE_ACCURACY
+from metrics_core import MetricsCore
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+
+
+def exact_quantile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[int(q * (len(sorted_values) - 1))]
+
+
+def max_relative_error(sketch: QuantileSketch, values: List[float]) -> float:
+    """Largest relative error over QUANTILES."""
+    ordered = sorted(values)
+    worst = 0.0
+    for q in QUANTILES:
+        exact = exact_quantile(ordered, q)
+        error = abs(sketch.quantile(q) - exact) / exact if exact else abs(sketch.quantile(q))
+        worst = max(worst, error)
+    return worst
+
+
+def _sketch_of(values: List[float], **options) -> QuantileSketch:
+    sketch = QuantileSketch(**options)
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def _accuracy_result(values: List[float]) -> Dict[str, Any]:
+    error = max_relative_error(_sketch_of(values), values)
+    return {"success": error <= SKETCH_RELATIVE_ACCURACY + 1e-12,
+            "message": f"max relative error {error:.4%} over {len(values)} samples"}
+
+
+def test_lognormal_accuracy() -> Dict[str, Any]:
+    """Log-normal latencies (median ~20ms, long tail)."""
+    rng = random.Random(1)
+    return _accuracy_result([rng.lognormvariate(3.0, 0.8) for _ in range(50000)])
+
+
+def test_exponential_accuracy() -> Dict[str, Any]:
+    """Exponential latencies (mean 5ms)."""
+    rng = random.Random(2)
+    return _accuracy_result([rng.expovariate(1 / 5.0) for _ in range(50000)])
+
+
+def test_bimodal_accuracy() -> Dict[str, Any]:
+    """90% cache hits around 0.05ms, 10% HA round trips around 80ms."""
+    rng = random.Random(3)
+    values = [rng.gauss(0.05, 0.01) if rng.random() < 0.9 else rng.gauss(80.0, 15.0) for _ in range(50000)]
+    return _accuracy_result([max(value, 0.001) for value in values])
+
+
+def test_merge_equals_union() -> Dict[str, Any]:
+    """Per-invocation sketches merged give the same quantiles as one sketch of all samples."""
+    rng = random.Random(4)
+    batches = [[rng.lognormvariate(2.5, 1.0) for _ in range(rng.randint(50, 500))] for _ in range(40)]
+    merged = QuantileSketch()
+    for batch in batches:
+        merged.merge(_sketch_of(batch))
+    everything = [value for batch in batches for value in batch]
+    single = _sketch_of(everything)
+    same = all(merged.quantile(q) == single.quantile(q) for q in QUANTILES)
+    ok = same and merged.count == len(everything) and max_relative_error(merged, everything) <= SKETCH_RELATIVE_ACCURACY
+    return {"success": ok, "message": f"{len(batches)} sketches, {merged.count} samples, identical={same}"}
+
+
+def test_bounded_memory() -> Dict[str, Any]:
+    """Values spanning 1e-3..1e6 never occupy more than max_buckets buckets."""
+    rng = random.Random(5)
+    sketch = QuantileSketch(max_buckets=256)
+    for _ in range(200000):
+        sketch.add(10 ** rng.uniform(-3, 6))
+    ok = sketch.bucket_count <= 256 and sketch.count == 200000 and sketch.collapsed > 0
+    return {"success": ok, "message": f"buckets={sketch.bucket_count}, collapsed={sketch.collapsed}"}
+
+
+def test_collapse_keeps_upper_quantiles() -> Dict[str, Any]:
+    """After collapsing the lowest buckets, p50 and above stay within the error bound."""
+    rng = random.Random(6)
+    values = [10 ** rng.uniform(-3, 4) for _ in range(50000)]
+    sketch = _sketch_of(values, max_buckets=600)
+    ordered = sorted(values)
+    errors = [abs(sketch.quantile(q) - exact_quantile(ordered, q)) / exact_quantile(ordered, q)
+              for q in (0.5, 0.95, 0.99)]
+    ok = sketch.collapsed > 0 and max(errors) <= SKETCH_RELATIVE_ACCURACY
+    return {"success": ok, "message": f"collapsed={sketch.collapsed}, max error {max(errors):.4%}"}
+
+
+def test_state_round_trip() -> Dict[str, Any]:
+    """to_dict() survives JSON and restores identical quantiles."""
+    rng = random.Random(7)
+    sketch = _sketch_of([rng.expovariate(0.1) for _ in range(5000)] + [0.0] * 10)
+    restored = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    ok = (all(restored.quantile(q) == sketch.quantile(q) for q in QUANTILES)
+          and restored.summary() == sketch.summary())
+    return {"success": ok, "message": f"buckets={restored.bucket_count}, zero_count={restored.zero_count}"}
+
+
+def test_metrics_core_uses_sketches() -> Dict[str, Any]:
+    """MetricsCore operation timings: fixed memory, p95 within the error bound."""
+    rng = random.Random(8)
+    core = MetricsCore()
+    values = [rng.lognormvariate(3.0, 0.6) for _ in range(20000)]
+    for value in values:
+        core.record_operation_metric('ha_get_state', True, value, None)
+        core.record_dispatcher_timing('HTTP', 'get', value)
+    report = core.get_performance_report()['operations']['ha_get_state']
+    exact = exact_quantile(sorted(values), 0.95)
+    error = abs(report['p95_ms'] - exact) / exact
+    dispatcher = core.get_dispatcher_stats()['HTTP.get']
+    buckets = core._operation_metrics['ha_get_state'].durations.bucket_count
+    ok = (error <= SKETCH_RELATIVE_ACCURACY and report['count'] == 20000 and buckets < 500
+          and dispatcher['count'] == 20000 and dispatcher['p95_ms'] == report['p95_ms'])
+    return {"success": ok, "message": f"p95 error {error:.4%}, buckets={buckets} for 20000 samples"}
+
+
+def run_metrics_sketch_tests() -> Dict[str, Any]:
+    """
+    Run all quantile sketch tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_lognormal_accuracy, test_exponential_accuracy, test_bimodal_accuracy,
+        test_merge_equals_union, test_bounded_memory, test_collapse_keeps_upper_quantiles,
+        test_state_round_trip, test_metrics_core_uses_sketches
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_metrics_sketch_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'exact_quantile',
+    'max_relative_error',
+    'run_metrics_sketch_tests',
+    'test_lognormal_accuracy',
+    'test_exponential_accuracy',
+    'test_bimodal_accuracy',
+    'test_merge_equals_union',
+    'test_bounded_memory',
+    'test_collapse_keeps_upper_quantiles',
+    'test_state_round_trip',
+    'test_metrics_core_uses_sketches'
+]
+
+# EOF
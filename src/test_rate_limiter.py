@@ -0,0 +1,193 @@
+# test_rate_limiter.py
+"""
+test_rate_limiter.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for the shared GCRA rate limiter engine
+
+Uses an injected clock; no sleeping.
+
+Covers:
+- Burst: 'burst' operations back to back, the next one rejected
+- Steady state: one operation per interval admitted after the burst
+- reset(): state and counters cleared, limits kept
+- Configuration tiers (CONFIGURATION_TIER) and per-limiter 'enabled'
+- RATE_LIMIT_ENABLED / RATE_LIMIT_DISABLED switches
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, List, Optional
+
+import rate_limiter
+from rate_limiter import RateLimiter, get_rate_limiter
+
+
+class _Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@contextmanager
+def _registry(tier: Optional[str] = None, enabled: bool = True, disabled: frozenset = frozenset()):
+    """Fresh limiter registry with the given tier and switches; restored afterwards."""
+    saved = (rate_limiter._LIMITERS, rate_limiter._CONFIG, rate_limiter.RATE_LIMIT_ENABLED,
+             rate_limiter.RATE_LIMIT_DISABLED, os.environ.get('CONFIGURATION_TIER'))
+    rate_limiter._LIMITERS = {}
+    rate_limiter._CONFIG = None
+    rate_limiter.RATE_LIMIT_ENABLED = enabled
+    rate_limiter.RATE_LIMIT_DISABLED = disabled
+    if tier is not None:
+        os.environ['CONFIGURATION_TIER'] = tier
+    try:
+        yield
+    finally:
+        (rate_limiter._LIMITERS, rate_limiter._CONFIG, rate_limiter.RATE_LIMIT_ENABLED,
+         rate_limiter.RATE_LIMIT_DISABLED, tier_env) = saved
+        if tier_env is None:
+            os.environ.pop('CONFIGURATION_TIER', None)
+        else:
+            os.environ['CONFIGURATION_TIER'] = tier_env
+
+
+def test_burst_admission() -> Dict[str, Any]:
+    """Exactly 'burst' operations pass at one instant; the next is rejected."""
+    limiter = RateLimiter('test', rate_per_second=10, burst=5, clock=_Clock())
+    admitted = [limiter.allow() for _ in range(7)]
+    ok = (admitted == [True] * 5 + [False] * 2 and limiter.allowed == 5 and limiter.rejected == 2
+          and limiter.in_use() == 5)
+    return {"success": ok, "message": f"admitted={admitted}, in_use={limiter.in_use()}"}
+
+
+def test_steady_state_admission() -> Dict[str, Any]:
+    """After the burst, one operation per interval; idle time refills the burst."""
+    clock = _Clock()
+    limiter = RateLimiter('test', rate_per_second=10, burst=3, clock=clock)
+    for _ in range(3):
+        limiter.allow()
+    steady = []
+    for _ in range(5):
+        clock.now += 0.1
+        steady.append((limiter.allow(), limiter.allow()))
+    clock.now += 1.0
+    refilled = [limiter.allow() for _ in range(4)]
+    ok = steady == [(True, False)] * 5 and refilled == [True, True, True, False]
+    return {"success": ok, "message": f"steady={steady}, refilled={refilled}"}
+
+
+def test_reset() -> Dict[str, Any]:
+    """reset() clears state and counters but keeps rate and burst."""
+    limiter = RateLimiter('test', rate_per_second=2, burst=2, clock=_Clock())
+    for _ in range(4):
+        limiter.allow()
+    limiter.reset()
+    stats = limiter.get_stats()
+    ok = (stats['allowed'] == 0 and stats['rejected'] == 0 and stats['in_use'] == 0
+          and stats['burst'] == 2 and stats['rate_per_second'] == 2.0
+          and [limiter.allow() for _ in range(3)] == [True, True, False])
+    return {"success": ok, "message": f"stats={stats}"}
+
+
+def test_config_tiers() -> Dict[str, Any]:
+    """Tier limits win over the caller's default; tier 'enabled': False disables a limiter."""
+    with _registry(tier='standard'):
+        standard = get_rate_limiter('websocket', 50)
+        unknown = get_rate_limiter('test_unlisted', 25)
+    with _registry(tier='maximum'):
+        maximum = get_rate_limiter('websocket', 50)
+        cache = get_rate_limiter('cache', 50)
+    with _registry(tier='no-such-tier'):
+        fallback = get_rate_limiter('websocket', 50)
+    ok = (standard.rate_per_second == 300 and standard.burst == 300 and standard.enabled
+          and unknown.rate_per_second == 25 and unknown.burst == 25
+          and maximum.rate_per_second == 600 and cache.enabled is False
+          and fallback.rate_per_second == 300)
+    return {"success": ok, "message": f"standard={standard.rate_per_second}, maximum={maximum.rate_per_second}, "
+                                      f"cache_enabled={cache.enabled}, fallback={fallback.rate_per_second}"}
+
+
+def test_environment_switches() -> Dict[str, Any]:
+    """RATE_LIMIT_ENABLED=false disables all; RATE_LIMIT_DISABLED disables by name."""
+    with _registry(tier='standard', enabled=False):
+        all_off = get_rate_limiter('websocket', 1, burst=1)
+        all_off_admitted = [all_off.allow() for _ in range(3)]
+    with _registry(tier='standard', disabled=frozenset({'websocket'})):
+        named_off = get_rate_limiter('websocket')
+        still_on = get_rate_limiter('http_client')
+    ok = (all_off.enabled is False and all_off_admitted == [True] * 3 and all_off.allowed == 0
+          and named_off.enabled is False and still_on.enabled is True)
+    return {"success": ok, "message": f"all_off={all_off.enabled}, named_off={named_off.enabled}, "
+                                      f"still_on={still_on.enabled}"}
+
+
+def run_rate_limiter_tests() -> Dict[str, Any]:
+    """
+    Run all rate limiter tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_burst_admission, test_steady_state_admission, test_reset,
+        test_config_tiers, test_environment_switches
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_rate_limiter_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_rate_limiter_tests',
+    'test_burst_admission',
+    'test_steady_state_admission',
+    'test_reset',
+    'test_config_tiers',
+    'test_environment_switches'
+]
+
+# EOF
@@ -0,0 +1,248 @@
+# test_structured_logging.py
+"""
+test_structured_logging.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests and per-call benchmark for structured, level-gated logging
+
+Covers:
+- One JSON record per event with message, level, logger and fields
+- Arguments are not formatted (str() never called) when the level is off
+- Sensitive fields redacted (nested, by key segment), exceptions sanitized,
+  correlation_id added
+- get_logger() through the gateway returns one handle per name
+- Benchmark: disabled and enabled per-call cost vs the log_* wrappers
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import io
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, List
+
+import gateway
+from logging_core import StructuredLogger, get_structured_logger
+from logging_manager import _RATE_LIMITER
+from invocation_context import begin_invocation, end_invocation
+
+
+class _CountingArg:
+    """Counts how often it is formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self) -> str:
+        self.formatted += 1
+        return 'formatted'
+
+
+@contextmanager
+def _captured_output():
+    """Redirect event records and classic log lines into buffers."""
+    streams = []
+    for logger in (logging.getLogger('SUGA-ISP.events'), logging.getLogger()):
+        for handler in logger.handlers:
+            if isinstance(handler, logging.StreamHandler):
+                buffer = io.StringIO()
+                streams.append((handler, handler.setStream(buffer), buffer))
+    _RATE_LIMITER.reset()
+    try:
+        yield streams[0][2] if streams else io.StringIO()
+    finally:
+        for handler, original, _ in streams:
+            handler.setStream(original)
+        _RATE_LIMITER.reset()
+
+
+def _records(buffer: io.StringIO) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in buffer.getvalue().splitlines() if line]
+
+
+def test_one_json_record_per_event() -> Dict[str, Any]:
+    """info() writes one parseable JSON line with message and fields."""
+    log = get_structured_logger('test.records')
+    with _captured_output() as buffer:
+        log.info("Alexa directive: %s.%s", 'Alexa.PowerController', 'TurnOn', entity_id='light.kitchen', attempt=2)
+        log.warning("Slow HA call", duration_ms=812.5)
+    records = _records(buffer)
+    first = records[0] if records else {}
+    ok = (len(records) == 2 and first.get('message') == 'Alexa directive: Alexa.PowerController.TurnOn'
+          and first.get('level') == 'INFO' and first.get('logger') == 'test.records'
+          and first.get('entity_id') == 'light.kitchen' and first.get('attempt') == 2
+          and isinstance(first.get('timestamp'), int) and records[1]['level'] == 'WARNING')
+    return {"success": ok, "message": f"{len(records)} records: {first}"}
+
+
+def test_disabled_level_not_formatted() -> Dict[str, Any]:
+    """A disabled level never formats its args or serializes its fields."""
+    log = get_structured_logger('test.lazy')
+    argument = _CountingArg()
+    field = _CountingArg()
+    with _captured_output() as buffer:
+        for _ in range(100):
+            log.debug("Directive structure %s", argument, directive=field)
+    ok = argument.formatted == 0 and field.formatted == 0 and not buffer.getvalue()
+    return {"success": ok, "message": f"formatted args={argument.formatted}, fields={field.formatted}"}
+
+
+def test_fields_sanitized() -> Dict[str, Any]:
+    """Token fields redacted, exceptions sanitized, long strings truncated."""
+    log = get_structured_logger('test.sanitize')
+    try:
+        raise ConnectionError("refused at /var/task/ha_client.py")
+    except ConnectionError as e:
+        error = e
+    with _captured_output() as buffer:
+        log.error("HA call failed", error=error, oauth_token='secret-value', body='x' * 1000)
+    record = _records(buffer)[0]
+    ok = (record['oauth_token'] == '***REDACTED***' and record['error_type'] == 'ConnectionError'
+          and '/var/task/' not in record['error'] and len(record['body']) == 200)
+    return {"success": ok, "message": f"error={record['error']!r}"}
+
+
+def test_nested_fields_redacted() -> Dict[str, Any]:
+    """Sensitive keys redacted at any depth; matched on name segments, not substrings."""
+    log = get_structured_logger('test.nested')
+    directive = {'endpoint': {'endpointId': 'light#kitchen', 'scope': {'type': 'BearerToken', 'token': 'SECRET'}},
+                 'payload': {'grants': [{'grantee': {'accessToken': 'SECRET'}}]}}
+    with _captured_output() as buffer:
+        log.error("Directive", directive=directive, token_length=412, author='ha', oauth_config={'region': 'eu'},
+                  refresh_token='SECRET')
+    line = buffer.getvalue()
+    record = _records(buffer)[0]
+    ok = ('SECRET' not in line and record['directive']['endpoint']['scope']['token'] == '***REDACTED***'
+          and record['directive']['endpoint']['endpointId'] == 'light#kitchen'
+          and record['directive']['payload']['grants'][0]['grantee']['accessToken'] == '***REDACTED***'
+          and record['token_length'] == 412 and record['author'] == 'ha' and record['oauth_config'] == {'region': 'eu'}
+          and directive['endpoint']['scope']['token'] == 'SECRET')
+    return {"success": ok, "message": line.strip()[:200]}
+
+
+def test_correlation_id_field() -> Dict[str, Any]:
+    """Events inside an invocation carry its correlation_id."""
+    log = get_structured_logger('test.correlation')
+
+    class _Context:
+        aws_request_id = 'req-1234'
+
+        @staticmethod
+        def get_remaining_time_in_millis() -> int:
+            return 5000
+
+    with _captured_output() as buffer:
+        begin_invocation(_Context())
+        try:
+            log.info("inside")
+        finally:
+            end_invocation()
+        log.info("outside")
+    records = _records(buffer)
+    ok = records[0].get('correlation_id') == 'req-1234' and 'correlation_id' not in records[1]
+    return {"success": ok, "message": f"records={records}"}
+
+
+def test_gateway_handle() -> Dict[str, Any]:
+    """gateway.get_logger() returns the same StructuredLogger per name."""
+    first = gateway.get_logger('ha_alexa')
+    second = gateway.get_logger('ha_alexa')
+    ok = isinstance(first, StructuredLogger) and first is second and first.is_enabled(logging.INFO)
+    return {"success": ok, "message": f"logger={first.name}"}
+
+
+def _per_call_us(call: Callable[[], None], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def test_benchmark_per_call_cost() -> Dict[str, Any]:
+    """Disabled structured calls cost far less than the wrapper path; report enabled cost."""
+    log = get_structured_logger('test.benchmark')
+    directive = {'header': {'namespace': 'Alexa', 'name': 'ReportState'}, 'endpoint': {'endpointId': 'light#kitchen'},
+                 'payload': {}}
+    iterations = 300
+    with _captured_output():
+        disabled = _per_call_us(lambda: log.debug("Directive %s", 'Alexa', directive=directive), iterations * 10)
+        wrapper_disabled = _per_call_us(
+            lambda: gateway.log_debug(f"Directive structure: {json.dumps(directive, indent=2)[:500]}"), iterations)
+        enabled = _per_call_us(lambda: log.info("Directive %s", 'Alexa', directive=directive), iterations)
+        _RATE_LIMITER.reset()
+        wrapper_enabled = _per_call_us(
+            lambda: gateway.log_info(f"Directive keys: {list(directive.keys())}"), iterations)
+    ok = disabled * 10 < wrapper_disabled and disabled < enabled
+    return {"success": ok,
+            "message": f"disabled {disabled:.2f}us (log_debug wrapper {wrapper_disabled:.2f}us), "
+                       f"enabled {enabled:.2f}us (log_info wrapper {wrapper_enabled:.2f}us) per call"}
+
+
+def run_structured_logging_tests() -> Dict[str, Any]:
+    """
+    Run all structured logging tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_one_json_record_per_event, test_disabled_level_not_formatted, test_fields_sanitized,
+        test_nested_fields_redacted, test_correlation_id_field, test_gateway_handle, test_benchmark_per_call_cost
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_structured_logging_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_structured_logging_tests',
+    'test_one_json_record_per_event',
+    'test_disabled_level_not_formatted',
+    'test_fields_sanitized',
+    'test_nested_fields_redacted',
+    'test_correlation_id_field',
+    'test_gateway_handle',
+    'test_benchmark_per_call_cost'
+]
+
+# EOF
@@ -0,0 +1,272 @@
+# test_websocket_session.py
+"""
+test_websocket_session.py
+Version: 1.0.0
+Date: 2026-10-18
+Description: Tests for WebSocketSession reply timeouts and the
+             permessage-deflate transport (websocket_deflate)
+
+Runs against the local stand-in WebSocket server (websocket_standin).
+
+Covers:
+- A timed-out reply leaves the in-flight set
+- The next submit() goes through acquire() and pings the peer first
+- The late reply is discarded, not buffered or handed to a new request
+- Compressed round trip (both directions) through DeflateWebSocket
+- Context takeover on (repeated messages shrink) and off (per-message reset)
+- RSV1 frame on a connection without permessage-deflate rejected
+- Oversized messages rejected before allocation: single frame, bogus
+  length header, fragment total, inflated size
+
+Copyright 2025 Joseph Hersey
+
+Licensed under the Apache License, Version 2.0.
+"""
+
+import json
+import struct
+import sys
+import time
+from typing import Dict, Any, Callable, List
+
+from websocket_deflate import DeflateWebSocket, PerMessageDeflate, WebSocketDeflateError, encode_frame
+from websocket_session import WebSocketSession, WebSocketSessionError
+from websocket_standin import StandInWebSocketServer, StandInClientSocket
+
+_STATES = [{'entity_id': f'sensor.s{i}', 'state': str(i), 'attributes': {'unit_of_measurement': 'W'}}
+           for i in range(400)]
+
+# Message limit for the oversize tests (the 2000-entity reply is ~150 KB)
+_MAX_MESSAGE_BYTES = 64 * 1024
+
+
+def _session(server: StandInWebSocketServer) -> WebSocketSession:
+    return WebSocketSession(
+        server.url,
+        auth_message={'type': 'auth', 'access_token': 'test'},
+        socket_factory=StandInClientSocket.factory
+    )
+
+
+def test_timeout_clears_in_flight() -> Dict[str, Any]:
+    """After a timeout nothing is in flight and the next submit() acquires with a ping."""
+    with StandInWebSocketServer(latency_ms=200) as server:
+        session = _session(server)
+        session.request({'type': 'ping'}, timeout=2.0)
+        try:
+            session.request({'type': 'get_states'}, timeout=0.05)
+            timed_out = False
+        except WebSocketSessionError:
+            timed_out = True
+        in_flight = session.get_stats()['in_flight']
+        before = session.get_stats()
+        server.latency_ms = 0
+        time.sleep(0.25)
+        reply = session.request({'type': 'get_states'}, timeout=2.0)
+        after = session.get_stats()
+        session.close()
+    ok = (timed_out and in_flight == 0 and after['acquisitions'] == before['acquisitions'] + 1
+          and after['liveness_checks'] == before['liveness_checks'] + 1 and after['reconnects'] == 0
+          and reply.get('type') == 'result' and after['request_timeouts'] == 1)
+    return {"success": ok, "message": f"timed_out={timed_out}, in_flight={in_flight}, "
+                                      f"liveness_checks={after['liveness_checks']}"}
+
+
+def test_late_reply_discarded() -> Dict[str, Any]:
+    """The reply to a timed-out request is dropped, not buffered or misrouted."""
+    with StandInWebSocketServer(latency_ms=150) as server:
+        session = _session(server)
+        try:
+            session.request({'type': 'config/entity_registry/list'}, timeout=0.02)
+        except WebSocketSessionError:
+            pass
+        server.latency_ms = 0
+        time.sleep(0.2)
+        reply = session.request({'type': 'get_states'}, timeout=2.0)
+        stats = session.get_stats()
+        pending = session.drain_pending()
+        session.close()
+    ok = (stats['late_replies_discarded'] == 1 and not pending
+          and reply.get('id') == 2 and reply.get('type') == 'result')
+    return {"success": ok, "message": f"discarded={stats['late_replies_discarded']}, pending={len(pending)}, "
+                                      f"reply_id={reply.get('id')}"}
+
+
+def _deflate_client(server: StandInWebSocketServer, **options) -> DeflateWebSocket:
+    """Connected, authenticated DeflateWebSocket."""
+    client = DeflateWebSocket.factory(server.url, timeout=2.0, **options)
+    client.recv()  # auth_required
+    client.send(json.dumps({'type': 'auth', 'access_token': 'test'}))
+    client.recv()  # auth_ok
+    return client
+
+
+def _request(client: DeflateWebSocket, msg_id: int, msg_type: str = 'get_states') -> Dict[str, Any]:
+    client.send(json.dumps({'id': msg_id, 'type': msg_type}))
+    return json.loads(client.recv())
+
+
+def _frame_header(first: int, length: int) -> bytes:
+    """Unmasked frame header with an explicit first byte (FIN/RSV/opcode)."""
+    if length < 126:
+        return struct.pack('!BB', first, length)
+    if length < 65536:
+        return struct.pack('!BBH', first, 126, length)
+    return struct.pack('!BBQ', first, 127, length)
+
+
+def _recv_error(client: DeflateWebSocket) -> str:
+    """Exception type raised by the next recv() ('' if none)."""
+    try:
+        client.recv()
+    except (ConnectionError, WebSocketDeflateError) as e:
+        return type(e).__name__
+    finally:
+        client.close()
+    return ''
+
+
+def test_deflate_round_trip() -> Dict[str, Any]:
+    """Replies arrive compressed and inflate to the original; large commands go out compressed."""
+    with StandInWebSocketServer({'get_states': lambda msg: _STATES}, compression=True) as server:
+        client = _deflate_client(server)
+        client.send(json.dumps({'id': 1, 'type': 'get_states', 'entity_ids': [e['entity_id'] for e in _STATES]}))
+        reply = json.loads(client.recv())
+        stats = client.get_stats()['compression']
+        client.close()
+    ok = (reply.get('result') == _STATES and server.stats['compressed_connections'] == 1
+          and stats['messages_inflated'] == 3 and stats['messages_deflated'] == 1
+          and stats['compressed_bytes_in'] < stats['inflated_bytes_in'] / 4)
+    return {"success": ok, "message": f"inflated={stats['messages_inflated']}, deflated={stats['messages_deflated']}, "
+                                      f"ratio_in={stats['ratio_in']}"}
+
+
+def test_context_takeover() -> Dict[str, Any]:
+    """With takeover a repeated reply compresses against the first; without, each stands alone."""
+    # Small enough for a repeat to fall inside the 32 KB window
+    states = _STATES[:100]
+    sizes = {}
+    flags = {}
+    for no_context_takeover in (False, True):
+        with StandInWebSocketServer({'get_states': lambda msg: states}, compression=True,
+                                    no_context_takeover=no_context_takeover) as server:
+            client = _deflate_client(server)
+            deflate = client.deflate
+            replies = []
+            for msg_id in (1, 2):
+                before = deflate.stats['compressed_bytes_in']
+                replies.append(_request(client, msg_id)['result'] == states)
+                sizes.setdefault(no_context_takeover, []).append(deflate.stats['compressed_bytes_in'] - before)
+            flags[no_context_takeover] = (deflate.inflate_no_context_takeover, deflate.deflate_no_context_takeover)
+            client.close()
+        if replies != [True, True]:
+            return {"success": False, "message": f"replies={replies} (no_context_takeover={no_context_takeover})"}
+    takeover, reset = sizes[False], sizes[True]
+    ok = (takeover[1] < takeover[0] / 4 and abs(reset[1] - reset[0]) <= 8
+          and flags == {False: (False, False), True: (True, True)})
+    return {"success": ok, "message": f"takeover={takeover}, no_takeover={reset}"}
+
+
+def test_rsv1_without_negotiation() -> Dict[str, Any]:
+    """A compressed frame on an uncompressed connection fails with WebSocketDeflateError."""
+    payload, _ = PerMessageDeflate(compress_threshold=0).deflate(b'{"type": "event"}')
+    with StandInWebSocketServer(compression=False) as server:
+        client = _deflate_client(server)
+        negotiated = client.deflate is not None
+        server.push_frame(encode_frame(payload, rsv1=True))
+        error = _recv_error(client)
+    ok = not negotiated and error == 'WebSocketDeflateError'
+    return {"success": ok, "message": f"negotiated={negotiated}, error={error}"}
+
+
+def test_oversize_message() -> Dict[str, Any]:
+    """Messages over max_message_bytes fail before their buffer is allocated."""
+    big_states = [dict(state, entity_id=f'sensor.big{i}') for i, state in enumerate(_STATES * 5)]
+    chunk = b'x' * (40 * 1024)
+    errors = {}
+    with StandInWebSocketServer({'get_states': lambda msg: big_states}) as server:
+        client = _deflate_client(server, compression=False, max_message_bytes=_MAX_MESSAGE_BYTES)
+        client.send(json.dumps({'id': 1, 'type': 'get_states'}))
+        errors['frame'] = _recv_error(client)
+
+        # 1 TB claimed: would be a MemoryError if allocated
+        client = _deflate_client(server, compression=False, max_message_bytes=_MAX_MESSAGE_BYTES)
+        server.push_frame(_frame_header(0x81, 1 << 40))
+        errors['header'] = _recv_error(client)
+
+        # Two 40 KB fragments: each fits, the message doesn't
+        client = _deflate_client(server, compression=False, max_message_bytes=_MAX_MESSAGE_BYTES)
+        server.push_frame(_frame_header(0x01, len(chunk)) + chunk + _frame_header(0x80, len(chunk)) + chunk)
+        errors['fragments'] = _recv_error(client)
+        connected = client.connected
+    with StandInWebSocketServer({'get_states': lambda msg: big_states}, compression=True) as server:
+        client = _deflate_client(server, max_message_bytes=_MAX_MESSAGE_BYTES)
+        client.send(json.dumps({'id': 1, 'type': 'get_states'}))
+        errors['inflated'] = _recv_error(client)
+    ok = (errors == {'frame': 'ConnectionError', 'header': 'ConnectionError', 'fragments': 'ConnectionError',
+                     'inflated': 'WebSocketDeflateError'} and not connected)
+    return {"success": ok, "message": f"errors={errors}"}
+
+
+def run_websocket_session_tests() -> Dict[str, Any]:
+    """
+    Run all WebSocket session tests.
+
+    Returns:
+        Test results dictionary
+    """
+    results = {
+        "total_tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "tests": []
+    }
+
+    tests: List[Callable[[], Dict[str, Any]]] = [
+        test_timeout_clears_in_flight, test_late_reply_discarded, test_deflate_round_trip,
+        test_context_takeover, test_rsv1_without_negotiation, test_oversize_message
+    ]
+    for test in tests:
+        results["total_tests"] += 1
+        try:
+            test_result = test()
+        except Exception as e:
+            test_result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        if test_result.get("success"):
+            results["passed"] += 1
+        else:
+            results["failed"] += 1
+        results["tests"].append({
+            "name": test.__name__,
+            "success": test_result.get("success", False),
+            "message": test_result.get("message", test_result.get("error", ""))
+        })
+
+    return results
+
+
+def main():
+    results = run_websocket_session_tests()
+    for test in results["tests"]:
+        status = "PASS" if test["success"] else "FAIL"
+        print(f"[{status}] {test['name']}: {test['message']}")
+    print(f"\n{results['passed']}/{results['total_tests']} passed")
+    return 0 if results['passed'] == results['total_tests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+__all__ = [
+    'run_websocket_session_tests',
+    'test_timeout_clears_in_flight',
+    'test_late_reply_discarded',
+    'test_deflate_round_trip',
+    'test_context_takeover',
+    'test_rsv1_without_negotiation',
+    'test_oversize_message'
+]
+
+# EOF
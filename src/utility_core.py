@@ -1,9 +1,11 @@
 """
 utility_core.py - Core Utility Implementation (Internal)
-Version: 3.1.0
-Date: 2025-12-02
+Version: 3.2.0
+Date: 2026-10-18
 Description: SharedUtilityCore class with SINGLETON pattern, rate limiting
 
+CHANGED (3.2.0): Rate limiting via shared GCRA limiter (rate_limiter.py) replaces deque window
+
 ADDED: render_template_impl - Template {placeholder} substitution
 ADDED: config_get_impl - Typed config from environment
 
@@ -17,7 +19,7 @@ import uuid
 import traceback
 import os
 from typing import Dict, Any, Optional, List
-from collections import deque
+from rate_limiter import get_rate_limiter
 import logging as stdlib_logging
 
 from utility_types import UtilityMetrics, DEFAULT_MAX_JSON_CACHE_SIZE
@@ -51,24 +53,20 @@ class SharedUtilityCore:
         }
         
         # Rate limiting (1000 ops/sec for infrastructure - LESS-21)
-        self._rate_limiter = deque(maxlen=1000)
-        self._rate_limit_window_ms = 1000
-        self._rate_limited_count = 0
+        self._rate_limiter = get_rate_limiter('utility', 1000)
     
     def _check_rate_limit(self) -> bool:
-        """Check rate limit (1000 ops/sec)."""
-        now = time.time() * 1000
+        """
+        Check if operation is within rate limit.
         
-        while self._rate_limiter and (now - self._rate_limiter[0]) > self._rate_limit_window_ms:
-            self._rate_limiter.popleft()
+        Shared GCRA limiter 'utility' (rate_limiter.py): O(1), monotonic clock.
+        No threading locks needed (AP-08, DEC-04).
         
-        if len(self._rate_limiter) >= 1000:
-            self._rate_limited_count += 1
-            return False
-        
-        self._rate_limiter.append(now)
-        return True
-    
+        Returns:
+            bool: True if operation allowed, False if rate limited
+        """
+        return self._rate_limiter.allow()
+
     # ===== TRACKING =====
     
     def _start_operation_tracking(self, operation_type: str):
@@ -507,7 +505,7 @@ class SharedUtilityCore:
             "json_cache_size": len(self._json_cache),
             "json_cache_limit": DEFAULT_MAX_JSON_CACHE_SIZE,
             "cache_enabled": self._cache_enabled,
-            "rate_limited_count": self._rate_limited_count
+            "rate_limited_count": self._rate_limiter.rejected
         }
     
     def get_stats(self) -> Dict[str, Any]:
@@ -573,8 +571,7 @@ class SharedUtilityCore:
             self._json_cache.clear()
             self._json_cache_order.clear()
             self._id_pool.clear()
-            self._rate_limiter.clear()
-            self._rate_limited_count = 0
+            self._rate_limiter.reset()
             return True
         except Exception:
             return False
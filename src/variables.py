@@ -1,8 +1,11 @@
 """
 variables.py
-Version: 2025.10.11.01
+Version: 2026.10.18.01
 Description: Configuration System Core Data Structure with inheritance, override management, and resource constraint validation
 
+CHANGES (2026.10.18.01):
+- ADDED: RATE_LIMIT_INTERFACE_CONFIG - per-tier limits for rate_limiter.py
+
 Copyright 2025 Joseph Hersey
 
    Licensed under the Apache License, Version 2.0 (the "License");
@@ -527,6 +530,58 @@ SINGLETON_INTERFACE_CONFIG = {
     }
 }
 
+# ===== RATE LIMIT CONFIGURATION =====
+# Shared GCRA limiters (rate_limiter.py), one per interface core.
+# burst = operations allowed back to back; enabled False = no limiting
+# (internal hot paths already covered by outer limits).
+
+RATE_LIMIT_INTERFACE_CONFIG = {
+    ConfigurationTier.MINIMUM: {
+        "enabled": True,
+        "limits": {
+            "cache": {"rate_per_second": 1000, "burst": 1000},
+            "http_client": {"rate_per_second": 500, "burst": 500},
+            "websocket": {"rate_per_second": 300, "burst": 300},
+            "config": {"rate_per_second": 1000, "burst": 1000},
+            "circuit_breaker": {"rate_per_second": 1000, "burst": 1000},
+            "singleton": {"rate_per_second": 1000, "burst": 1000},
+            "security": {"rate_per_second": 1000, "burst": 1000},
+            "utility": {"rate_per_second": 1000, "burst": 1000},
+            "initialization": {"rate_per_second": 1000, "burst": 1000}
+        }
+    },
+    
+    ConfigurationTier.STANDARD: {
+        "enabled": True,
+        "limits": {
+            "cache": {"rate_per_second": 1000, "burst": 1000},
+            "http_client": {"rate_per_second": 500, "burst": 500},
+            "websocket": {"rate_per_second": 300, "burst": 300},
+            "config": {"rate_per_second": 1000, "burst": 1000},
+            "circuit_breaker": {"rate_per_second": 1000, "burst": 1000},
+            "singleton": {"rate_per_second": 1000, "burst": 1000},
+            "security": {"rate_per_second": 1000, "burst": 1000},
+            "utility": {"rate_per_second": 1000, "burst": 1000},
+            "initialization": {"rate_per_second": 1000, "burst": 1000}
+        }
+    },
+    
+    ConfigurationTier.MAXIMUM: {
+        "enabled": True,
+        "limits": {
+            "cache": {"rate_per_second": 2000, "burst": 2000, "enabled": False},
+            "http_client": {"rate_per_second": 1000, "burst": 1000},
+            "websocket": {"rate_per_second": 600, "burst": 600},
+            "config": {"rate_per_second": 2000, "burst": 2000},
+            "circuit_breaker": {"rate_per_second": 2000, "burst": 2000},
+            "singleton": {"rate_per_second": 2000, "burst": 2000, "enabled": False},
+            "security": {"rate_per_second": 2000, "burst": 2000},
+            "utility": {"rate_per_second": 2000, "burst": 2000, "enabled": False},
+            "initialization": {"rate_per_second": 2000, "burst": 2000}
+        }
+    }
+}
+
 # ===== PLACEHOLDER INTERFACE CONFIGURATIONS (FUTURE PHASES) =====
 
 LAMBDA_INTERFACE_CONFIG = {
@@ -696,7 +751,7 @@ __all__ = [
     'CACHE_INTERFACE_CONFIG', 'LOGGING_INTERFACE_CONFIG', 'METRICS_INTERFACE_CONFIG',
     'SECURITY_INTERFACE_CONFIG', 'CIRCUIT_BREAKER_INTERFACE_CONFIG', 'SINGLETON_INTERFACE_CONFIG',
     'LAMBDA_INTERFACE_CONFIG', 'HTTP_CLIENT_INTERFACE_CONFIG', 'UTILITY_INTERFACE_CONFIG',
-    'INITIALIZATION_INTERFACE_CONFIG',
+    'INITIALIZATION_INTERFACE_CONFIG', 'RATE_LIMIT_INTERFACE_CONFIG',
     
     # Presets and constraints
     'CONFIGURATION_PRESETS', 'AWS_LAMBDA_CONSTRAINTS', 'OPTIMIZATION_TARGETS'
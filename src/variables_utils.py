@@ -1,8 +1,11 @@
 """
 variables_utils.py
-Version: 2025.10.11.01
+Version: 2026.10.18.01
 Description: Complete utility functions for configuration estimation and validation
 
+CHANGES (2026.10.18.01):
+- ADDED: get_rate_limit_configuration(); 'rate_limits' section in system config
+
 Copyright 2025 Joseph Hersey
 
    Licensed under the Apache License, Version 2.0 (the "License");
@@ -25,7 +28,7 @@ from variables import (
     CACHE_INTERFACE_CONFIG, LOGGING_INTERFACE_CONFIG, 
     METRICS_INTERFACE_CONFIG, SECURITY_INTERFACE_CONFIG,
     CIRCUIT_BREAKER_INTERFACE_CONFIG, SINGLETON_INTERFACE_CONFIG,
-    CONFIGURATION_PRESETS
+    RATE_LIMIT_INTERFACE_CONFIG, CONFIGURATION_PRESETS
 )
 
 # ===== RESOURCE ESTIMATION FUNCTIONS =====
@@ -106,6 +109,10 @@ def get_singleton_configuration(tier: ConfigurationTier) -> Dict[str, Any]:
     """Get singleton interface configuration for specified tier."""
     return SINGLETON_INTERFACE_CONFIG.get(tier, SINGLETON_INTERFACE_CONFIG[ConfigurationTier.MINIMUM]).copy()
 
+def get_rate_limit_configuration(tier: ConfigurationTier) -> Dict[str, Any]:
+    """Get rate limiter configuration for specified tier."""
+    return RATE_LIMIT_INTERFACE_CONFIG.get(tier, RATE_LIMIT_INTERFACE_CONFIG[ConfigurationTier.STANDARD]).copy()
+
 # ===== VALIDATION FUNCTIONS =====
 
 def validate_phase2_memory_constraints(cache_tier: ConfigurationTier = ConfigurationTier.STANDARD,
@@ -281,6 +288,8 @@ def apply_configuration_overrides(base_tier: ConfigurationTier,
     singleton_tier = overrides.get(InterfaceType.SINGLETON, base_tier)
     configuration["singleton"] = get_singleton_configuration(singleton_tier)
     
+    configuration["rate_limits"] = get_rate_limit_configuration(base_tier)
+    
     placeholder_config = {"tier": base_tier.value, "status": "placeholder"}
     
     configuration["lambda"] = placeholder_config
@@ -583,6 +592,7 @@ __all__ = [
     'estimate_metrics_count',
     'get_cache_configuration', 'get_logging_configuration', 'get_metrics_configuration',
     'get_security_configuration', 'get_circuit_breaker_configuration', 'get_singleton_configuration',
+    'get_rate_limit_configuration',
     'validate_phase2_memory_constraints', 'validate_phase3_memory_constraints', 'validate_override_combination',
     'apply_configuration_overrides', 'get_full_system_configuration',
     'get_preset_configuration', 'list_configuration_presets',
@@ -1,9 +1,36 @@
 """
 websocket_core.py - WebSocket CLIENT Core Implementation
-Version: 2025.10.22.01 
+Version: 2026.10.18.06
 Description: WebSocket CLIENT operations implementation with manager pattern.
              Internal module - accessed via interface_websocket.py router.
 
+CHANGES (2026.10.18.06):
+- CHANGED: Connections resolve the host through the shared DNS cache
+  (websocket_deflate.open_client_socket, passed to websocket-client as socket=)
+
+CHANGES (2026.10.18.05):
+- CHANGED: Rate limiting via shared GCRA limiter (rate_limiter.py) replaces deque window
+
+CHANGES (2026.10.18.04):
+- ADDED: permessage-deflate (websocket_deflate.DeflateWebSocket) for connect()
+  and sessions - WEBSOCKET_DEFLATE_ENABLED / _WINDOW_BITS / _MEM_LEVEL or
+  compression= / window_bits= / mem_level= kwargs
+- CHANGED: receive() parses JSON from frame bytes (recv_data) - no str copy
+
+CHANGES (2026.10.18.03):
+- ADDED: session_subscribe() / session_poll() - server-pushed events on the
+  persistent session, with generation for lost-subscription detection
+
+CHANGES (2026.10.18.02):
+- ADDED: session_pipeline() - N commands in flight on one socket, replies
+  matched by message ID (websocket_session.WebSocketReply futures)
+
+CHANGES (2026.10.18.01):
+- ADDED: Persistent authenticated sessions (websocket_session.WebSocketSession)
+  - session_request() reuses one socket per (url, credentials) across invocations
+  - Ping/pong liveness check, transparent reconnect, idle/lifetime caps
+  - Session reuse rate and reconnect cost in get_stats()
+
 Copyright 2025 Joseph Hersey
 
    Licensed under the Apache License, Version 2.0 (the "License");
@@ -19,10 +46,42 @@ Copyright 2025 Joseph Hersey
    limitations under the License.
 """
 
+import hashlib
 import json
-import time
-from typing import Dict, Any, Optional
-from collections import deque
+import os
+from typing import Dict, Any, Optional, List
+from rate_limiter import get_rate_limiter
+
+from websocket_session import (
+    WebSocketSession,
+    WebSocketSessionError,
+    WS_SESSION_PING_AFTER_SECONDS,
+    WS_SESSION_MAX_IDLE_SECONDS,
+    WS_SESSION_MAX_LIFETIME_SECONDS
+)
+from websocket_deflate import (
+    DeflateWebSocket,
+    open_client_socket,
+    OPCODE_CLOSE,
+    WS_DEFLATE_WINDOW_BITS,
+    WS_DEFLATE_MEM_LEVEL
+)
+
+# permessage-deflate (off by default; lower window bits = less memory per socket)
+WEBSOCKET_DEFLATE_ENABLED = os.getenv('WEBSOCKET_DEFLATE_ENABLED', 'false').lower() == 'true'
+WEBSOCKET_DEFLATE_WINDOW_BITS = int(os.getenv('WEBSOCKET_DEFLATE_WINDOW_BITS', str(WS_DEFLATE_WINDOW_BITS)))
+WEBSOCKET_DEFLATE_MEM_LEVEL = int(os.getenv('WEBSOCKET_DEFLATE_MEM_LEVEL', str(WS_DEFLATE_MEM_LEVEL)))
+
+
+def _deflate_options(kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """DeflateWebSocket connect options from kwargs/env, or None if compression is off."""
+    if not kwargs.get('compression', WEBSOCKET_DEFLATE_ENABLED):
+        return None
+    return {
+        'compression': True,
+        'window_bits': kwargs.get('window_bits', WEBSOCKET_DEFLATE_WINDOW_BITS),
+        'mem_level': kwargs.get('mem_level', WEBSOCKET_DEFLATE_MEM_LEVEL)
+    }
 
 
 class WebSocketCore:
@@ -48,9 +107,7 @@ class WebSocketCore:
         """
         # Rate limiting (300 ops/sec - lower for WebSocket)
         # LESS-21: Rate limiting essential for DoS protection
-        self._rate_limiter = deque(maxlen=300)  # 300 ops/sec window
-        self._rate_limit_window_ms = 1000  # 1 second window
-        self._rate_limited_count = 0
+        self._rate_limiter = get_rate_limiter('websocket', 300)
         
         # Statistics
         self._total_operations = 0
@@ -58,32 +115,22 @@ class WebSocketCore:
         self._messages_sent_count = 0
         self._messages_received_count = 0
         self._errors_count = 0
+        
+        # Persistent sessions keyed by url + credential fingerprint
+        self._sessions: Dict[str, WebSocketSession] = {}
     
     def _check_rate_limit(self) -> bool:
         """
         Check if operation is within rate limit.
         
-        LESS-21: Uses deque for efficient rate limiting.
+        Shared GCRA limiter 'websocket' (rate_limiter.py): O(1), monotonic clock.
         No threading locks needed (AP-08, DEC-04).
         
         Returns:
             bool: True if operation allowed, False if rate limited
         """
-        now = time.time() * 1000  # milliseconds
-        
-        # Remove expired timestamps
-        while self._rate_limiter and (now - self._rate_limiter[0]) > self._rate_limit_window_ms:
-            self._rate_limiter.popleft()
-        
-        # Check if over limit
-        if len(self._rate_limiter) >= 300:  # 300 ops/sec
-            self._rate_limited_count += 1
-            return False
-        
-        # Add current timestamp
-        self._rate_limiter.append(now)
-        return True
-    
+        return self._rate_limiter.allow()
+
     def connect(self, url: str, timeout: int = 10, **kwargs) -> Dict[str, Any]:
         """
         Establish WebSocket CLIENT connection (outbound to external server).
@@ -94,7 +141,8 @@ class WebSocketCore:
         Args:
             url: WebSocket URL to connect to (ws:// or wss://)
             timeout: Connection timeout in seconds
-            **kwargs: Additional parameters including optional correlation_id
+            **kwargs: Additional parameters including optional correlation_id,
+                      compression / window_bits / mem_level (permessage-deflate)
             
         Returns:
             Success response with connection object, or error response
@@ -118,12 +166,16 @@ class WebSocketCore:
             return create_error_response('URL parameter is required', 'WEBSOCKET_NO_URL')
         
         try:
-            import websocket
-            
             log_info(f"[{correlation_id}] Establishing WebSocket CLIENT connection to {url}")
             
-            ws = websocket.WebSocket()
-            ws.connect(url, timeout=timeout)
+            deflate_options = _deflate_options(kwargs)
+            if deflate_options is not None:
+                ws = DeflateWebSocket.factory(url, timeout, **deflate_options)
+                record_metric('websocket.deflate_negotiated', 1.0 if ws.deflate else 0.0)
+            else:
+                import websocket
+                ws = websocket.WebSocket()
+                ws.connect(url, timeout=timeout, socket=open_client_socket(url, timeout))
             
             self._connections_count += 1
             record_metric('websocket.connections', 1.0)
@@ -248,8 +300,10 @@ class WebSocketCore:
         try:
             log_info(f"[{correlation_id}] Receiving WebSocket message from external server")
             
-            message_str = connection.recv()
-            message = json.loads(message_str)
+            opcode, payload = connection.recv_data()
+            if opcode == OPCODE_CLOSE:
+                raise ConnectionError('Connection closed by server')
+            message = json.loads(payload)
             
             self._messages_received_count += 1
             record_metric('websocket.messages_received', 1.0)
@@ -397,6 +451,312 @@ class WebSocketCore:
             'correlation_id': correlation_id
         })
     
+    @staticmethod
+    def _session_key(url: str, auth_message: Optional[Dict[str, Any]]) -> str:
+        """Build session key (credentials are fingerprinted, never stored in key)."""
+        if not auth_message:
+            return url
+        digest = hashlib.sha256(
+            json.dumps(auth_message, sort_keys=True).encode('utf-8')
+        ).hexdigest()[:16]
+        return f"{url}#{digest}"
+    
+    def get_session(self, url: str, auth_message: Optional[Dict[str, Any]] = None,
+                    timeout: float = 10.0, **kwargs) -> WebSocketSession:
+        """
+        Get (or create) persistent session for url + credentials.
+        
+        Session is created lazily; socket is opened on first acquire().
+        
+        Args:
+            url: WebSocket URL (ws:// or wss://)
+            auth_message: Optional auth message sent after connect
+            timeout: Connect/auth timeout in seconds
+            **kwargs: ping_after_seconds, max_idle_seconds, max_lifetime_seconds,
+                      auth_ok_type, socket_factory, compression, window_bits, mem_level
+            
+        Returns:
+            WebSocketSession instance
+        """
+        key = self._session_key(url, auth_message)
+        session = self._sessions.get(key)
+        if session is None:
+            socket_factory = kwargs.get('socket_factory')
+            connect_options = _deflate_options(kwargs)
+            if connect_options is not None and socket_factory is None:
+                socket_factory = DeflateWebSocket.factory
+            session = WebSocketSession(
+                url,
+                auth_message=auth_message,
+                auth_ok_type=kwargs.get('auth_ok_type', 'auth_ok'),
+                connect_timeout=timeout,
+                ping_after_seconds=kwargs.get('ping_after_seconds', WS_SESSION_PING_AFTER_SECONDS),
+                max_idle_seconds=kwargs.get('max_idle_seconds', WS_SESSION_MAX_IDLE_SECONDS),
+                max_lifetime_seconds=kwargs.get('max_lifetime_seconds', WS_SESSION_MAX_LIFETIME_SECONDS),
+                connect_options=connect_options,
+                socket_factory=socket_factory
+            )
+            self._sessions[key] = session
+        return session
+    
+    def _run_on_session(self, url: str, auth_message: Optional[Dict[str, Any]], timeout: float,
+                        operation: Any, message_count: int, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run operation(session, timeout) on persistent session with one transparent reconnect.
+        
+        Shared by session_request and session_pipeline.
+        """
+        from gateway import log_debug, log_error, create_success_response, create_error_response, record_metric, get_invocation_deadline
+        
+        self._total_operations += 1
+        correlation_id = options.pop('correlation_id', None)
+        
+        if not url:
+            self._errors_count += 1
+            return create_error_response('URL parameter is required', 'WEBSOCKET_NO_URL')
+        
+        deadline = options.pop('deadline', None) or get_invocation_deadline()
+        if deadline is not None:
+            timeout = deadline.cap_timeout(timeout)
+            if timeout <= 0:
+                deadline.record_miss()
+                return create_error_response('Invocation deadline exceeded', 'DEADLINE_EXCEEDED')
+        
+        session = self.get_session(url, auth_message=auth_message, timeout=timeout, **options)
+        connects_before = session.get_stats()['connects']
+        
+        try:
+            try:
+                result = operation(session, timeout)
+            except WebSocketSessionError as e:
+                # Dead socket found mid-request: reconnect once, then give up
+                if session.connected:
+                    raise
+                log_debug(f"[{correlation_id}] WebSocket session dropped, reconnecting: {e}")
+                result = operation(session, timeout)
+        except WebSocketSessionError as e:
+            log_error(f"[{correlation_id}] WebSocket session request failed: {str(e)}")
+            self._errors_count += 1
+            record_metric('websocket.session_errors', 1.0)
+            return create_error_response(f'Session request failed: {str(e)}', 'WEBSOCKET_SESSION_FAILED')
+        
+        self._messages_sent_count += message_count
+        self._messages_received_count += message_count
+        
+        stats = session.get_stats()
+        reconnected = stats['connects'] > connects_before
+        record_metric('websocket.session_reused', 0.0 if reconnected else 1.0)
+        if reconnected:
+            record_metric('websocket.session_connect_ms', stats['last_connect_ms'])
+        
+        return create_success_response("WebSocket session request completed", {
+            'response': result,
+            'correlation_id': correlation_id,
+            'reconnected': reconnected
+        })
+    
+    def session_request(self, url: str, message: Dict[str, Any],
+                        auth_message: Optional[Dict[str, Any]] = None,
+                        timeout: float = 10.0, **kwargs) -> Dict[str, Any]:
+        """
+        Send request over persistent authenticated session and wait for its reply.
+        
+        Unlike request(), the socket is kept open for later invocations.
+        The message 'id' is assigned by the session. If the socket turned out
+        to be dead, one transparent reconnect + retry is attempted.
+        
+        Args:
+            url: WebSocket URL (ws:// or wss://)
+            message: Dictionary to send (without 'id')
+            auth_message: Optional auth message sent after connect
+            timeout: Connect and reply timeout in seconds
+            **kwargs: Session options and optional correlation_id
+            
+        Returns:
+            Success response with reply frame, or error response
+        """
+        if not self._check_rate_limit():
+            from gateway import create_error_response
+            return create_error_response('Rate limit exceeded', 'RATE_LIMIT_EXCEEDED')
+        
+        if not isinstance(message, dict):
+            from gateway import create_error_response
+            self._errors_count += 1
+            return create_error_response('Message must be a dictionary', 'WEBSOCKET_INVALID_MESSAGE')
+        
+        return self._run_on_session(
+            url, auth_message, timeout,
+            lambda session, wait: session.request(message, timeout=wait),
+            1, kwargs
+        )
+    
+    def session_pipeline(self, url: str, messages: List[Dict[str, Any]],
+                         auth_message: Optional[Dict[str, Any]] = None,
+                         timeout: float = 10.0, **kwargs) -> Dict[str, Any]:
+        """
+        Pipeline several requests over persistent session (one round trip).
+        
+        All messages are sent before any reply is read; replies are matched
+        by ID. On a dropped socket the whole pipeline is retried once, so
+        only pipeline read-only commands.
+        
+        Args:
+            url: WebSocket URL (ws:// or wss://)
+            messages: List of dictionaries to send (without 'id')
+            auth_message: Optional auth message sent after connect
+            timeout: Connect timeout and total reply timeout in seconds
+            **kwargs: Session options and optional correlation_id
+            
+        Returns:
+            Success response with list of reply frames (same order as messages)
+        """
+        if not self._check_rate_limit():
+            from gateway import create_error_response
+            return create_error_response('Rate limit exceeded', 'RATE_LIMIT_EXCEEDED')
+        
+        if not isinstance(messages, list) or not all(isinstance(m, dict) for m in messages):
+            from gateway import create_error_response
+            self._errors_count += 1
+            return create_error_response('Messages must be a list of dictionaries', 'WEBSOCKET_INVALID_MESSAGE')
+        
+        return self._run_on_session(
+            url, auth_message, timeout,
+            lambda session, wait: session.pipeline(messages, timeout=wait),
+            len(messages), kwargs
+        )
+    
+    def session_subscribe(self, url: str, message: Dict[str, Any],
+                          auth_message: Optional[Dict[str, Any]] = None,
+                          timeout: float = 10.0, **kwargs) -> Dict[str, Any]:
+        """
+        Subscribe to server-pushed events on persistent session.
+        
+        Args:
+            url: WebSocket URL (ws:// or wss://)
+            message: Subscription command (without 'id')
+            auth_message: Optional auth message sent after connect
+            timeout: Connect and reply timeout in seconds
+            **kwargs: Session options and optional correlation_id
+            
+        Returns:
+            Success response with 'subscription_id' and 'generation'
+        """
+        if not self._check_rate_limit():
+            from gateway import create_error_response
+            return create_error_response('Rate limit exceeded', 'RATE_LIMIT_EXCEEDED')
+        
+        if not isinstance(message, dict):
+            from gateway import create_error_response
+            self._errors_count += 1
+            return create_error_response('Message must be a dictionary', 'WEBSOCKET_INVALID_MESSAGE')
+        
+        result = self._run_on_session(
+            url, auth_message, timeout,
+            lambda session, wait: (session.subscribe(message, timeout=wait), session.generation),
+            1, kwargs
+        )
+        if result.get('success'):
+            subscription_id, generation = result['data'].pop('response')
+            result['data']['subscription_id'] = subscription_id
+            result['data']['generation'] = generation
+        return result
+    
+    def session_poll(self, url: str, auth_message: Optional[Dict[str, Any]] = None,
+                     subscription_ids: Optional[List[int]] = None,
+                     wait: float = 0.0, **kwargs) -> Dict[str, Any]:
+        """
+        Collect events pushed to persistent session since the last poll.
+        
+        Never reconnects: a lost connection is reported (connected=False) so
+        the subscriber can resubscribe and resync.
+        
+        Args:
+            url: WebSocket URL (ws:// or wss://)
+            auth_message: Credentials used for the session
+            subscription_ids: Only events for these subscriptions (None = all)
+            wait: Seconds to wait for frames before returning
+            
+        Returns:
+            Success response with 'events', 'connected', 'generation', 'frames_dropped'
+        """
+        from gateway import create_success_response, create_error_response
+        
+        if not self._check_rate_limit():
+            return create_error_response('Rate limit exceeded', 'RATE_LIMIT_EXCEEDED')
+        
+        self._total_operations += 1
+        session = self._sessions.get(self._session_key(url, auth_message))
+        if session is None:
+            return create_success_response("WebSocket session not open", {
+                'events': [], 'connected': False, 'generation': 0, 'frames_dropped': 0
+            })
+        
+        frames_read = session.poll(wait=wait)
+        self._messages_received_count += frames_read
+        events = session.drain_events(set(subscription_ids) if subscription_ids is not None else None)
+        
+        return create_success_response("WebSocket session polled", {
+            'events': events,
+            'connected': session.connected,
+            'generation': session.generation,
+            'frames_dropped': session.get_stats()['frames_dropped']
+        })
+    
+    def close_session(self, url: Optional[str] = None, auth_message: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Close persistent session(s).
+        
+        Args:
+            url: Session URL (None = close all sessions)
+            auth_message: Credentials used for the session
+            
+        Returns:
+            Number of sessions closed
+        """
+        if url is None:
+            keys = list(self._sessions.keys())
+        else:
+            keys = [self._session_key(url, auth_message)]
+        
+        closed = 0
+        for key in keys:
+            session = self._sessions.pop(key, None)
+            if session is not None:
+                session.close()
+                closed += 1
+        return closed
+    
+    def get_session_stats(self) -> Dict[str, Any]:
+        """
+        Get aggregated persistent session statistics.
+        
+        Returns:
+            Dictionary with totals, reuse_rate, avg_reconnect_ms and per-session stats
+        """
+        totals = {
+            'sessions': len(self._sessions),
+            'acquisitions': 0,
+            'reuses': 0,
+            'connects': 0,
+            'reconnects': 0,
+            'connect_ms_total': 0.0
+        }
+        per_session = {}
+        for key, session in self._sessions.items():
+            stats = session.get_stats()
+            per_session[key.split('#', 1)[0]] = stats
+            for field in ('acquisitions', 'reuses', 'connects', 'reconnects', 'connect_ms_total'):
+                totals[field] += stats[field]
+        
+        totals['reuse_rate'] = (
+            round(totals['reuses'] / totals['acquisitions'], 4) if totals['acquisitions'] else 0.0
+        )
+        totals['avg_connect_ms'] = (
+            round(totals['connect_ms_total'] / totals['connects'], 2) if totals['connects'] else 0.0
+        )
+        totals['per_session'] = per_session
+        return totals
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get WebSocket manager statistics.
@@ -416,10 +776,11 @@ class WebSocketCore:
             'messages_sent_count': self._messages_sent_count,
             'messages_received_count': self._messages_received_count,
             'errors_count': self._errors_count,
-            'rate_limited_count': self._rate_limited_count,
-            'rate_limit_window_ms': self._rate_limit_window_ms,
-            'current_rate_limit_size': len(self._rate_limiter),
-            'max_rate_limit': self._rate_limiter.maxlen
+            'rate_limited_count': self._rate_limiter.rejected,
+            'rate_limit': self._rate_limiter.get_stats(),
+            'current_rate_limit_size': self._rate_limiter.in_use(),
+            'max_rate_limit': self._rate_limiter.burst,
+            'sessions': self.get_session_stats()
         })
     
     def reset(self) -> bool:
@@ -443,9 +804,11 @@ class WebSocketCore:
             self._messages_received_count = 0
             self._errors_count = 0
             
+            # Close persistent sessions
+            self.close_session()
+            
             # Reset rate limiting
-            self._rate_limiter.clear()
-            self._rate_limited_count = 0
+            self._rate_limiter.reset()
             
             return True
         except Exception:
@@ -525,6 +888,49 @@ def websocket_request_implementation(url: str, message: Dict[str, Any], timeout:
     return manager.request(url=url, message=message, timeout=timeout, **kwargs)
 
 
+def websocket_session_request_implementation(url: str, message: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+    """Send request over persistent session using manager."""
+    manager = get_websocket_manager()
+    return manager.session_request(url=url, message=message, **kwargs)
+
+
+def websocket_session_pipeline_implementation(url: str, messages: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+    """Pipeline requests over persistent session using manager."""
+    manager = get_websocket_manager()
+    return manager.session_pipeline(url=url, messages=messages, **kwargs)
+
+
+def websocket_session_subscribe_implementation(url: str, message: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+    """Subscribe to events on persistent session using manager."""
+    manager = get_websocket_manager()
+    return manager.session_subscribe(url=url, message=message, **kwargs)
+
+
+def websocket_session_poll_implementation(url: str, **kwargs) -> Dict[str, Any]:
+    """Poll events from persistent session using manager."""
+    manager = get_websocket_manager()
+    return manager.session_poll(url=url, **kwargs)
+
+
+def websocket_session_close_implementation(url: Optional[str] = None,
+                                           auth_message: Optional[Dict[str, Any]] = None,
+                                           **kwargs) -> Dict[str, Any]:
+    """Close persistent session(s) using manager."""
+    manager = get_websocket_manager()
+    closed = manager.close_session(url=url, auth_message=auth_message)
+    
+    from gateway import create_success_response
+    return create_success_response("WebSocket session closed", {'closed': closed})
+
+
+def websocket_session_stats_implementation(**kwargs) -> Dict[str, Any]:
+    """Get persistent session statistics using manager."""
+    manager = get_websocket_manager()
+    
+    from gateway import create_success_response
+    return create_success_response("WebSocket session statistics", manager.get_session_stats())
+
+
 def websocket_get_stats_implementation() -> Dict[str, Any]:
     """Get WebSocket statistics using manager."""
     manager = get_websocket_manager()
@@ -554,6 +960,12 @@ __all__ = [
     'websocket_receive_implementation',
     'websocket_close_implementation',
     'websocket_request_implementation',
+    'websocket_session_request_implementation',
+    'websocket_session_pipeline_implementation',
+    'websocket_session_subscribe_implementation',
+    'websocket_session_poll_implementation',
+    'websocket_session_close_implementation',
+    'websocket_session_stats_implementation',
     'websocket_get_stats_implementation',
     'websocket_reset_implementation',
 ]
@@ -0,0 +1,624 @@
+"""
+websocket_deflate.py - permessage-deflate WebSocket CLIENT Transport
+Version: 2026.10.18.03
+Description: RFC 7692 permessage-deflate negotiation and codec, plus a stdlib
+             RFC 6455 client socket that uses it. Internal module - selected by
+             websocket_core when compression is enabled.
+
+CHANGELOG:
+- 2026.10.18.03: Frame sizes checked before allocating
+  - Data frames (and the sum of a message's fragments) over
+    max_message_bytes fail the connection before their buffer is allocated,
+    compressed or not
+  - Control frames over 125 bytes or fragmented fail the connection
+- 2026.10.18.02: open_client_socket() - TCP (+TLS for wss) connect through
+  the shared DNS cache (dns_cache.py), also handed to websocket-client as
+  its socket= option
+- 2026.10.18.01: Initial version
+  - Extension offer / response negotiation (window bits, context takeover)
+  - PerMessageDeflate codec with configurable window size and memory level
+  - DeflateWebSocket: websocket-client compatible subset (connect, send,
+    recv_data, recv, ping, settimeout, close, connected) over socket/ssl
+  - Incoming payloads read into one preallocated buffer (recv_into) and
+    handed to the caller as bytes - no str decode before json.loads
+
+DESIGN DECISION: Own transport instead of websocket-client
+Reason: websocket-client rejects frames with RSV1 set, so it cannot receive
+compressed messages. The session only needs a small part of its interface,
+which DeflateWebSocket provides; websocket-client stays the default when
+compression is off.
+
+DESIGN DECISION: Window bits bound decompression memory
+Reason: Inflate allocates 2**window_bits bytes per stream. The offer asks
+the server to compress with at most window_bits (server_max_window_bits),
+so 128 MB functions can trade ratio for memory (e.g. 12 = 4 KB instead of
+32 KB per socket). mem_level bounds the compressor (outgoing messages, which
+are small HA commands; below compress_threshold they are sent uncompressed).
+
+COMPLIANCE:
+- AP-08: No threading locks (Lambda single-threaded)
+- DEC-04: Lambda single-threaded model
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import base64
+import hashlib
+import os
+import socket
+import ssl
+import struct
+import zlib
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from dns_cache import get_dns_cache
+
+EXTENSION_NAME = 'permessage-deflate'
+
+# Defaults
+WS_DEFLATE_WINDOW_BITS = 15
+WS_DEFLATE_MEM_LEVEL = 8
+WS_DEFLATE_COMPRESS_THRESHOLD = 256
+WS_DEFLATE_MAX_MESSAGE_BYTES = 32 * 1024 * 1024
+
+# zlib cannot compress raw deflate streams with an 8-bit window
+_MIN_WINDOW_BITS = 9
+_MAX_WINDOW_BITS = 15
+
+# Appended to every compressed message before inflating (RFC 7692 7.2.2)
+_DEFLATE_TAIL = b'\x00\x00\xff\xff'
+
+# RFC 6455 opcodes
+OPCODE_CONT = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class WebSocketDeflateError(Exception):
+    """Raised on failed negotiation or invalid compressed payload."""
+
+
+def _clamp_window_bits(value: int) -> int:
+    return max(_MIN_WINDOW_BITS, min(_MAX_WINDOW_BITS, int(value)))
+
+
+# ===== NEGOTIATION =====
+
+def build_offer(window_bits: int = WS_DEFLATE_WINDOW_BITS) -> str:
+    """
+    Build Sec-WebSocket-Extensions offer.
+
+    Asks the server to compress with at most window_bits and tells it the
+    client may use client_max_window_bits.
+    """
+    window_bits = _clamp_window_bits(window_bits)
+    return (f'{EXTENSION_NAME}; client_max_window_bits={window_bits}; '
+            f'server_max_window_bits={window_bits}')
+
+
+def parse_extension_params(header_value: str) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Parse the permessage-deflate entry of a Sec-WebSocket-Extensions header.
+
+    Returns:
+        Parameter dict (valueless parameters map to None), or None if the
+        server did not accept the extension
+    """
+    for extension in (header_value or '').split(','):
+        parts = [part.strip() for part in extension.split(';')]
+        if not parts or parts[0].lower() != EXTENSION_NAME:
+            continue
+        params: Dict[str, Optional[str]] = {}
+        for part in parts[1:]:
+            if not part:
+                continue
+            name, _, value = part.partition('=')
+            params[name.strip().lower()] = value.strip().strip('"') or None
+        return params
+    return None
+
+
+class PerMessageDeflate:
+    """
+    permessage-deflate codec for one connection.
+
+    Args:
+        inflate_window_bits: Peer's compression window (our inflate memory)
+        deflate_window_bits: Our compression window
+        inflate_no_context_takeover: Peer resets its compressor per message
+        deflate_no_context_takeover: We reset our compressor per message
+        mem_level: zlib memLevel for our compressor (1-9)
+        compress_threshold: Outgoing payloads smaller than this are sent plain
+        max_message_bytes: Upper bound on one inflated message
+    """
+
+    __slots__ = ('inflate_window_bits', 'deflate_window_bits',
+                 'inflate_no_context_takeover', 'deflate_no_context_takeover',
+                 'mem_level', 'compress_threshold', 'max_message_bytes',
+                 '_inflater', '_deflater', 'stats')
+
+    def __init__(self, inflate_window_bits: int = WS_DEFLATE_WINDOW_BITS,
+                 deflate_window_bits: int = WS_DEFLATE_WINDOW_BITS,
+                 inflate_no_context_takeover: bool = False,
+                 deflate_no_context_takeover: bool = False,
+                 mem_level: int = WS_DEFLATE_MEM_LEVEL,
+                 compress_threshold: int = WS_DEFLATE_COMPRESS_THRESHOLD,
+                 max_message_bytes: int = WS_DEFLATE_MAX_MESSAGE_BYTES):
+        self.inflate_window_bits = _clamp_window_bits(inflate_window_bits)
+        self.deflate_window_bits = _clamp_window_bits(deflate_window_bits)
+        self.inflate_no_context_takeover = inflate_no_context_takeover
+        self.deflate_no_context_takeover = deflate_no_context_takeover
+        self.mem_level = max(1, min(9, int(mem_level)))
+        self.compress_threshold = compress_threshold
+        self.max_message_bytes = max_message_bytes
+        self._inflater = None
+        self._deflater = None
+        self.stats = {
+            'messages_inflated': 0,
+            'messages_deflated': 0,
+            'compressed_bytes_in': 0,
+            'inflated_bytes_in': 0,
+            'raw_bytes_out': 0,
+            'compressed_bytes_out': 0
+        }
+
+    @classmethod
+    def from_response(cls, params: Dict[str, Optional[str]],
+                      window_bits: int = WS_DEFLATE_WINDOW_BITS, **options) -> 'PerMessageDeflate':
+        """Client side codec from the server's accepted parameters."""
+        server_bits = params.get('server_max_window_bits')
+        client_bits = params.get('client_max_window_bits')
+        try:
+            inflate_bits = int(server_bits) if server_bits else _MAX_WINDOW_BITS
+            deflate_bits = min(int(client_bits), window_bits) if client_bits else window_bits
+        except ValueError as e:
+            raise WebSocketDeflateError(f'Invalid window bits in response: {params}') from e
+        if not 8 <= inflate_bits <= _MAX_WINDOW_BITS or not 8 <= deflate_bits <= _MAX_WINDOW_BITS:
+            raise WebSocketDeflateError(f'Window bits out of range: {params}')
+        if deflate_bits < _MIN_WINDOW_BITS:
+            # zlib cannot honor an 8-bit window; send everything uncompressed
+            options['compress_threshold'] = float('inf')
+        return cls(inflate_window_bits=inflate_bits,
+                   deflate_window_bits=deflate_bits,
+                   inflate_no_context_takeover='server_no_context_takeover' in params,
+                   deflate_no_context_takeover='client_no_context_takeover' in params,
+                   **options)
+
+    def inflate(self, payload: bytearray) -> bytes:
+        """
+        Inflate one compressed message.
+
+        payload is extended in place with the deflate tail, so the compressed
+        buffer is not copied.
+
+        Raises:
+            WebSocketDeflateError: Corrupt stream or message over max_message_bytes
+        """
+        if self._inflater is None or self.inflate_no_context_takeover:
+            self._inflater = zlib.decompressobj(wbits=-self.inflate_window_bits)
+        compressed_size = len(payload)
+        payload.extend(_DEFLATE_TAIL)
+        try:
+            data = self._inflater.decompress(payload, self.max_message_bytes)
+        except zlib.error as e:
+            self._inflater = None
+            raise WebSocketDeflateError(f'Inflate failed: {e}') from e
+        if self._inflater.unconsumed_tail:
+            self._inflater = None
+            raise WebSocketDeflateError(f'Message exceeds {self.max_message_bytes} bytes')
+        self.stats['messages_inflated'] += 1
+        self.stats['compressed_bytes_in'] += compressed_size
+        self.stats['inflated_bytes_in'] += len(data)
+        return data
+
+    def deflate(self, data: bytes) -> Tuple[bytes, bool]:
+        """
+        Compress one outgoing message if it is worth it.
+
+        Returns:
+            (payload, compressed) - compressed means RSV1 must be set
+        """
+        if len(data) < self.compress_threshold:
+            return data, False
+        if self._deflater is None or self.deflate_no_context_takeover:
+            self._deflater = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED,
+                                              -self.deflate_window_bits, self.mem_level)
+        payload = self._deflater.compress(data) + self._deflater.flush(zlib.Z_SYNC_FLUSH)
+        if payload.endswith(_DEFLATE_TAIL):
+            payload = payload[:-4]
+        self.stats['messages_deflated'] += 1
+        self.stats['raw_bytes_out'] += len(data)
+        self.stats['compressed_bytes_out'] += len(payload)
+        return payload, True
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['inflate_window_bits'] = self.inflate_window_bits
+        stats['deflate_window_bits'] = self.deflate_window_bits
+        stats['mem_level'] = self.mem_level
+        inflated = stats['inflated_bytes_in']
+        stats['ratio_in'] = round(stats['compressed_bytes_in'] / inflated, 4) if inflated else 0.0
+        return stats
+
+
+# ===== FRAME CODEC =====
+
+def apply_mask(payload: bytes, key: bytes) -> bytes:
+    """XOR payload with 4-byte masking key."""
+    if not payload:
+        return b''
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(len(payload), 'big')
+
+
+def encode_frame(payload: bytes, opcode: int = OPCODE_TEXT, mask: bool = False, rsv1: bool = False) -> bytes:
+    """Encode a single (final) WebSocket frame."""
+    first = 0x80 | (0x40 if rsv1 else 0) | opcode
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+
+    if length < 126:
+        header = struct.pack('!BB', first, mask_bit | length)
+    elif length < 65536:
+        header = struct.pack('!BBH', first, mask_bit | 126, length)
+    else:
+        header = struct.pack('!BBQ', first, mask_bit | 127, length)
+
+    if not mask:
+        return header + payload
+
+    key = os.urandom(4)
+    return header + key + apply_mask(payload, key)
+
+
+# ===== CLIENT SOCKET =====
+
+def open_client_socket(url: str, timeout: Optional[float] = None,
+                       sslopt: Optional[Dict[str, Any]] = None) -> socket.socket:
+    """
+    Connected socket for a ws:// or wss:// URL (TLS wrapped for wss).
+
+    The host is resolved through the shared DNS cache, so reconnects skip
+    getaddrinfo and a failed connect refreshes the cached addresses.
+
+    Args:
+        url: WebSocket URL
+        timeout: Connect and socket timeout in seconds
+        sslopt: {'cert_reqs': ssl.CERT_NONE} disables certificate checks
+    """
+    parsed = urlparse(url)
+    secure = parsed.scheme == 'wss'
+    host = parsed.hostname
+    port = parsed.port or (443 if secure else 80)
+
+    sock = get_dns_cache().create_connection((host, port), timeout)
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if secure:
+            context = ssl.create_default_context()
+            if (sslopt or {}).get('cert_reqs') == ssl.CERT_NONE:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            sock = context.wrap_socket(sock, server_hostname=host)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class DeflateWebSocket:
+    """
+    Stdlib WebSocket client socket with permessage-deflate.
+
+    Implements the part of websocket-client's WebSocket used by
+    websocket_session and websocket_core. Pass DeflateWebSocket.factory as
+    socket_factory to WebSocketSession.
+
+    Connect options:
+        compression: Offer permessage-deflate (default True)
+        window_bits: Max LZ77 window offered for both directions (9-15)
+        mem_level: zlib memLevel for outgoing compression (1-9)
+        compress_threshold: Smallest outgoing payload worth compressing
+        max_message_bytes: Upper bound on one incoming message (frame
+            payloads on the wire and inflated messages)
+        sslopt: {'cert_reqs': ssl.CERT_NONE} disables certificate checks
+        header: Extra request headers ('Name: value' strings)
+    """
+
+    def __init__(self):
+        self.sock: Optional[socket.socket] = None
+        self.connected = False
+        self.deflate: Optional[PerMessageDeflate] = None
+        self.max_message_bytes = WS_DEFLATE_MAX_MESSAGE_BYTES
+        self._leftover = b''
+        self._in_frame = False
+        self._fragments: Optional[Tuple[int, bool, bytearray]] = None
+        self.stats = {
+            'frames_in': 0,
+            'wire_bytes_in': 0,
+            'payload_bytes_in': 0,
+            'frames_out': 0,
+            'wire_bytes_out': 0
+        }
+
+    @classmethod
+    def factory(cls, url: str, timeout: float, **options) -> 'DeflateWebSocket':
+        client = cls()
+        client.connect(url, timeout=timeout, **options)
+        return client
+
+    # ===== HANDSHAKE =====
+
+    def connect(self, url: str, timeout: Optional[float] = None, **options) -> None:
+        parsed = urlparse(url)
+        secure = parsed.scheme == 'wss'
+        host = parsed.hostname
+        port = parsed.port or (443 if secure else 80)
+
+        sock = open_client_socket(url, timeout, options.get('sslopt'))
+        self.sock = sock
+
+        compression = options.get('compression', True)
+        window_bits = options.get('window_bits', WS_DEFLATE_WINDOW_BITS)
+        self.max_message_bytes = options.get('max_message_bytes', WS_DEFLATE_MAX_MESSAGE_BYTES)
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        path = parsed.path or '/'
+        if parsed.query:
+            path = f'{path}?{parsed.query}'
+        default_port = 443 if secure else 80
+        host_header = host if port == default_port else f'{host}:{port}'
+        lines = [
+            f'GET {path} HTTP/1.1',
+            f'Host: {host_header}',
+            'Upgrade: websocket',
+            'Connection: Upgrade',
+            f'Sec-WebSocket-Key: {key}',
+            'Sec-WebSocket-Version: 13',
+        ]
+        if compression:
+            lines.append(f'Sec-WebSocket-Extensions: {build_offer(window_bits)}')
+        lines.extend(options.get('header') or [])
+        sock.sendall(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+        status, headers = self._read_handshake()
+        if status != 101:
+            self.close()
+            raise ConnectionError(f'Handshake rejected: HTTP {status}')
+        expected = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        if headers.get('sec-websocket-accept') != expected:
+            self.close()
+            raise ConnectionError('Handshake rejected: bad Sec-WebSocket-Accept')
+
+        params = parse_extension_params(headers.get('sec-websocket-extensions', ''))
+        if params is not None:
+            if not compression:
+                self.close()
+                raise WebSocketDeflateError('Server enabled permessage-deflate that was not offered')
+            self.deflate = PerMessageDeflate.from_response(
+                params, window_bits=window_bits,
+                mem_level=options.get('mem_level', WS_DEFLATE_MEM_LEVEL),
+                compress_threshold=options.get('compress_threshold', WS_DEFLATE_COMPRESS_THRESHOLD),
+                max_message_bytes=self.max_message_bytes
+            )
+        self.connected = True
+
+    def _read_handshake(self) -> Tuple[int, Dict[str, str]]:
+        data = b''
+        while b'\r\n\r\n' not in data:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError('Connection closed during handshake')
+            data += chunk
+            if len(data) > 65536:
+                raise ConnectionError('Handshake response too large')
+        head, _, self._leftover = data.partition(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            status = int(lines[0].split(' ', 2)[1])
+        except (IndexError, ValueError):
+            raise ConnectionError(f'Malformed handshake response: {lines[0]!r}')
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        return status, headers
+
+    # ===== READING =====
+
+    def _recv_into(self, view: memoryview) -> None:
+        """Fill view completely (handshake leftover first)."""
+        offset = 0
+        if self._leftover:
+            count = min(len(self._leftover), len(view))
+            view[:count] = self._leftover[:count]
+            self._leftover = self._leftover[count:]
+            offset = count
+        while offset < len(view):
+            try:
+                received = self.sock.recv_into(view[offset:])
+            except socket.timeout:
+                if offset or self._in_frame:
+                    # Part of a frame is consumed - the stream cannot be resumed
+                    self.connected = False
+                    raise ConnectionError('Timed out in the middle of a frame')
+                raise
+            if not received:
+                self.connected = False
+                raise ConnectionError('Connection closed')
+            offset += received
+
+    def _recv_bytes(self, count: int) -> bytearray:
+        buffer = bytearray(count)
+        if count:
+            self._recv_into(memoryview(buffer))
+        return buffer
+
+    def _read_frame_header(self) -> Tuple[bool, bool, int, int]:
+        """
+        Read and validate one frame header.
+
+        The payload length comes from the server; it is checked here, before
+        any buffer for the payload is allocated.
+        """
+        self._in_frame = False
+        first, second = self._recv_bytes(2)
+        self._in_frame = True
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', self._recv_bytes(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self._recv_bytes(8))[0]
+        if second & 0x80:
+            # RFC 6455 5.1: client must fail the connection on a masked frame
+            raise ConnectionError('Masked frame from server')
+        fin, opcode = bool(first & 0x80), first & 0x0F
+        if opcode >= OPCODE_CLOSE:
+            # RFC 6455 5.5: control frames are at most 125 bytes, never fragmented
+            if length > 125 or not fin:
+                self.connected = False
+                raise ConnectionError('Invalid control frame')
+        else:
+            buffered = len(self._fragments[2]) if self._fragments is not None else 0
+            if buffered + length > self.max_message_bytes:
+                self.connected = False
+                raise ConnectionError(f'Message exceeds {self.max_message_bytes} bytes')
+        header_size = 2 + (2 if length >= 126 else 0) + (6 if length >= 65536 else 0)
+        self.stats['wire_bytes_in'] += header_size + length
+        return fin, bool(first & 0x40), opcode, length
+
+    def _read_message(self) -> Tuple[int, Any]:
+        """
+        Read one message; control frames are returned as they arrive.
+
+        Fragments are appended to one bytearray (kept across interleaved
+        control frames); a single-frame message is read straight into its
+        own buffer (no join copy).
+        """
+        while True:
+            fin, rsv1, frame_opcode, length = self._read_frame_header()
+            self.stats['frames_in'] += 1
+
+            if frame_opcode >= OPCODE_CLOSE:
+                return frame_opcode, bytes(self._recv_bytes(length))
+
+            if self._fragments is None:
+                if frame_opcode == OPCODE_CONT:
+                    raise ConnectionError('Continuation frame without a message')
+                if rsv1 and self.deflate is None:
+                    raise WebSocketDeflateError('Compressed frame on a connection without permessage-deflate')
+                self._fragments = (frame_opcode, rsv1, self._recv_bytes(length))
+            else:
+                message = self._fragments[2]
+                offset = len(message)
+                message.extend(bytes(length))
+                if length:
+                    self._recv_into(memoryview(message)[offset:])
+
+            if fin:
+                break
+
+        opcode, compressed, message = self._fragments
+        self._fragments = None
+        data = self.deflate.inflate(message) if compressed else message
+        self.stats['payload_bytes_in'] += len(data)
+        return opcode, data
+
+    def recv_data(self, control_frame: bool = False) -> Tuple[int, Any]:
+        """
+        Receive next message as (opcode, payload bytes).
+
+        Text payloads stay bytes - json.loads accepts them directly.
+        Pings are answered; pongs/pings are returned only with control_frame.
+        """
+        while True:
+            opcode, payload = self._read_message()
+            if opcode == OPCODE_CLOSE:
+                if self.connected:
+                    try:
+                        self._send_frame(payload[:2], OPCODE_CLOSE)
+                    except OSError:
+                        pass
+                self.connected = False
+                return opcode, payload
+            if opcode == OPCODE_PING:
+                self._send_frame(payload, OPCODE_PONG)
+                if control_frame:
+                    return opcode, payload
+                continue
+            if opcode == OPCODE_PONG and not control_frame:
+                continue
+            return opcode, payload
+
+    def recv(self) -> Any:
+        opcode, payload = self.recv_data()
+        if opcode == OPCODE_CLOSE:
+            raise ConnectionError('Connection closed by server')
+        return bytes(payload).decode('utf-8') if opcode == OPCODE_TEXT else payload
+
+    # ===== WRITING =====
+
+    def _send_frame(self, payload: bytes, opcode: int, rsv1: bool = False) -> None:
+        frame = encode_frame(payload, opcode, mask=True, rsv1=rsv1)
+        self.sock.sendall(frame)
+        self.stats['frames_out'] += 1
+        self.stats['wire_bytes_out'] += len(frame)
+
+    def send(self, data: Any, opcode: int = OPCODE_TEXT) -> None:
+        payload = data.encode('utf-8') if isinstance(data, str) else data
+        compressed = False
+        if self.deflate is not None and opcode in (OPCODE_TEXT, OPCODE_BINARY):
+            payload, compressed = self.deflate.deflate(payload)
+        self._send_frame(payload, opcode, rsv1=compressed)
+
+    def ping(self, payload: Any = '') -> None:
+        self._send_frame(payload.encode('utf-8') if isinstance(payload, str) else payload, OPCODE_PING)
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        self.sock.settimeout(timeout)
+
+    def close(self) -> None:
+        if self.sock is None:
+            return
+        try:
+            if self.connected:
+                self._send_frame(struct.pack('!H', 1000), OPCODE_CLOSE)
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+        self.connected = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Transport byte counters (+ codec stats when compression negotiated)."""
+        stats = dict(self.stats)
+        stats['compression'] = self.deflate.get_stats() if self.deflate else None
+        return stats
+
+
+__all__ = [
+    'DeflateWebSocket',
+    'open_client_socket',
+    'PerMessageDeflate',
+    'WebSocketDeflateError',
+    'build_offer',
+    'parse_extension_params',
+    'encode_frame',
+    'apply_mask',
+    'WS_DEFLATE_WINDOW_BITS',
+    'WS_DEFLATE_MEM_LEVEL',
+    'WS_DEFLATE_COMPRESS_THRESHOLD',
+    'WS_DEFLATE_MAX_MESSAGE_BYTES',
+]
+
+# EOF
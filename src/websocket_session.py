@@ -0,0 +1,624 @@
+"""
+websocket_session.py - Persistent WebSocket CLIENT Session
+Version: 2026.10.18.06
+Description: Long-lived, already-authenticated WebSocket session reused across
+             warm invocations. Internal module - managed by websocket_core.
+
+CHANGELOG:
+- 2026.10.18.06: Timed-out replies leave the in-flight set
+  - wait() fails the futures it timed out on and removes them, so the next
+    submit() goes through acquire() (idle/lifetime checks, and a ping
+    because the peer missed a deadline) again
+  - Their late replies are discarded instead of buffered
+  - A receive timeout is handled the same way (socket kept, as documented)
+    instead of dropping the socket and every other in-flight reply
+- 2026.10.18.05: websocket-client connects get a socket from
+  websocket_deflate.open_client_socket (shared DNS cache) unless the
+  connect options bring their own socket or a proxy
+- 2026.10.18.04: Byte payloads into the JSON parser
+  - Frames read with recv_data() and parsed from bytes (no str decode copy)
+  - Transport stats (bytes, compression) when the socket provides them
+- 2026.10.18.03: Event subscriptions
+  - subscribe() / poll() / drain_events() for server-pushed events
+  - generation counter (bumped on every connect) so subscribers detect lost
+    subscriptions; frames_dropped counts pending buffer overflow
+- 2026.10.18.02: Multiplexed request/response correlation
+  - submit() assigns the message ID and returns a WebSocketReply future
+  - Frame reader dispatches replies to futures by ID, other frames buffered
+  - pipeline() sends N commands before reading any reply
+  - Pluggable socket_factory (stand-in server for benchmarks/tests)
+- 2026.10.18.01: Initial version
+  - Lazy connect + optional auth handshake (e.g. Home Assistant auth)
+  - Liveness check (ping/pong) after idle period, transparent reconnect
+  - Idle and lifetime caps
+  - Reuse rate and reconnect cost statistics
+
+DESIGN DECISION: Session survives between invocations
+Reason: Lambda freezes the container between invocations but keeps sockets.
+A session that was idle longer than ping_after_seconds is checked with a
+ping before use; if the peer went away while frozen, it is reconnected
+transparently. Sessions idle longer than max_idle_seconds are never reused
+(NAT/load balancer idle timeouts drop them silently).
+
+DESIGN DECISION: Cooperative reader instead of a reader thread
+Reason: Lambda is single-threaded (DEC-04). The reader runs inside
+WebSocketReply.result() / pipeline(): it reads frames until the awaited
+IDs are resolved, completing any other outstanding futures on the way.
+
+COMPLIANCE:
+- AP-08: No threading locks (Lambda single-threaded)
+- DEC-04: Lambda single-threaded model
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import json
+import socket
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Callable, List
+
+from websocket_deflate import open_client_socket
+
+# Defaults (seconds)
+WS_SESSION_PING_AFTER_SECONDS = 30.0
+WS_SESSION_MAX_IDLE_SECONDS = 240.0
+WS_SESSION_MAX_LIFETIME_SECONDS = 3600.0
+WS_SESSION_PING_TIMEOUT_SECONDS = 2.0
+
+# RFC 6455 opcodes
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PONG = 0xA
+
+
+class WebSocketSessionError(Exception):
+    """Raised when a session cannot be (re)established or used."""
+
+
+def _is_timeout(error: Exception) -> bool:
+    """Check if a receive error is a plain timeout (socket still usable)."""
+    return isinstance(error, (socket.timeout, TimeoutError)) or 'Timeout' in type(error).__name__
+
+
+class WebSocketReply:
+    """
+    Future for the reply to one submitted message.
+
+    result() drives the session reader until this reply (or an error) arrives.
+    """
+
+    __slots__ = ('id', 'message', '_session', '_frame', '_error', '_done')
+
+    def __init__(self, session: 'WebSocketSession', message_id: int, message: Dict[str, Any]):
+        self.id = message_id
+        self.message = message
+        self._session = session
+        self._frame: Optional[Dict[str, Any]] = None
+        self._error: Optional[Exception] = None
+        self._done = False
+
+    def done(self) -> bool:
+        """Check if reply (or error) is available."""
+        return self._done
+
+    def set_result(self, frame: Dict[str, Any]) -> None:
+        self._frame = frame
+        self._done = True
+
+    def set_error(self, error: Exception) -> None:
+        self._error = error
+        self._done = True
+
+    def result(self, timeout: float = 10.0) -> Dict[str, Any]:
+        """
+        Wait for the reply frame.
+
+        Raises:
+            WebSocketSessionError: On timeout or connection failure
+        """
+        if not self._done:
+            self._session.wait([self], timeout)
+        if self._error is not None:
+            raise self._error
+        return self._frame
+
+
+class WebSocketSession:
+    """
+    Persistent WebSocket client session.
+
+    auth_message is sent right after connecting. Frames received before the
+    reply whose 'type' equals auth_ok_type are treated as greetings
+    (e.g. Home Assistant's auth_required). Any other reply type fails auth.
+    """
+
+    def __init__(self, url: str, auth_message: Optional[Dict[str, Any]] = None,
+                 auth_ok_type: str = 'auth_ok',
+                 auth_greeting_types: tuple = ('auth_required',),
+                 connect_timeout: float = 10.0,
+                 ping_after_seconds: float = WS_SESSION_PING_AFTER_SECONDS,
+                 max_idle_seconds: float = WS_SESSION_MAX_IDLE_SECONDS,
+                 max_lifetime_seconds: float = WS_SESSION_MAX_LIFETIME_SECONDS,
+                 connect_options: Optional[Dict[str, Any]] = None,
+                 socket_factory: Optional[Callable[..., Any]] = None):
+        self.url = url
+        self._auth_message = auth_message
+        self._auth_ok_type = auth_ok_type
+        self._auth_greeting_types = auth_greeting_types
+        self._connect_timeout = connect_timeout
+        self._ping_after = ping_after_seconds
+        self._max_idle = max_idle_seconds
+        self._max_lifetime = max_lifetime_seconds
+        self._connect_options = connect_options or {}
+        self._socket_factory = socket_factory
+
+        self._ws = None
+        self._connected_at = 0.0
+        self._last_used = 0.0
+        self._next_id = 1
+        self._pending_frames = deque(maxlen=1000)
+        self._futures: Dict[int, WebSocketReply] = {}
+        self._abandoned_ids: set = set()
+        self._liveness_due = False
+        self._subscriptions: set = set()
+        self.generation = 0
+        self.server_info: Dict[str, Any] = {}
+
+        self._stats = {
+            'acquisitions': 0,
+            'reuses': 0,
+            'connects': 0,
+            'reconnects': 0,
+            'connect_ms_total': 0.0,
+            'last_connect_ms': 0.0,
+            'liveness_checks': 0,
+            'liveness_failures': 0,
+            'idle_expirations': 0,
+            'lifetime_expirations': 0,
+            'requests': 0,
+            'request_errors': 0,
+            'pipelines': 0,
+            'max_in_flight': 0,
+            'frames_buffered': 0,
+            'frames_dropped': 0,
+            'events_received': 0,
+            'request_timeouts': 0,
+            'late_replies_discarded': 0
+        }
+
+    # ===== CONNECTION LIFECYCLE =====
+
+    @property
+    def connected(self) -> bool:
+        """Check if a socket is currently held (not necessarily alive)."""
+        return self._ws is not None and getattr(self._ws, 'connected', True)
+
+    def _open_socket(self, timeout: float):
+        """Open raw socket via socket_factory, or websocket-client by default."""
+        if self._socket_factory is not None:
+            return self._socket_factory(self.url, timeout, **self._connect_options)
+        import websocket
+        options = self._connect_options
+        if 'socket' not in options and 'http_proxy_host' not in options:
+            options = dict(options, socket=open_client_socket(self.url, timeout, options.get('sslopt')))
+        ws = websocket.WebSocket()
+        ws.connect(self.url, timeout=timeout, **options)
+        return ws
+
+    def _recv_json(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Receive one data frame and parse JSON straight from its bytes."""
+        if timeout is not None:
+            self._ws.settimeout(timeout)
+        opcode, data = self._ws.recv_data()
+        if opcode == OPCODE_CLOSE:
+            raise ConnectionError('Connection closed by server')
+        return json.loads(data)
+
+    def _send_json(self, message: Dict[str, Any]) -> None:
+        self._ws.send(json.dumps(message))
+
+    def _authenticate(self, timeout: float) -> None:
+        """Run the auth handshake on a fresh socket."""
+        if self._auth_message is None:
+            return
+
+        deadline = time.monotonic() + timeout
+        sent = False
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise WebSocketSessionError('Authentication timed out')
+
+            if not sent and not self._auth_greeting_types:
+                self._send_json(self._auth_message)
+                sent = True
+
+            frame = self._recv_json(remaining)
+            frame_type = frame.get('type')
+
+            if frame_type in self._auth_greeting_types:
+                self.server_info = frame
+                if not sent:
+                    self._send_json(self._auth_message)
+                    sent = True
+                continue
+
+            if frame_type == self._auth_ok_type:
+                self.server_info.update(frame)
+                return
+
+            raise WebSocketSessionError(f'Authentication failed: {frame_type}')
+
+    def _connect(self, reason: str) -> None:
+        """Open and authenticate a new socket."""
+        self._close_socket()
+
+        start = time.perf_counter()
+        try:
+            self._ws = self._open_socket(self._connect_timeout)
+            self._authenticate(self._connect_timeout)
+        except Exception as e:
+            self._close_socket()
+            raise WebSocketSessionError(f'Connect failed ({reason}): {e}') from e
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        now = time.monotonic()
+        self._connected_at = now
+        self._last_used = now
+        self._next_id = 1
+        self._pending_frames.clear()
+        self._futures.clear()
+        self._abandoned_ids.clear()
+        self._liveness_due = False
+        self._subscriptions.clear()
+        self.generation += 1
+
+        self._stats['connects'] += 1
+        if reason != 'initial':
+            self._stats['reconnects'] += 1
+        self._stats['connect_ms_total'] += duration_ms
+        self._stats['last_connect_ms'] = duration_ms
+
+    def _close_socket(self, error: Optional[Exception] = None) -> None:
+        # Outstanding replies can never arrive on a new socket
+        if self._futures:
+            failure = error or WebSocketSessionError('Connection closed')
+            for future in self._futures.values():
+                future.set_error(failure)
+            self._futures.clear()
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+        self._ws = None
+
+    def _is_alive(self) -> bool:
+        """
+        Liveness check with a protocol-level ping.
+
+        Data frames that arrive before the pong are kept for later reads.
+        """
+        self._stats['liveness_checks'] += 1
+        try:
+            self._ws.ping()
+            self._ws.settimeout(WS_SESSION_PING_TIMEOUT_SECONDS)
+            while True:
+                opcode, data = self._ws.recv_data(control_frame=True)
+                if opcode == OPCODE_PONG:
+                    return True
+                if opcode == OPCODE_CLOSE:
+                    return False
+                if opcode in (OPCODE_TEXT, OPCODE_BINARY):
+                    self._dispatch(json.loads(data))
+        except Exception:
+            self._stats['liveness_failures'] += 1
+            return False
+
+    def acquire(self) -> 'WebSocketSession':
+        """
+        Make sure the session holds a live, authenticated socket.
+
+        Raises:
+            WebSocketSessionError: If (re)connect fails
+        """
+        self._stats['acquisitions'] += 1
+        now = time.monotonic()
+
+        if not self.connected:
+            self._connect('initial' if self._stats['connects'] == 0 else 'disconnected')
+            return self
+
+        idle = now - self._last_used
+        if idle > self._max_idle:
+            self._stats['idle_expirations'] += 1
+            self._connect('idle')
+            return self
+
+        if now - self._connected_at > self._max_lifetime:
+            self._stats['lifetime_expirations'] += 1
+            self._connect('lifetime')
+            return self
+
+        if idle > self._ping_after or self._liveness_due:
+            self._liveness_due = False
+            if not self._is_alive():
+                self._connect('liveness')
+                return self
+
+        self._stats['reuses'] += 1
+        self._last_used = now
+        return self
+
+    def close(self) -> None:
+        """Close the session socket (next acquire reconnects)."""
+        self._close_socket()
+
+    # ===== MESSAGING =====
+
+    def next_id(self) -> int:
+        """Allocate next message ID (must increase per connection for HA)."""
+        message_id = self._next_id
+        self._next_id += 1
+        return message_id
+
+    def submit(self, message: Dict[str, Any]) -> WebSocketReply:
+        """
+        Send message with a fresh ID without waiting for the reply.
+
+        Args:
+            message: Message without 'id'
+
+        Returns:
+            WebSocketReply future resolved by the frame reader
+        """
+        if not self._futures:
+            self.acquire()
+        elif not self.connected:
+            raise WebSocketSessionError('Connection closed')
+
+        outgoing = dict(message)
+        outgoing['id'] = self.next_id()
+        future = WebSocketReply(self, outgoing['id'], outgoing)
+
+        try:
+            self._send_json(outgoing)
+        except Exception as e:
+            self._stats['request_errors'] += 1
+            failure = WebSocketSessionError(f'Send failed: {e}')
+            self._close_socket(failure)
+            raise failure from e
+
+        self._futures[future.id] = future
+        self._stats['requests'] += 1
+        if len(self._futures) > self._stats['max_in_flight']:
+            self._stats['max_in_flight'] = len(self._futures)
+        return future
+
+    def _dispatch(self, frame: Dict[str, Any]) -> None:
+        """Route frame to its reply future, or buffer it (events, unknown IDs)."""
+        # Event frames reuse their subscription's ID and are never replies
+        if frame.get('type') != 'event':
+            future = self._futures.pop(frame.get('id'), None)
+            if future is not None:
+                future.set_result(frame)
+                return
+            if frame.get('id') in self._abandoned_ids:
+                # Reply to a request that already timed out
+                self._abandoned_ids.discard(frame.get('id'))
+                self._stats['late_replies_discarded'] += 1
+                return
+        else:
+            self._stats['events_received'] += 1
+        if len(self._pending_frames) == self._pending_frames.maxlen:
+            self._stats['frames_dropped'] += 1
+        self._pending_frames.append(frame)
+        self._stats['frames_buffered'] += 1
+
+    def wait(self, futures: List[WebSocketReply], timeout: float = 10.0) -> None:
+        """
+        Run the frame reader until all given futures are done.
+
+        Replies for other outstanding futures are resolved along the way.
+
+        Futures still open at the deadline fail with the timeout error and
+        leave the in-flight set; their replies are discarded if they arrive
+        later.
+
+        Raises:
+            WebSocketSessionError: On timeout (socket kept) or read failure (socket dropped)
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            while not all(future.done() for future in futures):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._abandon([future for future in futures if not future.done()])
+                try:
+                    frame = self._recv_json(remaining)
+                except Exception as e:
+                    if not _is_timeout(e):
+                        raise
+                    self._abandon([future for future in futures if not future.done()])
+                self._dispatch(frame)
+            self._last_used = time.monotonic()
+        except WebSocketSessionError:
+            self._stats['request_errors'] += 1
+            raise
+        except Exception as e:
+            # Socket state unknown - drop it so the next acquire reconnects
+            self._stats['request_errors'] += 1
+            failure = WebSocketSessionError(f'Request failed: {e}')
+            self._close_socket(failure)
+            raise failure from e
+
+    def _abandon(self, futures: List[WebSocketReply]) -> None:
+        """
+        Fail timed-out futures and stop tracking them.
+
+        With nothing in flight the next submit() runs acquire() again, so a
+        socket that went quiet is liveness-checked before it is reused.
+
+        Raises:
+            WebSocketSessionError: Always (the timeout)
+        """
+        failure = WebSocketSessionError(f'Timed out waiting for reply to id(s) {[f.id for f in futures]}')
+        for future in futures:
+            self._futures.pop(future.id, None)
+            self._abandoned_ids.add(future.id)
+            future.set_error(failure)
+        self._stats['request_timeouts'] += len(futures)
+        # A peer that missed a reply deadline is pinged before the next use
+        self._liveness_due = True
+        raise failure
+
+    def request(self, message: Dict[str, Any], timeout: float = 10.0) -> Dict[str, Any]:
+        """
+        Send message with a fresh ID and wait for the reply with that ID.
+
+        Frames for other IDs (events, late replies) are dispatched to their
+        own futures or kept in the pending buffer.
+
+        Args:
+            message: Message without 'id'
+            timeout: Seconds to wait for the reply
+
+        Returns:
+            Reply frame (dict)
+        """
+        return self.submit(message).result(timeout)
+
+    def pipeline(self, messages: List[Dict[str, Any]], timeout: float = 10.0) -> List[Dict[str, Any]]:
+        """
+        Send all messages back-to-back, then collect replies in any arrival order.
+
+        Total latency is roughly one round trip plus the slowest command instead
+        of the sum of all round trips.
+
+        Args:
+            messages: Messages without 'id'
+            timeout: Seconds to wait for all replies
+
+        Returns:
+            Reply frames in the order of messages
+        """
+        self._stats['pipelines'] += 1
+        futures = [self.submit(message) for message in messages]
+        self.wait(futures, timeout)
+        return [future.result(0) for future in futures]
+
+    # ===== EVENT SUBSCRIPTIONS =====
+
+    def subscribe(self, message: Dict[str, Any], timeout: float = 10.0) -> int:
+        """
+        Send a subscription command (e.g. HA subscribe_events).
+
+        Events arrive as frames of type 'event' carrying the subscription ID
+        and are collected by poll()/drain_events(). Subscriptions are lost on
+        reconnect; compare generation to detect that.
+
+        Returns:
+            Subscription ID
+
+        Raises:
+            WebSocketSessionError: If the server rejects the subscription
+        """
+        reply = self.request(message, timeout)
+        if reply.get('type') == 'result' and not reply.get('success', True):
+            error = reply.get('error', {}).get('message', 'Subscription rejected')
+            raise WebSocketSessionError(error)
+        self._subscriptions.add(reply['id'])
+        return reply['id']
+
+    def unsubscribe(self, subscription_id: int, message: Dict[str, Any], timeout: float = 10.0) -> None:
+        """Send unsubscribe command and forget the subscription (best effort)."""
+        self._subscriptions.discard(subscription_id)
+        if self.connected:
+            self.request(message, timeout)
+
+    def poll(self, wait: float = 0.0, max_frames: int = 10000) -> int:
+        """
+        Read frames that are already available without waiting for new ones.
+
+        Used to catch up on events pushed while the container was frozen.
+
+        Args:
+            wait: Seconds to wait for the first/next frame before stopping
+            max_frames: Upper bound on frames read in one poll
+
+        Returns:
+            Number of frames read (0 if disconnected)
+        """
+        if not self.connected:
+            return 0
+        read = 0
+        try:
+            while read < max_frames:
+                self._ws.settimeout(max(wait, 0.001))
+                self._dispatch(self._recv_json())
+                read += 1
+        except Exception as e:
+            if not _is_timeout(e):
+                self._close_socket(WebSocketSessionError(f'Connection lost: {e}'))
+        if read:
+            self._last_used = time.monotonic()
+        return read
+
+    def drain_events(self, subscription_ids: Optional[set] = None) -> List[Dict[str, Any]]:
+        """
+        Return and remove buffered event frames (other frames stay buffered).
+
+        Args:
+            subscription_ids: Only these subscriptions (None = all)
+        """
+        events = []
+        kept = deque(maxlen=self._pending_frames.maxlen)
+        for frame in self._pending_frames:
+            if frame.get('type') == 'event' and (subscription_ids is None or frame.get('id') in subscription_ids):
+                events.append(frame)
+            else:
+                kept.append(frame)
+        self._pending_frames = kept
+        return events
+
+    def drain_pending(self) -> List[Dict[str, Any]]:
+        """Return and clear frames buffered while waiting for replies."""
+        frames = list(self._pending_frames)
+        self._pending_frames.clear()
+        return frames
+
+    # ===== STATS =====
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get session statistics (reuse rate, reconnect cost)."""
+        stats = self._stats.copy()
+        acquisitions = stats['acquisitions']
+        stats['reuse_rate'] = round(stats['reuses'] / acquisitions, 4) if acquisitions else 0.0
+        stats['avg_connect_ms'] = (
+            round(stats['connect_ms_total'] / stats['connects'], 2) if stats['connects'] else 0.0
+        )
+        stats['connected'] = self.connected
+        stats['age_seconds'] = round(time.monotonic() - self._connected_at, 2) if self.connected else 0.0
+        stats['idle_seconds'] = round(time.monotonic() - self._last_used, 2) if self.connected else 0.0
+        stats['pending_frames'] = len(self._pending_frames)
+        stats['in_flight'] = len(self._futures)
+        stats['subscriptions'] = len(self._subscriptions)
+        stats['generation'] = self.generation
+        transport_stats = getattr(self._ws, 'get_stats', None)
+        stats['transport'] = transport_stats() if callable(transport_stats) else None
+        return stats
+
+
+__all__ = [
+    'WebSocketSession',
+    'WebSocketSessionError',
+    'WebSocketReply',
+    'WS_SESSION_PING_AFTER_SECONDS',
+    'WS_SESSION_MAX_IDLE_SECONDS',
+    'WS_SESSION_MAX_LIFETIME_SECONDS',
+]
+
+# EOF
@@ -0,0 +1,541 @@
+"""
+websocket_standin.py - Local Stand-In WebSocket Server (Benchmarks/Tests)
+Version: 2026.10.18.03
+Description: Minimal RFC 6455 loopback server scripted like Home Assistant's
+             WebSocket API, plus a stdlib client socket with the subset of the
+             websocket-client interface used by websocket_session.
+
+CHANGELOG:
+- 2026.10.18.03: Transport tests
+  - no_context_takeover=True negotiates server/client_no_context_takeover
+  - push_frame() queues raw frame bytes (malformed or unnegotiated frames)
+- 2026.10.18.02: permessage-deflate
+  - compression=True accepts the client's permessage-deflate offer and
+    compresses outgoing frames (compression=False = uncompressed stand-in)
+  - bytes_sent / frames_sent in stats for transfer benchmarks
+  - Frame codec shared with websocket_deflate
+- 2026.10.18.01: Initial version
+  - HA auth handshake (auth_required -> auth -> auth_ok/auth_invalid)
+  - Scripted command handlers with simulated processing latency
+  - Replies scheduled independently so pipelined commands overlap (like HA)
+  - Protocol ping/pong, event push to subscriptions, connection drop
+
+DESIGN DECISION: Benchmark and test tooling only
+Reason: Never used on the Lambda request path. The server runs in background
+threads on 127.0.0.1, which is fine for local tooling but not for Lambda
+code (AP-08). Outgoing frames are handed to the connection thread through a
+queue so the connection socket only has one writer.
+
+Copyright 2025 Joseph Hersey
+Licensed under Apache 2.0 (see LICENSE).
+"""
+
+import base64
+import hashlib
+import heapq
+import json
+import os
+import queue
+import select
+import socket
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from websocket_deflate import (
+    PerMessageDeflate,
+    parse_extension_params,
+    encode_frame,
+    apply_mask as _apply_mask,
+    OPCODE_TEXT,
+    OPCODE_BINARY,
+    OPCODE_CLOSE,
+    OPCODE_PING,
+    OPCODE_PONG
+)
+
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+# ===== FRAME CODEC =====
+
+class _BufferedReader:
+    """Socket reader that first returns bytes read past the HTTP handshake."""
+
+    def __init__(self, sock: socket.socket, leftover: bytes = b''):
+        self.sock = sock
+        self.leftover = leftover
+
+    def recv(self, count: int) -> bytes:
+        if self.leftover:
+            chunk, self.leftover = self.leftover[:count], self.leftover[count:]
+            return chunk
+        return self.sock.recv(count)
+
+
+def _read_handshake(sock: socket.socket) -> Tuple[bytes, bytes]:
+    """Read HTTP handshake; returns (head, bytes already read past it)."""
+    data = b''
+    while b'\r\n\r\n' not in data:
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError('Connection closed during handshake')
+        data += chunk
+    head, _, rest = data.partition(b'\r\n\r\n')
+    return head, rest
+
+
+def _recv_exact(sock: Any, count: int) -> bytes:
+    data = bytearray()
+    while len(data) < count:
+        chunk = sock.recv(count - len(data))
+        if not chunk:
+            raise ConnectionError('Connection closed')
+        data.extend(chunk)
+    return bytes(data)
+
+
+def read_frame(sock: Any) -> Tuple[int, bytes, bool]:
+    """
+    Read one complete message (continuation frames joined).
+
+    Returns:
+        (opcode, payload, rsv1) of the first frame
+    """
+    opcode = None
+    rsv1 = False
+    payload = bytearray()
+    while True:
+        first, second = _recv_exact(sock, 2)
+        fin = bool(first & 0x80)
+        frame_opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', _recv_exact(sock, 2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', _recv_exact(sock, 8))[0]
+        key = _recv_exact(sock, 4) if second & 0x80 else None
+        data = _recv_exact(sock, length) if length else b''
+        if key:
+            data = _apply_mask(data, key)
+
+        if frame_opcode >= OPCODE_CLOSE:
+            # Control frames may interleave with fragmented messages
+            return frame_opcode, data, False
+
+        if opcode is None:
+            opcode = frame_opcode
+            rsv1 = bool(first & 0x40)
+        payload.extend(data)
+        if fin:
+            return opcode, bytes(payload), rsv1
+
+
+# ===== STAND-IN SERVER =====
+
+def _default_handlers() -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    """HA-like command handlers returning the 'result' payload."""
+    return {
+        'get_states': lambda msg: [],
+        'config/entity_registry/list': lambda msg: [],
+        'config/device_registry/list': lambda msg: [],
+        'config/area_registry/list': lambda msg: [],
+    }
+
+
+class StandInWebSocketServer:
+    """
+    Loopback WebSocket server behaving like Home Assistant's API.
+
+    Args:
+        handlers: Command type -> callable(message) returning the result payload
+        latency_ms: Simulated processing time per command
+        access_token: Accepted token (None = accept any)
+        compression: Accept permessage-deflate offers
+        no_context_takeover: Negotiate no context takeover in both directions
+    """
+
+    def __init__(self, handlers: Optional[Dict[str, Callable]] = None,
+                 latency_ms: float = 0.0, access_token: Optional[str] = None,
+                 compression: bool = False, no_context_takeover: bool = False):
+        self.handlers = _default_handlers()
+        if handlers:
+            self.handlers.update(handlers)
+        self.latency_ms = latency_ms
+        self.access_token = access_token
+        self.compression = compression
+        self.no_context_takeover = no_context_takeover
+
+        self._sock: Optional[socket.socket] = None
+        self._running = False
+        self._connections: List['_StandInConnection'] = []
+        self.stats = {'connections': 0, 'commands': 0, 'auth_failures': 0, 'pings': 0,
+                      'frames_sent': 0, 'bytes_sent': 0, 'compressed_connections': 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self._sock.getsockname()[:2]
+        return f"ws://{host}:{port}/api/websocket"
+
+    def start(self) -> 'StandInWebSocketServer':
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(('127.0.0.1', 0))
+        self._sock.listen(16)
+        self._running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._running = False
+        self.drop_connections()
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _accept_loop(self) -> None:
+        while self._running:
+            try:
+                client, _ = self._sock.accept()
+            except OSError:
+                return
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection = _StandInConnection(self, client)
+            self._connections.append(connection)
+            self.stats['connections'] += 1
+            threading.Thread(target=connection.run, daemon=True).start()
+
+    def push_event(self, event: Dict[str, Any], event_type: Optional[str] = None) -> int:
+        """
+        Push an event to all matching subscriptions on live connections.
+
+        Returns:
+            Number of frames queued
+        """
+        event_type = event_type or event.get('event_type')
+        queued = 0
+        for connection in list(self._connections):
+            queued += connection.push_event(event, event_type)
+        return queued
+
+    def push_frame(self, frame: bytes) -> int:
+        """
+        Queue raw frame bytes on all live connections (sent as is).
+
+        Returns:
+            Number of connections the frame was queued on
+        """
+        queued = 0
+        for connection in list(self._connections):
+            if connection.alive:
+                connection.push_frame(frame)
+                queued += 1
+        return queued
+
+    def drop_connections(self) -> None:
+        """Close all client connections abruptly (simulates HA restart/NAT drop)."""
+        for connection in list(self._connections):
+            connection.drop()
+        self._connections = []
+
+    def wait_for_subscriptions(self, count: int = 1, timeout: float = 2.0) -> bool:
+        """Wait until live connections hold at least count subscriptions."""
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            if sum(len(c.subscriptions) for c in list(self._connections) if c.alive) >= count:
+                return True
+            time.sleep(0.002)
+        return False
+
+
+class _StandInConnection:
+    """One accepted client connection."""
+
+    def __init__(self, server: StandInWebSocketServer, sock: socket.socket):
+        self.server = server
+        self.sock = sock
+        self.alive = True
+        self.authenticated = False
+        self.subscriptions: Dict[int, Optional[str]] = {}
+        self.reader = _BufferedReader(sock)
+        self._outgoing: 'queue.Queue[bytes]' = queue.Queue()
+        self._scheduled: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._seq = 0
+        self.deflate: Optional[PerMessageDeflate] = None
+
+    # --- handshake ---
+
+    def _handshake(self) -> bool:
+        request, leftover = _read_handshake(self.sock)
+        self.reader = _BufferedReader(self.sock, leftover)
+        headers = {}
+        for line in request.decode('latin-1').split('\r\n')[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        accept = base64.b64encode(
+            hashlib.sha1((headers.get('sec-websocket-key', '') + _WS_GUID).encode()).digest()
+        ).decode()
+        extension = ''
+        offer = parse_extension_params(headers.get('sec-websocket-extensions', ''))
+        if self.server.compression and offer is not None:
+            # Server window honors the client's server_max_window_bits limit
+            server_bits = int(offer.get('server_max_window_bits') or 15)
+            client_bits = int(offer.get('client_max_window_bits') or 15)
+            no_takeover = self.server.no_context_takeover
+            self.deflate = PerMessageDeflate(inflate_window_bits=client_bits,
+                                             deflate_window_bits=server_bits,
+                                             inflate_no_context_takeover=no_takeover,
+                                             deflate_no_context_takeover=no_takeover,
+                                             compress_threshold=0)
+            takeover = '; server_no_context_takeover; client_no_context_takeover' if no_takeover else ''
+            extension = (f'Sec-WebSocket-Extensions: permessage-deflate; '
+                         f'server_max_window_bits={server_bits}; '
+                         f'client_max_window_bits={client_bits}{takeover}\r\n')
+            self.server.stats['compressed_connections'] += 1
+        response = (
+            'HTTP/1.1 101 Switching Protocols\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Accept: {accept}\r\n'
+            f'{extension}'
+            '\r\n'
+        )
+        self.sock.sendall(response.encode())
+        return True
+
+    # --- outgoing ---
+
+    def send_json(self, message: Dict[str, Any]) -> None:
+        payload = json.dumps(message).encode('utf-8')
+        if self.deflate is not None:
+            payload, compressed = self.deflate.deflate(payload)
+            frame = encode_frame(payload, rsv1=compressed)
+        else:
+            frame = encode_frame(payload)
+        self.server.stats['frames_sent'] += 1
+        self.server.stats['bytes_sent'] += len(frame)
+        self._outgoing.put(frame)
+
+    def push_frame(self, frame: bytes) -> None:
+        self.server.stats['frames_sent'] += 1
+        self.server.stats['bytes_sent'] += len(frame)
+        self._outgoing.put(frame)
+
+    def _flush(self) -> None:
+        while True:
+            try:
+                frame = self._outgoing.get_nowait()
+            except queue.Empty:
+                return
+            self.sock.sendall(frame)
+
+    def push_event(self, event: Dict[str, Any], event_type: Optional[str]) -> int:
+        if not self.alive:
+            return 0
+        queued = 0
+        for sub_id, sub_type in list(self.subscriptions.items()):
+            if sub_type is None or sub_type == event_type:
+                self.send_json({'id': sub_id, 'type': 'event', 'event': event})
+                queued += 1
+        return queued
+
+    def drop(self) -> None:
+        self.alive = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    # --- incoming ---
+
+    def _handle_message(self, message: Dict[str, Any]) -> None:
+        msg_type = message.get('type')
+
+        if not self.authenticated:
+            if msg_type == 'auth' and (
+                self.server.access_token is None or message.get('access_token') == self.server.access_token
+            ):
+                self.authenticated = True
+                self.send_json({'type': 'auth_ok', 'ha_version': 'stand-in'})
+            else:
+                self.server.stats['auth_failures'] += 1
+                self.send_json({'type': 'auth_invalid', 'message': 'Invalid access token'})
+            return
+
+        self.server.stats['commands'] += 1
+        msg_id = message.get('id')
+
+        if msg_type == 'ping':
+            reply = {'id': msg_id, 'type': 'pong'}
+        elif msg_type == 'subscribe_events':
+            self.subscriptions[msg_id] = message.get('event_type')
+            reply = {'id': msg_id, 'type': 'result', 'success': True, 'result': None}
+        elif msg_type == 'unsubscribe_events':
+            self.subscriptions.pop(message.get('subscription'), None)
+            reply = {'id': msg_id, 'type': 'result', 'success': True, 'result': None}
+        elif msg_type in self.server.handlers:
+            try:
+                result = self.server.handlers[msg_type](message)
+                reply = {'id': msg_id, 'type': 'result', 'success': True, 'result': result}
+            except Exception as e:
+                reply = {'id': msg_id, 'type': 'result', 'success': False,
+                         'error': {'code': 'handler_error', 'message': str(e)}}
+        else:
+            reply = {'id': msg_id, 'type': 'result', 'success': False,
+                     'error': {'code': 'unknown_command', 'message': f'Unknown command: {msg_type}'}}
+
+        # Each command is processed independently: replies are due latency_ms
+        # after their own arrival, so pipelined commands overlap.
+        self._seq += 1
+        due = time.monotonic() + self.server.latency_ms / 1000.0
+        heapq.heappush(self._scheduled, (due, self._seq, reply))
+
+    def run(self) -> None:
+        try:
+            if not self._handshake():
+                return
+            self.send_json({'type': 'auth_required', 'ha_version': 'stand-in'})
+            while self.alive:
+                self._flush()
+                now = time.monotonic()
+                while self._scheduled and self._scheduled[0][0] <= now:
+                    self.send_json(heapq.heappop(self._scheduled)[2])
+                self._flush()
+
+                wait = 0.002
+                if self._scheduled:
+                    wait = max(0.0, min(wait, self._scheduled[0][0] - now))
+                if not self.reader.leftover:
+                    readable, _, _ = select.select([self.sock], [], [], wait)
+                    if not readable:
+                        continue
+
+                opcode, payload, compressed = read_frame(self.reader)
+                if compressed and self.deflate is not None:
+                    payload = self.deflate.inflate(bytearray(payload))
+                if opcode == OPCODE_CLOSE:
+                    self.sock.sendall(encode_frame(payload[:2], OPCODE_CLOSE))
+                    return
+                if opcode == OPCODE_PING:
+                    self.server.stats['pings'] += 1
+                    self.sock.sendall(encode_frame(payload, OPCODE_PONG))
+                    continue
+                if opcode in (OPCODE_TEXT, OPCODE_BINARY):
+                    self._handle_message(json.loads(payload))
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.drop()
+
+
+# ===== STAND-IN CLIENT SOCKET =====
+
+class StandInClientSocket:
+    """
+    Stdlib WebSocket client socket (subset of websocket-client's WebSocket).
+
+    Supports connect, send, recv, recv_data(control_frame=True), ping,
+    settimeout, close and the connected attribute. Pass
+    StandInClientSocket.factory as socket_factory to WebSocketSession.
+    """
+
+    def __init__(self):
+        self.sock: Optional[socket.socket] = None
+        self.reader: Optional[_BufferedReader] = None
+        self.connected = False
+
+    @classmethod
+    def factory(cls, url: str, timeout: float, **options) -> 'StandInClientSocket':
+        client = cls()
+        client.connect(url, timeout=timeout, **options)
+        return client
+
+    def connect(self, url: str, timeout: Optional[float] = None, **options) -> None:
+        parsed = urlparse(url)
+        self.sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (
+            f'GET {parsed.path or "/"} HTTP/1.1\r\n'
+            f'Host: {parsed.hostname}:{parsed.port}\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Key: {key}\r\n'
+            'Sec-WebSocket-Version: 13\r\n'
+            '\r\n'
+        )
+        self.sock.sendall(request.encode())
+        response, leftover = _read_handshake(self.sock)
+        if b' 101 ' not in response.split(b'\r\n', 1)[0]:
+            raise ConnectionError('Handshake rejected')
+        self.reader = _BufferedReader(self.sock, leftover)
+        self.connected = True
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        self.sock.settimeout(timeout)
+
+    def send(self, data: str, opcode: int = OPCODE_TEXT) -> None:
+        payload = data.encode('utf-8') if isinstance(data, str) else data
+        self.sock.sendall(encode_frame(payload, opcode, mask=True))
+
+    def ping(self, payload: str = '') -> None:
+        self.send(payload, OPCODE_PING)
+
+    def recv_data(self, control_frame: bool = False) -> Tuple[int, bytes]:
+        while True:
+            opcode, payload, _ = read_frame(self.reader)
+            if opcode == OPCODE_CLOSE:
+                self.connected = False
+                return opcode, payload
+            if opcode == OPCODE_PING:
+                self.sock.sendall(encode_frame(payload, OPCODE_PONG, mask=True))
+                if control_frame:
+                    return opcode, payload
+                continue
+            if opcode == OPCODE_PONG and not control_frame:
+                continue
+            return opcode, payload
+
+    def recv(self) -> str:
+        opcode, payload = self.recv_data()
+        if opcode == OPCODE_CLOSE:
+            raise ConnectionError('Connection closed by server')
+        return payload.decode('utf-8') if opcode == OPCODE_TEXT else payload
+
+    def close(self) -> None:
+        if self.sock is None:
+            return
+        try:
+            if self.connected:
+                self.sock.sendall(encode_frame(struct.pack('!H', 1000), OPCODE_CLOSE, mask=True))
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+        self.connected = False
+
+
+__all__ = [
+    'StandInWebSocketServer',
+    'StandInClientSocket',
+    'encode_frame',
+    'read_frame',
+]
+
+# EOF